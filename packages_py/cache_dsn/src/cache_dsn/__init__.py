@@ -30,6 +30,7 @@ from .config import (
 )
 from .stores import MemoryStore, create_memory_store
 from .resolver import DnsCacheResolver, create_dns_cache_resolver
+from .snapshot import write_snapshot, read_snapshot, load_snapshot
 
 
 __all__ = [
@@ -64,6 +65,10 @@ __all__ = [
     # Resolver
     "DnsCacheResolver",
     "create_dns_cache_resolver",
+    # Snapshots
+    "write_snapshot",
+    "read_snapshot",
+    "load_snapshot",
 ]
 
 
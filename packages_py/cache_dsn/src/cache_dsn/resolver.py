@@ -29,6 +29,7 @@ from .config import (
     LoadBalanceState,
 )
 from .stores.memory import MemoryStore
+from .snapshot import load_snapshot, write_snapshot
 
 
 class DnsCacheResolver:
@@ -407,6 +408,14 @@ class DnsCacheResolver:
             ))
         return deleted
 
+    async def export_snapshot(self, path: str) -> int:
+        """Write every cached entry to a snapshot file, returning the number written"""
+        return await write_snapshot(self._store, path)
+
+    async def import_snapshot(self, path: str) -> int:
+        """Load unexpired entries from a snapshot file, returning the number loaded"""
+        return await load_snapshot(self._store, path)
+
     async def clear(self) -> None:
         """Clear all cached entries"""
         keys = await self._store.keys()
@@ -0,0 +1,156 @@
+"""
+DNS cache snapshots for warm starts
+
+File I/O runs in a worker thread about a megabyte at a time, so exporting or
+importing a large cache never blocks the event loop for long.
+"""
+import asyncio
+import json
+import os
+import struct
+import time
+from contextlib import suppress
+from dataclasses import asdict
+from typing import IO, AsyncIterator, Iterator, List, Optional
+
+from .config import is_expired
+from .types import CachedEntry, DnsCacheStore, ResolvedEndpoint
+
+_SNAPSHOT_MAGIC = b"DNSN"
+_FORMAT_VERSION = 1
+# magic, version, created_at
+_SNAPSHOT_HEADER = struct.Struct("<4sId")
+# record length
+_RECORD_HEADER = struct.Struct("<I")
+# Bytes handed to the worker thread per write or read
+_BATCH_SIZE = 1024 * 1024
+
+
+def _encode_entry(entry: CachedEntry) -> bytes:
+    """Encode an entry as compact JSON"""
+    return json.dumps(asdict(entry), separators=(",", ":")).encode("utf-8")
+
+
+def _decode_entry(data: bytes) -> CachedEntry:
+    """Decode an entry produced by _encode_entry"""
+    fields = json.loads(data)
+    fields["endpoints"] = [ResolvedEndpoint(**endpoint) for endpoint in fields["endpoints"]]
+    return CachedEntry(**fields)
+
+
+def _finish_file(f: IO[bytes], chunks: List[bytes]) -> None:
+    """Write the last chunks, sync and close a snapshot file"""
+    with f:
+        f.writelines(chunks)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+async def write_snapshot(store: DnsCacheStore, path: str) -> int:
+    """Stream every cached entry to a snapshot file (written to a temp file, then renamed)"""
+    # peek() reads without refreshing the entry's LRU position
+    peek = getattr(store, "peek", None) or store.get
+    tmp_path = f"{path}.tmp"
+    f = await asyncio.to_thread(open, tmp_path, "wb")
+    written = 0
+    try:
+        chunks = [_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _FORMAT_VERSION, time.time())]
+        pending = len(chunks[0])
+        for key in await store.keys():
+            entry = await peek(key)
+            if entry is None:
+                continue
+            record = _encode_entry(entry)
+            chunks += (_RECORD_HEADER.pack(len(record)), record)
+            pending += _RECORD_HEADER.size + len(record)
+            written += 1
+            if pending >= _BATCH_SIZE:
+                await asyncio.to_thread(f.writelines, chunks)
+                chunks, pending = [], 0
+        await asyncio.to_thread(_finish_file, f, chunks)
+    except BaseException:
+        f.close()
+        with suppress(OSError):
+            os.remove(tmp_path)
+        raise
+    await asyncio.to_thread(os.replace, tmp_path, path)
+    return written
+
+
+def _open_snapshot(path: str) -> IO[bytes]:
+    """Open a snapshot file positioned at its first record"""
+    f = open(path, "rb")
+    header = f.read(_SNAPSHOT_HEADER.size)
+    if len(header) == _SNAPSHOT_HEADER.size:
+        magic, version, _ = _SNAPSHOT_HEADER.unpack(header)
+        if magic == _SNAPSHOT_MAGIC and version == _FORMAT_VERSION:
+            return f
+    f.close()
+    raise ValueError(f"Not a DNS cache snapshot: {path}")
+
+
+def _read_records(f: IO[bytes], buffer: bytearray) -> Optional[List[bytes]]:
+    """
+    Read the next batch of a snapshot and split off its complete records
+
+    An incomplete record stays in buffer for the next batch. Returns None at
+    the end of the file, dropping a truncated trailing record.
+    """
+    chunk = f.read(_BATCH_SIZE)
+    if not chunk:
+        return None
+    buffer += chunk
+
+    records = []
+    offset = 0
+    while len(buffer) - offset >= _RECORD_HEADER.size:
+        (length,) = _RECORD_HEADER.unpack_from(buffer, offset)
+        start = offset + _RECORD_HEADER.size
+        if start + length > len(buffer):
+            break
+        records.append(bytes(buffer[start:start + length]))
+        offset = start + length
+    del buffer[:offset]
+    return records
+
+
+def read_snapshot(path: str) -> Iterator[CachedEntry]:
+    """Yield entries from a snapshot file one record at a time (blocking)"""
+    with _open_snapshot(path) as f:
+        buffer = bytearray()
+        while True:
+            records = _read_records(f, buffer)
+            if records is None:
+                return
+            for record in records:
+                yield _decode_entry(record)
+
+
+async def _aread_snapshot(path: str) -> AsyncIterator[CachedEntry]:
+    """Yield entries from a snapshot file, reading off the event loop"""
+    f = await asyncio.to_thread(_open_snapshot, path)
+    try:
+        buffer = bytearray()
+        while True:
+            records = await asyncio.to_thread(_read_records, f, buffer)
+            if records is None:
+                return
+            for record in records:
+                yield _decode_entry(record)
+    finally:
+        f.close()
+
+
+async def load_snapshot(store: DnsCacheStore, path: str) -> int:
+    """Load unexpired entries from a snapshot file (a missing file loads nothing)"""
+    if not os.path.exists(path):
+        return 0
+
+    loaded = 0
+    now = time.time()
+    async for entry in _aread_snapshot(path):
+        if is_expired(entry.expires_at, now):
+            continue
+        await store.set(entry.dsn, entry)
+        loaded += 1
+    return loaded
@@ -32,6 +32,10 @@ class MemoryStore(DnsCacheStore):
             self._lru_order[key] = self._access_counter
         return entry
 
+    async def peek(self, key: str) -> Optional[CachedEntry]:
+        """Get a cached entry without refreshing its LRU position"""
+        return self._cache.get(key)
+
     async def set(self, key: str, entry: CachedEntry) -> None:
         """Set a cached entry"""
         # Evict if at capacity
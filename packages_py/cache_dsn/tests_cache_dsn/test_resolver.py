@@ -22,8 +22,10 @@ from cache_dsn.types import (
     DnsCacheConfig,
     ResolvedEndpoint,
     DnsCacheEvent,
+    CachedEntry,
 )
 from cache_dsn.stores.memory import MemoryStore
+from cache_dsn import snapshot
 
 
 def create_test_config(**overrides) -> DnsCacheConfig:
@@ -802,3 +804,105 @@ class TestCreateDnsCacheResolver:
 
         assert isinstance(resolver, DnsCacheResolver)
         await resolver.destroy()
+
+
+class TestSnapshot:
+    """Tests for snapshot export/import"""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_warm_starts_resolver(self, tmp_path):
+        """Should serve imported entries from cache without resolving"""
+        path = str(tmp_path / "dns.snap")
+        resolver = DnsCacheResolver(create_test_config())
+
+        async def custom_resolver(dsn: str) -> List[ResolvedEndpoint]:
+            return [
+                ResolvedEndpoint(host="10.0.0.1", port=443, weight=2, metadata={"zone": "a"}),
+                ResolvedEndpoint(host="10.0.0.2", port=443, healthy=False),
+            ]
+
+        resolver.register_resolver("api.example.com", custom_resolver)
+        await resolver.resolve("api.example.com")
+        assert await resolver.export_snapshot(path) == 1
+        await resolver.destroy()
+
+        warm = DnsCacheResolver(create_test_config())
+        assert await warm.import_snapshot(path) == 1
+        result = await warm.resolve("api.example.com")
+
+        assert result.from_cache is True
+        assert result.endpoints[0].weight == 2
+        assert result.endpoints[0].metadata == {"zone": "a"}
+        assert result.endpoints[1].healthy is False
+        await warm.destroy()
+
+    @pytest.mark.asyncio
+    async def test_import_skips_expired_entries(self, tmp_path):
+        """Should not load entries that expired before import"""
+        path = str(tmp_path / "dns.snap")
+        store = MemoryStore()
+        now = time.time()
+        for dsn, expires_at in (("live.example.com", now + 60), ("old.example.com", now - 1)):
+            await store.set(dsn, CachedEntry(
+                dsn=dsn,
+                endpoints=[ResolvedEndpoint(host="10.0.0.1", port=80)],
+                resolved_at=now - 120,
+                expires_at=expires_at,
+                ttl_seconds=60.0,
+            ))
+        resolver = DnsCacheResolver(create_test_config(), store)
+        assert await resolver.export_snapshot(path) == 2
+
+        warm = DnsCacheResolver(create_test_config())
+        assert await warm.import_snapshot(path) == 1
+        assert await warm.select_endpoint("old.example.com") is None
+        await warm.destroy()
+
+    @pytest.mark.asyncio
+    async def test_export_keeps_lru_order(self, tmp_path):
+        """Should not refresh LRU positions while exporting"""
+        store = MemoryStore()
+        now = time.time()
+        for dsn in ("a.example.com", "b.example.com"):
+            await store.set(dsn, CachedEntry(
+                dsn=dsn,
+                endpoints=[ResolvedEndpoint(host="10.0.0.1", port=80)],
+                resolved_at=now,
+                expires_at=now + 60,
+                ttl_seconds=60.0,
+            ))
+        order = dict(store._lru_order)
+
+        resolver = DnsCacheResolver(create_test_config(), store)
+        assert await resolver.export_snapshot(str(tmp_path / "dns.snap")) == 2
+        assert store._lru_order == order
+
+    @pytest.mark.asyncio
+    async def test_round_trip_across_read_batches(self, tmp_path, monkeypatch):
+        """Should split records correctly when they straddle read batches"""
+        monkeypatch.setattr(snapshot, "_BATCH_SIZE", 64)
+        path = str(tmp_path / "dns.snap")
+        store = MemoryStore()
+        now = time.time()
+        dsns = [f"host-{i}.example.com" for i in range(20)]
+        for dsn in dsns:
+            await store.set(dsn, CachedEntry(
+                dsn=dsn,
+                endpoints=[ResolvedEndpoint(host="10.0.0.1", port=80)],
+                resolved_at=now,
+                expires_at=now + 60,
+                ttl_seconds=60.0,
+            ))
+        assert await DnsCacheResolver(create_test_config(), store).export_snapshot(path) == 20
+
+        warm = MemoryStore()
+        assert await snapshot.load_snapshot(warm, path) == 20
+        assert sorted(await warm.keys()) == sorted(dsns)
+        assert [entry.dsn for entry in snapshot.read_snapshot(path)] == dsns
+
+    @pytest.mark.asyncio
+    async def test_import_missing_file(self, tmp_path):
+        """Should load nothing when no snapshot exists"""
+        resolver = DnsCacheResolver(create_test_config())
+        assert await resolver.import_snapshot(str(tmp_path / "missing.snap")) == 0
+        await resolver.destroy()
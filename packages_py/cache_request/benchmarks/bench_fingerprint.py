@@ -0,0 +1,57 @@
+"""
+Benchmark: digest-based request fingerprints.
+
+Compares the previous idempotency fingerprint (method, URL and the body
+decoded into one string) with the fixed-size digest, for time per call and
+bytes retained per stored fingerprint, and shows the streaming digest
+keeping pace with hashing a buffered body.
+
+Run from the package root:
+    PYTHONPATH=src python benchmarks/bench_fingerprint.py
+"""
+import sys
+import timeit
+
+from cache_request import BodyDigest, RequestFingerprint, digest_body, generate_fingerprint
+
+URL = "https://example.atlassian.net/rest/api/3/issue/bulk"
+BODY_SIZES = [256, 64 * 1024, 5 * 1024 * 1024]
+CHUNK_SIZE = 64 * 1024
+
+
+def legacy_fingerprint(request: RequestFingerprint) -> str:
+    """The string-join fingerprint this package used before digests."""
+    parts = [request.method, request.url]
+    if request.body:
+        parts.append(request.body.decode("utf-8", errors="replace"))
+    return "|".join(parts)
+
+
+def streamed_digest(body: bytes) -> str:
+    digest = BodyDigest()
+    for i in range(0, len(body), CHUNK_SIZE):
+        digest.update(body[i:i + CHUNK_SIZE])
+    return digest.hexdigest()
+
+
+def main() -> None:
+    for size in BODY_SIZES:
+        body = b'{"fields": "summary"}'[:size].ljust(size, b"x")
+        request = RequestFingerprint(method="POST", url=URL, body=body)
+        number = max(3, 20_000_000 // size)
+
+        legacy = timeit.timeit(lambda: legacy_fingerprint(request), number=number) / number
+        digest = timeit.timeit(lambda: generate_fingerprint(request), number=number) / number
+        buffered = timeit.timeit(lambda: digest_body(body), number=number) / number
+        streamed = timeit.timeit(lambda: streamed_digest(body), number=number) / number
+
+        print(
+            f"body {size:>9,} B: "
+            f"string join {legacy * 1e6:9.1f}us / {sys.getsizeof(legacy_fingerprint(request)):>9,} B retained, "
+            f"digest {digest * 1e6:9.1f}us / {sys.getsizeof(generate_fingerprint(request)):>3} B retained; "
+            f"body hash buffered {buffered * 1e6:9.1f}us, streamed {streamed * 1e6:9.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
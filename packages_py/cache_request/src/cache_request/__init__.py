@@ -8,9 +8,12 @@ from .types import (
     StoredResponse,
     InFlightRequest,
     CacheRequestStore,
+    ReservableCacheRequestStore,
     SingleflightStore,
+    DistributedSingleflightStore,
     CacheRequestConfig,
     IdempotencyCheckResult,
+    IdempotencyReservation,
     SingleflightResult,
     CacheRequestEventType,
     CacheRequestEvent,
@@ -24,6 +27,12 @@ from .idempotency import (
     merge_idempotency_config,
     generate_fingerprint,
 )
+from .fingerprint import (
+    BodyDigest,
+    digest_body,
+    fingerprint_digest,
+    request_body_digest,
+)
 from .singleflight import (
     Singleflight,
     create_singleflight,
@@ -46,9 +55,12 @@ __all__ = [
     "StoredResponse",
     "InFlightRequest",
     "CacheRequestStore",
+    "ReservableCacheRequestStore",
     "SingleflightStore",
+    "DistributedSingleflightStore",
     "CacheRequestConfig",
     "IdempotencyCheckResult",
+    "IdempotencyReservation",
     "SingleflightResult",
     "CacheRequestEventType",
     "CacheRequestEvent",
@@ -60,6 +72,11 @@ __all__ = [
     "DEFAULT_IDEMPOTENCY_CONFIG",
     "merge_idempotency_config",
     "generate_fingerprint",
+    # Fingerprints
+    "BodyDigest",
+    "digest_body",
+    "fingerprint_digest",
+    "request_body_digest",
     # Singleflight
     "Singleflight",
     "create_singleflight",
@@ -72,4 +89,25 @@ __all__ = [
     "create_memory_singleflight_store",
 ]
 
+# Optional Redis store
+try:
+    from .stores import (
+        RedisCacheStore,
+        RedisSingleflightStore,
+        create_redis_cache_store,
+        create_redis_singleflight_store,
+    )
+
+    __all__.extend(
+        [
+            "RedisCacheStore",
+            "RedisSingleflightStore",
+            "create_redis_cache_store",
+            "create_redis_singleflight_store",
+        ]
+    )
+except ImportError:
+    pass
+
+
 __version__ = "1.0.0"
@@ -0,0 +1,90 @@
+"""
+Fixed-size request fingerprints.
+
+Bodies are hashed once, incrementally, into a body digest; fingerprints
+then combine method, URL, body digest and (optionally) headers, so a
+fingerprint costs the same few bytes however large the body is.
+"""
+import hashlib
+from typing import Dict, Iterable, Optional, Union
+
+from .types import RequestFingerprint
+
+# SHA-256 rather than BLAKE2b: with CPU SHA extensions it hashes large
+# bodies several times faster (see benchmarks/bench_fingerprint.py)
+_hash = hashlib.sha256
+
+
+class BodyDigest:
+    """
+    Incremental SHA-256 digest of a request body.
+
+    Feed chunks with update() as the body is read. With max_size set, the
+    digest is abandoned once more than max_size bytes have been seen and
+    hexdigest() returns None, so callers can stop buffering oversized bodies.
+    """
+
+    def __init__(self, max_size: Optional[int] = None) -> None:
+        self._hash = _hash()
+        self._max_size = max_size
+        self.size = 0
+
+    def update(self, chunk: bytes) -> None:
+        """Add a chunk of the body."""
+        if self.overflowed:
+            return
+        self.size += len(chunk)
+        if self.overflowed:
+            self._hash = None
+            return
+        self._hash.update(chunk)
+
+    @property
+    def overflowed(self) -> bool:
+        """Whether the body outgrew max_size."""
+        return self._max_size is not None and self.size > self._max_size
+
+    def hexdigest(self) -> Optional[str]:
+        """Digest of the body so far, or None if it is empty or overflowed."""
+        if not self.size or self.overflowed:
+            return None
+        return self._hash.hexdigest()
+
+
+def digest_body(body: Union[bytes, Iterable[bytes], None]) -> Optional[str]:
+    """Digest a body given whole or as chunks; None for a missing or empty body."""
+    if body is None:
+        return None
+    digest = BodyDigest()
+    if isinstance(body, (bytes, bytearray, memoryview)):
+        digest.update(body)
+    else:
+        for chunk in body:
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def request_body_digest(request: RequestFingerprint) -> Optional[str]:
+    """Body digest of a request, hashing its body unless a digest was supplied."""
+    if request.body_digest is not None:
+        return request.body_digest
+    return digest_body(request.body) if request.body else None
+
+
+def fingerprint_digest(
+    method: str,
+    url: str,
+    body_digest: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> str:
+    """Combine request parts into a fixed-size fingerprint."""
+    hasher = _hash()
+    for part in (method, url, body_digest or ""):
+        hasher.update(part.encode("utf-8", "surrogateescape"))
+        hasher.update(b"\0")
+
+    if headers:
+        for name, value in sorted((k.lower(), v) for k, v in headers.items()):
+            hasher.update(f"{name}:{value}\n".encode("utf-8", "surrogateescape"))
+
+    return hasher.hexdigest()
@@ -1,21 +1,24 @@
 """
 Idempotency key management for HTTP requests.
 """
-import hashlib
+import asyncio
 import time
 import uuid
-from typing import Callable, Optional, Set, TypeVar
+from typing import Callable, Dict, Optional, Set, TypeVar
 
 from .types import (
     IdempotencyConfig,
     CacheRequestStore,
+    ReservableCacheRequestStore,
     StoredResponse,
     IdempotencyCheckResult,
+    IdempotencyReservation,
     RequestFingerprint,
     CacheRequestEvent,
     CacheRequestEventType,
     CacheRequestEventListener,
 )
+from .fingerprint import fingerprint_digest, request_body_digest
 from .stores.memory import MemoryCacheStore
 
 T = TypeVar("T")
@@ -32,6 +35,8 @@ DEFAULT_IDEMPOTENCY_CONFIG = IdempotencyConfig(
     auto_generate=True,
     methods=["POST", "PATCH"],
     key_generator=_default_key_generator,
+    reservation_ttl_seconds=30,
+    wait_timeout_seconds=30,
 )
 
 
@@ -46,6 +51,8 @@ def merge_idempotency_config(
             auto_generate=DEFAULT_IDEMPOTENCY_CONFIG.auto_generate,
             methods=list(DEFAULT_IDEMPOTENCY_CONFIG.methods),
             key_generator=DEFAULT_IDEMPOTENCY_CONFIG.key_generator,
+            reservation_ttl_seconds=DEFAULT_IDEMPOTENCY_CONFIG.reservation_ttl_seconds,
+            wait_timeout_seconds=DEFAULT_IDEMPOTENCY_CONFIG.wait_timeout_seconds,
         )
 
     return IdempotencyConfig(
@@ -58,18 +65,18 @@ def merge_idempotency_config(
         else DEFAULT_IDEMPOTENCY_CONFIG.auto_generate,
         methods=config.methods if config.methods else list(DEFAULT_IDEMPOTENCY_CONFIG.methods),
         key_generator=config.key_generator or DEFAULT_IDEMPOTENCY_CONFIG.key_generator,
+        reservation_ttl_seconds=config.reservation_ttl_seconds
+        if config.reservation_ttl_seconds is not None
+        else DEFAULT_IDEMPOTENCY_CONFIG.reservation_ttl_seconds,
+        wait_timeout_seconds=config.wait_timeout_seconds
+        if config.wait_timeout_seconds is not None
+        else DEFAULT_IDEMPOTENCY_CONFIG.wait_timeout_seconds,
     )
 
 
 def generate_fingerprint(request: RequestFingerprint) -> str:
-    """Generate a request fingerprint for validation."""
-    parts = [request.method, request.url]
-
-    if request.body:
-        body_str = request.body.decode("utf-8", errors="replace")
-        parts.append(body_str)
-
-    return "|".join(parts)
+    """Generate a fixed-size request fingerprint (method, URL and body digest) for validation."""
+    return fingerprint_digest(request.method, request.url, request_body_digest(request))
 
 
 class IdempotencyConflictError(Exception):
@@ -102,6 +109,9 @@ class IdempotencyManager:
         # Execute request and store response
         response = await http_client.post(url)
         await manager.store(check.key, response)
+
+    To keep concurrent duplicates from executing too, use reserve() in
+    place of check(); it waits for the original request's response.
     """
 
     def __init__(
@@ -112,6 +122,8 @@ class IdempotencyManager:
         self._config = merge_idempotency_config(config)
         self._store = store or MemoryCacheStore()
         self._listeners: Set[CacheRequestEventListener] = set()
+        # token -> renewal task of each reservation held by this manager
+        self._renewals: Dict[str, asyncio.Task] = {}
 
     def generate_key(self) -> str:
         """Generate a new idempotency key."""
@@ -160,13 +172,125 @@ class IdempotencyManager:
 
         return IdempotencyCheckResult(cached=False, key=key)
 
+    async def reserve(
+        self,
+        key: str,
+        fingerprint: Optional[RequestFingerprint] = None,
+    ) -> IdempotencyReservation:
+        """
+        Atomically claim a key, or get the original request's response.
+
+        If another request holds the key, wait for its response; if that
+        request ends without storing one, try to take the key over. When
+        acquired is True the caller must execute the request and then call
+        store() or release() with the reservation's token; until then the
+        reservation is renewed so a slow request keeps the key. Stores
+        without reservation support behave like check().
+
+        Raises:
+            IdempotencyConflictError: If the key belongs to a different request,
+                or the original request is still running after wait_timeout_seconds
+        """
+        store = self._store
+        if not isinstance(store, ReservableCacheRequestStore):
+            result = await self.check(key, fingerprint)
+            return IdempotencyReservation(
+                key=key, acquired=not result.cached, response=result.response
+            )
+
+        current_fingerprint = generate_fingerprint(fingerprint) if fingerprint else None
+        deadline = time.time() + self._config.wait_timeout_seconds
+
+        while True:
+            result = await self.check(key, fingerprint)
+            if result.cached:
+                return IdempotencyReservation(key=key, acquired=False, response=result.response)
+
+            token = uuid.uuid4().hex
+            reserved, holder = await store.reserve(
+                key, token, current_fingerprint, self._config.reservation_ttl_seconds
+            )
+            if reserved:
+                self._renewals[token] = asyncio.ensure_future(self._renew(key, token))
+                self._emit(
+                    CacheRequestEvent(
+                        type=CacheRequestEventType.IDEMPOTENCY_RESERVE,
+                        key=key,
+                        timestamp=time.time(),
+                    )
+                )
+                return IdempotencyReservation(key=key, acquired=True, token=token)
+
+            if current_fingerprint and holder and holder != current_fingerprint:
+                raise IdempotencyConflictError(
+                    f"Idempotency key '{key}' is already associated with a different request"
+                )
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise IdempotencyConflictError(
+                    f"Idempotency key '{key}' is still being processed by another request"
+                )
+
+            self._emit(
+                CacheRequestEvent(
+                    type=CacheRequestEventType.IDEMPOTENCY_WAIT,
+                    key=key,
+                    timestamp=time.time(),
+                )
+            )
+            # Loop back either way: a stored response is validated by check(),
+            # and an abandoned reservation can be taken over
+            await store.wait(key, remaining)
+
+    async def _renew(self, key: str, token: str) -> None:
+        """Keep extending a reservation while this manager still holds it"""
+        store = self._store
+        ttl = self._config.reservation_ttl_seconds
+        while True:
+            await asyncio.sleep(ttl / 3)
+            try:
+                if not await store.renew(key, token, ttl):
+                    return
+            except Exception:
+                pass  # Let the reservation lapse rather than fail the holder
+
+    def _stop_renewal(self, token: Optional[str]) -> bool:
+        """Stop renewing a reservation; False if this manager no longer holds it"""
+        task = self._renewals.pop(token, None) if token is not None else None
+        if task is None:
+            return False
+        task.cancel()
+        return True
+
+    async def release(self, key: str, token: Optional[str]) -> None:
+        """
+        Give up a reservation without storing a response, letting a waiting duplicate execute.
+
+        Args:
+            key: The idempotency key
+            token: The token of the reservation, from reserve(); releasing an
+                already completed reservation does nothing
+        """
+        if self._stop_renewal(token):
+            await self._store.complete(key, token)
+
     async def store(
         self,
         key: str,
         value: T,
         fingerprint: Optional[RequestFingerprint] = None,
+        token: Optional[str] = None,
     ) -> None:
-        """Store a response with an idempotency key."""
+        """
+        Store a response with an idempotency key.
+
+        Args:
+            key: The idempotency key
+            value: The response to store
+            fingerprint: The request, validated against later retries
+            token: The token of the reservation to complete, from reserve()
+        """
         now = time.time()
         response = StoredResponse(
             value=value,
@@ -175,7 +299,10 @@ class IdempotencyManager:
             fingerprint=generate_fingerprint(fingerprint) if fingerprint else None,
         )
 
-        await self._store.set(key, response)
+        if self._stop_renewal(token):
+            await self._store.complete(key, token, response)
+        else:
+            await self._store.set(key, response)
 
         self._emit(
             CacheRequestEvent(
@@ -232,6 +359,8 @@ class IdempotencyManager:
 
     async def close(self) -> None:
         """Close the manager and release resources."""
+        for token in list(self._renewals):
+            self._stop_renewal(token)
         await self._store.close()
         self._listeners.clear()
 
@@ -5,13 +5,14 @@ When multiple identical requests are made concurrently, only one
 actually executes - others wait and receive the same result.
 """
 import asyncio
-import hashlib
 import time
-from typing import Awaitable, Callable, Optional, Set, TypeVar
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Set, Tuple, TypeVar
 
 from .types import (
     SingleflightConfig,
     SingleflightStore,
+    DistributedSingleflightStore,
     InFlightRequest,
     RequestFingerprint,
     SingleflightResult,
@@ -19,27 +20,17 @@ from .types import (
     CacheRequestEventType,
     CacheRequestEventListener,
 )
+from .fingerprint import fingerprint_digest, request_body_digest
 from .stores.memory import MemorySingleflightStore
 
 T = TypeVar("T")
 
 
 def _default_fingerprint_generator(request: RequestFingerprint) -> str:
-    """Default fingerprint generator using SHA-256."""
-    hasher = hashlib.sha256()
-    hasher.update(request.method.encode())
-    hasher.update(request.url.encode())
-
-    if request.body:
-        hasher.update(request.body)
-
-    if request.headers:
-        sorted_headers = "|".join(
-            f"{k}:{v}" for k, v in sorted(request.headers.items())
-        )
-        hasher.update(sorted_headers.encode())
-
-    return hasher.hexdigest()
+    """Default fingerprint generator: a fixed-size digest of the whole request."""
+    return fingerprint_digest(
+        request.method, request.url, request_body_digest(request), request.headers
+    )
 
 
 DEFAULT_SINGLEFLIGHT_CONFIG = SingleflightConfig(
@@ -48,6 +39,8 @@ DEFAULT_SINGLEFLIGHT_CONFIG = SingleflightConfig(
     fingerprint_generator=_default_fingerprint_generator,
     include_headers=False,
     header_keys=[],
+    memo_ttl_seconds=0,
+    memo_max_entries=1000,
 )
 
 
@@ -62,6 +55,8 @@ def merge_singleflight_config(
             fingerprint_generator=DEFAULT_SINGLEFLIGHT_CONFIG.fingerprint_generator,
             include_headers=DEFAULT_SINGLEFLIGHT_CONFIG.include_headers,
             header_keys=list(DEFAULT_SINGLEFLIGHT_CONFIG.header_keys),
+            memo_ttl_seconds=DEFAULT_SINGLEFLIGHT_CONFIG.memo_ttl_seconds,
+            memo_max_entries=DEFAULT_SINGLEFLIGHT_CONFIG.memo_max_entries,
         )
 
     return SingleflightConfig(
@@ -77,6 +72,12 @@ def merge_singleflight_config(
         header_keys=config.header_keys
         if config.header_keys
         else list(DEFAULT_SINGLEFLIGHT_CONFIG.header_keys),
+        memo_ttl_seconds=config.memo_ttl_seconds
+        if config.memo_ttl_seconds is not None
+        else DEFAULT_SINGLEFLIGHT_CONFIG.memo_ttl_seconds,
+        memo_max_entries=config.memo_max_entries
+        if config.memo_max_entries is not None
+        else DEFAULT_SINGLEFLIGHT_CONFIG.memo_max_entries,
     )
 
 
@@ -103,6 +104,9 @@ class Singleflight:
         # All 50 results are identical
         print(results[0].shared)  # False (the leader)
         print(results[1].shared)  # True (joined existing)
+
+    With memo_ttl_seconds set, a completed result is also shared with
+    identical requests arriving shortly afterwards.
     """
 
     def __init__(
@@ -113,6 +117,9 @@ class Singleflight:
         self._config = merge_singleflight_config(config)
         self._store = store or MemorySingleflightStore()
         self._listeners: Set[CacheRequestEventListener] = set()
+        # fingerprint -> (value, completed_at), least recently used first
+        self._memo: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._memo_hits = 0
 
     def supports_coalescing(self, method: str) -> bool:
         """Check if a request method supports coalescing."""
@@ -135,6 +142,7 @@ class Singleflight:
                 url=request.url,
                 headers=filtered_headers,
                 body=request.body,
+                body_digest=request.body_digest,
             )
         elif not self._config.include_headers:
             filtered_request = RequestFingerprint(
@@ -142,6 +150,7 @@ class Singleflight:
                 url=request.url,
                 headers=None,
                 body=request.body,
+                body_digest=request.body_digest,
             )
 
         generator = self._config.fingerprint_generator or _default_fingerprint_generator
@@ -151,15 +160,30 @@ class Singleflight:
         self,
         request: RequestFingerprint,
         fn: Callable[[], Awaitable[T]],
+        memoize: bool = True,
     ) -> SingleflightResult[T]:
         """
         Execute a function with request coalescing.
 
         If an identical request is already in-flight, wait for it and share the result.
         Otherwise, execute the function and share the result with any subsequent waiters.
+
+        With a DistributedSingleflightStore, identical requests in other processes are
+        coalesced too; if the leading process fails or dies, its waiters fetch on their own.
+
+        Args:
+            request: The request to coalesce
+            fn: Function performing the request
+            memoize: Keep the result in the memo window (when enabled). Pass False
+                for results that hold resources, such as a response still streaming
+                in. Default: True
         """
         fingerprint = self.generate_fingerprint(request)
 
+        memoized = self._memo_get(fingerprint)
+        if memoized is not None:
+            return memoized
+
         # Check for in-flight request
         existing = self._store.get(fingerprint)
         if existing:
@@ -196,6 +220,32 @@ class Singleflight:
 
         self._store.set(fingerprint, in_flight)
 
+        if isinstance(self._store, DistributedSingleflightStore):
+            try:
+                token = await self._store.acquire(fingerprint)
+            except Exception:
+                # Store unreachable: coalesce within this process only
+                return await self._lead(fingerprint, in_flight, fn, memoize=memoize)
+            except BaseException:
+                self._abandon(fingerprint, in_flight)
+                raise
+            if token is None:
+                return await self._follow(fingerprint, in_flight, fn, memoize)
+            return await self._lead(fingerprint, in_flight, fn, token, memoize)
+
+        return await self._lead(fingerprint, in_flight, fn, memoize=memoize)
+
+    async def _lead(
+        self,
+        fingerprint: str,
+        in_flight: InFlightRequest,
+        fn: Callable[[], Awaitable[T]],
+        token: Optional[str] = None,
+        memoize: bool = True,
+    ) -> SingleflightResult[T]:
+        """Run the request and share its result with local (and, given a lock token, remote) waiters."""
+        future = in_flight.future
+
         self._emit(
             CacheRequestEvent(
                 type=CacheRequestEventType.SINGLEFLIGHT_LEAD,
@@ -208,6 +258,10 @@ class Singleflight:
             value = await fn()
 
             future.set_result(value)
+            if memoize:
+                self._memo_set(fingerprint, value)
+            if token is not None:
+                await self._publish(fingerprint, token, True, value)
 
             current = self._store.get(fingerprint)
             final_subscribers = current.subscribers if current else 1
@@ -234,6 +288,8 @@ class Singleflight:
 
         except Exception as error:
             future.set_exception(error)
+            if token is not None:
+                await self._publish(fingerprint, token, False)
 
             self._emit(
                 CacheRequestEvent(
@@ -248,6 +304,121 @@ class Singleflight:
 
             raise
 
+        except BaseException:
+            # Cancelled: release local waiters and the lock (stopping its renewal)
+            self._abandon(fingerprint, in_flight)
+            if token is not None:
+                await self._publish(fingerprint, token, False)
+            raise
+
+    async def _publish(
+        self, fingerprint: str, token: str, succeeded: bool, value: Optional[T] = None
+    ) -> None:
+        """Hand the leader's result to other processes; they fall back on any failure."""
+        store = self._store
+        payload = None
+        if succeeded:
+            try:
+                payload = store.dumps(value)
+            except Exception:
+                payload = None
+        try:
+            await store.complete(fingerprint, token, payload)
+        except Exception:
+            pass  # Followers notice the lock lapse and fetch themselves
+
+    async def _follow(
+        self,
+        fingerprint: str,
+        in_flight: InFlightRequest,
+        fn: Callable[[], Awaitable[T]],
+        memoize: bool = True,
+    ) -> SingleflightResult[T]:
+        """Wait for another process's result, or fetch here if it never arrives."""
+        store = self._store
+
+        self._emit(
+            CacheRequestEvent(
+                type=CacheRequestEventType.SINGLEFLIGHT_JOIN,
+                key=fingerprint,
+                timestamp=time.time(),
+                metadata={"subscribers": in_flight.subscribers, "remote": True},
+            )
+        )
+
+        try:
+            payload = await store.wait(fingerprint, self._config.ttl_seconds)
+            value = store.loads(payload) if payload is not None else None
+        except Exception:
+            payload = None
+        except BaseException:
+            self._abandon(fingerprint, in_flight)
+            raise
+
+        if payload is None:
+            self._emit(
+                CacheRequestEvent(
+                    type=CacheRequestEventType.SINGLEFLIGHT_FALLBACK,
+                    key=fingerprint,
+                    timestamp=time.time(),
+                )
+            )
+            return await self._lead(fingerprint, in_flight, fn, memoize=memoize)
+
+        in_flight.future.set_result(value)
+        if memoize:
+            self._memo_set(fingerprint, value)
+        current = self._store.get(fingerprint)
+        self._store.delete(fingerprint)
+        return SingleflightResult(
+            value=value,
+            shared=True,
+            subscribers=current.subscribers if current else 1,
+        )
+
+    def _abandon(self, fingerprint: str, in_flight: InFlightRequest) -> None:
+        """Cancel a request that was interrupted, so local joiners don't wait on it forever."""
+        in_flight.future.cancel()
+        self._store.delete(fingerprint)
+
+    def _memo_get(self, fingerprint: str) -> Optional[SingleflightResult]:
+        """Serve a recently completed result, if it is still within the memo window."""
+        entry = self._memo.get(fingerprint)
+        if entry is None:
+            return None
+        value, completed_at = entry
+        age = time.time() - completed_at
+        if age >= self._config.memo_ttl_seconds:
+            del self._memo[fingerprint]
+            return None
+
+        self._memo.move_to_end(fingerprint)
+        self._memo_hits += 1
+        self._emit(
+            CacheRequestEvent(
+                type=CacheRequestEventType.SINGLEFLIGHT_MEMO_HIT,
+                key=fingerprint,
+                timestamp=time.time(),
+                metadata={"age_seconds": age},
+            )
+        )
+        return SingleflightResult(value=value, shared=True, subscribers=1, memoized=True)
+
+    def _memo_set(self, fingerprint: str, value: Any) -> None:
+        """Remember a completed result, evicting expired then least recently used entries."""
+        if self._config.memo_ttl_seconds <= 0 or self._config.memo_max_entries <= 0:
+            return
+        now = time.time()
+        self._memo[fingerprint] = (value, now)
+        self._memo.move_to_end(fingerprint)
+
+        horizon = now - self._config.memo_ttl_seconds
+        while self._memo:
+            oldest = next(iter(self._memo.values()))
+            if oldest[1] > horizon and len(self._memo) <= self._config.memo_max_entries:
+                break
+            self._memo.popitem(last=False)
+
     def is_in_flight(self, request: RequestFingerprint) -> bool:
         """Check if a request is currently in-flight."""
         fingerprint = self.generate_fingerprint(request)
@@ -260,8 +431,12 @@ class Singleflight:
         return existing.subscribers if existing else 0
 
     def get_stats(self) -> dict:
-        """Get statistics about in-flight requests."""
-        return {"in_flight": self._store.size()}
+        """Get statistics about in-flight requests and the result memo."""
+        return {
+            "in_flight": self._store.size(),
+            "memoized": len(self._memo),
+            "memo_hits": self._memo_hits,
+        }
 
     def get_config(self) -> SingleflightConfig:
         """Get configuration."""
@@ -285,12 +460,14 @@ class Singleflight:
                 pass  # Ignore listener errors
 
     def clear(self) -> None:
-        """Clear all in-flight requests (use with caution)."""
+        """Clear all in-flight requests and memoized results (use with caution)."""
         self._store.clear()
+        self._memo.clear()
 
     def close(self) -> None:
         """Close and release resources."""
         self._store.clear()
+        self._memo.clear()
         self._listeners.clear()
 
 
@@ -14,3 +14,23 @@ __all__ = [
     "create_memory_cache_store",
     "create_memory_singleflight_store",
 ]
+
+# Optional Redis store (requires redis package)
+try:
+    from .redis import (
+        RedisCacheStore,
+        RedisSingleflightStore,
+        create_redis_cache_store,
+        create_redis_singleflight_store,
+    )
+
+    __all__.extend(
+        [
+            "RedisCacheStore",
+            "RedisSingleflightStore",
+            "create_redis_cache_store",
+            "create_redis_singleflight_store",
+        ]
+    )
+except ImportError:
+    pass
@@ -0,0 +1,49 @@
+"""
+Expiry-ordered index for in-memory stores.
+
+A min-heap of (expires_at, token, key) with lazy deletion: overwritten or
+deleted entries leave stale heap items behind, which are skipped when popped
+because their token no longer matches the live entry. Sweeping therefore
+costs O(expired · log n) instead of a scan over every entry.
+"""
+import heapq
+import itertools
+from typing import Iterable, Iterator, List, Tuple
+
+
+class ExpiryIndex:
+    """Min-heap of expiry times with lazy deletion."""
+
+    def __init__(self, rebuild_slack: int = 64) -> None:
+        self._heap: List[Tuple[float, int, str]] = []
+        self._tokens = itertools.count(1)
+        self._rebuild_slack = rebuild_slack
+
+    def push(self, key: str, expires_at: float) -> int:
+        """Schedule a key for expiry; returns the token identifying this schedule."""
+        token = next(self._tokens)
+        heapq.heappush(self._heap, (expires_at, token, key))
+        return token
+
+    def pop_expired(self, now: float) -> Iterator[Tuple[str, int]]:
+        """Pop (key, token) pairs whose expiry is at or before now."""
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, token, key = heapq.heappop(heap)
+            yield key, token
+
+    def needs_rebuild(self, live_entries: int) -> bool:
+        """Whether stale items dominate the heap."""
+        return len(self._heap) > 2 * live_entries + self._rebuild_slack
+
+    def rebuild(self, live: Iterable[Tuple[float, int, str]]) -> None:
+        """Replace the heap with only the live (expires_at, token, key) items."""
+        self._heap = list(live)
+        heapq.heapify(self._heap)
+
+    def clear(self) -> None:
+        """Drop all scheduled expiries."""
+        self._heap.clear()
+
+    def __len__(self) -> int:
+        return len(self._heap)
@@ -3,28 +3,37 @@ Memory store implementations for cache_request.
 """
 import asyncio
 import time
-from typing import Dict, Optional, TypeVar
+from typing import Dict, Optional, Tuple, TypeVar
 
 from ..types import (
-    CacheRequestStore,
+    ReservableCacheRequestStore,
     StoredResponse,
     SingleflightStore,
     InFlightRequest,
 )
+from .expiry import ExpiryIndex
 
 T = TypeVar("T")
 
 
-class MemoryCacheStore(CacheRequestStore):
+class MemoryCacheStore(ReservableCacheRequestStore):
     """
     In-memory cache store for idempotency responses.
+
+    Reservations are kept alongside the responses, and waiters are woken
+    through an asyncio.Event per key, so they only work within one event loop.
     """
 
     def __init__(self, cleanup_interval_seconds: float = 60.0) -> None:
         self._cache: Dict[str, StoredResponse] = {}
+        self._expiry = ExpiryIndex()
+        self._expiry_tokens: Dict[str, int] = {}
         self._cleanup_interval = cleanup_interval_seconds
         self._cleanup_task: Optional[asyncio.Task] = None
         self._closed = False
+        # key -> (token, fingerprint, expires_at)
+        self._reservations: Dict[str, Tuple[str, Optional[str], float]] = {}
+        self._completions: Dict[str, asyncio.Event] = {}
 
     async def _start_cleanup(self) -> None:
         """Start the background cleanup task."""
@@ -41,13 +50,24 @@ class MemoryCacheStore(CacheRequestStore):
                 break
 
     def _cleanup(self) -> None:
-        """Remove expired entries."""
-        now = time.time()
-        expired_keys = [
-            key for key, entry in self._cache.items() if entry.expires_at <= now
-        ]
-        for key in expired_keys:
+        """Remove expired entries, visiting only those due in the expiry index."""
+        for key, token in self._expiry.pop_expired(time.time()):
+            if self._expiry_tokens.get(key) == token:
+                self._delete_entry(key)
+
+        if self._expiry.needs_rebuild(len(self._cache)):
+            self._expiry.rebuild(
+                (self._cache[key].expires_at, token, key)
+                for key, token in self._expiry_tokens.items()
+            )
+
+    def _delete_entry(self, key: str) -> bool:
+        """Delete an entry (its heap item is dropped lazily)."""
+        if key in self._cache:
             del self._cache[key]
+            del self._expiry_tokens[key]
+            return True
+        return False
 
     async def get(self, key: str) -> Optional[StoredResponse]:
         """Get a stored response by idempotency key."""
@@ -57,7 +77,7 @@ class MemoryCacheStore(CacheRequestStore):
 
         # Check if expired
         if entry.expires_at <= time.time():
-            del self._cache[key]
+            self._delete_entry(key)
             return None
 
         return entry
@@ -65,6 +85,12 @@ class MemoryCacheStore(CacheRequestStore):
     async def set(self, key: str, response: StoredResponse) -> None:
         """Store a response with an idempotency key."""
         self._cache[key] = response
+        self._expiry_tokens[key] = self._expiry.push(key, response.expires_at)
+
+        # Keep lazily deleted heap items bounded even without expiries
+        if self._expiry.needs_rebuild(len(self._cache)):
+            self._cleanup()
+
         # Ensure cleanup is running
         await self._start_cleanup()
 
@@ -76,24 +102,95 @@ class MemoryCacheStore(CacheRequestStore):
 
         # Check if expired
         if entry.expires_at <= time.time():
-            del self._cache[key]
+            self._delete_entry(key)
             return False
 
         return True
 
     async def delete(self, key: str) -> bool:
         """Delete a stored response."""
-        if key in self._cache:
-            del self._cache[key]
-            return True
-        return False
+        return self._delete_entry(key)
+
+    def _reservation(self, key: str) -> Optional[Tuple[str, Optional[str], float]]:
+        """Get a live reservation, dropping it once lapsed."""
+        reservation = self._reservations.get(key)
+        if reservation is not None and reservation[2] <= time.time():
+            del self._reservations[key]
+            self._wake(key)
+            return None
+        return reservation
+
+    def _wake(self, key: str) -> None:
+        """Wake everything waiting on a key."""
+        event = self._completions.pop(key, None)
+        if event is not None:
+            event.set()
+
+    async def reserve(
+        self, key: str, token: str, fingerprint: Optional[str], ttl_seconds: float
+    ) -> Tuple[bool, Optional[str]]:
+        """Reserve a key if it is neither stored nor reserved."""
+        entry = await self.get(key)
+        if entry is not None:
+            return False, entry.fingerprint
+        reservation = self._reservation(key)
+        if reservation is not None:
+            return False, reservation[1]
+        self._reservations[key] = (token, fingerprint, time.time() + ttl_seconds)
+        return True, None
+
+    async def complete(
+        self, key: str, token: str, response: Optional[StoredResponse] = None
+    ) -> None:
+        """Store the response (if any), release the reservation and wake waiters."""
+        if response is not None:
+            await self.set(key, response)
+        reservation = self._reservations.get(key)
+        if reservation is not None and reservation[0] == token:
+            del self._reservations[key]
+        self._wake(key)
+
+    async def renew(self, key: str, token: str, ttl_seconds: float) -> bool:
+        """Extend a reservation still held by token."""
+        reservation = self._reservation(key)
+        if reservation is None or reservation[0] != token:
+            return False
+        self._reservations[key] = (token, reservation[1], time.time() + ttl_seconds)
+        return True
+
+    async def wait(self, key: str, timeout_seconds: float) -> Optional[StoredResponse]:
+        """Wait until a reserved key has a response."""
+        deadline = time.time() + timeout_seconds
+        while True:
+            entry = await self.get(key)
+            if entry is not None:
+                return entry
+            reservation = self._reservation(key)
+            now = time.time()
+            if reservation is None or now >= deadline:
+                return None
+
+            event = self._completions.setdefault(key, asyncio.Event())
+            try:
+                await asyncio.wait_for(event.wait(), min(deadline, reservation[2]) - now)
+            except asyncio.TimeoutError:
+                pass
+
+    def _clear_reservations(self) -> None:
+        """Drop all reservations and wake their waiters."""
+        self._reservations.clear()
+        for key in list(self._completions):
+            self._wake(key)
 
     async def clear(self) -> None:
-        """Clear all stored responses."""
+        """Clear all stored responses and reservations."""
         self._cache.clear()
+        self._expiry_tokens.clear()
+        self._expiry.clear()
+        self._clear_reservations()
 
     async def size(self) -> int:
-        """Get current size of store."""
+        """Get current size of store (O(1) plus any expiries now due)."""
         # Clean up expired entries first
         self._cleanup()
         return len(self._cache)
@@ -109,6 +206,9 @@ class MemoryCacheStore(CacheRequestStore):
                 pass
             self._cleanup_task = None
         self._cache.clear()
+        self._expiry_tokens.clear()
+        self._expiry.clear()
+        self._clear_reservations()
 
 
 class MemorySingleflightStore(SingleflightStore):
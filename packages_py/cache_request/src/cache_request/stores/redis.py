@@ -0,0 +1,462 @@
+"""
+Redis stores for sharing idempotency responses and in-flight requests across processes.
+"""
+import asyncio
+import pickle
+import time
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Protocol, Tuple
+
+from ..types import DistributedSingleflightStore, ReservableCacheRequestStore, StoredResponse
+from .memory import MemorySingleflightStore
+
+# Completion notifications (waiters re-check Redis either way)
+_DONE = b"1"
+_FAILED = b"0"
+
+# Delete or extend a lock only while it still holds our token, in one step.
+# A lock value is the holder's token, optionally followed by a newline and
+# more data (reservations carry the request fingerprint).
+_COMPARE_AND_DELETE = r"""
+local held = redis.call('GET', KEYS[1])
+if held and string.match(held, '^[^\n]*') == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+_COMPARE_AND_PEXPIRE = r"""
+local held = redis.call('GET', KEYS[1])
+if held and string.match(held, '^[^\n]*') == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class RedisPubSubProtocol(Protocol):
+    """Protocol for a Redis pub/sub connection (compatible with redis-py async)"""
+
+    async def subscribe(self, *channels: str) -> Any:
+        ...
+
+    async def unsubscribe(self, *channels: str) -> Any:
+        ...
+
+    async def get_message(
+        self, ignore_subscribe_messages: bool = False, timeout: Optional[float] = 0.0
+    ) -> Optional[Dict[str, Any]]:
+        ...
+
+    async def close(self) -> None:
+        ...
+
+
+class RedisClientProtocol(Protocol):
+    """Protocol for Redis client (compatible with redis-py async, decode_responses=False)"""
+
+    async def get(self, name: str) -> Optional[bytes]:
+        ...
+
+    async def set(
+        self, name: str, value: bytes, px: Optional[int] = None, nx: bool = False
+    ) -> Any:
+        ...
+
+    async def exists(self, *names: str) -> int:
+        ...
+
+    async def delete(self, *names: str) -> int:
+        ...
+
+    async def eval(self, script: str, numkeys: int, *keys_and_args: Any) -> Any:
+        ...
+
+    async def publish(self, channel: str, message: bytes) -> int:
+        ...
+
+    def pubsub(self) -> RedisPubSubProtocol:
+        ...
+
+    def scan_iter(self, match: Optional[str] = None, count: Optional[int] = None) -> AsyncIterator:
+        ...
+
+    async def close(self) -> None:
+        ...
+
+
+async def _wait_for_release(
+    client: RedisClientProtocol,
+    channel: str,
+    lock_key: str,
+    fetch: Callable[[], Awaitable[Optional[bytes]]],
+    timeout_seconds: float,
+    poll_interval_seconds: float,
+) -> Optional[bytes]:
+    """
+    Wait for a result guarded by a lock key.
+
+    Re-checks the result and the lock on every message on the channel and
+    every poll interval. Returns None once the lock is gone without a
+    result (the holder failed or died) or the timeout runs out.
+    """
+    loop = asyncio.get_event_loop()
+    deadline = loop.time() + timeout_seconds
+
+    pubsub = client.pubsub()
+    await pubsub.subscribe(channel)
+    try:
+        while True:
+            data = await fetch()
+            if data is not None:
+                return data
+            if not await client.exists(lock_key):
+                # Finished just now, or the holder is gone
+                return await fetch()
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            await pubsub.get_message(
+                ignore_subscribe_messages=True,
+                timeout=min(poll_interval_seconds, remaining),
+            )
+    finally:
+        try:
+            await pubsub.unsubscribe(channel)
+            await pubsub.close()
+        except Exception:
+            pass
+
+
+class RedisCacheStore(ReservableCacheRequestStore):
+    """
+    Redis implementation of CacheRequestStore, with reservations.
+
+    Responses are pickled under key_prefix with a native TTL. A reservation
+    is a SET NX PX key holding the reserving request's token and
+    fingerprint; completing it publishes on the key's channel so duplicates
+    in any process stop waiting, and a holder that dies simply lets the
+    reservation lapse.
+
+    Stored values are pickled by default, so only share the Redis database
+    with trusted processes, or pass your own dumps/loads.
+
+    Example:
+        client = redis.asyncio.Redis.from_url(url)  # decode_responses=False
+        manager = IdempotencyManager(store=RedisCacheStore(client))
+    """
+
+    def __init__(
+        self,
+        client: RedisClientProtocol,
+        key_prefix: str = "cache_request:",
+        reservation_key_prefix: Optional[str] = None,
+        poll_interval_seconds: float = 0.5,
+        scan_count: int = 500,
+        dumps: Optional[Callable[[Any], bytes]] = None,
+        loads: Optional[Callable[[bytes], Any]] = None,
+    ) -> None:
+        """
+        Create a new RedisCacheStore.
+
+        Args:
+            client: Redis client (async redis-py instance, decode_responses=False)
+            key_prefix: Prefix for stored responses. Default: 'cache_request:'
+            reservation_key_prefix: Prefix for reservations and their channels; must not
+                start with key_prefix. Default: key_prefix without its trailing ':' plus '_reservation:'
+            poll_interval_seconds: How often waiters check on a reservation
+                between notifications. Default: 0.5
+            scan_count: SCAN batch size hint for size/clear. Default: 500
+            dumps: Response serializer. Default: pickle.dumps
+            loads: Response deserializer. Default: pickle.loads
+        """
+        self._client = client
+        self._key_prefix = key_prefix
+        self._reservation_key_prefix = (
+            reservation_key_prefix or f"{key_prefix.rstrip(':')}_reservation:"
+        )
+        self._poll_interval = poll_interval_seconds
+        self._scan_count = scan_count
+        self._dumps = dumps or pickle.dumps
+        self._loads = loads or pickle.loads
+
+    def _get_key(self, key: str) -> str:
+        """Get the full key with prefix"""
+        return f"{self._key_prefix}{key}"
+
+    def _get_reservation_key(self, key: str) -> str:
+        """Get the key of a reservation (also its channel)"""
+        return f"{self._reservation_key_prefix}{key}"
+
+    async def _get_raw(self, key: str) -> Optional[bytes]:
+        """Get a stored response's blob"""
+        return await self._client.get(self._get_key(key))
+
+    def _decode(self, data: Optional[bytes]) -> Optional[StoredResponse]:
+        """Decode a stored blob, treating unreadable or expired data as a miss"""
+        if data is None:
+            return None
+        try:
+            response = self._loads(data)
+        except Exception:
+            return None
+        if response.expires_at <= time.time():
+            return None
+        return response
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        """Get a stored response by idempotency key."""
+        return self._decode(await self._get_raw(key))
+
+    async def set(self, key: str, response: StoredResponse) -> None:
+        """Store a response with an idempotency key."""
+        ttl_ms = int((response.expires_at - time.time()) * 1000)
+        if ttl_ms <= 0:
+            return
+        await self._client.set(self._get_key(key), self._dumps(response), px=ttl_ms)
+
+    async def has(self, key: str) -> bool:
+        """Check if a key exists."""
+        return await self._client.exists(self._get_key(key)) > 0
+
+    async def delete(self, key: str) -> bool:
+        """Delete a stored response."""
+        return await self._client.delete(self._get_key(key)) > 0
+
+    async def reserve(
+        self, key: str, token: str, fingerprint: Optional[str], ttl_seconds: float
+    ) -> Tuple[bool, Optional[str]]:
+        """Reserve a key if it is neither stored nor reserved."""
+        stored = await self.get(key)
+        if stored is not None:
+            return False, stored.fingerprint
+
+        reservation_key = self._get_reservation_key(key)
+        value = token.encode() + b"\n" + (fingerprint or "").encode()
+        if await self._client.set(
+            reservation_key, value, px=max(1, int(ttl_seconds * 1000)), nx=True
+        ):
+            # The previous holder may have stored its response in between
+            stored = await self.get(key)
+            if stored is None:
+                return True, None
+            await self.complete(key, token)
+            return False, stored.fingerprint
+
+        held = await self._client.get(reservation_key)
+        if held is None:
+            return False, None
+        holder = held.split(b"\n", 1)[-1].decode()
+        return False, holder or None
+
+    async def complete(
+        self, key: str, token: str, response: Optional[StoredResponse] = None
+    ) -> None:
+        """Store the response (if any), release the reservation and notify waiters."""
+        if response is not None:
+            await self.set(key, response)
+
+        # Only release the reservation if it is still ours
+        reservation_key = self._get_reservation_key(key)
+        await self._client.eval(_COMPARE_AND_DELETE, 1, reservation_key, token)
+
+        await self._client.publish(reservation_key, _DONE if response is not None else _FAILED)
+
+    async def renew(self, key: str, token: str, ttl_seconds: float) -> bool:
+        """Extend a reservation still held by token."""
+        return bool(
+            await self._client.eval(
+                _COMPARE_AND_PEXPIRE,
+                1,
+                self._get_reservation_key(key),
+                token,
+                max(1, int(ttl_seconds * 1000)),
+            )
+        )
+
+    async def wait(self, key: str, timeout_seconds: float) -> Optional[StoredResponse]:
+        """Wait until a reserved key has a response, in this or any other process."""
+        reservation_key = self._get_reservation_key(key)
+        data = await _wait_for_release(
+            self._client,
+            reservation_key,
+            reservation_key,
+            lambda: self._get_raw(key),
+            timeout_seconds,
+            self._poll_interval,
+        )
+        return self._decode(data)
+
+    async def _scan_keys(self, prefix: str) -> List[Any]:
+        """Collect all keys under a prefix"""
+        return [k async for k in self._client.scan_iter(match=f"{prefix}*", count=self._scan_count)]
+
+    async def clear(self) -> None:
+        """Clear all stored responses and reservations under the prefixes."""
+        full_keys = await self._scan_keys(self._key_prefix) + await self._scan_keys(
+            self._reservation_key_prefix
+        )
+        for i in range(0, len(full_keys), self._scan_count):
+            await self._client.delete(*full_keys[i:i + self._scan_count])
+
+    async def size(self) -> int:
+        """Get current number of stored responses."""
+        return len(await self._scan_keys(self._key_prefix))
+
+    async def close(self) -> None:
+        """Close the store and its client."""
+        await self._client.close()
+
+
+class RedisSingleflightStore(MemorySingleflightStore, DistributedSingleflightStore):
+    """
+    Singleflight store that coalesces identical requests across processes.
+
+    The first process to SET NX the fingerprint's lock leads; the lock has a
+    short TTL that the leader keeps renewing while its request runs. When it
+    finishes, the leader writes the serialized result under a result key,
+    releases the lock and publishes on the fingerprint's channel. Followers
+    subscribe to that channel and re-check the result and lock keys on every
+    message or poll interval, so a follower that subscribes late still finds
+    the result, and one whose leader died (its lock expired without a
+    result) gives up and fetches on its own.
+
+    Results are pickled by default, so only share the Redis database with
+    trusted processes, or pass your own dumps/loads.
+
+    Example:
+        client = redis.asyncio.Redis.from_url(url)  # decode_responses=False
+        sf = Singleflight(store=RedisSingleflightStore(client))
+    """
+
+    def __init__(
+        self,
+        client: RedisClientProtocol,
+        key_prefix: str = "cache_request_sf:",
+        lock_ttl_seconds: float = 5.0,
+        result_ttl_seconds: float = 5.0,
+        poll_interval_seconds: float = 0.5,
+        dumps: Optional[Callable[[Any], bytes]] = None,
+        loads: Optional[Callable[[bytes], Any]] = None,
+    ) -> None:
+        """
+        Create a new RedisSingleflightStore.
+
+        Args:
+            client: Redis client (async redis-py instance, decode_responses=False)
+            key_prefix: Prefix for lock and result keys and channels. Default: 'cache_request_sf:'
+            lock_ttl_seconds: Leader lock TTL, renewed while the leader runs. Default: 5
+            result_ttl_seconds: How long a result stays readable for late followers. Default: 5
+            poll_interval_seconds: How often followers check on the leader
+                between notifications. Default: 0.5
+            dumps: Result serializer. Default: pickle.dumps
+            loads: Result deserializer. Default: pickle.loads
+        """
+        super().__init__()
+        self._client = client
+        self._key_prefix = key_prefix
+        self._lock_ttl_ms = max(1, int(lock_ttl_seconds * 1000))
+        self._result_ttl_ms = max(1, int(result_ttl_seconds * 1000))
+        self._poll_interval = poll_interval_seconds
+        self._dumps = dumps or pickle.dumps
+        self._loads = loads or pickle.loads
+        self._renewals: Dict[str, asyncio.Task] = {}
+
+    def _lock_key(self, fingerprint: str) -> str:
+        """Get the key of a fingerprint's leader lock"""
+        return f"{self._key_prefix}lock:{fingerprint}"
+
+    def _result_key(self, fingerprint: str) -> str:
+        """Get the key of a fingerprint's published result"""
+        return f"{self._key_prefix}result:{fingerprint}"
+
+    def _channel(self, fingerprint: str) -> str:
+        """Get the channel a fingerprint's completion is published on"""
+        return f"{self._key_prefix}done:{fingerprint}"
+
+    async def acquire(self, fingerprint: str) -> Optional[str]:
+        """Take the leader lock; returns a token, or None if another process holds it."""
+        token = uuid.uuid4().hex
+        acquired = await self._client.set(
+            self._lock_key(fingerprint), token.encode(), px=self._lock_ttl_ms, nx=True
+        )
+        if not acquired:
+            return None
+        self._stop_renewal(fingerprint)
+        self._renewals[fingerprint] = asyncio.ensure_future(self._renew(fingerprint, token))
+        return token
+
+    async def _renew(self, fingerprint: str, token: str) -> None:
+        """Keep extending the lock while this process still owns it"""
+        lock_key = self._lock_key(fingerprint)
+        while True:
+            await asyncio.sleep(self._lock_ttl_ms / 3000)
+            try:
+                if not await self._client.eval(
+                    _COMPARE_AND_PEXPIRE, 1, lock_key, token, self._lock_ttl_ms
+                ):
+                    return
+            except Exception:
+                pass  # Let the lock lapse rather than fail the leader
+
+    def _stop_renewal(self, fingerprint: str) -> None:
+        """Cancel a fingerprint's lock renewal"""
+        task = self._renewals.pop(fingerprint, None)
+        if task is not None:
+            task.cancel()
+
+    async def complete(self, fingerprint: str, token: str, payload: Optional[bytes]) -> None:
+        """Store the result, release the lock and notify followers."""
+        self._stop_renewal(fingerprint)
+        if payload is not None:
+            await self._client.set(self._result_key(fingerprint), payload, px=self._result_ttl_ms)
+
+        # Only release the lock if it is still ours
+        await self._client.eval(_COMPARE_AND_DELETE, 1, self._lock_key(fingerprint), token)
+
+        await self._client.publish(
+            self._channel(fingerprint), _DONE if payload is not None else _FAILED
+        )
+
+    async def wait(self, fingerprint: str, timeout_seconds: float) -> Optional[bytes]:
+        """Wait for the leading process's result."""
+        result_key = self._result_key(fingerprint)
+        return await _wait_for_release(
+            self._client,
+            self._channel(fingerprint),
+            self._lock_key(fingerprint),
+            lambda: self._client.get(result_key),
+            timeout_seconds,
+            self._poll_interval,
+        )
+
+    def dumps(self, value: Any) -> bytes:
+        """Serialize a result for other processes."""
+        return self._dumps(value)
+
+    def loads(self, payload: bytes) -> Any:
+        """Deserialize a result published by another process."""
+        return self._loads(payload)
+
+    def clear(self) -> None:
+        """Clear all in-flight requests and stop renewing locks."""
+        super().clear()
+        for fingerprint in list(self._renewals):
+            self._stop_renewal(fingerprint)
+
+
+def create_redis_singleflight_store(
+    client: RedisClientProtocol,
+    key_prefix: str = "cache_request_sf:",
+    lock_ttl_seconds: float = 5.0,
+) -> RedisSingleflightStore:
+    """Create a Redis singleflight store."""
+    return RedisSingleflightStore(client, key_prefix, lock_ttl_seconds)
+
+
+def create_redis_cache_store(
+    client: RedisClientProtocol,
+    key_prefix: str = "cache_request:",
+) -> RedisCacheStore:
+    """Create a Redis cache store."""
+    return RedisCacheStore(client, key_prefix)
@@ -4,7 +4,7 @@ Types for cache_request package.
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Callable, Generic, Optional, TypeVar, Dict, List
+from typing import Any, Callable, Generic, Optional, Tuple, TypeVar, Dict, List
 import asyncio
 
 T = TypeVar("T")
@@ -29,6 +29,12 @@ class IdempotencyConfig:
     key_generator: Optional[Callable[[], str]] = None
     """Custom key generator function."""
 
+    reservation_ttl_seconds: float = 30
+    """How long a reservation holds a key in progress before it lapses."""
+
+    wait_timeout_seconds: float = 30
+    """How long a duplicate waits for the original request's result."""
+
 
 @dataclass
 class SingleflightConfig:
@@ -49,6 +55,12 @@ class SingleflightConfig:
     header_keys: List[str] = field(default_factory=list)
     """Headers to include in fingerprint if include_headers is True."""
 
+    memo_ttl_seconds: float = 0
+    """How long a completed result keeps being shared with identical requests (0 disables)."""
+
+    memo_max_entries: int = 1000
+    """Most memoized results kept; the least recently used are evicted first."""
+
 
 @dataclass
 class RequestFingerprint:
@@ -58,6 +70,8 @@ class RequestFingerprint:
     url: str
     headers: Optional[Dict[str, str]] = None
     body: Optional[bytes] = None
+    body_digest: Optional[str] = None
+    """Precomputed body digest (see fingerprint.BodyDigest), used instead of body."""
 
 
 @dataclass
@@ -130,6 +144,44 @@ class CacheRequestStore(ABC):
         pass
 
 
+class ReservableCacheRequestStore(CacheRequestStore):
+    """
+    Cache request store that can atomically reserve keys while their request runs.
+
+    A reservation marks a key in progress until it is completed or its TTL
+    lapses, so concurrent duplicates wait for the original result instead
+    of executing it again.
+    """
+
+    @abstractmethod
+    async def reserve(
+        self, key: str, token: str, fingerprint: Optional[str], ttl_seconds: float
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Reserve a key if it is neither stored nor reserved.
+
+        Returns (reserved, fingerprint of the request holding the reservation).
+        """
+        pass
+
+    @abstractmethod
+    async def complete(
+        self, key: str, token: str, response: Optional[StoredResponse] = None
+    ) -> None:
+        """Store the response (if any), release the reservation and wake waiters."""
+        pass
+
+    @abstractmethod
+    async def renew(self, key: str, token: str, ttl_seconds: float) -> bool:
+        """Extend a reservation still held by token; False once it lapsed or changed hands."""
+        pass
+
+    @abstractmethod
+    async def wait(self, key: str, timeout_seconds: float) -> Optional[StoredResponse]:
+        """Wait until a reserved key has a response; None if the reservation ended without one."""
+        pass
+
+
 class SingleflightStore(ABC):
     """Singleflight store interface for tracking in-flight requests."""
 
@@ -164,6 +216,41 @@ class SingleflightStore(ABC):
         pass
 
 
+class DistributedSingleflightStore(SingleflightStore):
+    """
+    Singleflight store that also coalesces across processes.
+
+    The sync methods track requests in flight in this process; the async
+    methods elect one leader per fingerprint across all processes and hand
+    its serialized result to the others.
+    """
+
+    @abstractmethod
+    async def acquire(self, fingerprint: str) -> Optional[str]:
+        """Try to become the leader; returns a lock token, or None if another process leads."""
+        pass
+
+    @abstractmethod
+    async def complete(self, fingerprint: str, token: str, payload: Optional[bytes]) -> None:
+        """Publish the leader's result (None if it failed) and release the lock."""
+        pass
+
+    @abstractmethod
+    async def wait(self, fingerprint: str, timeout_seconds: float) -> Optional[bytes]:
+        """Wait for another process's result; None if it failed, died or timed out."""
+        pass
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        """Serialize a result for other processes."""
+        pass
+
+    @abstractmethod
+    def loads(self, payload: bytes) -> Any:
+        """Deserialize a result published by another process."""
+        pass
+
+
 @dataclass
 class CacheRequestConfig:
     """Combined cache request configuration."""
@@ -178,6 +265,23 @@ class CacheRequestConfig:
     """Custom store for idempotency responses."""
 
 
+@dataclass
+class IdempotencyReservation(Generic[T]):
+    """Result of reserving an idempotency key."""
+
+    key: str
+    """The idempotency key used."""
+
+    acquired: bool
+    """Whether this caller holds the key and must execute the request."""
+
+    response: Optional[StoredResponse[T]] = None
+    """The original response, when it was stored already or while waiting."""
+
+    token: Optional[str] = None
+    """Identifies the reservation when acquired; pass it to store() or release()."""
+
+
 @dataclass
 class IdempotencyCheckResult(Generic[T]):
     """Result of an idempotency check."""
@@ -205,6 +309,9 @@ class SingleflightResult(Generic[T]):
     subscribers: int
     """Number of requests that shared this result."""
 
+    memoized: bool = False
+    """Whether this was served from the memo of a recently completed request."""
+
 
 class CacheRequestEventType(str, Enum):
     """Event types for cache request operations."""
@@ -213,10 +320,14 @@ class CacheRequestEventType(str, Enum):
     IDEMPOTENCY_MISS = "idempotency:miss"
     IDEMPOTENCY_STORE = "idempotency:store"
     IDEMPOTENCY_EXPIRE = "idempotency:expire"
+    IDEMPOTENCY_RESERVE = "idempotency:reserve"
+    IDEMPOTENCY_WAIT = "idempotency:wait"
     SINGLEFLIGHT_JOIN = "singleflight:join"
     SINGLEFLIGHT_LEAD = "singleflight:lead"
     SINGLEFLIGHT_COMPLETE = "singleflight:complete"
     SINGLEFLIGHT_ERROR = "singleflight:error"
+    SINGLEFLIGHT_FALLBACK = "singleflight:fallback"
+    SINGLEFLIGHT_MEMO_HIT = "singleflight:memo-hit"
 
 
 @dataclass
@@ -1,5 +1,6 @@
 """Pytest configuration and fixtures for cache_request tests."""
 import asyncio
+import time
 import pytest
 from typing import AsyncGenerator, Generator
 
@@ -42,3 +43,110 @@ def singleflight(
     sf = Singleflight(store=memory_singleflight_store)
     yield sf
     sf.close()
+
+
+class FakePubSub:
+    """Pub/sub connection for FakeRedis."""
+
+    def __init__(self, client: "FakeRedis") -> None:
+        self._client = client
+        self._messages: asyncio.Queue = asyncio.Queue()
+        self.channels = set()
+
+    async def subscribe(self, *channels):
+        for channel in channels:
+            self.channels.add(channel)
+            self._client.subscribers.setdefault(channel, set()).add(self)
+
+    async def unsubscribe(self, *channels):
+        for channel in channels or list(self.channels):
+            self.channels.discard(channel)
+            self._client.subscribers.get(channel, set()).discard(self)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        try:
+            return await asyncio.wait_for(self._messages.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self):
+        await self.unsubscribe()
+
+
+class FakeRedis:
+    """Minimal in-process stand-in for an async redis-py client (bytes mode)."""
+
+    def __init__(self) -> None:
+        self.data = {}
+        self.expiry = {}
+        self.subscribers = {}
+        self.published = []
+        self.closed = False
+
+    def _alive(self, name):
+        expires_at = self.expiry.get(name)
+        if expires_at is not None and expires_at <= time.time():
+            self.data.pop(name, None)
+            self.expiry.pop(name, None)
+        return name in self.data
+
+    async def get(self, name):
+        return self.data[name] if self._alive(name) else None
+
+    async def set(self, name, value, px=None, nx=False):
+        if nx and self._alive(name):
+            return None
+        self.data[name] = bytes(value)
+        if px is not None:
+            self.expiry[name] = time.time() + px / 1000
+        else:
+            self.expiry.pop(name, None)
+        return True
+
+    async def exists(self, *names):
+        return sum(1 for n in names if self._alive(n))
+
+    async def delete(self, *names):
+        names = [n.decode() if isinstance(n, bytes) else n for n in names]
+        removed = sum(1 for n in names if self._alive(n))
+        for name in names:
+            self.data.pop(name, None)
+            self.expiry.pop(name, None)
+        return removed
+
+    async def eval(self, script, numkeys, *keys_and_args):
+        # Only the stores' compare-and-DEL / compare-and-PEXPIRE scripts
+        name, token, *args = keys_and_args
+        token = token.encode() if isinstance(token, str) else token
+        held = self.data[name] if self._alive(name) else None
+        if held is None or held.split(b"\n", 1)[0] != token:
+            return 0
+        if "PEXPIRE" in script:
+            self.expiry[name] = time.time() + int(args[0]) / 1000
+            return 1
+        return await self.delete(name)
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+        receivers = self.subscribers.get(channel, set())
+        for pubsub in receivers:
+            pubsub._messages.put_nowait({"type": "message", "channel": channel, "data": message})
+        return len(receivers)
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    async def scan_iter(self, match=None, count=None):
+        prefix = match[:-1] if match and match.endswith("*") else match
+        for name in list(self.data):
+            if self._alive(name) and (prefix is None or name.startswith(prefix)):
+                yield name.encode()
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_redis() -> FakeRedis:
+    """In-process Redis stand-in shared by several simulated processes."""
+    return FakeRedis()
@@ -0,0 +1,211 @@
+"""Tests for cross-process singleflight over Redis."""
+import asyncio
+import pytest
+
+from cache_request import (
+    Singleflight,
+    RequestFingerprint,
+    CacheRequestEventType,
+    RedisSingleflightStore,
+)
+
+REQUEST = RequestFingerprint(method="GET", url="https://api.example.com/data")
+
+
+class Upstream:
+    """Fetch function that counts calls and can be held open or made to fail."""
+
+    def __init__(self, delay: float = 0.05, fail: bool = False) -> None:
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("upstream failed")
+        return {"status": 200, "call": self.calls}
+
+
+def process(fake_redis, **kwargs) -> Singleflight:
+    """A Singleflight as another worker process would create it."""
+    kwargs.setdefault("poll_interval_seconds", 0.02)
+    return Singleflight(store=RedisSingleflightStore(fake_redis, **kwargs))
+
+
+class TestRedisSingleflight:
+    @pytest.mark.asyncio
+    async def test_coalesces_across_processes(self, fake_redis):
+        a, b = process(fake_redis), process(fake_redis)
+        upstream = Upstream()
+
+        results = await asyncio.gather(
+            a.do(REQUEST, upstream),
+            b.do(REQUEST, upstream),
+            b.do(REQUEST, upstream),
+        )
+
+        assert upstream.calls == 1
+        assert [r.value for r in results] == [{"status": 200, "call": 1}] * 3
+        assert [r.shared for r in results] == [False, True, True]
+        assert results[1].subscribers == 2
+        assert not any(name.startswith("cache_request_sf:lock:") for name in fake_redis.data)
+
+    @pytest.mark.asyncio
+    async def test_result_is_published_with_ttl(self, fake_redis):
+        a = process(fake_redis, result_ttl_seconds=1)
+        await a.do(REQUEST, Upstream(delay=0))
+
+        fingerprint = a.generate_fingerprint(REQUEST)
+        result_key = f"cache_request_sf:result:{fingerprint}"
+        assert result_key in fake_redis.expiry
+        assert fake_redis.published == [(f"cache_request_sf:done:{fingerprint}", b"1")]
+
+    @pytest.mark.asyncio
+    async def test_leader_error_makes_followers_fetch(self, fake_redis):
+        a, b = process(fake_redis), process(fake_redis)
+        events = []
+        b.on(lambda e: events.append(e.type))
+        failing, healthy = Upstream(fail=True), Upstream()
+
+        results = await asyncio.gather(
+            a.do(REQUEST, failing), b.do(REQUEST, healthy), return_exceptions=True
+        )
+
+        assert isinstance(results[0], RuntimeError)
+        assert results[1].value == {"status": 200, "call": 1}
+        assert results[1].shared is False
+        assert (failing.calls, healthy.calls) == (1, 1)
+        assert CacheRequestEventType.SINGLEFLIGHT_FALLBACK in events
+
+    @pytest.mark.asyncio
+    async def test_dead_leader_is_detected_by_lock_expiry(self, fake_redis):
+        b = process(fake_redis)
+        fingerprint = b.generate_fingerprint(REQUEST)
+        # A leader that took the lock and then crashed
+        await fake_redis.set(f"cache_request_sf:lock:{fingerprint}", b"gone", px=100, nx=True)
+
+        upstream = Upstream(delay=0)
+        result = await asyncio.wait_for(b.do(REQUEST, upstream), timeout=2)
+
+        assert upstream.calls == 1
+        assert result.shared is False
+
+    @pytest.mark.asyncio
+    async def test_wait_gives_up_after_ttl(self, fake_redis):
+        store = RedisSingleflightStore(fake_redis, poll_interval_seconds=0.02)
+        await fake_redis.set("cache_request_sf:lock:fp", b"busy", px=10_000)
+        assert await store.wait("fp", 0.05) is None
+
+    @pytest.mark.asyncio
+    async def test_lock_is_renewed_while_leader_runs(self, fake_redis):
+        a = process(fake_redis, lock_ttl_seconds=0.06)
+        b = process(fake_redis, lock_ttl_seconds=0.06)
+        upstream = Upstream(delay=0.25)
+
+        async def follow():
+            await asyncio.sleep(0.02)
+            return await b.do(REQUEST, upstream)
+
+        results = await asyncio.gather(a.do(REQUEST, upstream), follow())
+
+        assert upstream.calls == 1
+        assert results[1].shared is True
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_releases_lock(self, fake_redis):
+        store = RedisSingleflightStore(fake_redis, lock_ttl_seconds=0.06)
+        a = Singleflight(store=store)
+        fingerprint = a.generate_fingerprint(REQUEST)
+        leader = asyncio.ensure_future(a.do(REQUEST, Upstream(delay=10)))
+        await asyncio.sleep(0.01)
+        assert f"cache_request_sf:lock:{fingerprint}" in fake_redis.data
+
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+        assert not fake_redis.data
+        assert not store._renewals
+        assert fake_redis.published == [(f"cache_request_sf:done:{fingerprint}", b"0")]
+        assert not a.is_in_flight(REQUEST)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_follower_does_not_strand_local_joiners(self, fake_redis):
+        a, b = process(fake_redis), process(fake_redis)
+        leader = asyncio.ensure_future(a.do(REQUEST, Upstream(delay=10)))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(b.do(REQUEST, Upstream()))
+        await asyncio.sleep(0.01)
+
+        follower.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+        assert b.get_stats()["in_flight"] == 0
+
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        result = await asyncio.wait_for(b.do(REQUEST, Upstream(delay=0)), timeout=1)
+        assert result.shared is False
+
+    @pytest.mark.asyncio
+    async def test_cancelled_acquire_does_not_strand_local_joiners(self, fake_redis):
+        b = process(fake_redis)
+        set_lock = fake_redis.set
+
+        async def slow_set(*args, **kwargs):
+            await asyncio.sleep(10)
+            return await set_lock(*args, **kwargs)
+
+        fake_redis.set = slow_set
+        first = asyncio.ensure_future(b.do(REQUEST, Upstream()))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        fake_redis.set = set_lock
+        result = await asyncio.wait_for(b.do(REQUEST, Upstream(delay=0)), timeout=1)
+        assert result.shared is False
+
+    @pytest.mark.asyncio
+    async def test_renewal_stops_once_lock_changes_hands(self, fake_redis):
+        store = RedisSingleflightStore(fake_redis, lock_ttl_seconds=0.03)
+        token = await store.acquire("fp")
+        # The lock lapsed and another process took it
+        await fake_redis.set("cache_request_sf:lock:fp", b"other", px=10_000)
+        await asyncio.sleep(0.05)
+
+        assert store._renewals["fp"].done()
+        await store.complete("fp", token, None)
+        assert fake_redis.data["cache_request_sf:lock:fp"] == b"other"
+
+    @pytest.mark.asyncio
+    async def test_unreachable_redis_coalesces_locally(self, fake_redis):
+        async def down(*args, **kwargs):
+            raise ConnectionError("redis down")
+
+        fake_redis.set = down
+        a = process(fake_redis)
+        upstream = Upstream()
+
+        results = await asyncio.gather(a.do(REQUEST, upstream), a.do(REQUEST, upstream))
+        assert upstream.calls == 1
+        assert [r.shared for r in results] == [False, True]
+
+    @pytest.mark.asyncio
+    async def test_unserializable_result_makes_followers_fetch(self, fake_redis):
+        a, b = process(fake_redis), process(fake_redis)
+
+        async def unpicklable():
+            await asyncio.sleep(0.05)
+            return lambda: None
+
+        upstream = Upstream()
+        results = await asyncio.gather(a.do(REQUEST, unpicklable), b.do(REQUEST, upstream))
+
+        assert callable(results[0].value)
+        assert upstream.calls == 1
+        assert fake_redis.published[0][1] == b"0"
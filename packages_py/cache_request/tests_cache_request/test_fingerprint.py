@@ -0,0 +1,61 @@
+"""Tests for fixed-size, streaming request fingerprints."""
+from cache_request import (
+    BodyDigest,
+    RequestFingerprint,
+    Singleflight,
+    digest_body,
+    fingerprint_digest,
+    generate_fingerprint,
+    request_body_digest,
+)
+
+BODY = b'{"query": "status = open"}' * 1000
+
+
+class TestBodyDigest:
+    def test_chunked_matches_whole(self):
+        digest = BodyDigest()
+        for i in range(0, len(BODY), 1000):
+            digest.update(BODY[i:i + 1000])
+
+        assert digest.size == len(BODY)
+        assert digest.hexdigest() == digest_body(BODY)
+        assert digest_body(BODY[i:i + 7] for i in range(0, len(BODY), 7)) == digest_body(BODY)
+
+    def test_empty_body_has_no_digest(self):
+        assert BodyDigest().hexdigest() is None
+        assert digest_body(b"") is None
+        assert digest_body(None) is None
+
+    def test_max_size_abandons_digest(self):
+        digest = BodyDigest(max_size=len(BODY))
+        digest.update(BODY)
+        assert not digest.overflowed
+        assert digest.hexdigest() == digest_body(BODY)
+
+        digest.update(b"x")
+        assert digest.overflowed
+        assert digest.hexdigest() is None
+
+    def test_precomputed_digest_is_used(self):
+        request = RequestFingerprint(method="POST", url="/q", body_digest="abc")
+        assert request_body_digest(request) == "abc"
+        assert request_body_digest(RequestFingerprint(method="POST", url="/q", body=BODY)) == digest_body(BODY)
+
+
+class TestFingerprintDigest:
+    def test_fields_are_delimited(self):
+        assert fingerprint_digest("GET", "/ab", "c") != fingerprint_digest("GET", "/a", "bc")
+
+    def test_header_names_are_case_insensitive_and_unordered(self):
+        assert fingerprint_digest("GET", "/", headers={"Accept": "a", "X-Id": "1"}) == fingerprint_digest(
+            "GET", "/", headers={"x-id": "1", "accept": "a"}
+        )
+
+    def test_streamed_and_buffered_bodies_fingerprint_alike(self):
+        buffered = RequestFingerprint(method="POST", url="/q", body=BODY)
+        streamed = RequestFingerprint(method="POST", url="/q", body_digest=digest_body([BODY[:10], BODY[10:]]))
+
+        assert generate_fingerprint(buffered) == generate_fingerprint(streamed)
+        sf = Singleflight()
+        assert sf.generate_fingerprint(buffered) == sf.generate_fingerprint(streamed)
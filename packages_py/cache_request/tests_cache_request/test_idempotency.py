@@ -26,6 +26,8 @@ from cache_request import (
     CacheRequestEvent,
     CacheRequestEventType,
     MemoryCacheStore,
+    RedisCacheStore,
+    CacheRequestStore,
     DEFAULT_IDEMPOTENCY_CONFIG,
     merge_idempotency_config,
     generate_fingerprint,
@@ -609,6 +611,166 @@ class TestIdempotencyManager:
         await manager.close()
 
 
+class PlainStore(CacheRequestStore):
+    """Store without reservation support."""
+
+    def __init__(self) -> None:
+        self._inner = MemoryCacheStore()
+
+    async def get(self, key):
+        return await self._inner.get(key)
+
+    async def set(self, key, response):
+        await self._inner.set(key, response)
+
+    async def has(self, key):
+        return await self._inner.has(key)
+
+    async def delete(self, key):
+        return await self._inner.delete(key)
+
+    async def clear(self):
+        await self._inner.clear()
+
+    async def size(self):
+        return await self._inner.size()
+
+    async def close(self):
+        await self._inner.close()
+
+
+ORDER = RequestFingerprint(method="POST", url="/api/orders", body=b'{"item": 1}')
+
+
+class TestReservations:
+    """Tests for atomic reservations, against the memory and Redis stores."""
+
+    @pytest.fixture(params=["memory", "redis"])
+    def make_manager(self, request, fake_redis):
+        managers = []
+
+        def make(**config) -> IdempotencyManager:
+            if request.param == "memory":
+                # One process: managers share the store
+                store = managers[0]._store if managers else MemoryCacheStore()
+            else:
+                # One store per simulated process, sharing Redis
+                store = RedisCacheStore(fake_redis, poll_interval_seconds=0.02)
+            manager = IdempotencyManager(IdempotencyConfig(**config), store)
+            managers.append(manager)
+            return manager
+
+        return make
+
+    async def test_concurrent_duplicates_execute_once(self, make_manager) -> None:
+        a, b = make_manager(), make_manager()
+        calls = []
+
+        async def submit(manager: IdempotencyManager):
+            reservation = await manager.reserve("key", ORDER)
+            if not reservation.acquired:
+                return reservation.response.value
+            calls.append(manager)
+            await asyncio.sleep(0.05)
+            await manager.store("key", "created", ORDER, reservation.token)
+            return "created"
+
+        results = await asyncio.gather(submit(a), submit(b), submit(b))
+
+        assert results == ["created"] * 3
+        assert len(calls) == 1
+
+    async def test_release_hands_key_to_waiter(self, make_manager) -> None:
+        a, b = make_manager(), make_manager()
+        held = await a.reserve("key", ORDER)
+        assert held.acquired is True
+
+        waiter = asyncio.ensure_future(b.reserve("key", ORDER))
+        await asyncio.sleep(0.02)
+        assert not waiter.done()
+
+        await a.release("key", held.token)
+        reservation = await asyncio.wait_for(waiter, 1)
+        assert reservation.acquired is True
+        assert reservation.response is None
+
+    async def test_different_request_in_progress_conflicts(self, make_manager) -> None:
+        a, b = make_manager(), make_manager()
+        await a.reserve("key", ORDER)
+
+        other = RequestFingerprint(method="POST", url="/api/orders", body=b'{"item": 2}')
+        with pytest.raises(IdempotencyConflictError):
+            await b.reserve("key", other)
+
+    async def test_wait_timeout_conflicts(self, make_manager) -> None:
+        a, b = make_manager(), make_manager(wait_timeout_seconds=0.05)
+        await a.reserve("key", ORDER)
+
+        with pytest.raises(IdempotencyConflictError, match="still being processed"):
+            await b.reserve("key", ORDER)
+
+    async def test_lapsed_reservation_is_taken_over(self, make_manager) -> None:
+        a, b = make_manager(reservation_ttl_seconds=0.05), make_manager()
+        held = await a.reserve("key", ORDER)
+        a._stop_renewal(held.token)  # holder died
+
+        reservation = await asyncio.wait_for(b.reserve("key", ORDER), 1)
+        assert reservation.acquired is True
+
+    async def test_slow_holder_keeps_reservation(self, make_manager) -> None:
+        a = make_manager(reservation_ttl_seconds=0.06)
+        b = make_manager(wait_timeout_seconds=0.2)
+        held = await a.reserve("key", ORDER)
+
+        with pytest.raises(IdempotencyConflictError, match="still being processed"):
+            await b.reserve("key", ORDER)
+
+        await a.release("key", held.token)
+        assert (await b.reserve("key", ORDER)).acquired is True
+
+    async def test_stale_holder_cannot_release_takeover(self, make_manager) -> None:
+        a = make_manager(reservation_ttl_seconds=0.05)
+        c = make_manager(wait_timeout_seconds=0.05)
+        first = await a.reserve("key", ORDER)
+        a._stop_renewal(first.token)  # first holder stalls past its lease
+        await asyncio.sleep(0.06)
+        second = await a.reserve("key", ORDER)
+        assert second.acquired is True
+
+        # The first holder finishing must not release the second one's reservation
+        await a.release("key", first.token)
+        with pytest.raises(IdempotencyConflictError, match="still being processed"):
+            await c.reserve("key", ORDER)
+
+        await a.store("key", "created", ORDER, second.token)
+        reservation = await c.reserve("key", ORDER)
+        assert reservation.response.value == "created"
+
+    async def test_emits_reserve_and_wait_events(self, make_manager) -> None:
+        a, b = make_manager(), make_manager()
+        events = []
+        b.on(lambda e: events.append(e.type))
+
+        held = await a.reserve("key", ORDER)
+        waiter = asyncio.ensure_future(b.reserve("key", ORDER))
+        await asyncio.sleep(0.02)
+        await a.store("key", "created", ORDER, held.token)
+        await waiter
+
+        assert CacheRequestEventType.IDEMPOTENCY_WAIT in events
+        assert events[-1] == CacheRequestEventType.IDEMPOTENCY_HIT
+
+    async def test_store_without_reservations_falls_back_to_check(self) -> None:
+        manager = IdempotencyManager(store=PlainStore())
+        assert (await manager.reserve("key")).acquired is True
+        assert (await manager.reserve("key")).acquired is True
+
+        await manager.store("key", "value")
+        reservation = await manager.reserve("key")
+        assert reservation.acquired is False
+        assert reservation.response.value == "value"
+
+
 class TestIdempotencyConflictError:
     """Tests for IdempotencyConflictError."""
 
@@ -661,27 +823,45 @@ class TestConfigurationHelpers:
         assert merged.methods == ["PUT"]
 
     def test_generate_fingerprint_method_and_url(self) -> None:
-        """Should generate fingerprint from method and url."""
+        """Should generate a fixed-size fingerprint from method and url."""
         fingerprint = generate_fingerprint(
             RequestFingerprint(method="POST", url="/api/users")
         )
-        assert fingerprint == "POST|/api/users"
+        assert len(fingerprint) == 64
+        assert fingerprint == generate_fingerprint(
+            RequestFingerprint(method="POST", url="/api/users")
+        )
+        assert fingerprint != generate_fingerprint(
+            RequestFingerprint(method="PUT", url="/api/users")
+        )
 
     def test_generate_fingerprint_with_body(self) -> None:
-        """Should include body in fingerprint."""
-        fingerprint = generate_fingerprint(
-            RequestFingerprint(
-                method="POST", url="/api/users", body=b'{"name":"test"}'
-            )
+        """Should include body in fingerprint without growing with it."""
+        small = generate_fingerprint(
+            RequestFingerprint(method="POST", url="/api/users", body=b'{"name":"test"}')
+        )
+        large = generate_fingerprint(
+            RequestFingerprint(method="POST", url="/api/users", body=b"x" * 5_000_000)
+        )
+        assert len(small) == len(large) == 64
+        assert small != generate_fingerprint(
+            RequestFingerprint(method="POST", url="/api/users")
         )
-        assert fingerprint == 'POST|/api/users|{"name":"test"}'
 
     def test_generate_fingerprint_handles_none_body(self) -> None:
-        """Should handle None body."""
+        """Should treat a missing and an empty body alike."""
         fingerprint = generate_fingerprint(
             RequestFingerprint(method="GET", url="/api/users", body=None)
         )
-        assert fingerprint == "GET|/api/users"
+        assert fingerprint == generate_fingerprint(
+            RequestFingerprint(method="GET", url="/api/users", body=b"")
+        )
+
+    def test_generate_fingerprint_ignores_headers(self) -> None:
+        """Should only cover method, url and body."""
+        assert generate_fingerprint(
+            RequestFingerprint(method="POST", url="/api/users", headers={"x-trace": "1"})
+        ) == generate_fingerprint(RequestFingerprint(method="POST", url="/api/users"))
 
 
 class TestFactoryFunction:
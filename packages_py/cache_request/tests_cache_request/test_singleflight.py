@@ -819,6 +819,86 @@ class TestSingleflight:
         assert singleflight.is_in_flight(request) is False
 
 
+class TestSingleflightMemo:
+    """Tests for the completed-result memo window."""
+
+    @staticmethod
+    def request(path: str = "/api/data") -> RequestFingerprint:
+        return RequestFingerprint(method="GET", url=path)
+
+    async def test_disabled_by_default(self) -> None:
+        sf = Singleflight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            return "value"
+
+        await sf.do(self.request(), fetch)
+        await sf.do(self.request(), fetch)
+        assert len(calls) == 2
+        assert sf.get_stats()["memoized"] == 0
+
+    async def test_shares_result_within_window(self) -> None:
+        sf = Singleflight(SingleflightConfig(memo_ttl_seconds=0.05))
+        events: List[CacheRequestEvent] = []
+        sf.on(events.append)
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            return f"value-{len(calls)}"
+
+        first = await sf.do(self.request(), fetch)
+        second = await sf.do(self.request(), fetch)
+
+        assert (first.value, first.memoized) == ("value-1", False)
+        assert (second.value, second.shared, second.memoized) == ("value-1", True, True)
+        assert len(calls) == 1
+        assert events[-1].type == CacheRequestEventType.SINGLEFLIGHT_MEMO_HIT
+        assert sf.get_stats()["memo_hits"] == 1
+
+        await asyncio.sleep(0.06)
+        third = await sf.do(self.request(), fetch)
+        assert (third.value, third.memoized) == ("value-2", False)
+
+    async def test_errors_are_not_memoized(self) -> None:
+        sf = Singleflight(SingleflightConfig(memo_ttl_seconds=10))
+
+        async def fail():
+            raise ValueError("upstream down")
+
+        with pytest.raises(ValueError):
+            await sf.do(self.request(), fail)
+        result = await sf.do(self.request(), lambda: async_value("ok"))
+        assert (result.value, result.memoized) == ("ok", False)
+
+    async def test_memoize_false_skips_memo(self) -> None:
+        sf = Singleflight(SingleflightConfig(memo_ttl_seconds=10))
+
+        await sf.do(self.request(), lambda: async_value("first"), memoize=False)
+        result = await sf.do(self.request(), lambda: async_value("second"))
+        assert (result.value, result.memoized) == ("second", False)
+
+    async def test_size_limit_evicts_least_recently_used(self) -> None:
+        sf = Singleflight(SingleflightConfig(memo_ttl_seconds=10, memo_max_entries=2))
+
+        await sf.do(self.request("/a"), lambda: async_value("a"))
+        await sf.do(self.request("/b"), lambda: async_value("b"))
+        await sf.do(self.request("/a"), lambda: async_value("a2"))  # touch /a
+        await sf.do(self.request("/c"), lambda: async_value("c"))  # evicts /b
+
+        assert sf.get_stats()["memoized"] == 2
+        assert (await sf.do(self.request("/a"), lambda: async_value("a3"))).memoized is True
+        assert (await sf.do(self.request("/b"), lambda: async_value("b2"))).value == "b2"
+
+    async def test_clear_drops_memo(self) -> None:
+        sf = Singleflight(SingleflightConfig(memo_ttl_seconds=10))
+        await sf.do(self.request(), lambda: async_value("old"))
+        sf.clear()
+        assert (await sf.do(self.request(), lambda: async_value("new"))).value == "new"
+
+
 class TestConfigurationHelpers:
     """Tests for configuration helper functions."""
 
@@ -17,6 +17,7 @@ from typing import Any
 
 from cache_request import (
     MemoryCacheStore,
+    RedisCacheStore,
     MemorySingleflightStore,
     create_memory_cache_store,
     create_memory_singleflight_store,
@@ -580,3 +581,118 @@ class TestMemorySingleflightStore:
         """Should create a singleflight store."""
         store = create_memory_singleflight_store()
         assert isinstance(store, MemorySingleflightStore)
+
+
+class TestMemoryCacheStoreExpiryIndex:
+    """Tests for the expiry-ordered index behind cleanup."""
+
+    @pytest.mark.asyncio
+    async def test_sweep_removes_only_due_entries(self):
+        store = MemoryCacheStore()
+        now = time.time()
+
+        for i in range(1000):
+            await store.set(f"live{i}", StoredResponse(value=i, cached_at=now, expires_at=now + 60))
+        for i in range(10):
+            await store.set(f"gone{i}", StoredResponse(value=i, cached_at=now, expires_at=now - 1))
+
+        assert await store.size() == 1000
+
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_overwrite_replaces_expiry(self):
+        store = MemoryCacheStore()
+        now = time.time()
+
+        await store.set("key", StoredResponse(value="old", cached_at=now, expires_at=now - 1))
+        await store.set("key", StoredResponse(value="new", cached_at=now, expires_at=now + 60))
+
+        assert await store.size() == 1
+        assert (await store.get("key")).value == "new"
+
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_stale_heap_items_stay_bounded(self):
+        store = MemoryCacheStore()
+        now = time.time()
+
+        for i in range(5000):
+            await store.set("hot", StoredResponse(value=i, cached_at=now, expires_at=now + 60))
+
+        assert len(store._expiry) <= 2 * 1 + 64 + 1
+        assert await store.size() == 1
+
+        await store.close()
+
+
+class TestRedisCacheStore:
+    """Tests for RedisCacheStore against an in-process Redis stand-in."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_with_native_ttl(self, fake_redis):
+        store = RedisCacheStore(fake_redis)
+        now = time.time()
+        await store.set("key", StoredResponse(value={"id": 1}, cached_at=now, expires_at=now + 60, fingerprint="fp"))
+
+        stored = await store.get("key")
+        assert (stored.value, stored.fingerprint) == ({"id": 1}, "fp")
+        assert await store.has("key") is True
+        assert "cache_request:key" in fake_redis.expiry
+
+        assert await store.delete("key") is True
+        assert await store.get("key") is None
+
+    @pytest.mark.asyncio
+    async def test_expired_and_unreadable_entries_are_misses(self, fake_redis):
+        store = RedisCacheStore(fake_redis)
+        now = time.time()
+        await store.set("old", StoredResponse(value=1, cached_at=now, expires_at=now - 1))
+        await fake_redis.set("cache_request:garbage", b"not a pickle")
+
+        assert await store.get("old") is None
+        assert await store.get("garbage") is None
+
+    @pytest.mark.asyncio
+    async def test_size_and_clear_cover_reservations(self, fake_redis):
+        store = RedisCacheStore(fake_redis)
+        now = time.time()
+        await store.set("a", StoredResponse(value=1, cached_at=now, expires_at=now + 60))
+        assert await store.reserve("b", "token", "fp", 30) == (True, None)
+        assert await store.reserve("b", "other", "fp2", 30) == (False, "fp")
+
+        assert await store.size() == 1
+        await store.clear()
+        assert fake_redis.data == {}
+
+    @pytest.mark.asyncio
+    async def test_complete_only_releases_own_reservation(self, fake_redis):
+        store = RedisCacheStore(fake_redis)
+        await store.reserve("key", "mine", None, 30)
+
+        await store.complete("key", "someone-else")
+        assert await fake_redis.exists("cache_request_reservation:key") == 1
+
+        await store.complete("key", "mine")
+        assert await fake_redis.exists("cache_request_reservation:key") == 0
+        assert fake_redis.published[-1] == ("cache_request_reservation:key", b"0")
+
+    @pytest.mark.asyncio
+    async def test_complete_releases_in_one_compare_and_delete(self, fake_redis):
+        store = RedisCacheStore(fake_redis)
+        await store.reserve("key", "mine", "fp", 30)
+        reads = []
+        get = fake_redis.get
+
+        async def recording_get(name):
+            reads.append(name)
+            return await get(name)
+
+        fake_redis.get = recording_get
+        await store.complete("key", "min")
+        assert await fake_redis.exists("cache_request_reservation:key") == 1
+
+        await store.complete("key", "mine")
+        assert await fake_redis.exists("cache_request_reservation:key") == 0
+        assert "cache_request_reservation:key" not in reads
@@ -0,0 +1,122 @@
+"""
+Micro-benchmark: MemoryCacheStore.set entry-size accounting.
+
+Compares the previous json.dumps-based size estimate against the size
+carried on the CachedResponse (computed once by ResponseCache).
+
+Run from the package root:
+    PYTHONPATH=src python benchmarks/bench_entry_size.py
+"""
+import asyncio
+import json
+import time
+import timeit
+
+from cache_response import (
+    CacheControlDirectives,
+    CacheEntryMetadata,
+    CachedResponse,
+    MemoryCacheStore,
+    estimate_entry_size,
+)
+
+ITERATIONS = 50_000
+
+
+def _json_entry_size(response: CachedResponse) -> int:
+    """The json.dumps-based estimate MemoryCacheStore used before."""
+    size = len(response.body) if response.body else 0
+    metadata_dict = {
+        "url": response.metadata.url,
+        "method": response.metadata.method,
+        "status_code": response.metadata.status_code,
+        "headers": response.metadata.headers,
+        "cached_at": response.metadata.cached_at,
+        "expires_at": response.metadata.expires_at,
+        "etag": response.metadata.etag,
+        "last_modified": response.metadata.last_modified,
+        "cache_control": response.metadata.cache_control,
+        "vary": response.metadata.vary,
+    }
+    return size + len(json.dumps(metadata_dict, default=str))
+
+
+class _JsonSizedStore(MemoryCacheStore):
+    """MemoryCacheStore with the old per-set json sizing."""
+
+    def _calculate_entry_size(self, response: CachedResponse) -> int:
+        return _json_entry_size(response)
+
+
+def _make_response(sized: bool) -> CachedResponse:
+    now = time.time()
+    metadata = CacheEntryMetadata(
+        url="https://example.atlassian.net/rest/api/3/search?jql=project%3DMTA&maxResults=50",
+        method="GET",
+        status_code=200,
+        headers={
+            "content-type": "application/json;charset=UTF-8",
+            "cache-control": "max-age=60, private",
+            "etag": '"a1b2c3d4e5f6"',
+            "vary": "Accept-Encoding, Authorization",
+            "x-arequestid": "9f1c2d3e-4b5a-6789-abcd-ef0123456789",
+            "date": "Fri, 16 Oct 2026 12:00:00 GMT",
+            "server": "AtlassianEdge",
+            "strict-transport-security": "max-age=63072000; preload",
+        },
+        cached_at=now,
+        expires_at=now + 3600,
+        etag='"a1b2c3d4e5f6"',
+        cache_control="max-age=60, private",
+        directives=CacheControlDirectives(max_age=60, private=True),
+        vary="Accept-Encoding, Authorization",
+    )
+    body = b'{"issues": []}' * 200
+    return CachedResponse(
+        metadata=metadata,
+        body=body,
+        size=estimate_entry_size(metadata, body) if sized else None,
+    )
+
+
+def _bench_set(store: MemoryCacheStore, response: CachedResponse) -> float:
+    loop = asyncio.new_event_loop()
+    try:
+        def run() -> None:
+            loop.run_until_complete(_set_many(store, response))
+
+        return min(timeit.repeat(run, number=1, repeat=5)) / ITERATIONS
+    finally:
+        loop.run_until_complete(store.close())
+        loop.close()
+
+
+async def _set_many(store: MemoryCacheStore, response: CachedResponse) -> None:
+    for i in range(ITERATIONS):
+        await store.set(f"key{i % 512}", response)
+
+
+def main() -> None:
+    json_cost = _bench_set(_JsonSizedStore(max_entries=1024), _make_response(sized=False))
+    carried_cost = _bench_set(MemoryCacheStore(max_entries=1024), _make_response(sized=True))
+    sample = _make_response(sized=False)
+    estimate_cost = min(
+        timeit.repeat(
+            lambda: estimate_entry_size(sample.metadata, sample.body),
+            number=10_000,
+            repeat=3,
+        )
+    ) / 10_000
+    json_size_cost = min(
+        timeit.repeat(lambda: _json_entry_size(sample), number=10_000, repeat=3)
+    ) / 10_000
+
+    print(f"set() with json.dumps sizing : {json_cost * 1e6:8.2f} us/op")
+    print(f"set() with carried size      : {carried_cost * 1e6:8.2f} us/op")
+    print(f"speedup                      : {json_cost / carried_cost:8.2f}x")
+    print(f"json.dumps size estimate     : {json_size_cost * 1e6:8.2f} us/op")
+    print(f"estimate_entry_size          : {estimate_cost * 1e6:8.2f} us/op")
+
+
+if __name__ == "__main__":
+    main()
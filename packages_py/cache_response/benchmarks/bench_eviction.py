@@ -0,0 +1,95 @@
+"""
+Trace-driven benchmark: MemoryCacheStore eviction policies.
+
+Replays a key trace against a store per policy (get, then set on a miss)
+and reports hit rate and throughput. The default trace is synthetic: a
+Zipf-distributed working set of API endpoints (config, user, issue
+lookups) interrupted by periodic one-off crawls, e.g. walking every page
+of a Confluence space.
+
+Run from the package root:
+    PYTHONPATH=src python benchmarks/bench_eviction.py
+    PYTHONPATH=src python benchmarks/bench_eviction.py trace.txt  # one key per line
+"""
+import asyncio
+import random
+import sys
+import time
+from typing import List
+
+from cache_response import CacheEntryMetadata, CachedResponse, MemoryCacheStore
+
+CAPACITY = 500
+WORKING_SET = 2_000
+ZIPF_EXPONENT = 1.0
+TRACE_LENGTH = 200_000
+CRAWL_EVERY = 20_000
+CRAWL_LENGTH = 5_000
+POLICIES = ("lru", "w-tinylfu")
+
+
+def synthetic_trace(seed: int = 7) -> List[str]:
+    """Zipf working set with periodic scans of never-repeated keys."""
+    rng = random.Random(seed)
+    weights = [1 / (rank ** ZIPF_EXPONENT) for rank in range(1, WORKING_SET + 1)]
+    endpoints = [f"GET:https://example.atlassian.net/rest/api/3/item/{i}" for i in range(WORKING_SET)]
+
+    trace: List[str] = []
+    crawl = 0
+    while len(trace) < TRACE_LENGTH:
+        trace.extend(rng.choices(endpoints, weights, k=CRAWL_EVERY))
+        trace.extend(
+            f"GET:https://example.atlassian.net/wiki/rest/api/content/{crawl}-{page}"
+            for page in range(CRAWL_LENGTH)
+        )
+        crawl += 1
+    return trace[:TRACE_LENGTH]
+
+
+def load_trace(path: str) -> List[str]:
+    """Read a trace file with one cache key per line."""
+    with open(path) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def make_response(key: str) -> CachedResponse:
+    now = time.time()
+    return CachedResponse(
+        metadata=CacheEntryMetadata(
+            url=key,
+            method="GET",
+            status_code=200,
+            headers={"content-type": "application/json"},
+            cached_at=now,
+            expires_at=now + 3600,
+        ),
+        body=b"{}",
+        size=1024,
+    )
+
+
+async def replay(policy: str, trace: List[str]) -> None:
+    store = MemoryCacheStore(max_entries=CAPACITY, eviction_policy=policy)
+    start = time.perf_counter()
+    for key in trace:
+        if await store.get(key) is None:
+            await store.set(key, make_response(key))
+    elapsed = time.perf_counter() - start
+
+    stats = store.get_stats()
+    print(
+        f"{stats.eviction_policy:>10}: hit rate {stats.hit_rate:6.2%}  "
+        f"({len(trace) / elapsed:,.0f} accesses/s)"
+    )
+    await store.close()
+
+
+async def main() -> None:
+    trace = load_trace(sys.argv[1]) if len(sys.argv) > 1 else synthetic_trace()
+    print(f"{len(trace):,} accesses, {len(set(trace)):,} distinct keys, capacity {CAPACITY}")
+    for policy in POLICIES:
+        await replay(policy, trace)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+"""
+Benchmark: memoized Cache-Control / Vary parsing on the ResponseCache path.
+
+Runs ResponseCache.store + lookup over a realistic mix of repeated header
+strings, once with the parse memo disabled (each call re-parses) and once
+with it enabled.
+
+Run from the package root:
+    PYTHONPATH=src python benchmarks/bench_parse_cache.py
+"""
+import asyncio
+import time
+import timeit
+
+from cache_response import ResponseCache, clear_parse_caches, parse_cache_control
+from cache_response import parser
+
+ITERATIONS = 20_000
+URLS = [f"https://example.atlassian.net/rest/api/3/issue/MTA-{i}" for i in range(200)]
+HEADER_SETS = [
+    {"Cache-Control": "max-age=60, private", "Content-Type": "application/json"},
+    {"Cache-Control": "public, max-age=300, stale-while-revalidate=30", "Vary": "Accept, Accept-Encoding"},
+    {"Cache-Control": "max-age=0, must-revalidate", "ETag": '"abc"'},
+]
+REQUEST_HEADERS = {"Accept": "application/json", "Accept-Encoding": "gzip"}
+
+
+async def store_and_lookup(cache: ResponseCache) -> None:
+    for i in range(ITERATIONS):
+        url = URLS[i % len(URLS)]
+        await cache.store("GET", url, 200, HEADER_SETS[i % len(HEADER_SETS)], b"{}", REQUEST_HEADERS)
+        await cache.lookup("GET", url, REQUEST_HEADERS)
+
+
+def run_path() -> float:
+    cache = ResponseCache(store=None)
+    start = time.perf_counter()
+    asyncio.run(store_and_lookup(cache))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    header = HEADER_SETS[1]["Cache-Control"]
+    raw_parse = parser._parse_cache_control.__wrapped__
+    raw = timeit.timeit(lambda: raw_parse(header), number=200_000)
+    memo = timeit.timeit(lambda: parse_cache_control(header), number=200_000)
+    print(f"parse_cache_control x200k: raw {raw * 1000:.1f}ms, memoized {memo * 1000:.1f}ms")
+
+    memoized_cc, memoized_vary = parser._parse_cache_control, parser._parse_vary
+    parser._parse_cache_control = memoized_cc.__wrapped__
+    parser._parse_vary = memoized_vary.__wrapped__
+    try:
+        uncached = run_path()
+    finally:
+        parser._parse_cache_control, parser._parse_vary = memoized_cc, memoized_vary
+
+    clear_parse_caches()
+    cached = run_path()
+    print(
+        f"store+lookup x{ITERATIONS:,}: no memo {uncached * 1000:.0f}ms, "
+        f"memo {cached * 1000:.0f}ms ({uncached / cached:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
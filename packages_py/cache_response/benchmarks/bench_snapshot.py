@@ -0,0 +1,66 @@
+"""
+Benchmark: snapshot export/import throughput.
+
+Fills a MemoryCacheStore with SIZE_MB of JSON-sized entries, exports it to
+a snapshot and imports it into an empty cache, reporting MB/s and peak
+traced memory for the import.
+
+Run from the package root:
+    PYTHONPATH=src python benchmarks/bench_snapshot.py
+    PYTHONPATH=src python benchmarks/bench_snapshot.py 500  # snapshot size in MB
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from cache_response import MemoryCacheStore, ResponseCache
+
+ENTRY_BODY_SIZE = 16 * 1024
+
+
+async def main() -> None:
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    entries = size_mb * 1024 * 1024 // ENTRY_BODY_SIZE
+    store_budget = size_mb * 2 * 1024 * 1024
+    body = b"x" * ENTRY_BODY_SIZE
+
+    source = ResponseCache(store=MemoryCacheStore(max_size=store_budget, max_entries=entries + 1))
+    for i in range(entries):
+        await source.store(
+            "GET",
+            f"https://example.atlassian.net/rest/api/3/issue/MTA-{i}",
+            200,
+            {"cache-control": "max-age=3600", "content-type": "application/json"},
+            body,
+        )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "responses.snap")
+
+        start = time.perf_counter()
+        written = await source.export_snapshot(path)
+        export_seconds = time.perf_counter() - start
+        file_mb = os.path.getsize(path) / (1024 * 1024)
+        await source.close()
+
+        target = ResponseCache(store=MemoryCacheStore(max_size=store_budget, max_entries=entries + 1))
+        tracemalloc.start()
+        start = time.perf_counter()
+        loaded = await target.import_snapshot(path)
+        import_seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(f"{written:,} entries, {file_mb:.0f}MB snapshot")
+    print(f"export: {export_seconds:.2f}s ({file_mb / export_seconds:.0f} MB/s)")
+    print(
+        f"import: {import_seconds:.2f}s ({file_mb / import_seconds:.0f} MB/s), "
+        f"{loaded:,} loaded, peak traced memory {peak / (1024 * 1024):.0f}MB"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -9,9 +9,12 @@ from .types import (
     CachedResponse,
     CacheFreshness,
     CacheLookupResult,
+    CacheKeyStats,
     RevalidationResult,
     CacheResponseStore,
+    SyncCacheResponseStore,
     CacheResponseConfig,
+    PostCacheRule,
     CacheResponseEventType,
     CacheResponseEvent,
     CacheResponseEventListener,
@@ -33,19 +36,63 @@ from .parser import (
     is_vary_uncacheable,
     extract_vary_headers,
     match_vary_headers,
+    normalize_vary_value,
+    vary_digest,
+    normalize_url,
+    parse_cache_tags,
     get_header_value,
     normalize_headers,
+    clear_parse_caches,
 )
 from .cache import (
     ResponseCache,
     create_response_cache,
+    SyncResponseCache,
+    create_sync_response_cache,
     DEFAULT_CACHE_RESPONSE_CONFIG,
     merge_cache_response_config,
 )
+from .post import (
+    RequestBodyDigest,
+    digest_request_body,
+)
+from .revalidation import (
+    RevalidationScheduler,
+    RevalidationStats,
+)
+from .snapshot import (
+    write_snapshot,
+    read_snapshot,
+    load_snapshot,
+    snapshot_lifespan,
+)
+from .compression import (
+    BodyCodec,
+    ZlibCodec,
+    register_body_codec,
+    get_body_codec,
+    encode_response_body,
+    decode_response_body,
+    stored_body,
+)
 from .stores import (
     MemoryCacheStore,
     MemoryCacheStats,
     create_memory_cache_store,
+    SyncMemoryCacheStore,
+    create_sync_memory_cache_store,
+    estimate_entry_size,
+    EvictionPolicy,
+    LruPolicy,
+    WTinyLfuPolicy,
+    CountMinSketch,
+    create_eviction_policy,
+    DiskCacheStore,
+    DiskCacheStats,
+    create_disk_cache_store,
+    TieredCacheStore,
+    TieredCacheStats,
+    create_tiered_cache_store,
 )
 
 
@@ -56,9 +103,12 @@ __all__ = [
     "CachedResponse",
     "CacheFreshness",
     "CacheLookupResult",
+    "CacheKeyStats",
     "RevalidationResult",
     "CacheResponseStore",
+    "SyncCacheResponseStore",
     "CacheResponseConfig",
+    "PostCacheRule",
     "CacheResponseEventType",
     "CacheResponseEvent",
     "CacheResponseEventListener",
@@ -79,17 +129,66 @@ __all__ = [
     "is_vary_uncacheable",
     "extract_vary_headers",
     "match_vary_headers",
+    "normalize_vary_value",
+    "vary_digest",
+    "normalize_url",
+    "parse_cache_tags",
     "get_header_value",
     "normalize_headers",
+    "clear_parse_caches",
     # Cache manager
     "ResponseCache",
     "create_response_cache",
+    "SyncResponseCache",
+    "create_sync_response_cache",
     "DEFAULT_CACHE_RESPONSE_CONFIG",
     "merge_cache_response_config",
+    # POST query caching
+    "RequestBodyDigest",
+    "digest_request_body",
+    # Background revalidation
+    "RevalidationScheduler",
+    "RevalidationStats",
+    # Snapshots
+    "write_snapshot",
+    "read_snapshot",
+    "load_snapshot",
+    "snapshot_lifespan",
+    # Body codecs
+    "BodyCodec",
+    "ZlibCodec",
+    "register_body_codec",
+    "get_body_codec",
+    "encode_response_body",
+    "decode_response_body",
+    "stored_body",
     # Stores
     "MemoryCacheStore",
     "MemoryCacheStats",
     "create_memory_cache_store",
+    "SyncMemoryCacheStore",
+    "create_sync_memory_cache_store",
+    "estimate_entry_size",
+    "EvictionPolicy",
+    "LruPolicy",
+    "WTinyLfuPolicy",
+    "CountMinSketch",
+    "create_eviction_policy",
+    "DiskCacheStore",
+    "DiskCacheStats",
+    "create_disk_cache_store",
+    "TieredCacheStore",
+    "TieredCacheStats",
+    "create_tiered_cache_store",
 ]
 
+# Optional Redis store
+try:
+    from .stores import RedisCacheStore, RedisCacheStats, create_redis_cache_store
+
+    __all__.extend(["RedisCacheStore", "RedisCacheStats", "create_redis_cache_store"])
+except ImportError:
+    pass
+
+
 __version__ = "1.0.0"
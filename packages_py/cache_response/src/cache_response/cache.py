@@ -2,12 +2,17 @@
 RFC 7234 HTTP Response Cache Manager.
 """
 import asyncio
+import re
+import threading
 import time
-from typing import Callable, Dict, Optional, Set
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
 from .types import (
+    CacheKeyStats,
     CacheResponseConfig,
     CacheResponseStore,
+    SyncCacheResponseStore,
     CachedResponse,
     CacheEntryMetadata,
     CacheLookupResult,
@@ -15,6 +20,8 @@ from .types import (
     CacheResponseEventType,
     CacheResponseEventListener,
     CacheFreshness,
+    CacheControlDirectives,
+    PostCacheRule,
 )
 from .parser import (
     parse_cache_control,
@@ -31,8 +38,24 @@ from .parser import (
     extract_vary_headers,
     match_vary_headers,
     normalize_headers,
+    normalize_url,
+    parse_cache_tags,
+    vary_digest,
 )
-from .stores.memory import MemoryCacheStore
+from .compression import (
+    decode_response_body,
+    encode_response_body,
+    get_body_codec,
+    stored_body,
+)
+from .revalidation import RevalidationScheduler, RevalidationStats
+from .stores.memory import MemoryCacheStore, SyncMemoryCacheStore, estimate_entry_size
+from .stores.serialization import get_stale_window
+from .snapshot import load_snapshot, write_snapshot
+
+VARIANT_KEY_SEPARATOR = "|vary:"
+BODY_KEY_SEPARATOR = "|body:"
+_MAX_TRACKED_HIT_COUNTS = 10_000
 
 
 def _default_key_generator(
@@ -61,6 +84,17 @@ DEFAULT_CACHE_RESPONSE_CONFIG = CacheResponseConfig(
     include_query_in_key=True,
     key_generator=_default_key_generator,
     vary_headers=[],
+    body_codec=None,
+    body_codec_min_size=1024,
+    max_vary_variants=8,
+    refresh_ahead=False,
+    refresh_ahead_fraction=0.8,
+    refresh_ahead_min_hits=3,
+    max_concurrent_refreshes=4,
+    max_concurrent_revalidations=4,
+    revalidation_queue_size=256,
+    normalize_urls=False,
+    post_cache_rules=[],
 )
 
 
@@ -82,6 +116,20 @@ def merge_cache_response_config(
             include_query_in_key=DEFAULT_CACHE_RESPONSE_CONFIG.include_query_in_key,
             key_generator=DEFAULT_CACHE_RESPONSE_CONFIG.key_generator,
             vary_headers=list(DEFAULT_CACHE_RESPONSE_CONFIG.vary_headers),
+            body_codec=DEFAULT_CACHE_RESPONSE_CONFIG.body_codec,
+            body_codec_min_size=DEFAULT_CACHE_RESPONSE_CONFIG.body_codec_min_size,
+            max_vary_variants=DEFAULT_CACHE_RESPONSE_CONFIG.max_vary_variants,
+            refresh_ahead=DEFAULT_CACHE_RESPONSE_CONFIG.refresh_ahead,
+            refresh_ahead_fraction=DEFAULT_CACHE_RESPONSE_CONFIG.refresh_ahead_fraction,
+            refresh_ahead_min_hits=DEFAULT_CACHE_RESPONSE_CONFIG.refresh_ahead_min_hits,
+            max_concurrent_refreshes=DEFAULT_CACHE_RESPONSE_CONFIG.max_concurrent_refreshes,
+            max_concurrent_revalidations=DEFAULT_CACHE_RESPONSE_CONFIG.max_concurrent_revalidations,
+            revalidation_queue_size=DEFAULT_CACHE_RESPONSE_CONFIG.revalidation_queue_size,
+            tag_headers=list(DEFAULT_CACHE_RESPONSE_CONFIG.tag_headers),
+            tagger=DEFAULT_CACHE_RESPONSE_CONFIG.tagger,
+            normalize_urls=DEFAULT_CACHE_RESPONSE_CONFIG.normalize_urls,
+            ignored_query_params=list(DEFAULT_CACHE_RESPONSE_CONFIG.ignored_query_params),
+            post_cache_rules=list(DEFAULT_CACHE_RESPONSE_CONFIG.post_cache_rules),
         )
 
     return CacheResponseConfig(
@@ -117,57 +165,73 @@ def merge_cache_response_config(
         vary_headers=config.vary_headers
         if config.vary_headers
         else list(DEFAULT_CACHE_RESPONSE_CONFIG.vary_headers),
+        body_codec=config.body_codec or DEFAULT_CACHE_RESPONSE_CONFIG.body_codec,
+        body_codec_min_size=config.body_codec_min_size
+        if config.body_codec_min_size is not None
+        else DEFAULT_CACHE_RESPONSE_CONFIG.body_codec_min_size,
+        max_vary_variants=config.max_vary_variants
+        if config.max_vary_variants is not None
+        else DEFAULT_CACHE_RESPONSE_CONFIG.max_vary_variants,
+        refresh_ahead=config.refresh_ahead
+        if config.refresh_ahead is not None
+        else DEFAULT_CACHE_RESPONSE_CONFIG.refresh_ahead,
+        refresh_ahead_fraction=config.refresh_ahead_fraction
+        if config.refresh_ahead_fraction is not None
+        else DEFAULT_CACHE_RESPONSE_CONFIG.refresh_ahead_fraction,
+        refresh_ahead_min_hits=config.refresh_ahead_min_hits
+        if config.refresh_ahead_min_hits is not None
+        else DEFAULT_CACHE_RESPONSE_CONFIG.refresh_ahead_min_hits,
+        max_concurrent_refreshes=config.max_concurrent_refreshes
+        if config.max_concurrent_refreshes is not None
+        else DEFAULT_CACHE_RESPONSE_CONFIG.max_concurrent_refreshes,
+        max_concurrent_revalidations=config.max_concurrent_revalidations
+        if config.max_concurrent_revalidations is not None
+        else DEFAULT_CACHE_RESPONSE_CONFIG.max_concurrent_revalidations,
+        revalidation_queue_size=config.revalidation_queue_size
+        if config.revalidation_queue_size is not None
+        else DEFAULT_CACHE_RESPONSE_CONFIG.revalidation_queue_size,
+        tag_headers=config.tag_headers
+        if config.tag_headers is not None
+        else list(DEFAULT_CACHE_RESPONSE_CONFIG.tag_headers),
+        tagger=config.tagger or DEFAULT_CACHE_RESPONSE_CONFIG.tagger,
+        normalize_urls=config.normalize_urls
+        if config.normalize_urls is not None
+        else DEFAULT_CACHE_RESPONSE_CONFIG.normalize_urls,
+        ignored_query_params=config.ignored_query_params
+        if config.ignored_query_params is not None
+        else list(DEFAULT_CACHE_RESPONSE_CONFIG.ignored_query_params),
+        post_cache_rules=config.post_cache_rules
+        if config.post_cache_rules
+        else list(DEFAULT_CACHE_RESPONSE_CONFIG.post_cache_rules),
     )
 
 
-class ResponseCache:
+class _ResponseCacheCore:
     """
-    RFC 7234 compliant HTTP response cache.
-
-    Implements:
-    - Cache-Control directive parsing and compliance
-    - ETag and Last-Modified conditional request support
-    - Vary header handling
-    - Stale-while-revalidate pattern
-    - Stale-if-error pattern
-    - LRU eviction (via store)
-
-    Example:
-        cache = ResponseCache()
-
-        # Check cache before making request
-        lookup = await cache.lookup('GET', 'https://api.example.com/data')
-        if lookup.found and lookup.freshness == CacheFreshness.FRESH:
-            return lookup.response
-
-        # Make request (with conditional headers if available)
-        headers = {}
-        if lookup.etag:
-            headers['If-None-Match'] = lookup.etag
-        if lookup.last_modified:
-            headers['If-Modified-Since'] = lookup.last_modified
-
-        response = await http_client.get(url, headers=headers)
-
-        # Handle 304 Not Modified
-        if response.status_code == 304 and lookup.response:
-            await cache.revalidate('GET', url)
-            return lookup.response
+    Store-independent half of the response cache.
 
-        # Store new response
-        await cache.store('GET', url, response.status_code, dict(response.headers), response.content)
+    Holds the merged config, key generation, POST rules, cacheability and
+    freshness decisions, entry building, Vary variant bookkeeping, hit
+    counting and events. Nothing here touches a store, so ResponseCache
+    (async stores) and SyncResponseCache (blocking stores) share it and
+    only differ in how they read and write entries.
     """
 
-    def __init__(
-        self,
-        config: Optional[CacheResponseConfig] = None,
-        store: Optional[CacheResponseStore] = None,
-    ) -> None:
+    def __init__(self, config: Optional[CacheResponseConfig] = None) -> None:
         self._config = merge_cache_response_config(config)
-        self._store = store or MemoryCacheStore()
+        if self._config.body_codec:
+            get_body_codec(self._config.body_codec)  # Fail fast on unknown codecs
         self._listeners: Set[CacheResponseEventListener] = set()
-        self._background_revalidator: Optional[Callable] = None
-        self._revalidating_keys: Set[str] = set()
+        self._hit_counts: Dict[str, int] = {}
+        self._refreshing_keys: Set[str] = set()
+        self._ignored_query_params = frozenset(
+            p.lower() for p in self._config.ignored_query_params
+        )
+        self._keys_generated = 0
+        self._keys_normalized = 0
+        self._post_rules: List[Tuple["re.Pattern", PostCacheRule]] = [
+            (re.compile(rule.url_pattern), rule) for rule in self._config.post_cache_rules
+        ]
 
     def generate_key(
         self,
@@ -175,39 +239,63 @@ class ResponseCache:
         url: str,
         request_headers: Optional[Dict[str, str]] = None,
         vary_headers: Optional[list] = None,
+        body_digest: Optional[str] = None,
     ) -> str:
-        """Generate cache key for a request."""
+        """Generate cache key for a request (body_digest keys POST queries by their body)."""
         cache_url = url
         if not self._config.include_query_in_key:
             query_index = url.find("?")
             if query_index != -1:
                 cache_url = url[:query_index]
 
+        self._keys_generated += 1
+        if self._config.normalize_urls:
+            normalized = normalize_url(cache_url, self._ignored_query_params)
+            if normalized != cache_url:
+                self._keys_normalized += 1
+                cache_url = normalized
+
         vary_header_values: Optional[Dict[str, str]] = None
         if request_headers and vary_headers and len(vary_headers) > 0:
             vary_header_values = extract_vary_headers(request_headers, vary_headers)
 
         key_generator = self._config.key_generator or _default_key_generator
-        return key_generator(method, cache_url, vary_header_values)
-
-    def is_cacheable(self, method: str) -> bool:
-        """Check if a request method is cacheable."""
+        key = key_generator(method, cache_url, vary_header_values)
+        if body_digest is not None:
+            key += f"{BODY_KEY_SEPARATOR}{body_digest}"
+        return key
+
+    def is_cacheable(self, method: str, url: Optional[str] = None) -> bool:
+        """Check if a request method is cacheable (POST only for URLs matching a post_cache_rule)."""
+        if url is not None and method.upper() == "POST" and self.post_cache_rule(url) is not None:
+            return True
         return is_cacheable_method(method, self._config.methods)
 
-    async def lookup(
+    def post_cache_rule(self, url: str) -> Optional[PostCacheRule]:
+        """Get the first post_cache_rule matching a URL."""
+        for pattern, rule in self._post_rules:
+            if pattern.search(url):
+                return rule
+        return None
+
+    def _request_rule(
+        self, method: str, url: str, body_digest: Optional[str]
+    ) -> Tuple[bool, Optional[PostCacheRule]]:
+        """Whether a request can use the cache, and the POST rule governing it if any."""
+        if body_digest is not None and method.upper() == "POST":
+            rule = self.post_cache_rule(url)
+            return rule is not None, rule
+        return self.is_cacheable(method), None
+
+    def _lookup_result(
         self,
-        method: str,
         url: str,
-        request_headers: Optional[Dict[str, str]] = None,
+        base_key: str,
+        key: str,
+        cached: Optional[CachedResponse],
+        request_headers: Optional[Dict[str, str]],
     ) -> CacheLookupResult:
-        """Look up a cached response."""
-        if not self.is_cacheable(method):
-            return CacheLookupResult(found=False)
-
-        # Use base key without vary headers - vary matching is done after retrieval
-        key = self.generate_key(method, url)
-        cached = await self._store.get(key)
-
+        """Evaluate the entry resolved for a request: Vary match, decoding, freshness and events."""
         if not cached:
             self._emit(
                 CacheResponseEvent(
@@ -219,8 +307,8 @@ class ResponseCache:
             )
             return CacheLookupResult(found=False)
 
-        # Check Vary header matching
-        if cached.metadata.vary and request_headers:
+        # Check Vary header matching (variants already matched by digest)
+        if key == base_key and cached.metadata.vary and request_headers:
             vary_list = parse_vary(cached.metadata.vary)
             if is_vary_uncacheable(cached.metadata.vary):
                 return CacheLookupResult(found=False)
@@ -229,6 +317,13 @@ class ResponseCache:
                 if not match_vary_headers(request_vary_headers, cached.metadata.vary_headers):
                     return CacheLookupResult(found=False)
 
+        if cached.body_codec:
+            try:
+                cached = decode_response_body(cached)
+            except Exception:
+                # Unknown codec or corrupt data: treat as a miss
+                return CacheLookupResult(found=False)
+
         freshness = determine_freshness(cached.metadata)
         should_revalidate = (
             freshness != CacheFreshness.FRESH
@@ -236,6 +331,8 @@ class ResponseCache:
         )
 
         # Emit appropriate event
+        should_refresh = False
+        hits = self._count_hit(base_key) if freshness != CacheFreshness.EXPIRED else 0
         if freshness == CacheFreshness.FRESH and not should_revalidate:
             self._emit(
                 CacheResponseEvent(
@@ -246,6 +343,7 @@ class ResponseCache:
                     metadata={"freshness": freshness.value},
                 )
             )
+            should_refresh = self._should_refresh_ahead(base_key, cached.metadata, hits)
         elif freshness == CacheFreshness.STALE:
             self._emit(
                 CacheResponseEvent(
@@ -257,14 +355,16 @@ class ResponseCache:
                 )
             )
 
-        # Trigger background revalidation for stale-while-revalidate
-        if (
-            self._config.stale_while_revalidate
-            and freshness == CacheFreshness.STALE
-            and self._background_revalidator
-            and key not in self._revalidating_keys
-        ):
-            self._trigger_background_revalidation(key, url, request_headers)
+        if should_refresh:
+            self._emit(
+                CacheResponseEvent(
+                    type=CacheResponseEventType.CACHE_REFRESH_AHEAD,
+                    key=key,
+                    url=url,
+                    timestamp=time.time(),
+                    metadata={"expires_at": cached.metadata.expires_at},
+                )
+            )
 
         return CacheLookupResult(
             found=True,
@@ -273,22 +373,85 @@ class ResponseCache:
             should_revalidate=should_revalidate,
             etag=cached.metadata.etag,
             last_modified=cached.metadata.last_modified,
+            should_refresh=should_refresh,
         )
 
-    async def store(
+    def _count_hit(self, base_key: str) -> int:
+        """Count a hit in the entry's current TTL (used for refresh-ahead and revalidation priority)."""
+        hits = self._hit_counts.pop(base_key, 0) + 1
+        self._hit_counts[base_key] = hits
+        if len(self._hit_counts) > _MAX_TRACKED_HIT_COUNTS:
+            del self._hit_counts[next(iter(self._hit_counts))]
+        return hits
+
+    def _should_refresh_ahead(
+        self, base_key: str, metadata: CacheEntryMetadata, hits: int
+    ) -> bool:
+        """
+        Decide whether a fresh hit makes the entry due for refresh-ahead.
+
+        An entry qualifies once it has enough hits in its current TTL and
+        has used up refresh_ahead_fraction of that TTL, while fewer than
+        max_concurrent_refreshes refreshes are in flight. The key is then
+        marked as refreshing until end_refresh(), store or revalidate.
+        """
+        if not self._config.refresh_ahead or hits < self._config.refresh_ahead_min_hits:
+            return False
+
+        ttl = metadata.expires_at - metadata.cached_at
+        refresh_at = metadata.cached_at + ttl * self._config.refresh_ahead_fraction
+        if ttl <= 0 or time.time() < refresh_at:
+            return False
+
+        if (
+            base_key in self._refreshing_keys
+            or len(self._refreshing_keys) >= self._config.max_concurrent_refreshes
+        ):
+            return False
+        self._refreshing_keys.add(base_key)
+        return True
+
+    def end_refresh(self, method: str, url: str, body_digest: Optional[str] = None) -> None:
+        """Release a refresh-ahead slot taken by lookup() (call when a refresh fails)."""
+        self._refreshing_keys.discard(self.generate_key(method, url, body_digest=body_digest))
+
+    @staticmethod
+    def _conditional_headers(
+        request_headers: Optional[Dict[str, str]], metadata: CacheEntryMetadata
+    ) -> Dict[str, str]:
+        """Request headers plus If-None-Match/If-Modified-Since from a cached entry."""
+        headers = dict(request_headers or {})
+        lower_names = {name.lower() for name in headers}
+        if metadata.etag and "if-none-match" not in lower_names:
+            headers["If-None-Match"] = metadata.etag
+        if metadata.last_modified and "if-modified-since" not in lower_names:
+            headers["If-Modified-Since"] = metadata.last_modified
+        return headers
+
+    def prepare_entry(
         self,
         method: str,
         url: str,
         status_code: int,
         response_headers: Dict[str, str],
-        body: Optional[bytes] = None,
         request_headers: Optional[Dict[str, str]] = None,
-    ) -> bool:
-        """Store a response in the cache."""
+        body_digest: Optional[str] = None,
+    ) -> Optional[CachedResponse]:
+        """
+        Decide cacheability from the status and headers alone.
+
+        Returns a body-less entry ready for store_entry(), or None (after
+        emitting a bypass event) when the response must not be cached. This
+        lets callers stream uncacheable bodies straight through.
+
+        POST queries (with body_digest) follow their post_cache_rule's TTL
+        instead of default_ttl_seconds.
+        """
         # Use base key without vary headers - consistent across all methods
-        base_key = self.generate_key(method, url)
+        base_key = self.generate_key(method, url, body_digest=body_digest)
 
-        if not self.is_cacheable(method):
+        cacheable, rule = self._request_rule(method, url, body_digest)
+        if not cacheable:
             self._emit(
                 CacheResponseEvent(
                     type=CacheResponseEventType.CACHE_BYPASS,
@@ -298,7 +461,7 @@ class ResponseCache:
                     metadata={"reason": "method-not-cacheable"},
                 )
             )
-            return False
+            return None
 
         if not is_cacheable_status(status_code, self._config.cacheable_statuses):
             self._emit(
@@ -310,11 +473,15 @@ class ResponseCache:
                     metadata={"reason": "status-not-cacheable", "status_code": status_code},
                 )
             )
-            return False
+            return None
 
         normalized_headers = normalize_headers(response_headers)
         cache_control = normalized_headers.get("cache-control")
         directives = parse_cache_control(cache_control)
+        if rule is not None and rule.override_cache_control:
+            # The rule vouches for the endpoint; cache on its TTL alone
+            cache_control = None
+            directives = parse_cache_control(None)
 
         if not should_cache(
             directives,
@@ -331,7 +498,7 @@ class ResponseCache:
                     metadata={"reason": "cache-control", "cache_control": cache_control},
                 )
             )
-            return False
+            return None
 
         vary = normalized_headers.get("vary")
         if is_vary_uncacheable(vary):
@@ -344,7 +511,7 @@ class ResponseCache:
                     metadata={"reason": "vary-star"},
                 )
             )
-            return False
+            return None
 
         vary_list = parse_vary(vary)
         vary_headers = (
@@ -352,13 +519,7 @@ class ResponseCache:
         )
 
         now = time.time()
-        expires_at = calculate_expiration(
-            normalized_headers,
-            directives,
-            self._config.default_ttl_seconds,
-            self._config.max_ttl_seconds,
-            now=now,
-        )
+        expires_at = self._expiration(normalized_headers, directives, rule, now)
 
         # Consider stale-while-revalidate/stale-if-error windows
         stale_window = max(
@@ -375,7 +536,7 @@ class ResponseCache:
                     metadata={"reason": "already-expired"},
                 )
             )
-            return False
+            return None
 
         metadata = CacheEntryMetadata(
             url=url,
@@ -392,51 +553,103 @@ class ResponseCache:
             vary_headers=vary_headers,
         )
 
-        cached_response = CachedResponse(metadata=metadata, body=body)
+        tags = parse_cache_tags(normalized_headers, self._config.tag_headers)
+        if self._config.tagger:
+            try:
+                tags.extend(self._config.tagger(method.upper(), url, normalized_headers))
+            except Exception:
+                # An untagged entry could outlive a tag invalidation; don't cache it
+                self._emit(
+                    CacheResponseEvent(
+                        type=CacheResponseEventType.CACHE_BYPASS,
+                        key=base_key,
+                        url=url,
+                        timestamp=now,
+                        metadata={"reason": "tagger-error"},
+                    )
+                )
+                return None
+
+        return CachedResponse(metadata=metadata, tags=list(dict.fromkeys(tags)) or None)
+
+    def _expiration(
+        self,
+        headers: Dict[str, str],
+        directives: CacheControlDirectives,
+        rule: Optional[PostCacheRule],
+        now: float,
+    ) -> float:
+        """Expiry of an entry; POST rules default to, and are capped at, their own TTL."""
+        if rule is None:
+            return calculate_expiration(
+                headers,
+                directives,
+                self._config.default_ttl_seconds,
+                self._config.max_ttl_seconds,
+                now=now,
+            )
+        ttl = min(rule.ttl_seconds, self._config.max_ttl_seconds)
+        return calculate_expiration(headers, directives, ttl, ttl, now=now)
+
+    def _finish_entry(self, base_key: str, entry: CachedResponse) -> Tuple[str, Optional[str]]:
+        """
+        Encode and size an entry for storage.
 
-        await self._store.set(base_key, cached_response)
+        Returns the key to store it under and, for a Vary variant, the
+        digest to record in the base key's index.
+        """
+        self._end_ttl_period(base_key)
 
+        if self._config.body_codec:
+            encode_response_body(
+                entry, self._config.body_codec, self._config.body_codec_min_size
+            )
+
+        # Size once here so stores don't have to re-measure on every set
+        entry.size = estimate_entry_size(entry.metadata, stored_body(entry))
+
+        vary_list = parse_vary(entry.metadata.vary)
+        if vary_list and self._config.max_vary_variants > 0:
+            digest = vary_digest(entry.metadata.vary_headers or {}, vary_list)
+            return self._variant_key(base_key, digest), digest
+        return base_key, None
+
+    def _emit_store(self, key: str, url: str, entry: CachedResponse) -> None:
+        """Emit the event for a stored entry."""
         self._emit(
             CacheResponseEvent(
                 type=CacheResponseEventType.CACHE_STORE,
-                key=base_key,
+                key=key,
                 url=url,
-                timestamp=now,
-                metadata={"expires_at": expires_at, "status_code": status_code},
+                timestamp=time.time(),
+                metadata={
+                    "expires_at": entry.metadata.expires_at,
+                    "status_code": entry.metadata.status_code,
+                },
             )
         )
 
-        return True
-
-    async def revalidate(
+    def _revalidated_entry(
         self,
         method: str,
         url: str,
-        response_headers: Optional[Dict[str, str]] = None,
-        request_headers: Optional[Dict[str, str]] = None,
-    ) -> bool:
-        """Revalidate a cached response (update expiration after 304 Not Modified)."""
-        # Use base key without vary headers - consistent with store/lookup
-        key = self.generate_key(method, url)
-        cached = await self._store.get(key)
-
-        if not cached:
-            return False
-
+        cached: CachedResponse,
+        response_headers: Optional[Dict[str, str]],
+        body_digest: Optional[str],
+    ) -> CachedResponse:
+        """Copy of a stored entry with its lifetime renewed from a 304 response."""
         now = time.time()
         normalized_headers = (
             normalize_headers(response_headers) if response_headers else cached.metadata.headers
         )
         cache_control = normalized_headers.get("cache-control") or cached.metadata.cache_control
         directives = parse_cache_control(cache_control)
+        rule = self._request_rule(method, url, body_digest)[1]
+        if rule is not None and rule.override_cache_control:
+            cache_control = None
+            directives = parse_cache_control(None)
 
-        expires_at = calculate_expiration(
-            normalized_headers,
-            directives,
-            self._config.default_ttl_seconds,
-            self._config.max_ttl_seconds,
-            now=now,
-        )
+        expires_at = self._expiration(normalized_headers, directives, rule, now)
 
         updated_metadata = CacheEntryMetadata(
             url=cached.metadata.url,
@@ -453,21 +666,289 @@ class ResponseCache:
             vary_headers=cached.metadata.vary_headers,
         )
 
-        updated_response = CachedResponse(metadata=updated_metadata, body=cached.body)
-
-        await self._store.set(key, updated_response)
-        self._revalidating_keys.discard(key)
+        # Body is carried over as stored; no need to decode it here
+        return CachedResponse(
+            metadata=updated_metadata,
+            body=cached.body,
+            size=estimate_entry_size(updated_metadata, stored_body(cached)),
+            encoded_body=cached.encoded_body,
+            body_codec=cached.body_codec,
+            tags=cached.tags,
+        )
 
+    def _emit_revalidate(self, key: str, url: str, entry: CachedResponse) -> None:
+        """Emit the event for a revalidated entry."""
         self._emit(
             CacheResponseEvent(
                 type=CacheResponseEventType.CACHE_REVALIDATE,
                 key=key,
                 url=url,
-                timestamp=now,
-                metadata={"expires_at": expires_at},
+                timestamp=entry.metadata.cached_at,
+                metadata={"expires_at": entry.metadata.expires_at},
+            )
+        )
+
+    def _end_ttl_period(self, base_key: str) -> None:
+        """Reset refresh-ahead tracking once an entry is replaced or revalidated."""
+        self._hit_counts.pop(base_key, None)
+        self._refreshing_keys.discard(base_key)
+
+    @staticmethod
+    def _variant_key(base_key: str, digest: str) -> str:
+        """Store key of one Vary variant under a base key."""
+        return f"{base_key}{VARIANT_KEY_SEPARATOR}{digest}"
+
+    def _resolve_key(
+        self,
+        base_key: str,
+        cached: Optional[CachedResponse],
+        request_headers: Optional[Dict[str, str]],
+    ) -> Optional[str]:
+        """
+        Key of the entry serving a request, given what is stored at its base key.
+
+        That is the base key itself, or the matching variant when the base
+        key holds a variant index (the index lists the digests of stored
+        variants, so the variant is found with one extra get instead of a
+        scan). None when nothing can serve the request.
+        """
+        if cached is None:
+            return None
+        if cached.variants is None:
+            return base_key
+
+        digest = vary_digest(request_headers or {}, parse_vary(cached.metadata.vary))
+        if digest not in cached.variants:
+            return None
+        return self._variant_key(base_key, digest)
+
+    def _variant_index(
+        self,
+        base_key: str,
+        entry: CachedResponse,
+        digest: str,
+        index: Optional[CachedResponse],
+    ) -> Tuple[CachedResponse, List[str]]:
+        """
+        Build a base key's index with a variant recorded as most recent.
+
+        Returns the new index entry and the variant keys it no longer lists
+        (the oldest beyond max_vary_variants, or all of them when the
+        resource now varies on different headers), which should be deleted.
+        """
+        vary_list = parse_vary(entry.metadata.vary)
+        purge_at = entry.metadata.expires_at + get_stale_window(entry)
+
+        variants: List[str] = []
+        dropped: List[str] = []
+        if index is not None and index.variants is not None:
+            if parse_vary(index.metadata.vary) == vary_list:
+                variants = [d for d in index.variants if d != digest]
+                purge_at = max(purge_at, index.metadata.expires_at)
+            else:
+                # The resource now varies on different headers; old variants can't match
+                dropped = [
+                    self._variant_key(base_key, stale)
+                    for stale in index.variants
+                    if stale != digest
+                ]
+        variants.append(digest)
+
+        while len(variants) > self._config.max_vary_variants:
+            dropped.append(self._variant_key(base_key, variants.pop(0)))
+
+        # The index outlives every variant it lists; it holds no body of its own
+        metadata = CacheEntryMetadata(
+            url=entry.metadata.url,
+            method=entry.metadata.method,
+            status_code=entry.metadata.status_code,
+            headers={},
+            cached_at=time.time(),
+            expires_at=purge_at,
+            vary=entry.metadata.vary,
+        )
+        index_entry = CachedResponse(
+            metadata=metadata,
+            size=estimate_entry_size(metadata) + sum(len(d) for d in variants),
+            variants=variants,
+        )
+        return index_entry, dropped
+
+    def get_key_stats(self) -> CacheKeyStats:
+        """Get key generation counters (how many keys URL normalization merged)."""
+        return CacheKeyStats(generated=self._keys_generated, normalized=self._keys_normalized)
+
+    def get_config(self) -> CacheResponseConfig:
+        """Get configuration."""
+        return self._config
+
+    def on(self, listener: CacheResponseEventListener) -> Callable[[], None]:
+        """Add event listener."""
+        self._listeners.add(listener)
+        return lambda: self._listeners.discard(listener)
+
+    def off(self, listener: CacheResponseEventListener) -> None:
+        """Remove event listener."""
+        self._listeners.discard(listener)
+
+    def _emit(self, event: CacheResponseEvent) -> None:
+        """Emit an event to all listeners."""
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception:
+                pass
+
+
+class ResponseCache(_ResponseCacheCore):
+    """
+    RFC 7234 compliant HTTP response cache.
+
+    Implements:
+    - Cache-Control directive parsing and compliance
+    - ETag and Last-Modified conditional request support
+    - Vary header handling (several variants per URL)
+    - Stale-while-revalidate pattern
+    - Stale-if-error pattern
+    - Refresh-ahead for hot entries (opt-in)
+    - Bounded, deduplicated background revalidation (hot keys first)
+    - Tag-based bulk invalidation (Surrogate-Key / Cache-Tag)
+    - URL normalization of cache keys (opt-in)
+    - POST query caching keyed by request body digest (opt-in per route)
+    - LRU eviction (via store)
+
+    Example:
+        cache = ResponseCache()
+
+        # Check cache before making request
+        lookup = await cache.lookup('GET', 'https://api.example.com/data')
+        if lookup.found and lookup.freshness == CacheFreshness.FRESH:
+            return lookup.response
+
+        # Make request (with conditional headers if available)
+        headers = {}
+        if lookup.etag:
+            headers['If-None-Match'] = lookup.etag
+        if lookup.last_modified:
+            headers['If-Modified-Since'] = lookup.last_modified
+
+        response = await http_client.get(url, headers=headers)
+
+        # Handle 304 Not Modified
+        if response.status_code == 304 and lookup.response:
+            await cache.revalidate('GET', url)
+            return lookup.response
+
+        # Store new response
+        await cache.store('GET', url, response.status_code, dict(response.headers), response.content)
+    """
+
+    def __init__(
+        self,
+        config: Optional[CacheResponseConfig] = None,
+        store: Optional[CacheResponseStore] = None,
+    ) -> None:
+        super().__init__(config)
+        self._store = store or MemoryCacheStore()
+        self._background_revalidator: Optional[Callable] = None
+        self._scheduler = RevalidationScheduler(
+            self._config.max_concurrent_revalidations, self._config.revalidation_queue_size
+        )
+        # Per base key: the lock serializing its variant index updates, and how many hold or await it
+        self._index_locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+
+    async def lookup(
+        self,
+        method: str,
+        url: str,
+        request_headers: Optional[Dict[str, str]] = None,
+        body_digest: Optional[str] = None,
+    ) -> CacheLookupResult:
+        """Look up a cached response (pass body_digest for POST queries)."""
+        if not self._request_rule(method, url, body_digest)[0]:
+            return CacheLookupResult(found=False)
+
+        # Use base key without vary headers - variants are resolved from there
+        base_key = self.generate_key(method, url, body_digest=body_digest)
+        key, cached = await self._resolve_entry(base_key, request_headers)
+        result = self._lookup_result(url, base_key, key, cached, request_headers)
+
+        if not result.found or not self._background_revalidator or body_digest is not None:
+            return result
+
+        # Trigger background revalidation for stale-while-revalidate
+        if self._config.stale_while_revalidate and result.freshness == CacheFreshness.STALE:
+            self._trigger_background_revalidation(key, url, request_headers)
+
+        if result.should_refresh:
+            self._trigger_background_revalidation(
+                key,
+                url,
+                self._conditional_headers(request_headers, result.response.metadata),
+                refresh_key=base_key,
             )
+
+        return result
+
+    async def store(
+        self,
+        method: str,
+        url: str,
+        status_code: int,
+        response_headers: Dict[str, str],
+        body: Optional[bytes] = None,
+        request_headers: Optional[Dict[str, str]] = None,
+        body_digest: Optional[str] = None,
+    ) -> bool:
+        """Store a response in the cache."""
+        entry = self.prepare_entry(
+            method, url, status_code, response_headers, request_headers, body_digest
         )
+        if entry is None:
+            return False
+        entry.body = body
+        await self.store_entry(method, url, entry, body_digest)
+        return True
 
+    async def store_entry(
+        self,
+        method: str,
+        url: str,
+        entry: CachedResponse,
+        body_digest: Optional[str] = None,
+    ) -> None:
+        """Store an entry produced by prepare_entry() once its body is known."""
+        base_key = self.generate_key(method, url, body_digest=body_digest)
+        key, digest = self._finish_entry(base_key, entry)
+        await self._store.set(key, entry)
+        if digest is not None:
+            await self._index_variant(base_key, entry, digest)
+        self._emit_store(key, url, entry)
+
+    async def revalidate(
+        self,
+        method: str,
+        url: str,
+        response_headers: Optional[Dict[str, str]] = None,
+        request_headers: Optional[Dict[str, str]] = None,
+        body_digest: Optional[str] = None,
+    ) -> bool:
+        """Revalidate a cached response (update expiration after 304 Not Modified)."""
+        # Use base key without vary headers - consistent with store/lookup
+        base_key = self.generate_key(method, url, body_digest=body_digest)
+        key, cached = await self._resolve_entry(base_key, request_headers)
+        self._end_ttl_period(base_key)
+
+        if not cached:
+            return False
+
+        updated = self._revalidated_entry(method, url, cached, response_headers, body_digest)
+        await self._store.set(key, updated)
+        if key != base_key:
+            digest = vary_digest(updated.metadata.vary_headers or {}, parse_vary(updated.metadata.vary))
+            await self._index_variant(base_key, updated, digest)
+
+        self._emit_revalidate(key, url, updated)
         return True
 
     async def invalidate(
@@ -475,9 +956,15 @@ class ResponseCache:
         method: str,
         url: str,
         request_headers: Optional[Dict[str, str]] = None,
+        body_digest: Optional[str] = None,
     ) -> bool:
-        """Invalidate a cached response."""
-        key = self.generate_key(method, url, request_headers)
+        """Invalidate a cached response, including every stored variant of it."""
+        key = self.generate_key(method, url, request_headers, body_digest=body_digest)
+        self._end_ttl_period(key)
+        cached = await self._store.get(key)
+        if cached is not None and cached.variants is not None:
+            for digest in cached.variants:
+                await self._store.delete(self._variant_key(key, digest))
         deleted = await self._store.delete(key)
 
         if deleted:
@@ -492,6 +979,86 @@ class ResponseCache:
 
         return deleted
 
+    async def invalidate_tag(self, tag: str) -> int:
+        """
+        Invalidate every entry carrying a tag; returns the number removed.
+
+        Stores with a tag index (keys_for_tag) make this O(tagged keys);
+        other stores are scanned.
+        """
+        keys_for_tag = getattr(self._store, "keys_for_tag", None)
+        if keys_for_tag is not None:
+            keys = await keys_for_tag(tag)
+        else:
+            keys = []
+            for key in await self._store.keys():
+                cached = await self._store.get(key)
+                if cached is not None and cached.tags and tag in cached.tags:
+                    keys.append(key)
+
+        invalidated = 0
+        for key in keys:
+            if await self._store.delete(key):
+                invalidated += 1
+                self._end_ttl_period(key.split(VARIANT_KEY_SEPARATOR, 1)[0])
+
+        self._emit(
+            CacheResponseEvent(
+                type=CacheResponseEventType.CACHE_INVALIDATE_TAG,
+                key=tag,
+                url="",
+                timestamp=time.time(),
+                metadata={"invalidated": invalidated},
+            )
+        )
+        return invalidated
+
+    async def _resolve_entry(
+        self, base_key: str, request_headers: Optional[Dict[str, str]]
+    ) -> Tuple[str, Optional[CachedResponse]]:
+        """Get the entry serving a request, following a variant index if present."""
+        cached = await self._store.get(base_key)
+        key = self._resolve_key(base_key, cached, request_headers)
+        if key is None:
+            return base_key, None
+        if key == base_key:
+            return key, cached
+        return key, await self._store.get(key)
+
+    async def _index_variant(self, base_key: str, entry: CachedResponse, digest: str) -> None:
+        """
+        Record a variant as most recent in the base key's index, evicting the oldest.
+
+        The index is read, modified and written back, so updates are
+        serialized per base key; otherwise two variants stored at once
+        could each drop the other from the index, orphaning it. This only
+        covers this instance: processes sharing a Disk or Redis store can
+        still race, and a variant lost that way is unreachable but harmless
+        until it is purged with its TTL.
+        """
+        async with self._index_lock(base_key):
+            index, dropped = self._variant_index(
+                base_key, entry, digest, await self._store.get(base_key)
+            )
+            for key in dropped:
+                await self._store.delete(key)
+            await self._store.set(base_key, index)
+
+    @asynccontextmanager
+    async def _index_lock(self, base_key: str) -> AsyncIterator[None]:
+        """Hold a base key's index lock, dropping it once no one needs it."""
+        lock, users = self._index_locks.get(base_key) or (asyncio.Lock(), 0)
+        self._index_locks[base_key] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._index_locks[base_key]
+            if users == 1:
+                del self._index_locks[base_key]
+            else:
+                self._index_locks[base_key] = (lock, users - 1)
+
     def set_background_revalidator(
         self, revalidator: Callable[[str, Optional[Dict[str, str]]], None]
     ) -> None:
@@ -503,26 +1070,48 @@ class ResponseCache:
         key: str,
         url: str,
         request_headers: Optional[Dict[str, str]] = None,
+        refresh_key: Optional[str] = None,
     ) -> None:
-        """Trigger background revalidation."""
+        """Queue a background revalidation on the scheduler."""
         if not self._background_revalidator:
             return
 
-        self._revalidating_keys.add(key)
+        revalidator = self._background_revalidator
 
         async def _revalidate():
-            try:
-                await self._background_revalidator(url, request_headers)
-            except Exception:
-                pass
-            finally:
-                self._revalidating_keys.discard(key)
+            await revalidator(url, request_headers)
 
-        asyncio.create_task(_revalidate())
+        def _release() -> None:
+            if refresh_key is not None:
+                self._refreshing_keys.discard(refresh_key)
 
-    def get_config(self) -> CacheResponseConfig:
-        """Get configuration."""
-        return self._config
+        base_key = key.split(VARIANT_KEY_SEPARATOR, 1)[0]
+        if not self._scheduler.schedule(
+            key, _revalidate, self._hit_counts.get(base_key, 0), _release
+        ):
+            _release()
+
+    def schedule_revalidation(
+        self,
+        method: str,
+        url: str,
+        revalidate: Callable[[], Awaitable[None]],
+        on_done: Optional[Callable[[], None]] = None,
+        body_digest: Optional[str] = None,
+    ) -> bool:
+        """
+        Queue a caller-driven background revalidation on the shared scheduler.
+
+        Hot keys (more hits in their current TTL) run first. Returns False,
+        without calling on_done, if the key is already being revalidated or
+        the queue is full.
+        """
+        key = self.generate_key(method, url, body_digest=body_digest)
+        return self._scheduler.schedule(key, revalidate, self._hit_counts.get(key, 0), on_done)
+
+    def get_revalidation_stats(self) -> RevalidationStats:
+        """Get background revalidation counters."""
+        return self._scheduler.get_stats()
 
     async def get_stats(self):
         """Get store statistics."""
@@ -530,22 +1119,13 @@ class ResponseCache:
             return self._store.get_stats()
         return {"size": await self._store.size()}
 
-    def on(self, listener: CacheResponseEventListener) -> Callable[[], None]:
-        """Add event listener."""
-        self._listeners.add(listener)
-        return lambda: self._listeners.discard(listener)
+    async def export_snapshot(self, path: str) -> int:
+        """Write every cached entry to a snapshot file; returns the number written."""
+        return await write_snapshot(self._store, path)
 
-    def off(self, listener: CacheResponseEventListener) -> None:
-        """Remove event listener."""
-        self._listeners.discard(listener)
-
-    def _emit(self, event: CacheResponseEvent) -> None:
-        """Emit an event to all listeners."""
-        for listener in self._listeners:
-            try:
-                listener(event)
-            except Exception:
-                pass
+    async def import_snapshot(self, path: str) -> int:
+        """Load entries from a snapshot file, skipping expired ones; returns the number loaded."""
+        return await load_snapshot(self._store, path)
 
     async def clear(self) -> None:
         """Clear all cached responses."""
@@ -553,9 +1133,174 @@ class ResponseCache:
 
     async def close(self) -> None:
         """Close the cache and release resources."""
+        await self._scheduler.close()
         await self._store.close()
         self._listeners.clear()
-        self._revalidating_keys.clear()
+        self._hit_counts.clear()
+        self._refreshing_keys.clear()
+
+
+class SyncResponseCache(_ResponseCacheCore):
+    """
+    Blocking counterpart of ResponseCache for sync clients.
+
+    Same config, keys, POST rules, Vary variants, tags and events, over a
+    SyncCacheResponseStore (a thread-safe, bounded SyncMemoryCacheStore by
+    default). There is no background revalidation: callers revalidate
+    stale entries inline.
+    """
+
+    def __init__(
+        self,
+        config: Optional[CacheResponseConfig] = None,
+        store: Optional[SyncCacheResponseStore] = None,
+    ) -> None:
+        super().__init__(config)
+        self._store = store or SyncMemoryCacheStore()
+        # Variant indexes are read-modify-written; keep concurrent threads from losing entries
+        self._index_lock = threading.Lock()
+
+    def lookup(
+        self,
+        method: str,
+        url: str,
+        request_headers: Optional[Dict[str, str]] = None,
+        body_digest: Optional[str] = None,
+    ) -> CacheLookupResult:
+        """Look up a cached response (pass body_digest for POST queries)."""
+        if not self._request_rule(method, url, body_digest)[0]:
+            return CacheLookupResult(found=False)
+
+        base_key = self.generate_key(method, url, body_digest=body_digest)
+        key, cached = self._resolve_entry(base_key, request_headers)
+        return self._lookup_result(url, base_key, key, cached, request_headers)
+
+    def store(
+        self,
+        method: str,
+        url: str,
+        status_code: int,
+        response_headers: Dict[str, str],
+        body: Optional[bytes] = None,
+        request_headers: Optional[Dict[str, str]] = None,
+        body_digest: Optional[str] = None,
+    ) -> bool:
+        """Store a response in the cache."""
+        entry = self.prepare_entry(
+            method, url, status_code, response_headers, request_headers, body_digest
+        )
+        if entry is None:
+            return False
+        entry.body = body
+        self.store_entry(method, url, entry, body_digest)
+        return True
+
+    def store_entry(
+        self,
+        method: str,
+        url: str,
+        entry: CachedResponse,
+        body_digest: Optional[str] = None,
+    ) -> None:
+        """Store an entry produced by prepare_entry() once its body is known."""
+        base_key = self.generate_key(method, url, body_digest=body_digest)
+        key, digest = self._finish_entry(base_key, entry)
+        self._store.set(key, entry)
+        if digest is not None:
+            self._index_variant(base_key, entry, digest)
+        self._emit_store(key, url, entry)
+
+    def revalidate(
+        self,
+        method: str,
+        url: str,
+        response_headers: Optional[Dict[str, str]] = None,
+        request_headers: Optional[Dict[str, str]] = None,
+        body_digest: Optional[str] = None,
+    ) -> bool:
+        """Revalidate a cached response (update expiration after 304 Not Modified)."""
+        base_key = self.generate_key(method, url, body_digest=body_digest)
+        key, cached = self._resolve_entry(base_key, request_headers)
+        self._end_ttl_period(base_key)
+
+        if not cached:
+            return False
+
+        updated = self._revalidated_entry(method, url, cached, response_headers, body_digest)
+        self._store.set(key, updated)
+        if key != base_key:
+            digest = vary_digest(updated.metadata.vary_headers or {}, parse_vary(updated.metadata.vary))
+            self._index_variant(base_key, updated, digest)
+
+        self._emit_revalidate(key, url, updated)
+        return True
+
+    def invalidate(
+        self,
+        method: str,
+        url: str,
+        request_headers: Optional[Dict[str, str]] = None,
+        body_digest: Optional[str] = None,
+    ) -> bool:
+        """Invalidate a cached response, including every stored variant of it."""
+        key = self.generate_key(method, url, request_headers, body_digest=body_digest)
+        self._end_ttl_period(key)
+        cached = self._store.get(key)
+        if cached is not None and cached.variants is not None:
+            for digest in cached.variants:
+                self._store.delete(self._variant_key(key, digest))
+        deleted = self._store.delete(key)
+
+        if deleted:
+            self._emit(
+                CacheResponseEvent(
+                    type=CacheResponseEventType.CACHE_EXPIRE,
+                    key=key,
+                    url=url,
+                    timestamp=time.time(),
+                )
+            )
+
+        return deleted
+
+    def _resolve_entry(
+        self, base_key: str, request_headers: Optional[Dict[str, str]]
+    ) -> Tuple[str, Optional[CachedResponse]]:
+        """Get the entry serving a request, following a variant index if present."""
+        cached = self._store.get(base_key)
+        key = self._resolve_key(base_key, cached, request_headers)
+        if key is None:
+            return base_key, None
+        if key == base_key:
+            return key, cached
+        return key, self._store.get(key)
+
+    def _index_variant(self, base_key: str, entry: CachedResponse, digest: str) -> None:
+        """Record a variant as most recent in the base key's index, evicting the oldest."""
+        with self._index_lock:
+            index, dropped = self._variant_index(
+                base_key, entry, digest, self._store.get(base_key)
+            )
+            for key in dropped:
+                self._store.delete(key)
+            self._store.set(base_key, index)
+
+    def get_stats(self):
+        """Get store statistics."""
+        if hasattr(self._store, 'get_stats'):
+            return self._store.get_stats()
+        return {"size": self._store.size()}
+
+    def clear(self) -> None:
+        """Clear all cached responses."""
+        self._store.clear()
+
+    def close(self) -> None:
+        """Close the cache and release resources."""
+        self._store.close()
+        self._listeners.clear()
+        self._hit_counts.clear()
+        self._refreshing_keys.clear()
 
 
 def create_response_cache(
@@ -564,3 +1309,11 @@ def create_response_cache(
 ) -> ResponseCache:
     """Create a response cache instance."""
     return ResponseCache(config, store)
+
+
+def create_sync_response_cache(
+    config: Optional[CacheResponseConfig] = None,
+    store: Optional[SyncCacheResponseStore] = None,
+) -> SyncResponseCache:
+    """Create a blocking response cache instance."""
+    return SyncResponseCache(config, store)
@@ -0,0 +1,99 @@
+"""
+Body codecs for compressed response storage.
+
+Bodies above a size threshold are encoded when stored and decoded lazily
+when a lookup hits, so stores account for (and hold) the compressed bytes.
+"""
+import zlib
+from abc import ABC, abstractmethod
+from dataclasses import replace
+from typing import Dict, Optional
+
+from .types import CachedResponse
+
+
+class BodyCodec(ABC):
+    """Body codec interface."""
+
+    name: str = ""
+    """Registry name, persisted with each encoded entry."""
+
+    @abstractmethod
+    def encode(self, data: bytes) -> bytes:
+        """Encode (compress) a body."""
+        pass
+
+    @abstractmethod
+    def decode(self, data: bytes) -> bytes:
+        """Decode (decompress) a body."""
+        pass
+
+
+class ZlibCodec(BodyCodec):
+    """zlib (DEFLATE) codec from the standard library."""
+
+    name = "zlib"
+
+    def __init__(self, level: int = 6) -> None:
+        self._level = level
+
+    def encode(self, data: bytes) -> bytes:
+        """Compress a body."""
+        return zlib.compress(data, self._level)
+
+    def decode(self, data: bytes) -> bytes:
+        """Decompress a body."""
+        return zlib.decompress(data)
+
+
+_CODECS: Dict[str, BodyCodec] = {ZlibCodec.name: ZlibCodec()}
+
+
+def register_body_codec(codec: BodyCodec) -> None:
+    """Register a codec so it can be selected by name and decoded on lookup."""
+    if not codec.name:
+        raise ValueError("Body codec must have a name")
+    _CODECS[codec.name] = codec
+
+
+def get_body_codec(name: str) -> BodyCodec:
+    """Get a registered codec by name."""
+    codec = _CODECS.get(name)
+    if codec is None:
+        raise ValueError(f"Unknown body codec '{name}'")
+    return codec
+
+
+def stored_body(response: CachedResponse) -> Optional[bytes]:
+    """Get the body bytes as held by the store (encoded if a codec was applied)."""
+    return response.encoded_body if response.body_codec else response.body
+
+
+def encode_response_body(
+    response: CachedResponse, codec_name: str, min_size: int = 0
+) -> CachedResponse:
+    """
+    Encode the body of a response in place.
+
+    Bodies shorter than min_size, or that do not shrink, are left raw.
+    """
+    body = response.body
+    if not body or len(body) < min_size or response.body_codec:
+        return response
+
+    encoded = get_body_codec(codec_name).encode(body)
+    if len(encoded) >= len(body):
+        return response
+
+    response.encoded_body = encoded
+    response.body_codec = codec_name
+    response.body = None
+    return response
+
+
+def decode_response_body(response: CachedResponse) -> CachedResponse:
+    """Return a copy of a response with its body decoded (or the response itself if raw)."""
+    if not response.body_codec:
+        return response
+    body = get_body_codec(response.body_codec).decode(response.encoded_body or b"")
+    return replace(response, body=body, encoded_body=None, body_codec=None)
@@ -1,71 +1,90 @@
 """
 Cache-Control header parsing and utilities for RFC 7234 compliance.
 """
+import hashlib
 import time
 from email.utils import parsedate_to_datetime
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from urllib.parse import unquote_plus, urlsplit, urlunsplit
 
 from .types import CacheControlDirectives, CacheEntryMetadata, CacheFreshness
 
 
+# Upstreams repeat a handful of header strings; parse each distinct one once
+PARSE_CACHE_SIZE = 1024
+
+_INT_DIRECTIVES = {
+    "max-age": "max_age",
+    "s-maxage": "s_maxage",
+    "stale-while-revalidate": "stale_while_revalidate",
+    "stale-if-error": "stale_if_error",
+}
+_FLAG_DIRECTIVES = {
+    "no-store": "no_store",
+    "no-cache": "no_cache",
+    "private": "private",
+    "public": "public",
+    "must-revalidate": "must_revalidate",
+    "proxy-revalidate": "proxy_revalidate",
+    "no-transform": "no_transform",
+    "immutable": "immutable",
+}
+_EMPTY_DIRECTIVES = CacheControlDirectives()
+
+
 def parse_cache_control(header: Optional[str]) -> CacheControlDirectives:
-    """Parse Cache-Control header into directives."""
-    directives = CacheControlDirectives()
+    """
+    Parse Cache-Control header into directives.
 
+    Results are memoized per raw header string (bounded LRU) and shared, which
+    is safe because CacheControlDirectives is immutable.
+    """
     if not header:
-        return directives
+        return _EMPTY_DIRECTIVES
+    return _parse_cache_control(header)
+
 
-    parts = [p.strip().lower() for p in header.split(",")]
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_cache_control(header: str) -> CacheControlDirectives:
+    """Parse a non-empty Cache-Control header (uncached)."""
+    fields: Dict[str, object] = {}
 
-    for part in parts:
+    for part in header.split(","):
+        part = part.strip().lower()
         if "=" in part:
             key, value = part.split("=", 1)
             key = key.strip()
             value = value.strip()
         else:
-            key = part.strip()
+            key = part
             value = None
 
-        if key == "no-store":
-            directives.no_store = True
-        elif key == "no-cache":
-            directives.no_cache = True
-        elif key == "max-age" and value:
-            try:
-                directives.max_age = int(value)
-            except ValueError:
-                pass
-        elif key == "s-maxage" and value:
-            try:
-                directives.s_maxage = int(value)
-            except ValueError:
-                pass
-        elif key == "private":
-            directives.private = True
-        elif key == "public":
-            directives.public = True
-        elif key == "must-revalidate":
-            directives.must_revalidate = True
-        elif key == "proxy-revalidate":
-            directives.proxy_revalidate = True
-        elif key == "no-transform":
-            directives.no_transform = True
-        elif key == "stale-while-revalidate" and value:
+        if key in _FLAG_DIRECTIVES:
+            fields[_FLAG_DIRECTIVES[key]] = True
+        elif key in _INT_DIRECTIVES and value:
             try:
-                directives.stale_while_revalidate = int(value)
+                fields[_INT_DIRECTIVES[key]] = int(value)
             except ValueError:
                 pass
-        elif key == "stale-if-error" and value:
-            try:
-                directives.stale_if_error = int(value)
-            except ValueError:
-                pass
-        elif key == "immutable":
-            directives.immutable = True
 
+    return CacheControlDirectives(**fields)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def intern_directives(directives: CacheControlDirectives) -> CacheControlDirectives:
+    """Return the shared instance equal to directives (e.g. after deserialization)."""
     return directives
 
 
+def clear_parse_caches() -> None:
+    """Drop all memoized header parses."""
+    _parse_cache_control.cache_clear()
+    _parse_vary.cache_clear()
+    _normalize_url.cache_clear()
+    intern_directives.cache_clear()
+
+
 def build_cache_control(directives: CacheControlDirectives) -> str:
     """Build Cache-Control header from directives."""
     parts: List[str] = []
@@ -252,12 +271,83 @@ def needs_revalidation(
 
 
 def parse_vary(header: Optional[str]) -> List[str]:
-    """Parse Vary header into list of header names."""
+    """Parse Vary header into list of header names (memoized per raw header string)."""
     if not header:
         return []
+    return list(_parse_vary(header))
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_vary(header: str) -> Tuple[str, ...]:
+    """Parse a non-empty Vary header (uncached)."""
     if header == "*":
-        return ["*"]
-    return [h.strip().lower() for h in header.split(",")]
+        return ("*",)
+    return tuple(h.strip().lower() for h in header.split(","))
+
+
+def parse_cache_tags(headers: Dict[str, str], header_names: List[str]) -> List[str]:
+    """
+    Collect tags from Surrogate-Key / Cache-Tag style headers.
+
+    Values may be space-separated (Surrogate-Key) or comma-separated
+    (Cache-Tag); duplicates are dropped, first occurrence wins.
+    """
+    tags: Dict[str, None] = {}
+    for name in header_names:
+        value = headers.get(name.lower())
+        if value:
+            for tag in value.replace(",", " ").split():
+                tags[tag] = None
+    return list(tags)
+
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str, ignored_params: FrozenSet[str] = frozenset()) -> str:
+    """
+    Normalize a URL for use in a cache key (memoized).
+
+    Lowercases the scheme and host, strips the scheme's default port and
+    the fragment, drops query parameters whose lowercased name is in
+    ignored_params and sorts the rest by name. Parameter values and the
+    order of repeated parameters are kept byte for byte.
+    """
+    return _normalize_url(url, ignored_params)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _normalize_url(url: str, ignored_params: frozenset) -> str:
+    """Normalize a URL (uncached)."""
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url  # Not a URL we can take apart; key it as-is
+
+    scheme = parts.scheme.lower()
+    host = parts.hostname or ""
+    if ":" in host:
+        host = f"[{host}]"  # IPv6 literal
+    netloc = host
+    if port is not None and port != _DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{port}"
+    userinfo, sep, _ = parts.netloc.rpartition("@")
+    if sep:
+        netloc = f"{userinfo}@{netloc}"
+
+    query = parts.query
+    if query:
+        params = [p for p in query.split("&") if p]
+        if ignored_params:
+            params = [
+                p for p in params
+                if unquote_plus(p.split("=", 1)[0]).lower() not in ignored_params
+            ]
+        params.sort(key=lambda p: p.split("=", 1)[0])
+        query = "&".join(params)
+
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
 
 
 def is_vary_uncacheable(vary: Optional[str]) -> bool:
@@ -283,6 +373,26 @@ def extract_vary_headers(
     return result
 
 
+def normalize_vary_value(value: Optional[str]) -> str:
+    """Normalize a request header value for Vary matching (trim, collapse list whitespace)."""
+    if value is None:
+        return "\x00"  # Absent differs from present-but-empty
+    return ",".join(" ".join(part.split()) for part in value.split(","))
+
+
+def vary_digest(headers: Dict[str, str], vary: List[str]) -> str:
+    """
+    Digest the request header values selected by a Vary list.
+
+    Header names are order- and case-insensitive and values are normalized,
+    so equivalent requests map to the same variant.
+    """
+    lowered = {k.lower(): v for k, v in headers.items()}
+    names = sorted({name.lower() for name in vary if name and name != "*"})
+    material = "\n".join(f"{name}:{normalize_vary_value(lowered.get(name))}" for name in names)
+    return hashlib.blake2b(material.encode("utf-8"), digest_size=8).hexdigest()
+
+
 def match_vary_headers(
     request_headers: Dict[str, str],
     cached_vary_headers: Dict[str, str],
@@ -0,0 +1,48 @@
+"""
+Request body digests for caching POST queries.
+"""
+from typing import Dict, Iterable, Optional
+
+from cache_request import BodyDigest
+
+from .parser import get_header_value
+
+
+class RequestBodyDigest(BodyDigest):
+    """
+    Streaming SHA-256 over a request body, finished with the rule's key headers.
+
+    Feed chunks with update() as the body is read. Once more than
+    max_body_size bytes have been seen the digest is abandoned and
+    hexdigest() returns None, so oversized bodies are never buffered twice.
+    """
+
+    def __init__(self, max_body_size: Optional[int] = None) -> None:
+        super().__init__(max_body_size)
+
+    def hexdigest(
+        self,
+        request_headers: Optional[Dict[str, str]] = None,
+        key_headers: Iterable[str] = (),
+    ) -> Optional[str]:
+        """Digest of the body plus the named request headers, or None if the body overflowed."""
+        if self.overflowed:
+            return None
+        digest = self._hash.copy()
+        for name in key_headers:
+            value = get_header_value(request_headers or {}, name) or ""
+            digest.update(b"\0" + name.lower().encode("latin-1") + b"=" + value.encode("latin-1", "replace"))
+        return digest.hexdigest()
+
+
+def digest_request_body(
+    body: Iterable[bytes],
+    request_headers: Optional[Dict[str, str]] = None,
+    key_headers: Iterable[str] = (),
+    max_body_size: Optional[int] = None,
+) -> Optional[str]:
+    """Digest a request body given as chunks (see RequestBodyDigest)."""
+    digest = RequestBodyDigest(max_body_size)
+    for chunk in body:
+        digest.update(chunk)
+    return digest.hexdigest(request_headers, key_headers)
@@ -0,0 +1,210 @@
+"""
+Bounded scheduler for background revalidations.
+"""
+import asyncio
+import heapq
+import itertools
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+
+@dataclass
+class RevalidationStats:
+    """Revalidation scheduler counters."""
+
+    queued: int
+    """Revalidations accepted into the queue."""
+
+    deduplicated: int
+    """Revalidations skipped because the key was already queued or running."""
+
+    dropped: int
+    """Revalidations dropped because the queue was full (including evicted cold ones)."""
+
+    succeeded: int
+    """Revalidations that completed."""
+
+    failed: int
+    """Revalidations that raised."""
+
+    pending: int
+    """Revalidations waiting for a worker."""
+
+    running: int
+    """Revalidations in flight."""
+
+
+class _Job:
+    __slots__ = ("key", "run", "priority", "seq", "on_done")
+
+    def __init__(
+        self,
+        key: str,
+        run: Callable[[], Awaitable[None]],
+        priority: int,
+        seq: int,
+        on_done: Optional[Callable[[], None]],
+    ) -> None:
+        self.key = key
+        self.run = run
+        self.priority = priority
+        self.seq = seq
+        self.on_done = on_done
+
+    def done(self) -> None:
+        if self.on_done is not None:
+            on_done, self.on_done = self.on_done, None
+            try:
+                on_done()
+            except Exception:
+                pass
+
+
+class RevalidationScheduler:
+    """
+    Runs background revalidations with a concurrency cap.
+
+    Jobs are keyed: scheduling a key that is already queued or running is a
+    no-op (a higher priority is kept). Waiting jobs run highest priority
+    first, FIFO among equals. When the queue is full a new job only gets in
+    by evicting a strictly colder one, so a burst of stale keys cannot
+    turn into a burst of upstream calls.
+
+    on_done runs exactly once for every accepted job: after it succeeds or
+    fails, or when it is evicted or discarded on close. It does not run
+    when schedule() returns False.
+    """
+
+    def __init__(self, max_concurrency: int = 4, max_queue_size: int = 256) -> None:
+        """
+        Create a new RevalidationScheduler.
+
+        Args:
+            max_concurrency: Most revalidations in flight at once. Default: 4
+            max_queue_size: Most revalidations waiting for a worker. Default: 256
+        """
+        self._max_concurrency = max(1, max_concurrency)
+        self._max_queue_size = max(0, max_queue_size)
+        self._pending: Dict[str, _Job] = {}
+        self._heap: List[Tuple[int, int, str]] = []
+        self._running: Set[str] = set()
+        self._workers: Set[asyncio.Task] = set()
+        self._seq = itertools.count()
+        self._queued = 0
+        self._deduplicated = 0
+        self._dropped = 0
+        self._succeeded = 0
+        self._failed = 0
+
+    def schedule(
+        self,
+        key: str,
+        run: Callable[[], Awaitable[None]],
+        priority: int = 0,
+        on_done: Optional[Callable[[], None]] = None,
+    ) -> bool:
+        """Queue a revalidation; returns False if it was deduplicated or dropped."""
+        queued = self._pending.get(key)
+        if queued is not None or key in self._running:
+            if queued is not None and priority > queued.priority:
+                queued.priority = priority
+                heapq.heappush(self._heap, (-priority, queued.seq, key))
+            self._deduplicated += 1
+            return False
+
+        if len(self._pending) >= self._max_queue_size:
+            coldest = min(
+                self._pending.values(), key=lambda job: (job.priority, -job.seq), default=None
+            )
+            if coldest is None or coldest.priority >= priority:
+                self._dropped += 1
+                return False
+            del self._pending[coldest.key]
+            self._dropped += 1
+            coldest.done()
+
+        job = _Job(key, run, priority, next(self._seq), on_done)
+        self._pending[key] = job
+        heapq.heappush(self._heap, (-priority, job.seq, key))
+        self._queued += 1
+        self._compact()
+        self._spawn_workers()
+        return True
+
+    def is_scheduled(self, key: str) -> bool:
+        """Check whether a key is queued or running."""
+        return key in self._pending or key in self._running
+
+    def get_stats(self) -> RevalidationStats:
+        """Get scheduler counters."""
+        return RevalidationStats(
+            queued=self._queued,
+            deduplicated=self._deduplicated,
+            dropped=self._dropped,
+            succeeded=self._succeeded,
+            failed=self._failed,
+            pending=len(self._pending),
+            running=len(self._running),
+        )
+
+    async def join(self) -> None:
+        """Wait until every queued and running revalidation has finished."""
+        while self._workers:
+            await asyncio.gather(*list(self._workers), return_exceptions=True)
+
+    async def close(self) -> None:
+        """Discard queued revalidations and cancel running ones."""
+        pending = list(self._pending.values())
+        self._pending.clear()
+        self._heap.clear()
+        for job in pending:
+            job.done()
+
+        workers = list(self._workers)
+        for worker in workers:
+            worker.cancel()
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    def _spawn_workers(self) -> None:
+        """Start workers until the queue is covered or the concurrency cap is reached."""
+        # A worker that has returned stays in _workers until its done callback
+        # runs, so only count live ones or a job scheduled meanwhile is stranded
+        live = sum(not worker.done() for worker in self._workers)
+        wanted = min(self._max_concurrency, len(self._pending) + len(self._running))
+        while live < wanted:
+            worker = asyncio.ensure_future(self._work())
+            self._workers.add(worker)
+            worker.add_done_callback(self._workers.discard)
+            live += 1
+
+    def _next_job(self) -> Optional[_Job]:
+        """Pop the highest-priority waiting job, skipping superseded heap entries."""
+        while self._heap:
+            neg_priority, seq, key = heapq.heappop(self._heap)
+            job = self._pending.get(key)
+            if job is not None and job.seq == seq and job.priority == -neg_priority:
+                del self._pending[key]
+                return job
+        return None
+
+    def _compact(self) -> None:
+        """Rebuild the heap once superseded entries outnumber live ones."""
+        if len(self._heap) > 2 * len(self._pending) + 64:
+            self._heap = [(-job.priority, job.seq, job.key) for job in self._pending.values()]
+            heapq.heapify(self._heap)
+
+    async def _work(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            self._running.add(job.key)
+            try:
+                await job.run()
+                self._succeeded += 1
+            except Exception:
+                self._failed += 1
+            finally:
+                self._running.discard(job.key)
+                job.done()
@@ -0,0 +1,251 @@
+"""
+Cache snapshots for warm starts.
+
+A snapshot is a flat binary file: a header followed by one record per
+entry (key plus an encoded blob). File I/O runs in a worker thread
+about a megabyte at a time, so exporting or importing a large cache
+never blocks the event loop for long, and neither side holds more than
+one batch beyond the store itself. Files are written to a temporary
+name and renamed into place, so a crash mid-export never leaves a
+truncated snapshot behind.
+"""
+import asyncio
+import os
+import struct
+import time
+from contextlib import asynccontextmanager, suppress
+from typing import IO, Any, AsyncIterable, AsyncIterator, Callable, Iterator, List, Optional, Tuple
+
+from .stores.serialization import decode_entry, encode_entry, get_stale_window
+from .types import CacheResponseStore, CachedResponse
+
+_SNAPSHOT_MAGIC = b"CRSN"
+_FORMAT_VERSION = 1
+# magic, version, created_at
+_SNAPSHOT_HEADER = struct.Struct("<4sId")
+# key length, entry length
+_RECORD_HEADER = struct.Struct("<HI")
+_MAX_KEY_BYTES = 0xFFFF
+# Bytes handed to the worker thread per write or read
+_BATCH_SIZE = 1024 * 1024
+
+
+def _finish_file(f: IO[bytes], chunks: List[bytes]) -> None:
+    """Write the last chunks, sync and close a snapshot file."""
+    with f:
+        f.writelines(chunks)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+async def write_snapshot_records(
+    path: str, magic: bytes, version: int, records: AsyncIterable[Tuple[str, bytes]]
+) -> int:
+    """
+    Write (key, blob) records to a snapshot file off the event loop.
+
+    Keys longer than 64KiB are skipped.
+
+    Returns:
+        Number of records written
+    """
+    tmp_path = f"{path}.tmp"
+    f = await asyncio.to_thread(open, tmp_path, "wb")
+    written = 0
+    try:
+        chunks = [_SNAPSHOT_HEADER.pack(magic, version, time.time())]
+        pending = len(chunks[0])
+        async for key, blob in records:
+            key_bytes = key.encode("utf-8")
+            if len(key_bytes) > _MAX_KEY_BYTES:
+                continue
+            chunks += (_RECORD_HEADER.pack(len(key_bytes), len(blob)), key_bytes, blob)
+            pending += _RECORD_HEADER.size + len(key_bytes) + len(blob)
+            written += 1
+            if pending >= _BATCH_SIZE:
+                await asyncio.to_thread(f.writelines, chunks)
+                chunks, pending = [], 0
+        await asyncio.to_thread(_finish_file, f, chunks)
+    except BaseException:
+        f.close()
+        with suppress(OSError):
+            os.remove(tmp_path)
+        raise
+    await asyncio.to_thread(os.replace, tmp_path, path)
+    return written
+
+
+def _open_snapshot(path: str, magic: bytes, version: int) -> IO[bytes]:
+    """Open a snapshot file positioned at its first record."""
+    f = open(path, "rb")
+    header = f.read(_SNAPSHOT_HEADER.size)
+    if len(header) == _SNAPSHOT_HEADER.size:
+        file_magic, file_version, _ = _SNAPSHOT_HEADER.unpack(header)
+        if file_magic == magic and file_version == version:
+            return f
+    f.close()
+    raise ValueError(f"Not a {magic.decode('ascii')} v{version} snapshot: {path}")
+
+
+def _read_records(f: IO[bytes], buffer: bytearray) -> Optional[List[Tuple[str, bytes]]]:
+    """
+    Read the next batch of a snapshot and split off its complete records.
+
+    An incomplete record stays in buffer for the next batch. Returns None
+    at the end of the file, dropping a truncated trailing record.
+    """
+    chunk = f.read(_BATCH_SIZE)
+    if not chunk:
+        return None
+    buffer += chunk
+
+    records = []
+    offset = 0
+    while len(buffer) - offset >= _RECORD_HEADER.size:
+        key_length, blob_length = _RECORD_HEADER.unpack_from(buffer, offset)
+        key_start = offset + _RECORD_HEADER.size
+        blob_start = key_start + key_length
+        end = blob_start + blob_length
+        if end > len(buffer):
+            break
+        records.append((buffer[key_start:blob_start].decode("utf-8"), bytes(buffer[blob_start:end])))
+        offset = end
+    del buffer[:offset]
+    return records
+
+
+def iter_snapshot_records(path: str, magic: bytes, version: int) -> Iterator[Tuple[str, bytes]]:
+    """
+    Yield (key, blob) records from a snapshot file (blocking; see aiter_snapshot_records).
+
+    A truncated trailing record ends the iteration.
+
+    Raises:
+        ValueError: If the file is not a snapshot with this magic and version
+    """
+    with _open_snapshot(path, magic, version) as f:
+        buffer = bytearray()
+        while True:
+            records = _read_records(f, buffer)
+            if records is None:
+                return
+            yield from records
+
+
+async def aiter_snapshot_records(
+    path: str, magic: bytes, version: int
+) -> AsyncIterator[Tuple[str, bytes]]:
+    """
+    Yield (key, blob) records from a snapshot file, reading off the event loop.
+
+    A truncated trailing record ends the iteration.
+
+    Raises:
+        ValueError: If the file is not a snapshot with this magic and version
+    """
+    f = await asyncio.to_thread(_open_snapshot, path, magic, version)
+    try:
+        buffer = bytearray()
+        while True:
+            records = await asyncio.to_thread(_read_records, f, buffer)
+            if records is None:
+                return
+            for record in records:
+                yield record
+    finally:
+        f.close()
+
+
+async def _store_records(store: CacheResponseStore) -> AsyncIterator[Tuple[str, bytes]]:
+    """Encode every live entry of a store, reading with peek() where the store has it."""
+    # peek() reads without counting a hit, reordering the LRU or promoting between tiers
+    peek = getattr(store, "peek", None) or store.get
+    for key in await store.keys():
+        response = await peek(key)
+        if response is not None:
+            yield key, encode_entry(response)
+
+
+async def write_snapshot(store: CacheResponseStore, path: str) -> int:
+    """
+    Stream every live entry of a store to a snapshot file.
+
+    Returns:
+        Number of entries written
+    """
+    return await write_snapshot_records(
+        path, _SNAPSHOT_MAGIC, _FORMAT_VERSION, _store_records(store)
+    )
+
+
+def read_snapshot(path: str) -> Iterator[Tuple[str, CachedResponse]]:
+    """
+    Yield (key, response) pairs from a snapshot file, one record at a time.
+
+    Blocking; load_snapshot() reads off the event loop. A truncated
+    trailing record ends the iteration.
+
+    Raises:
+        ValueError: If the file is not a snapshot of a supported version
+    """
+    for key, blob in iter_snapshot_records(path, _SNAPSHOT_MAGIC, _FORMAT_VERSION):
+        yield key, decode_entry(blob)
+
+
+async def load_snapshot(store: CacheResponseStore, path: str) -> int:
+    """
+    Load a snapshot file into a store, skipping entries past their stale window.
+
+    A missing file loads nothing (e.g. the first deploy).
+
+    Returns:
+        Number of entries loaded
+    """
+    if not os.path.exists(path):
+        return 0
+
+    loaded = 0
+    now = time.time()
+    async for key, blob in aiter_snapshot_records(path, _SNAPSHOT_MAGIC, _FORMAT_VERSION):
+        response = decode_entry(blob)
+        if response.metadata.expires_at + get_stale_window(response) <= now:
+            continue
+        await store.set(key, response)
+        loaded += 1
+    return loaded
+
+
+def snapshot_lifespan(*targets: Tuple[Any, str]) -> Callable[[Any], Any]:
+    """
+    Build a FastAPI/Starlette lifespan that warm-starts caches from snapshots.
+
+    Each target is an (object, path) pair where the object has async
+    import_snapshot(path) and export_snapshot(path) methods, such as
+    ResponseCache or cache_dsn's DnsCacheResolver. Snapshots are imported
+    on startup and exported on shutdown; both are best effort, so a bad
+    snapshot starts the app cold rather than failing startup.
+
+    Example:
+        app = FastAPI(lifespan=snapshot_lifespan(
+            (response_cache, "/var/cache/app/responses.snap"),
+            (dns_resolver, "/var/cache/app/dns.snap"),
+        ))
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: Optional[Any] = None) -> AsyncIterator[None]:
+        for target, path in targets:
+            try:
+                await target.import_snapshot(path)
+            except Exception:
+                pass  # Start cold
+        try:
+            yield
+        finally:
+            for target, path in targets:
+                try:
+                    await target.export_snapshot(path)
+                except Exception:
+                    pass
+
+    return lifespan
@@ -5,10 +5,52 @@ from .memory import (
     MemoryCacheStore,
     MemoryCacheStats,
     create_memory_cache_store,
+    SyncMemoryCacheStore,
+    create_sync_memory_cache_store,
+    estimate_entry_size,
+)
+from .eviction import (
+    EvictionPolicy,
+    LruPolicy,
+    WTinyLfuPolicy,
+    CountMinSketch,
+    create_eviction_policy,
+)
+from .tiered import (
+    TieredCacheStore,
+    TieredCacheStats,
+    create_tiered_cache_store,
+)
+from .disk import (
+    DiskCacheStore,
+    DiskCacheStats,
+    create_disk_cache_store,
 )
 
 __all__ = [
     "MemoryCacheStore",
     "MemoryCacheStats",
     "create_memory_cache_store",
+    "SyncMemoryCacheStore",
+    "create_sync_memory_cache_store",
+    "estimate_entry_size",
+    "EvictionPolicy",
+    "LruPolicy",
+    "WTinyLfuPolicy",
+    "CountMinSketch",
+    "create_eviction_policy",
+    "TieredCacheStore",
+    "TieredCacheStats",
+    "create_tiered_cache_store",
+    "DiskCacheStore",
+    "DiskCacheStats",
+    "create_disk_cache_store",
 ]
+
+# Optional Redis store (requires redis package)
+try:
+    from .redis import RedisCacheStore, RedisCacheStats, create_redis_cache_store
+
+    __all__.extend(["RedisCacheStore", "RedisCacheStats", "create_redis_cache_store"])
+except ImportError:
+    pass
@@ -0,0 +1,74 @@
+"""
+Content-addressed body pool for in-process stores.
+"""
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+# Bodies shorter than this are cheaper to copy than to hash and track
+MIN_POOLED_BODY_SIZE = 64
+
+
+class BodyPool:
+    """
+    Holds each distinct body once, with a reference count per digest.
+
+    Digests are 128-bit BLAKE2b; a pooled body is also compared byte for
+    byte before it is shared, so a collision only costs the sharing.
+    """
+
+    def __init__(self) -> None:
+        # digest -> [body, references]
+        self._bodies: Dict[bytes, List] = {}
+        self._shared_bytes = 0
+
+    @staticmethod
+    def digest(body: bytes) -> bytes:
+        """Content digest of a body."""
+        return hashlib.blake2b(body, digest_size=16).digest()
+
+    def acquire(
+        self, body: bytes, digest: Optional[bytes] = None
+    ) -> Tuple[Optional[bytes], bytes, bool]:
+        """
+        Take a reference to a body.
+
+        Returns (digest, pooled body, added): the digest is None if the body
+        could not be pooled, and added is True when the pool now holds a
+        new body.
+        """
+        if digest is None:
+            digest = self.digest(body)
+        slot = self._bodies.get(digest)
+        if slot is None:
+            self._bodies[digest] = [body, 1]
+            return digest, body, True
+        if slot[0] is not body and slot[0] != body:
+            return None, body, False
+        slot[1] += 1
+        self._shared_bytes += len(body)
+        return digest, slot[0], False
+
+    def release(self, digest: bytes) -> int:
+        """Drop a reference; returns the bytes freed (0 while other entries share the body)."""
+        slot = self._bodies.get(digest)
+        if slot is None:
+            return 0
+        slot[1] -= 1
+        if slot[1] > 0:
+            self._shared_bytes -= len(slot[0])
+            return 0
+        del self._bodies[digest]
+        return len(slot[0])
+
+    @property
+    def shared_bytes(self) -> int:
+        """Bytes saved by sharing bodies between entries."""
+        return self._shared_bytes
+
+    def clear(self) -> None:
+        """Drop all bodies."""
+        self._bodies.clear()
+        self._shared_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._bodies)
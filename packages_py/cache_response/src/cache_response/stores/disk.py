@@ -0,0 +1,678 @@
+"""
+Disk-backed cache store for RFC 7234 HTTP response caching.
+
+Entries are appended to a segment file that is read back through ``mmap``;
+a compact index log maps each key to its offset, lengths and purge time.
+Both files survive restarts, so a new worker starts with a warm cache.
+Compaction and fsync run in a worker thread so they never stall the
+event loop.
+"""
+import asyncio
+import mmap
+import os
+import struct
+import time
+from dataclasses import dataclass
+from typing import IO, Dict, List, Optional, Tuple
+
+from ..types import CacheResponseStore, CachedResponse
+from ..compression import stored_body
+from .serialization import (
+    build_response,
+    deserialize_metadata,
+    get_stale_window,
+    serialize_metadata,
+)
+from .tags import TagIndex
+
+SEGMENT_FILENAME = "responses.seg"
+INDEX_FILENAME = "responses.idx"
+
+_SEGMENT_MAGIC = b"CRSG"
+_INDEX_MAGIC = b"CRIX"
+_FORMAT_VERSION = 1
+
+# magic, version, generation
+_FILE_HEADER = struct.Struct("<4sIQ")
+# op, flags, key length, offset, metadata length, body length, purge_at
+_INDEX_RECORD = struct.Struct("<BBHQIId")
+
+_OP_DELETE = 0
+_OP_SET = 1
+_FLAG_HAS_BODY = 1
+_MAX_KEY_BYTES = 0xFFFF
+
+
+@dataclass
+class DiskIndexEntry:
+    """Location of a cached response inside the segment file."""
+
+    offset: int
+    metadata_length: int
+    body_length: int
+    purge_at: float
+    has_body: bool
+
+    @property
+    def size(self) -> int:
+        """Total bytes occupied in the segment file."""
+        return self.metadata_length + self.body_length
+
+
+@dataclass
+class DiskCacheStats:
+    """Disk cache statistics."""
+
+    entries: int
+    size_bytes: int
+    segment_bytes: int
+    dead_bytes: int
+    max_size_bytes: int
+    max_entries: int
+    utilization_percent: float
+
+
+class DiskCacheStore(CacheResponseStore):
+    """
+    Persistent cache store backed by an append-only, memory-mapped segment file.
+
+    Only the key index is held in memory; metadata and bodies are read from
+    the mapped segment on demand, so the cached data set may exceed the
+    process heap. Overwritten, deleted and evicted records are reclaimed by
+    a background compaction once dead bytes outweigh live bytes.
+
+    Example:
+        store = DiskCacheStore("/var/cache/mta/responses")
+        cache = ResponseCache(store=store)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_size: int = 1024 * 1024 * 1024,  # 1GB default
+        max_entries: int = 100_000,
+        max_entry_size: int = 50 * 1024 * 1024,  # 50MB default
+        cleanup_interval_seconds: float = 60.0,
+        compact_threshold_bytes: int = 16 * 1024 * 1024,  # 16MB default
+        fsync: bool = False,
+    ) -> None:
+        self._path = path
+        self._segment_path = os.path.join(path, SEGMENT_FILENAME)
+        self._index_path = os.path.join(path, INDEX_FILENAME)
+        self._max_size = max_size
+        self._max_entries = max_entries
+        self._max_entry_size = max_entry_size
+        self._cleanup_interval = cleanup_interval_seconds
+        self._compact_threshold = compact_threshold_bytes
+        self._fsync = fsync
+        self._cleanup_task: Optional[asyncio.Task] = None
+        self._compaction: Optional[asyncio.Task] = None
+        # Keeps compaction from swapping files while they are being fsynced
+        self._file_lock: Optional[asyncio.Lock] = None
+        # Bumped by clear() so a compaction that straddles it is discarded
+        self._generation = 0
+        self._closed = False
+
+        self._index: Dict[str, DiskIndexEntry] = {}
+        self._live_bytes = 0
+        self._segment_size = 0
+        self._index_records = 0
+        self._segment_file = None
+        self._index_file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._tags: Optional[TagIndex] = None
+
+        os.makedirs(path, exist_ok=True)
+        self._open()
+
+    # ------------------------------------------------------------------
+    # File management
+    # ------------------------------------------------------------------
+
+    def _open(self) -> None:
+        """Open (or create) the segment and index files and load the index."""
+        generation = self._read_generation(self._segment_path, _SEGMENT_MAGIC)
+        if generation is None or self._read_generation(
+            self._index_path, _INDEX_MAGIC
+        ) != generation:
+            # Missing, foreign or mismatched files: start a fresh generation
+            self._create_files(self._segment_path, self._index_path)
+
+        self._segment_file = open(self._segment_path, "r+b")
+        self._segment_file.seek(0, os.SEEK_END)
+        self._segment_size = self._segment_file.tell()
+        self._load_index()
+        self._index_file = open(self._index_path, "ab")
+        self._remap()
+
+    def _read_generation(self, path: str, magic: bytes) -> Optional[int]:
+        """Read the generation number from a file header, if valid."""
+        try:
+            with open(path, "rb") as f:
+                header = f.read(_FILE_HEADER.size)
+        except FileNotFoundError:
+            return None
+        if len(header) < _FILE_HEADER.size:
+            return None
+        file_magic, version, generation = _FILE_HEADER.unpack(header)
+        if file_magic != magic or version != _FORMAT_VERSION:
+            return None
+        return generation
+
+    def _create_files(self, segment_path: str, index_path: str) -> None:
+        """Create an empty segment/index pair sharing a new generation number."""
+        generation = int.from_bytes(os.urandom(8), "little")
+        with open(segment_path, "wb") as f:
+            f.write(_FILE_HEADER.pack(_SEGMENT_MAGIC, _FORMAT_VERSION, generation))
+        with open(index_path, "wb") as f:
+            f.write(_FILE_HEADER.pack(_INDEX_MAGIC, _FORMAT_VERSION, generation))
+
+    def _load_index(self) -> None:
+        """Replay the index log into memory, dropping a torn trailing record."""
+        with open(self._index_path, "rb") as f:
+            data = f.read()
+
+        self._index.clear()
+        self._tags = None
+        self._live_bytes = 0
+        self._index_records = 0
+
+        now = time.time()
+        position = _FILE_HEADER.size
+        while position + _INDEX_RECORD.size <= len(data):
+            op, flags, key_length, offset, meta_length, body_length, purge_at = (
+                _INDEX_RECORD.unpack_from(data, position)
+            )
+            end = position + _INDEX_RECORD.size + key_length
+            if end > len(data):
+                break
+            if op == _OP_SET and offset + meta_length + body_length > self._segment_size:
+                # Segment write never reached disk
+                break
+            key = data[position + _INDEX_RECORD.size:end].decode("utf-8")
+            position = end
+            self._index_records += 1
+
+            self._remove_from_index(key)
+            if op == _OP_SET and purge_at > now:
+                entry = DiskIndexEntry(
+                    offset=offset,
+                    metadata_length=meta_length,
+                    body_length=body_length,
+                    purge_at=purge_at,
+                    has_body=bool(flags & _FLAG_HAS_BODY),
+                )
+                self._index[key] = entry
+                self._live_bytes += entry.size
+
+        if position < len(data):
+            with open(self._index_path, "r+b") as f:
+                f.truncate(position)
+
+    def _remap(self) -> None:
+        """(Re)map the segment file so reads cover everything written so far."""
+        if self._mmap is not None:
+            self._mmap.close()
+        self._segment_file.flush()
+        self._mmap = mmap.mmap(self._segment_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _close_files(self) -> None:
+        """Close the mapping and file handles."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._segment_file is not None:
+            self._segment_file.close()
+            self._segment_file = None
+        if self._index_file is not None:
+            self._index_file.close()
+            self._index_file = None
+
+    def _sync(self, f) -> None:
+        """Flush a file, optionally forcing it to stable storage (blocking)."""
+        f.flush()
+        if self._fsync:
+            os.fsync(f.fileno())
+
+    def _lock_files(self) -> asyncio.Lock:
+        """Get the lock guarding the open files, creating it inside the running loop."""
+        if self._file_lock is None:
+            self._file_lock = asyncio.Lock()
+        return self._file_lock
+
+    async def _persist(self) -> None:
+        """
+        Force written records to stable storage, off the event loop (fsync only).
+
+        The segment is synced before the index. Should a crash persist an index
+        record without its segment data, loading drops the record instead.
+        """
+        if not self._fsync:
+            return
+        async with self._lock_files():
+            if self._segment_file is None:
+                return
+            files = (self._segment_file, self._index_file)
+            await asyncio.to_thread(lambda: [os.fsync(f.fileno()) for f in files])
+
+    # ------------------------------------------------------------------
+    # Index and segment helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _index_record(
+        op: int, key_bytes: bytes, entry: Optional[DiskIndexEntry] = None
+    ) -> bytes:
+        """Encode a set/delete record of the index log."""
+        if entry is None:
+            return _INDEX_RECORD.pack(op, 0, len(key_bytes), 0, 0, 0, 0.0) + key_bytes
+        return (
+            _INDEX_RECORD.pack(
+                op,
+                _FLAG_HAS_BODY if entry.has_body else 0,
+                len(key_bytes),
+                entry.offset,
+                entry.metadata_length,
+                entry.body_length,
+                entry.purge_at,
+            )
+            + key_bytes
+        )
+
+    def _append_index_record(
+        self, op: int, key_bytes: bytes, entry: Optional[DiskIndexEntry] = None
+    ) -> None:
+        """Append a set/delete record to the index log."""
+        self._index_file.write(self._index_record(op, key_bytes, entry))
+        self._index_file.flush()
+        self._index_records += 1
+
+    def _remove_from_index(self, key: str) -> Optional[DiskIndexEntry]:
+        """Remove a key from the in-memory index and update size tracking."""
+        entry = self._index.pop(key, None)
+        if entry is not None:
+            self._live_bytes -= entry.size
+            if self._tags is not None:
+                self._tags.remove(key)
+        return entry
+
+    def _delete_entry(self, key: str) -> bool:
+        """Delete an entry and persist a tombstone."""
+        if self._remove_from_index(key) is None:
+            return False
+        self._append_index_record(_OP_DELETE, key.encode("utf-8"))
+        return True
+
+    def _read(self, offset: int, length: int) -> bytes:
+        """Read bytes from the mapped segment."""
+        if self._mmap is None or offset + length > len(self._mmap):
+            self._remap()
+        return self._mmap[offset:offset + length]
+
+    def _read_entry(self, entry: DiskIndexEntry) -> CachedResponse:
+        """Materialize a cached response from the segment."""
+        data = self._read(entry.offset, entry.size)
+        metadata, extras = deserialize_metadata(data[:entry.metadata_length])
+        body = data[entry.metadata_length:] if entry.has_body else None
+        return build_response(metadata, body, extras)
+
+    def _evict_if_needed(self, required_size: int) -> None:
+        """Evict least recently used entries if needed to make room."""
+        while self._live_bytes + required_size > self._max_size and self._index:
+            self._delete_entry(next(iter(self._index)))
+
+        while len(self._index) >= self._max_entries and self._index:
+            self._delete_entry(next(iter(self._index)))
+
+    def _dead_bytes(self) -> int:
+        """Bytes in the segment no longer referenced by the index."""
+        return self._segment_size - _FILE_HEADER.size - self._live_bytes
+
+    def _needs_compaction(self) -> bool:
+        """Whether dead records dominate the segment or index log."""
+        dead = self._dead_bytes()
+        if dead >= self._compact_threshold and dead > self._live_bytes:
+            return True
+        return (
+            self._index_records > 2 * len(self._index)
+            and self._index_records * _INDEX_RECORD.size >= self._compact_threshold
+        )
+
+    def _maybe_compact(self) -> None:
+        """Start a background compaction when worthwhile and none is running."""
+        if self._compaction is None and not self._closed and self._needs_compaction():
+            self._compaction = asyncio.ensure_future(self._compact())
+
+    def _write_compacted(
+        self,
+        source: IO[bytes],
+        entries: List[Tuple[str, DiskIndexEntry]],
+        segment_tmp: str,
+        index_tmp: str,
+    ) -> Dict[str, DiskIndexEntry]:
+        """Copy entries into fresh segment and index files (runs in a worker thread)."""
+        self._create_files(segment_tmp, index_tmp)
+        moved_entries: Dict[str, DiskIndexEntry] = {}
+        with source, open(segment_tmp, "ab") as segment, open(index_tmp, "ab") as index:
+            offset = _FILE_HEADER.size
+            for key, entry in entries:
+                source.seek(entry.offset)
+                segment.write(source.read(entry.size))
+                moved = DiskIndexEntry(
+                    offset=offset,
+                    metadata_length=entry.metadata_length,
+                    body_length=entry.body_length,
+                    purge_at=entry.purge_at,
+                    has_body=entry.has_body,
+                )
+                index.write(self._index_record(_OP_SET, key.encode("utf-8"), moved))
+                moved_entries[key] = moved
+                offset += moved.size
+            self._sync(segment)
+            self._sync(index)
+        return moved_entries
+
+    async def _compact(self) -> None:
+        """Rewrite live records into fresh segment and index files."""
+        self._cleanup_expired()
+        segment_tmp = self._segment_path + ".tmp"
+        index_tmp = self._index_path + ".tmp"
+        generation = self._generation
+        snapshot = list(self._index.items())
+        self._segment_file.flush()
+        source = open(self._segment_path, "rb")
+        try:
+            moved_entries = await asyncio.to_thread(
+                self._write_compacted, source, snapshot, segment_tmp, index_tmp
+            )
+            async with self._lock_files():
+                # Closed or cleared meanwhile: drop the copy
+                if not self._closed and generation == self._generation:
+                    self._finish_compaction(
+                        dict(snapshot), moved_entries, segment_tmp, index_tmp
+                    )
+        finally:
+            source.close()
+            for path in (segment_tmp, index_tmp):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._compaction = None
+        await self._persist()
+
+    def _finish_compaction(
+        self,
+        snapshot: Dict[str, DiskIndexEntry],
+        moved_entries: Dict[str, DiskIndexEntry],
+        segment_tmp: str,
+        index_tmp: str,
+    ) -> None:
+        """Copy records written while compacting, then swap in the compacted files."""
+        new_index: Dict[str, DiskIndexEntry] = {}
+        records = len(moved_entries)
+        with open(segment_tmp, "ab") as segment, open(index_tmp, "ab") as index:
+            offset = segment.tell()
+            # Keep the current (LRU) order; only entries set since the snapshot are copied
+            for key, entry in self._index.items():
+                if snapshot.get(key) is entry:
+                    new_index[key] = moved_entries[key]
+                    continue
+                segment.write(self._read(entry.offset, entry.size))
+                moved = DiskIndexEntry(
+                    offset=offset,
+                    metadata_length=entry.metadata_length,
+                    body_length=entry.body_length,
+                    purge_at=entry.purge_at,
+                    has_body=entry.has_body,
+                )
+                index.write(self._index_record(_OP_SET, key.encode("utf-8"), moved))
+                new_index[key] = moved
+                offset += moved.size
+                records += 1
+            for key in moved_entries.keys() - new_index.keys():
+                index.write(self._index_record(_OP_DELETE, key.encode("utf-8")))
+                records += 1
+            segment.flush()
+            index.flush()
+
+        self._close_files()
+        # Replace the index first: a crash in between leaves mismatched
+        # generations, which resets the cache instead of corrupting it.
+        os.replace(index_tmp, self._index_path)
+        os.replace(segment_tmp, self._segment_path)
+
+        self._segment_file = open(self._segment_path, "r+b")
+        self._segment_file.seek(0, os.SEEK_END)
+        self._segment_size = self._segment_file.tell()
+        self._index_file = open(self._index_path, "ab")
+        self._index = new_index
+        self._live_bytes = sum(entry.size for entry in new_index.values())
+        self._index_records = records
+        self._remap()
+
+    # ------------------------------------------------------------------
+    # Cleanup
+    # ------------------------------------------------------------------
+
+    async def _start_cleanup(self) -> None:
+        """Start the background cleanup task."""
+        if self._cleanup_task is None and not self._closed:
+            self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+
+    async def _cleanup_loop(self) -> None:
+        """Background cleanup loop."""
+        while not self._closed:
+            try:
+                await asyncio.sleep(self._cleanup_interval)
+                self._cleanup()
+            except asyncio.CancelledError:
+                break
+
+    def _cleanup_expired(self) -> None:
+        """Drop expired keys from the index."""
+        now = time.time()
+        expired_keys = [key for key, entry in self._index.items() if entry.purge_at <= now]
+        for key in expired_keys:
+            self._delete_entry(key)
+
+    def _cleanup(self) -> None:
+        """Remove expired entries and reclaim space if worthwhile."""
+        if self._closed:
+            return
+        self._cleanup_expired()
+        self._maybe_compact()
+
+    # ------------------------------------------------------------------
+    # CacheResponseStore interface
+    # ------------------------------------------------------------------
+
+    def _live_entry(self, key: str) -> Optional[DiskIndexEntry]:
+        """Get the index entry of a live key, deleting it if past its stale window."""
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+
+        if entry.purge_at <= time.time():
+            self._delete_entry(key)
+            return None
+
+        return entry
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        """Get a cached response by key."""
+        entry = self._live_entry(key)
+        if entry is None:
+            return None
+
+        # Move to end for LRU
+        del self._index[key]
+        self._index[key] = entry
+
+        return self._read_entry(entry)
+
+    async def peek(self, key: str) -> Optional[CachedResponse]:
+        """Get a cached response without touching the LRU order."""
+        entry = self._live_entry(key)
+        return self._read_entry(entry) if entry is not None else None
+
+    async def set(self, key: str, response: CachedResponse) -> None:
+        """Store a response."""
+        if self._closed:
+            return
+
+        key_bytes = key.encode("utf-8")
+        if len(key_bytes) > _MAX_KEY_BYTES:
+            return
+
+        metadata_bytes = serialize_metadata(response)
+        body = stored_body(response)
+        size = len(metadata_bytes) + (len(body) if body else 0)
+
+        # Don't cache if entry is too large
+        if size > self._max_entry_size:
+            return
+
+        # Remove existing entry if present
+        if key in self._index:
+            self._remove_from_index(key)
+
+        # Evict entries if needed
+        self._evict_if_needed(size)
+
+        entry = DiskIndexEntry(
+            offset=self._segment_size,
+            metadata_length=len(metadata_bytes),
+            body_length=len(body) if body else 0,
+            purge_at=response.metadata.expires_at + get_stale_window(response),
+            has_body=body is not None,
+        )
+
+        # Segment first, then index: the index never points at unwritten data
+        self._segment_file.write(metadata_bytes)
+        if body:
+            self._segment_file.write(body)
+        self._segment_file.flush()
+        self._segment_size += entry.size
+
+        self._append_index_record(_OP_SET, key_bytes, entry)
+        self._index[key] = entry
+        self._live_bytes += entry.size
+        if self._tags is not None and response.tags:
+            self._tags.add(key, response.tags)
+
+        self._maybe_compact()
+        await self._persist()
+
+        # Ensure cleanup is running
+        await self._start_cleanup()
+
+    async def has(self, key: str) -> bool:
+        """Check if a key exists."""
+        entry = self._index.get(key)
+        if entry is None:
+            return False
+
+        if entry.purge_at <= time.time():
+            self._delete_entry(key)
+            return False
+
+        return True
+
+    async def delete(self, key: str) -> bool:
+        """Delete a cached response."""
+        deleted = self._delete_entry(key)
+        if deleted:
+            await self._persist()
+        return deleted
+
+    async def keys_for_tag(self, tag: str) -> List[str]:
+        """Get the keys carrying a tag (the tag index is built from disk on first use)."""
+        if self._tags is None:
+            self._tags = TagIndex()
+            for key, entry in self._index.items():
+                _, extras = deserialize_metadata(self._read(entry.offset, entry.metadata_length))
+                if extras.get("tags"):
+                    self._tags.add(key, extras["tags"])
+        return self._tags.keys(tag)
+
+    async def clear(self) -> None:
+        """Clear all cached responses."""
+        if self._closed:
+            return
+        self._generation += 1
+        async with self._lock_files():
+            self._close_files()
+            self._create_files(self._segment_path, self._index_path)
+            self._open()
+
+    async def size(self) -> int:
+        """Get current size of store."""
+        self._cleanup_expired()
+        return len(self._index)
+
+    async def keys(self) -> List[str]:
+        """Get all keys."""
+        self._cleanup_expired()
+        return list(self._index.keys())
+
+    async def close(self) -> None:
+        """Close the store and release resources. Cached data stays on disk."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+            try:
+                await self._cleanup_task
+            except asyncio.CancelledError:
+                pass
+            self._cleanup_task = None
+        if self._compaction is not None:
+            # Let the worker thread finish; its result is discarded
+            await asyncio.wait([self._compaction])
+        async with self._lock_files():
+            self._close_files()
+        self._index.clear()
+        self._live_bytes = 0
+
+    async def compact(self) -> None:
+        """Compact the segment and index files now (waiting for one already running)."""
+        if self._compaction is not None:
+            await asyncio.wait([self._compaction])
+        if not self._closed:
+            self._compaction = asyncio.ensure_future(self._compact())
+            await asyncio.shield(self._compaction)
+
+    def get_stats(self) -> DiskCacheStats:
+        """Get cache statistics."""
+        return DiskCacheStats(
+            entries=len(self._index),
+            size_bytes=self._live_bytes,
+            segment_bytes=self._segment_size,
+            dead_bytes=max(0, self._dead_bytes()),
+            max_size_bytes=self._max_size,
+            max_entries=self._max_entries,
+            utilization_percent=(self._live_bytes / self._max_size) * 100
+            if self._max_size > 0
+            else 0,
+        )
+
+
+def create_disk_cache_store(
+    path: str,
+    max_size: int = 1024 * 1024 * 1024,
+    max_entries: int = 100_000,
+    max_entry_size: int = 50 * 1024 * 1024,
+    cleanup_interval_seconds: float = 60.0,
+    compact_threshold_bytes: int = 16 * 1024 * 1024,
+    fsync: bool = False,
+) -> DiskCacheStore:
+    """Create a disk cache store."""
+    return DiskCacheStore(
+        path,
+        max_size=max_size,
+        max_entries=max_entries,
+        max_entry_size=max_entry_size,
+        cleanup_interval_seconds=cleanup_interval_seconds,
+        compact_threshold_bytes=compact_threshold_bytes,
+        fsync=fsync,
+    )
@@ -0,0 +1,272 @@
+"""
+Eviction policies for in-memory stores.
+
+A policy tracks key recency/frequency and chooses victims; the store owns
+the entries and decides when it is over budget. Two policies are built in:
+
+- ``lru``: evict the least recently used key.
+- ``w-tinylfu``: a small LRU admission window in front of a segmented LRU
+  (probation + protected), with a count-min sketch deciding whether a key
+  leaving the window is worth more than the main area's victim. One-off
+  scans pass through the window without flushing the frequently used set.
+"""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Optional, Type, Union
+
+_MASK_64 = (1 << 64) - 1
+_MIX = 0x9E3779B97F4A7C15
+_DEPTH = 4
+_MAX_COUNT = 15  # 4-bit saturating counters
+
+
+class CountMinSketch:
+    """
+    Count-min sketch of access frequency with 4-bit saturating counters.
+
+    Counters are halved once the number of increments reaches ten times the
+    table width, so old popularity fades.
+    """
+
+    def __init__(self, capacity: int = 1000) -> None:
+        width = 1 << max(4, (max(capacity, 1) - 1).bit_length())
+        self._rows = [bytearray(width) for _ in range(_DEPTH)]
+        self._mask = width - 1
+        self._sample_size = 10 * width
+        self._additions = 0
+
+    def _indexes(self, key: str) -> List[int]:
+        # Double hashing: row i probes h1 + i * h2, so one mix serves every row
+        mixed = (hash(key) * _MIX) & _MASK_64
+        h1 = mixed >> 32
+        h2 = (mixed & 0xFFFFFFFF) | 1
+        mask = self._mask
+        return [(h1 + i * h2) & mask for i in range(_DEPTH)]
+
+    def increment(self, key: str) -> None:
+        """Record one access of a key."""
+        added = False
+        for row, index in zip(self._rows, self._indexes(key)):
+            if row[index] < _MAX_COUNT:
+                row[index] += 1
+                added = True
+        if added:
+            self._additions += 1
+            if self._additions >= self._sample_size:
+                self._age()
+
+    def estimate(self, key: str) -> int:
+        """Estimated access count of a key."""
+        return min(map(bytearray.__getitem__, self._rows, self._indexes(key)))
+
+    def _age(self) -> None:
+        """Halve every counter."""
+        for row in self._rows:
+            row[:] = bytes(count >> 1 for count in row)
+        self._additions //= 2
+
+    def clear(self) -> None:
+        """Reset all counters."""
+        for row in self._rows:
+            row[:] = bytes(len(row))
+        self._additions = 0
+
+
+class EvictionPolicy(ABC):
+    """Eviction policy interface."""
+
+    name: str = ""
+    """Policy name reported in store statistics."""
+
+    def record_access(self, key: str) -> None:
+        """Record a lookup of a key, whether or not it is cached."""
+        pass
+
+    @abstractmethod
+    def on_insert(self, key: str) -> None:
+        """Track a newly stored key."""
+        pass
+
+    @abstractmethod
+    def on_hit(self, key: str) -> None:
+        """Update a tracked key after it was read or rewritten."""
+        pass
+
+    @abstractmethod
+    def on_remove(self, key: str) -> None:
+        """Stop tracking a key removed by the store."""
+        pass
+
+    @abstractmethod
+    def evict(self) -> Optional[str]:
+        """Choose a victim, stop tracking it and return its key (None if empty)."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Stop tracking all keys."""
+        pass
+
+    @abstractmethod
+    def __contains__(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class LruPolicy(EvictionPolicy):
+    """Least recently used eviction."""
+
+    name = "lru"
+
+    def __init__(self, capacity: int = 1000) -> None:
+        self._order: "OrderedDict[str, None]" = OrderedDict()
+
+    def on_insert(self, key: str) -> None:
+        """Track a key as most recently used."""
+        self._order[key] = None
+
+    def on_hit(self, key: str) -> None:
+        """Mark a key as most recently used."""
+        self._order.move_to_end(key)
+
+    def on_remove(self, key: str) -> None:
+        """Stop tracking a key."""
+        self._order.pop(key, None)
+
+    def evict(self) -> Optional[str]:
+        """Evict the least recently used key."""
+        if not self._order:
+            return None
+        key, _ = self._order.popitem(last=False)
+        return key
+
+    def clear(self) -> None:
+        """Stop tracking all keys."""
+        self._order.clear()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._order
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+
+class WTinyLfuPolicy(EvictionPolicy):
+    """
+    Window TinyLFU eviction.
+
+    New keys enter an LRU window sized to window_ratio of the tracked keys;
+    window overflow moves on to the probation segment. When the store needs
+    room, the window's LRU key competes with the main area's victim and the
+    one with the lower sketch frequency is evicted. Keys hit while on
+    probation move to the protected segment, capped at protected_ratio of
+    the main area.
+    """
+
+    name = "w-tinylfu"
+
+    def __init__(
+        self,
+        capacity: int = 1000,
+        window_ratio: float = 0.01,
+        protected_ratio: float = 0.8,
+    ) -> None:
+        self._sketch = CountMinSketch(capacity)
+        self._window_ratio = window_ratio
+        self._protected_ratio = protected_ratio
+        self._window: "OrderedDict[str, None]" = OrderedDict()
+        self._probation: "OrderedDict[str, None]" = OrderedDict()
+        self._protected: "OrderedDict[str, None]" = OrderedDict()
+
+    def record_access(self, key: str) -> None:
+        """Count a lookup in the frequency sketch."""
+        self._sketch.increment(key)
+
+    def on_insert(self, key: str) -> None:
+        """Add a new key to the window, moving window overflow to probation."""
+        self._window[key] = None
+        window_share = max(1, int(len(self) * self._window_ratio))
+        while len(self._window) > window_share:
+            overflow, _ = self._window.popitem(last=False)
+            self._probation[overflow] = None
+
+    def on_hit(self, key: str) -> None:
+        """Refresh recency, promoting probation hits to the protected segment."""
+        if key in self._window:
+            self._window.move_to_end(key)
+        elif key in self._probation:
+            del self._probation[key]
+            self._protected[key] = None
+            self._demote_protected()
+        elif key in self._protected:
+            self._protected.move_to_end(key)
+
+    def _demote_protected(self) -> None:
+        """Move protected overflow back to the probation segment."""
+        limit = max(1, int((len(self._probation) + len(self._protected)) * self._protected_ratio))
+        while len(self._protected) > limit:
+            key, _ = self._protected.popitem(last=False)
+            self._probation[key] = None
+
+    def on_remove(self, key: str) -> None:
+        """Stop tracking a key."""
+        for segment in (self._window, self._probation, self._protected):
+            segment.pop(key, None)
+
+    def _main_victim(self) -> Optional[str]:
+        """LRU key of the main area, taken from probation first."""
+        for segment in (self._probation, self._protected):
+            if segment:
+                return next(iter(segment))
+        return None
+
+    def evict(self) -> Optional[str]:
+        """Evict the loser of the window candidate vs main victim contest."""
+        victim = self._main_victim()
+
+        if self._window:
+            candidate, _ = self._window.popitem(last=False)
+            if victim is None or self._sketch.estimate(candidate) <= self._sketch.estimate(victim):
+                return candidate
+            # Admit the candidate to probation in place of the victim
+            self._probation[candidate] = None
+
+        if victim is None:
+            return None
+        self._probation.pop(victim, None)
+        self._protected.pop(victim, None)
+        return victim
+
+    def clear(self) -> None:
+        """Stop tracking all keys and reset frequencies."""
+        self._window.clear()
+        self._probation.clear()
+        self._protected.clear()
+        self._sketch.clear()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._window or key in self._probation or key in self._protected
+
+    def __len__(self) -> int:
+        return len(self._window) + len(self._probation) + len(self._protected)
+
+
+_POLICIES: Dict[str, Type[EvictionPolicy]] = {
+    LruPolicy.name: LruPolicy,
+    WTinyLfuPolicy.name: WTinyLfuPolicy,
+}
+
+
+def create_eviction_policy(
+    policy: Union[str, EvictionPolicy], capacity: int = 1000
+) -> EvictionPolicy:
+    """Create a policy by name ('lru' or 'w-tinylfu'), or pass an instance through."""
+    if isinstance(policy, EvictionPolicy):
+        return policy
+    policy_class = _POLICIES.get(policy)
+    if policy_class is None:
+        raise ValueError(f"Unknown eviction policy '{policy}'")
+    return policy_class(capacity)
@@ -2,12 +2,53 @@
 In-memory cache store for RFC 7234 HTTP response caching.
 """
 import asyncio
-import json
+import threading
 import time
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 
-from ..types import CacheResponseStore, CachedResponse
+from cache_request.stores.expiry import ExpiryIndex
+
+from ..compression import stored_body
+from ..types import (
+    CacheEntryMetadata,
+    CacheResponseStore,
+    CachedResponse,
+    SyncCacheResponseStore,
+)
+from .bodies import MIN_POOLED_BODY_SIZE, BodyPool
+from .eviction import EvictionPolicy, create_eviction_policy
+from .serialization import get_stale_window
+from .tags import TagIndex
+
+# Fixed-width metadata fields (timestamps, status code, directives, dataclass overhead)
+_METADATA_BASE_SIZE = 128
+
+
+def estimate_entry_size(metadata: CacheEntryMetadata, body: Optional[bytes] = None) -> int:
+    """
+    Estimate the size of a cache entry in bytes.
+
+    Sums the body length with the lengths of the URL, header names/values and
+    other variable-length metadata strings; no serialization is involved.
+    """
+    size = _METADATA_BASE_SIZE + len(metadata.url) + len(metadata.method)
+
+    for name, value in metadata.headers.items():
+        size += len(name) + len(value)
+
+    if metadata.vary_headers:
+        for name, value in metadata.vary_headers.items():
+            size += len(name) + len(value)
+
+    for value in (metadata.etag, metadata.last_modified, metadata.cache_control, metadata.vary):
+        if value:
+            size += len(value)
+
+    if body:
+        size += len(body)
+
+    return size
 
 
 @dataclass
@@ -16,6 +57,12 @@ class LruEntry:
 
     response: CachedResponse
     size: int
+    purge_at: float = 0
+    """When the entry leaves the stale window and is removed (Unix timestamp)."""
+    expiry_token: int = 0
+    """Token of this entry's item in the expiry index."""
+    body_digest: Optional[bytes] = None
+    """Digest of the entry's body in the body pool (size then excludes the body)."""
 
 
 @dataclass
@@ -27,184 +74,299 @@ class MemoryCacheStats:
     max_size_bytes: int
     max_entries: int
     utilization_percent: float
+    eviction_policy: str = "lru"
+    hits: int = 0
+    misses: int = 0
+    hit_rate: float = 0.0
+    pooled_bodies: int = 0
+    """Distinct bodies held by the body pool (dedupe_bodies only)."""
+    shared_bytes: int = 0
+    """Body bytes saved by sharing identical bodies between entries."""
 
 
-class MemoryCacheStore(CacheResponseStore):
+class _BoundedMemoryStore:
     """
-    In-memory cache store with LRU eviction.
+    Entry table, budgets and eviction bookkeeping shared by the memory stores.
+
+    Nothing here awaits or locks: MemoryCacheStore calls it from the event
+    loop, SyncMemoryCacheStore under its lock.
     """
 
     def __init__(
         self,
-        max_size: int = 100 * 1024 * 1024,  # 100MB default
-        max_entries: int = 1000,
-        max_entry_size: int = 5 * 1024 * 1024,  # 5MB default
-        cleanup_interval_seconds: float = 60.0,
+        max_size: int,
+        max_entries: int,
+        max_entry_size: int,
+        eviction_policy: Union[str, EvictionPolicy],
+        dedupe_bodies: bool,
     ) -> None:
         self._cache: Dict[str, LruEntry] = {}
+        self._policy = create_eviction_policy(eviction_policy, max_entries)
+        self._tags = TagIndex()
+        self._bodies: Optional[BodyPool] = BodyPool() if dedupe_bodies else None
+        self._hits = 0
+        self._misses = 0
+        self._expiry = ExpiryIndex()
         self._current_size: int = 0
         self._max_size = max_size
         self._max_entries = max_entries
         self._max_entry_size = max_entry_size
-        self._cleanup_interval = cleanup_interval_seconds
-        self._cleanup_task: Optional[asyncio.Task] = None
-        self._closed = False
-
-    async def _start_cleanup(self) -> None:
-        """Start the background cleanup task."""
-        if self._cleanup_task is None and not self._closed:
-            self._cleanup_task = asyncio.create_task(self._cleanup_loop())
-
-    async def _cleanup_loop(self) -> None:
-        """Background cleanup loop."""
-        while not self._closed:
-            try:
-                await asyncio.sleep(self._cleanup_interval)
-                self._cleanup()
-            except asyncio.CancelledError:
-                break
-
-    def _get_stale_window(self, response: CachedResponse) -> float:
-        """Calculate the stale window from directives."""
-        directives = response.metadata.directives
-        if not directives:
-            return 0
-        return max(
-            directives.stale_while_revalidate or 0,
-            directives.stale_if_error or 0,
-        )
 
     def _cleanup(self) -> None:
-        """Remove expired entries."""
-        now = time.time()
-        expired_keys = [
-            key
-            for key, entry in self._cache.items()
-            if entry.response.metadata.expires_at + self._get_stale_window(entry.response) <= now
-        ]
-        for key in expired_keys:
-            self._delete_entry(key)
+        """Remove expired entries, visiting only those due in the expiry index."""
+        for key, token in self._expiry.pop_expired(time.time()):
+            entry = self._cache.get(key)
+            if entry is not None and entry.expiry_token == token:
+                self._delete_entry(key)
+
+        if self._expiry.needs_rebuild(len(self._cache)):
+            self._expiry.rebuild(
+                (entry.purge_at, entry.expiry_token, key) for key, entry in self._cache.items()
+            )
 
     def _delete_entry(self, key: str) -> bool:
-        """Delete an entry and update size tracking."""
-        entry = self._cache.get(key)
+        """Delete an entry and update size tracking (its heap item is dropped lazily)."""
+        if self._drop_entry(key):
+            self._policy.on_remove(key)
+            return True
+        return False
+
+    def _drop_entry(self, key: str) -> bool:
+        """Remove an entry without notifying the eviction policy."""
+        entry = self._cache.pop(key, None)
         if entry:
             self._current_size -= entry.size
-            del self._cache[key]
+            if entry.body_digest is not None:
+                self._current_size -= self._bodies.release(entry.body_digest)
+            if entry.response.tags:
+                self._tags.remove(key)
             return True
         return False
 
+    def _pool_body(self, key: str, response: CachedResponse, size: int) -> Tuple[Optional[bytes], int]:
+        """
+        Point the response at the pooled copy of its body.
+
+        Returns the body digest and the size left to charge to the entry;
+        a body new to the pool is charged to the store right away. A body
+        carried over from the key's current entry (revalidation) is not
+        hashed again.
+        """
+        body = stored_body(response)
+        if not body or len(body) < MIN_POOLED_BODY_SIZE:
+            return None, size
+
+        current = self._cache.get(key)
+        known_digest = (
+            current.body_digest
+            if current is not None and stored_body(current.response) is body
+            else None
+        )
+        digest, pooled, added = self._bodies.acquire(body, known_digest)
+        if digest is None:
+            return None, size
+
+        if response.body_codec:
+            response.encoded_body = pooled
+        else:
+            response.body = pooled
+        if added:
+            self._current_size += len(pooled)
+        return digest, max(0, size - len(pooled))
+
     def _calculate_entry_size(self, response: CachedResponse) -> int:
-        """Calculate the size of a cache entry in bytes."""
-        size = 0
-
-        # Body size
-        if response.body:
-            size += len(response.body)
-
-        # Metadata size (rough estimate)
-        metadata_dict = {
-            "url": response.metadata.url,
-            "method": response.metadata.method,
-            "status_code": response.metadata.status_code,
-            "headers": response.metadata.headers,
-            "cached_at": response.metadata.cached_at,
-            "expires_at": response.metadata.expires_at,
-            "etag": response.metadata.etag,
-            "last_modified": response.metadata.last_modified,
-            "cache_control": response.metadata.cache_control,
-            "vary": response.metadata.vary,
-        }
-        size += len(json.dumps(metadata_dict, default=str))
-
-        return size
+        """Get the size of a cache entry in bytes, reusing the size carried by the entry."""
+        if response.size is not None:
+            return response.size
+        return estimate_entry_size(response.metadata, stored_body(response))
 
     def _evict_if_needed(self, required_size: int) -> None:
-        """Evict entries if needed to make room."""
-        # Evict by size
-        while self._current_size + required_size > self._max_size and self._cache:
-            oldest_key = next(iter(self._cache))
-            self._delete_entry(oldest_key)
-
-        # Evict by entry count
-        while len(self._cache) >= self._max_entries:
-            oldest_key = next(iter(self._cache))
-            self._delete_entry(oldest_key)
-
-    def _move_to_end(self, key: str) -> None:
-        """Move an entry to the end of the LRU queue."""
-        if key in self._cache:
-            entry = self._cache.pop(key)
-            self._cache[key] = entry
+        """Evict the policy's victims until there is room by size and entry count."""
+        while (
+            self._current_size + required_size > self._max_size
+            or len(self._cache) >= self._max_entries
+        ):
+            victim = self._policy.evict()
+            if victim is None:
+                break
+            self._drop_entry(victim)
 
-    async def get(self, key: str) -> Optional[CachedResponse]:
-        """Get a cached response by key."""
+    def _get_entry(self, key: str) -> Optional[CachedResponse]:
+        """Get a live entry, counting the hit or miss with the stats and the policy."""
+        self._policy.record_access(key)
         entry = self._cache.get(key)
         if not entry:
+            self._misses += 1
             return None
 
-        now = time.time()
-        stale_window = self._get_stale_window(entry.response)
-
         # Check if expired (including stale window)
-        if entry.response.metadata.expires_at + stale_window <= now:
+        if entry.purge_at <= time.time():
             self._delete_entry(key)
+            self._misses += 1
             return None
 
-        # Move to end for LRU
-        self._move_to_end(key)
+        self._hits += 1
+        self._policy.on_hit(key)
 
         return entry.response
 
-    async def set(self, key: str, response: CachedResponse) -> None:
-        """Store a response."""
+    def _set_entry(self, key: str, response: CachedResponse) -> None:
+        """Store an entry within the size and entry budgets."""
         size = self._calculate_entry_size(response)
 
         # Don't cache if entry is too large
         if size > self._max_entry_size:
             return
 
-        # Remove existing entry if present
-        if key in self._cache:
-            self._delete_entry(key)
+        # Reference the body before dropping the old entry so a shared body survives
+        body_digest = None
+        if self._bodies is not None:
+            body_digest, size = self._pool_body(key, response, size)
+
+        # Replace an existing entry in place, keeping its standing with the policy
+        if self._drop_entry(key):
+            self._policy.on_hit(key)
 
         # Evict entries if needed
         self._evict_if_needed(size)
 
         # Store new entry
-        self._cache[key] = LruEntry(response=response, size=size)
+        purge_at = response.metadata.expires_at + get_stale_window(response)
+        self._cache[key] = LruEntry(
+            response=response,
+            size=size,
+            purge_at=purge_at,
+            expiry_token=self._expiry.push(key, purge_at),
+            body_digest=body_digest,
+        )
         self._current_size += size
+        if key not in self._policy:
+            self._policy.on_insert(key)
+        if response.tags:
+            self._tags.add(key, response.tags)
 
-        # Ensure cleanup is running
-        await self._start_cleanup()
+        # Keep lazily deleted heap items bounded even without expiries
+        if self._expiry.needs_rebuild(len(self._cache)):
+            self._cleanup()
 
-    async def has(self, key: str) -> bool:
-        """Check if a key exists."""
+    def _peek_entry(self, key: str) -> Optional[CachedResponse]:
+        """Get a live entry without counting an access."""
         entry = self._cache.get(key)
         if not entry:
-            return False
-
-        now = time.time()
-        stale_window = self._get_stale_window(entry.response)
+            return None
 
         # Check if expired (including stale window)
-        if entry.response.metadata.expires_at + stale_window <= now:
+        if entry.purge_at <= time.time():
             self._delete_entry(key)
-            return False
+            return None
+
+        return entry.response
+
+    def _has_entry(self, key: str) -> bool:
+        """Check for a live entry without counting an access."""
+        return self._peek_entry(key) is not None
+
+    def _clear_entries(self) -> None:
+        """Drop every entry and reset size tracking."""
+        self._cache.clear()
+        self._expiry.clear()
+        self._policy.clear()
+        self._tags.clear()
+        if self._bodies is not None:
+            self._bodies.clear()
+        self._current_size = 0
 
-        return True
+    def _stats(self) -> MemoryCacheStats:
+        """Build the statistics snapshot."""
+        lookups = self._hits + self._misses
+        return MemoryCacheStats(
+            entries=len(self._cache),
+            size_bytes=self._current_size,
+            max_size_bytes=self._max_size,
+            max_entries=self._max_entries,
+            utilization_percent=(self._current_size / self._max_size) * 100
+            if self._max_size > 0
+            else 0,
+            eviction_policy=self._policy.name,
+            hits=self._hits,
+            misses=self._misses,
+            hit_rate=self._hits / lookups if lookups else 0.0,
+            pooled_bodies=len(self._bodies) if self._bodies is not None else 0,
+            shared_bytes=self._bodies.shared_bytes if self._bodies is not None else 0,
+        )
+
+
+class MemoryCacheStore(_BoundedMemoryStore, CacheResponseStore):
+    """
+    In-memory cache store with pluggable eviction (LRU by default).
+
+    Pass eviction_policy="w-tinylfu" to keep a frequently used set resident
+    through one-off scans. With dedupe_bodies=True, byte-identical bodies
+    are held once and charged against max_size once, however many keys
+    point at them.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 100 * 1024 * 1024,  # 100MB default
+        max_entries: int = 1000,
+        max_entry_size: int = 5 * 1024 * 1024,  # 5MB default
+        cleanup_interval_seconds: float = 60.0,
+        eviction_policy: Union[str, EvictionPolicy] = "lru",
+        dedupe_bodies: bool = False,
+    ) -> None:
+        super().__init__(max_size, max_entries, max_entry_size, eviction_policy, dedupe_bodies)
+        self._cleanup_interval = cleanup_interval_seconds
+        self._cleanup_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def _start_cleanup(self) -> None:
+        """Start the background cleanup task."""
+        if self._cleanup_task is None and not self._closed:
+            self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+
+    async def _cleanup_loop(self) -> None:
+        """Background cleanup loop."""
+        while not self._closed:
+            try:
+                await asyncio.sleep(self._cleanup_interval)
+                self._cleanup()
+            except asyncio.CancelledError:
+                break
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        """Get a cached response by key."""
+        return self._get_entry(key)
+
+    async def peek(self, key: str) -> Optional[CachedResponse]:
+        """Get a cached response without counting a hit or touching the eviction order."""
+        return self._peek_entry(key)
+
+    async def set(self, key: str, response: CachedResponse) -> None:
+        """Store a response."""
+        self._set_entry(key, response)
+
+        # Ensure cleanup is running
+        await self._start_cleanup()
+
+    async def has(self, key: str) -> bool:
+        """Check if a key exists."""
+        return self._has_entry(key)
 
     async def delete(self, key: str) -> bool:
         """Delete a cached response."""
         return self._delete_entry(key)
 
+    async def keys_for_tag(self, tag: str) -> List[str]:
+        """Get the keys carrying a tag."""
+        return self._tags.keys(tag)
+
     async def clear(self) -> None:
         """Clear all cached responses."""
-        self._cache.clear()
-        self._current_size = 0
+        self._clear_entries()
 
     async def size(self) -> int:
-        """Get current size of store."""
+        """Get current size of store (O(1) plus any expiries now due)."""
         self._cleanup()
         return len(self._cache)
 
@@ -223,20 +385,11 @@ class MemoryCacheStore(CacheResponseStore):
             except asyncio.CancelledError:
                 pass
             self._cleanup_task = None
-        self._cache.clear()
-        self._current_size = 0
+        self._clear_entries()
 
     def get_stats(self) -> MemoryCacheStats:
         """Get cache statistics."""
-        return MemoryCacheStats(
-            entries=len(self._cache),
-            size_bytes=self._current_size,
-            max_size_bytes=self._max_size,
-            max_entries=self._max_entries,
-            utilization_percent=(self._current_size / self._max_size) * 100
-            if self._max_size > 0
-            else 0,
-        )
+        return self._stats()
 
 
 def create_memory_cache_store(
@@ -244,6 +397,8 @@ def create_memory_cache_store(
     max_entries: int = 1000,
     max_entry_size: int = 5 * 1024 * 1024,
     cleanup_interval_seconds: float = 60.0,
+    eviction_policy: Union[str, EvictionPolicy] = "lru",
+    dedupe_bodies: bool = False,
 ) -> MemoryCacheStore:
     """Create a memory cache store."""
     return MemoryCacheStore(
@@ -251,4 +406,101 @@ def create_memory_cache_store(
         max_entries=max_entries,
         max_entry_size=max_entry_size,
         cleanup_interval_seconds=cleanup_interval_seconds,
+        eviction_policy=eviction_policy,
+        dedupe_bodies=dedupe_bodies,
+    )
+
+
+class SyncMemoryCacheStore(_BoundedMemoryStore, SyncCacheResponseStore):
+    """
+    Thread-safe, bounded in-memory store for sync clients.
+
+    Same budgets, eviction policies and bookkeeping as MemoryCacheStore,
+    guarded by a lock instead of relying on the event loop. Expired entries
+    are swept on writes rather than by a background task.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 100 * 1024 * 1024,  # 100MB default
+        max_entries: int = 1000,
+        max_entry_size: int = 5 * 1024 * 1024,  # 5MB default
+        eviction_policy: Union[str, EvictionPolicy] = "lru",
+        dedupe_bodies: bool = False,
+    ) -> None:
+        super().__init__(max_size, max_entries, max_entry_size, eviction_policy, dedupe_bodies)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Get a cached response by key."""
+        with self._lock:
+            return self._get_entry(key)
+
+    def peek(self, key: str) -> Optional[CachedResponse]:
+        """Get a cached response without counting a hit or touching the eviction order."""
+        with self._lock:
+            return self._peek_entry(key)
+
+    def set(self, key: str, response: CachedResponse) -> None:
+        """Store a response."""
+        with self._lock:
+            self._cleanup()
+            self._set_entry(key, response)
+
+    def has(self, key: str) -> bool:
+        """Check if a key exists."""
+        with self._lock:
+            return self._has_entry(key)
+
+    def delete(self, key: str) -> bool:
+        """Delete a cached response."""
+        with self._lock:
+            return self._delete_entry(key)
+
+    def keys_for_tag(self, tag: str) -> List[str]:
+        """Get the keys carrying a tag."""
+        with self._lock:
+            return self._tags.keys(tag)
+
+    def clear(self) -> None:
+        """Clear all cached responses."""
+        with self._lock:
+            self._clear_entries()
+
+    def size(self) -> int:
+        """Get current size of store."""
+        with self._lock:
+            self._cleanup()
+            return len(self._cache)
+
+    def keys(self) -> List[str]:
+        """Get all keys."""
+        with self._lock:
+            self._cleanup()
+            return list(self._cache.keys())
+
+    def close(self) -> None:
+        """Close the store and release resources."""
+        self.clear()
+
+    def get_stats(self) -> MemoryCacheStats:
+        """Get cache statistics."""
+        with self._lock:
+            return self._stats()
+
+
+def create_sync_memory_cache_store(
+    max_size: int = 100 * 1024 * 1024,
+    max_entries: int = 1000,
+    max_entry_size: int = 5 * 1024 * 1024,
+    eviction_policy: Union[str, EvictionPolicy] = "lru",
+    dedupe_bodies: bool = False,
+) -> SyncMemoryCacheStore:
+    """Create a thread-safe memory cache store for sync clients."""
+    return SyncMemoryCacheStore(
+        max_size=max_size,
+        max_entries=max_entries,
+        max_entry_size=max_entry_size,
+        eviction_policy=eviction_policy,
+        dedupe_bodies=dedupe_bodies,
     )
@@ -0,0 +1,348 @@
+"""
+Redis cache store for RFC 7234 HTTP response caching.
+Shares one cache across workers, processes and hosts.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Protocol, Tuple
+
+from ..types import CacheResponseStore, CachedResponse
+from .serialization import decode_entry, encode_entry, get_stale_window
+
+
+class RedisPipelineProtocol(Protocol):
+    """Protocol for a Redis pipeline (compatible with redis-py async)"""
+
+    def set(self, name: str, value: bytes, px: Optional[int] = None) -> Any:
+        ...
+
+    def delete(self, *names: str) -> Any:
+        ...
+
+    def sadd(self, name: str, *values: str) -> Any:
+        ...
+
+    def pexpire(self, name: str, time: int, nx: bool = False, gt: bool = False) -> Any:
+        ...
+
+    async def execute(self) -> List[Any]:
+        ...
+
+
+class RedisClientProtocol(Protocol):
+    """Protocol for Redis client (compatible with redis-py async, decode_responses=False)"""
+
+    async def get(self, name: str) -> Optional[bytes]:
+        ...
+
+    async def mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        ...
+
+    async def set(self, name: str, value: bytes, px: Optional[int] = None) -> Any:
+        ...
+
+    async def exists(self, *names: str) -> int:
+        ...
+
+    async def delete(self, *names: str) -> int:
+        ...
+
+    async def smembers(self, name: str) -> Any:
+        ...
+
+    def scan_iter(self, match: Optional[str] = None, count: Optional[int] = None) -> AsyncIterator:
+        ...
+
+    def pipeline(self, transaction: bool = True) -> RedisPipelineProtocol:
+        ...
+
+    async def close(self) -> None:
+        ...
+
+
+@dataclass
+class RedisCacheStats:
+    """Redis cache statistics."""
+
+    hits: int
+    misses: int
+    sets: int
+    batches: int
+    """Number of MGET round-trips used to serve lookups."""
+    batched_keys: int
+    """Number of keys served by those round-trips."""
+
+
+class RedisCacheStore(CacheResponseStore):
+    """
+    Redis implementation of CacheResponseStore.
+
+    Metadata and body are stored together under one key whose native TTL
+    covers the freshness lifetime plus the stale window, so Redis expires
+    entries on its own. Concurrent ``get`` calls issued in the same event
+    loop tick are coalesced into a single MGET, and bulk writes go through
+    a non-transactional pipeline.
+
+    Tagged entries are also added to one Redis set per tag (under
+    tag_key_prefix), whose TTL is pushed out to the longest-lived member;
+    members deleted before then are skipped harmlessly on invalidation.
+    Tag TTLs use PEXPIRE NX/GT (Redis 7+).
+
+    Example:
+        client = redis.asyncio.Redis.from_url(url)  # decode_responses=False
+        cache = ResponseCache(store=RedisCacheStore(client))
+    """
+
+    def __init__(
+        self,
+        client: RedisClientProtocol,
+        key_prefix: str = "cache_response:",
+        max_entry_size: int = 5 * 1024 * 1024,  # 5MB default
+        batch_gets: bool = True,
+        scan_count: int = 500,
+        tag_key_prefix: Optional[str] = None,
+    ) -> None:
+        """
+        Create a new RedisCacheStore.
+
+        Args:
+            client: Redis client (async redis-py instance, decode_responses=False)
+            key_prefix: Prefix for all keys. Default: 'cache_response:'
+            max_entry_size: Largest encoded entry to store in bytes. Default: 5MB
+            batch_gets: Coalesce concurrent gets into one MGET. Default: True
+            scan_count: SCAN batch size hint for keys/size/clear. Default: 500
+            tag_key_prefix: Prefix for tag sets; must not start with key_prefix.
+                Default: key_prefix without its trailing ':' plus '_tags:'
+        """
+        self._client = client
+        self._key_prefix = key_prefix
+        self._max_entry_size = max_entry_size
+        self._batch_gets = batch_gets
+        self._scan_count = scan_count
+        self._tag_key_prefix = tag_key_prefix or f"{key_prefix.rstrip(':')}_tags:"
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._hits = 0
+        self._misses = 0
+        self._sets = 0
+        self._batches = 0
+        self._batched_keys = 0
+
+    def _get_key(self, key: str) -> str:
+        """Get the full key with prefix"""
+        return f"{self._key_prefix}{key}"
+
+    def _get_tag_key(self, tag: str) -> str:
+        """Get the key of a tag's member set"""
+        return f"{self._tag_key_prefix}{tag}"
+
+    def _queue_tags(
+        self, pipe: RedisPipelineProtocol, key: str, response: CachedResponse, ttl_ms: int
+    ) -> None:
+        """Queue tag set updates for a stored entry"""
+        for tag in response.tags or ():
+            tag_key = self._get_tag_key(tag)
+            pipe.sadd(tag_key, key)
+            pipe.pexpire(tag_key, ttl_ms, nx=True)
+            pipe.pexpire(tag_key, ttl_ms, gt=True)
+
+    def _strip_key(self, full_key: Any) -> str:
+        """Strip the prefix from a key returned by SCAN"""
+        if isinstance(full_key, bytes):
+            full_key = full_key.decode("utf-8")
+        return full_key[len(self._key_prefix):]
+
+    def _decode(self, data: Optional[bytes]) -> Optional[CachedResponse]:
+        """Decode a stored blob, treating unreadable data as a miss"""
+        if data is None:
+            self._misses += 1
+            return None
+        try:
+            response = decode_entry(data)
+        except Exception:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return response
+
+    def _encode(self, response: CachedResponse) -> Optional[Tuple[bytes, int]]:
+        """Encode a response and compute its TTL in milliseconds"""
+        ttl_ms = int(
+            (response.metadata.expires_at + get_stale_window(response) - time.time()) * 1000
+        )
+        if ttl_ms <= 0:
+            return None
+        blob = encode_entry(response)
+        if len(blob) > self._max_entry_size:
+            return None
+        return blob, ttl_ms
+
+    async def _flush_gets(self) -> None:
+        """Resolve all pending gets with a single MGET"""
+        pending, self._pending = self._pending, {}
+        self._flush_task = None
+        keys = list(pending)
+
+        try:
+            values = await self._client.mget([self._get_key(k) for k in keys])
+        except Exception as error:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(error)
+            return
+
+        self._batches += 1
+        self._batched_keys += len(keys)
+        for key, value in zip(keys, values):
+            response = self._decode(value)
+            for future in pending[key]:
+                if not future.done():
+                    future.set_result(response)
+
+    async def peek(self, key: str) -> Optional[CachedResponse]:
+        """Get a cached response without counting a hit or miss"""
+        data = await self._client.get(self._get_key(key))
+        if data is None:
+            return None
+        try:
+            return decode_entry(data)
+        except Exception:
+            return None
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        """Get a cached response by key"""
+        if not self._batch_gets:
+            return self._decode(await self._client.get(self._get_key(key)))
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(key, []).append(future)
+        if self._flush_task is None:
+            # Runs after every task already scheduled for this tick has queued its key
+            self._flush_task = asyncio.ensure_future(self._flush_gets())
+        return await future
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[CachedResponse]]:
+        """Get several cached responses in one MGET round-trip"""
+        keys = list(keys)
+        if not keys:
+            return {}
+        values = await self._client.mget([self._get_key(k) for k in keys])
+        self._batches += 1
+        self._batched_keys += len(keys)
+        return {key: self._decode(value) for key, value in zip(keys, values)}
+
+    async def set(self, key: str, response: CachedResponse) -> None:
+        """Store a response with a TTL of expires_at plus the stale window"""
+        encoded = self._encode(response)
+        if encoded is None:
+            await self._client.delete(self._get_key(key))
+            return
+        blob, ttl_ms = encoded
+        if response.tags:
+            pipe = self._client.pipeline(transaction=False)
+            pipe.set(self._get_key(key), blob, px=ttl_ms)
+            self._queue_tags(pipe, key, response, ttl_ms)
+            await pipe.execute()
+        else:
+            await self._client.set(self._get_key(key), blob, px=ttl_ms)
+        self._sets += 1
+
+    async def set_many(self, items: Iterable[Tuple[str, CachedResponse]]) -> None:
+        """Store several responses in one pipelined round-trip"""
+        pipe = self._client.pipeline(transaction=False)
+        queued = 0
+        for key, response in items:
+            encoded = self._encode(response)
+            if encoded is None:
+                pipe.delete(self._get_key(key))
+            else:
+                blob, ttl_ms = encoded
+                pipe.set(self._get_key(key), blob, px=ttl_ms)
+                self._queue_tags(pipe, key, response, ttl_ms)
+                self._sets += 1
+            queued += 1
+        if queued:
+            await pipe.execute()
+
+    async def has(self, key: str) -> bool:
+        """Check if a key exists"""
+        return await self._client.exists(self._get_key(key)) > 0
+
+    async def delete(self, key: str) -> bool:
+        """Delete a cached response"""
+        return await self._client.delete(self._get_key(key)) > 0
+
+    async def keys_for_tag(self, tag: str) -> List[str]:
+        """Get the keys tagged with a tag (some may already be gone)"""
+        members = await self._client.smembers(self._get_tag_key(tag))
+        return [m.decode("utf-8") if isinstance(m, bytes) else m for m in members]
+
+    async def _scan_keys(self, prefix: Optional[str] = None) -> List[Any]:
+        """Collect all raw keys under the prefix"""
+        return [
+            full_key
+            async for full_key in self._client.scan_iter(
+                match=f"{prefix or self._key_prefix}*", count=self._scan_count
+            )
+        ]
+
+    async def clear(self) -> None:
+        """Clear all cached responses and tag sets under the prefixes"""
+        full_keys = await self._scan_keys() + await self._scan_keys(self._tag_key_prefix)
+        for i in range(0, len(full_keys), self._scan_count):
+            await self._client.delete(*full_keys[i:i + self._scan_count])
+
+    async def size(self) -> int:
+        """Get current number of cached responses"""
+        return len(await self._scan_keys())
+
+    async def keys(self) -> List[str]:
+        """Get all keys"""
+        return [self._strip_key(k) for k in await self._scan_keys()]
+
+    async def close(self) -> None:
+        """Close the store and cleanup resources"""
+        if self._flush_task is not None:
+            await self._flush_task
+        await self._client.close()
+
+    def get_stats(self) -> RedisCacheStats:
+        """Get cache statistics"""
+        return RedisCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            sets=self._sets,
+            batches=self._batches,
+            batched_keys=self._batched_keys,
+        )
+
+
+def create_redis_cache_store(
+    client: RedisClientProtocol,
+    key_prefix: str = "cache_response:",
+    max_entry_size: int = 5 * 1024 * 1024,
+    batch_gets: bool = True,
+    tag_key_prefix: Optional[str] = None,
+) -> RedisCacheStore:
+    """
+    Create a new RedisCacheStore instance.
+
+    Args:
+        client: Redis client (async redis-py instance, decode_responses=False)
+        key_prefix: Prefix for all keys
+        max_entry_size: Largest encoded entry to store in bytes
+        batch_gets: Coalesce concurrent gets into one MGET
+        tag_key_prefix: Prefix for tag sets (must not start with key_prefix)
+
+    Returns:
+        RedisCacheStore instance
+    """
+    return RedisCacheStore(
+        client,
+        key_prefix=key_prefix,
+        max_entry_size=max_entry_size,
+        batch_gets=batch_gets,
+        tag_key_prefix=tag_key_prefix,
+    )
@@ -0,0 +1,97 @@
+"""
+Serialization helpers shared by out-of-process cache stores.
+"""
+import json
+import struct
+from dataclasses import asdict
+from typing import Any, Dict, Optional, Tuple
+
+from ..compression import stored_body
+from ..parser import intern_directives
+from ..types import CacheControlDirectives, CacheEntryMetadata, CachedResponse
+
+_ENTRY_MAGIC = b"CRE1"
+# magic, flags, metadata length
+_ENTRY_HEADER = struct.Struct("<4sBI")
+_FLAG_HAS_BODY = 1
+# CachedResponse fields persisted alongside the metadata
+_ENTRY_EXTRAS = ("body_codec", "variants", "tags")
+
+
+def get_stale_window(response: CachedResponse) -> float:
+    """Calculate the stale window (seconds past expiry an entry is kept) from directives."""
+    directives = response.metadata.directives
+    if not directives:
+        return 0
+    return max(
+        directives.stale_while_revalidate or 0,
+        directives.stale_if_error or 0,
+    )
+
+
+def metadata_to_dict(metadata: CacheEntryMetadata) -> Dict[str, Any]:
+    """Convert entry metadata to a JSON-compatible dict."""
+    return asdict(metadata)
+
+
+def metadata_from_dict(data: Dict[str, Any]) -> CacheEntryMetadata:
+    """Rebuild entry metadata from a dict produced by metadata_to_dict."""
+    data = dict(data)
+    directives = data.get("directives")
+    data["directives"] = intern_directives(CacheControlDirectives(**directives)) if directives else None
+    return CacheEntryMetadata(**data)
+
+
+def serialize_metadata(response: CachedResponse) -> bytes:
+    """Serialize entry metadata (plus the body codec, variant list and tags, if any) to compact JSON bytes."""
+    data = metadata_to_dict(response.metadata)
+    if response.body_codec:
+        data["body_codec"] = response.body_codec
+    if response.variants is not None:
+        data["variants"] = response.variants
+    if response.tags:
+        data["tags"] = response.tags
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def deserialize_metadata(data: bytes) -> Tuple[CacheEntryMetadata, Dict[str, Any]]:
+    """Deserialize entry metadata and the entry-level extras from JSON bytes."""
+    data = json.loads(data)
+    extras = {name: data.pop(name) for name in _ENTRY_EXTRAS if name in data}
+    return metadata_from_dict(data), extras
+
+
+def build_response(
+    metadata: CacheEntryMetadata, body: Optional[bytes], extras: Dict[str, Any]
+) -> CachedResponse:
+    """Rebuild a response from stored parts, keeping an encoded body encoded."""
+    response = CachedResponse(
+        metadata=metadata, variants=extras.get("variants"), tags=extras.get("tags")
+    )
+    body_codec = extras.get("body_codec")
+    if body_codec:
+        response.encoded_body = body
+        response.body_codec = body_codec
+    else:
+        response.body = body
+    return response
+
+
+def encode_entry(response: CachedResponse) -> bytes:
+    """Encode metadata and body into a single self-describing blob."""
+    metadata_bytes = serialize_metadata(response)
+    body = stored_body(response)
+    flags = _FLAG_HAS_BODY if body is not None else 0
+    header = _ENTRY_HEADER.pack(_ENTRY_MAGIC, flags, len(metadata_bytes))
+    return b"".join((header, metadata_bytes, body or b""))
+
+
+def decode_entry(data: bytes) -> CachedResponse:
+    """Decode a blob produced by encode_entry."""
+    magic, flags, metadata_length = _ENTRY_HEADER.unpack_from(data)
+    if magic != _ENTRY_MAGIC:
+        raise ValueError("Not an encoded cache entry")
+    start = _ENTRY_HEADER.size
+    metadata, extras = deserialize_metadata(data[start:start + metadata_length])
+    body = bytes(data[start + metadata_length:]) if flags & _FLAG_HAS_BODY else None
+    return build_response(metadata, body, extras)
@@ -0,0 +1,48 @@
+"""
+Inverted tag index for in-process stores.
+"""
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class TagIndex:
+    """
+    Maps each tag to the keys carrying it, and each key to its tags.
+
+    Both directions are kept so removing a key costs O(its tags) and
+    listing a tag costs O(tagged keys).
+    """
+
+    def __init__(self) -> None:
+        self._keys_by_tag: Dict[str, Set[str]] = {}
+        self._tags_by_key: Dict[str, Tuple[str, ...]] = {}
+
+    def add(self, key: str, tags: Iterable[str]) -> None:
+        """Tag a key, replacing any tags it had."""
+        self.remove(key)
+        tags = tuple(tags)
+        if not tags:
+            return
+        self._tags_by_key[key] = tags
+        for tag in tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+
+    def remove(self, key: str) -> None:
+        """Drop a key from every tag it carries."""
+        for tag in self._tags_by_key.pop(key, ()):
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+    def keys(self, tag: str) -> List[str]:
+        """Keys carrying a tag."""
+        return list(self._keys_by_tag.get(tag, ()))
+
+    def clear(self) -> None:
+        """Drop all tags."""
+        self._keys_by_tag.clear()
+        self._tags_by_key.clear()
+
+    def __len__(self) -> int:
+        return len(self._keys_by_tag)
@@ -0,0 +1,293 @@
+"""
+Two-tier cache store: a small in-process L1 in front of a shared L2.
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..types import CacheResponseStore, CachedResponse
+from .memory import MemoryCacheStore
+
+
+@dataclass
+class TieredCacheStats:
+    """Tiered cache statistics."""
+
+    l1_hits: int
+    l2_hits: int
+    misses: int
+    promotions: int
+    """L2 hits copied into L1."""
+    l1_hit_ratio: float
+    """Share of all lookups served by L1."""
+    l2_hit_ratio: float
+    """Share of lookups that reached L2 and were served by it."""
+    hit_ratio: float
+    """Share of all lookups served by either tier."""
+    write_behind_pending: int
+    write_behind_overflows: int
+    """Writes done inline because the write-behind queue was full."""
+    l2_write_errors: int
+    """Background L2 writes that failed (the entry stays in L1 only)."""
+    l1: Optional[Any] = None
+    """L1 store statistics, if it reports any."""
+    l2: Optional[Any] = None
+    """L2 store statistics, if it reports any."""
+
+
+class TieredCacheStore(CacheResponseStore):
+    """
+    Two-tier implementation of CacheResponseStore.
+
+    Reads try L1 (in-process memory), then L2 (disk or Redis), promoting L2
+    hits into L1 so repeat hits cost no I/O. Writes go to both tiers; with
+    write_behind enabled the L2 write is queued and flushed in the
+    background (pipelined through ``set_many`` when L2 supports it), and a
+    full queue falls back to writing inline.
+
+    L1 is private to the process: an entry replaced or deleted in L2 by
+    another worker is still served from L1 until it expires or is evicted,
+    so keep L1 small relative to the churn of the shared tier.
+
+    Example:
+        store = TieredCacheStore(RedisCacheStore(client))
+        cache = ResponseCache(store=store)
+    """
+
+    def __init__(
+        self,
+        l2: CacheResponseStore,
+        l1: Optional[CacheResponseStore] = None,
+        write_behind: bool = False,
+        write_behind_queue_size: int = 1000,
+        write_behind_batch_size: int = 100,
+    ) -> None:
+        """
+        Create a new TieredCacheStore.
+
+        Args:
+            l2: Shared, larger store (e.g. DiskCacheStore or RedisCacheStore)
+            l1: In-process store. Default: MemoryCacheStore(16MB, 1000 entries)
+            write_behind: Queue L2 writes and flush them in the background. Default: False
+            write_behind_queue_size: Most writes waiting for L2 before writing inline. Default: 1000
+            write_behind_batch_size: Most writes flushed to L2 per batch. Default: 100
+        """
+        self._l1 = l1 or MemoryCacheStore(max_size=16 * 1024 * 1024, max_entries=1000)
+        self._l2 = l2
+        self._write_behind = write_behind
+        self._queue_size = write_behind_queue_size
+        self._batch_size = write_behind_batch_size
+        self._pending: Dict[str, CachedResponse] = {}
+        self._writing: Set[str] = set()
+        self._deleted_while_writing: Set[str] = set()
+        # Created on first use, inside the running loop (Python 3.9 binds it on construction)
+        self._pending_event: Optional[asyncio.Event] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._closed = False
+        self._l1_hits = 0
+        self._l2_hits = 0
+        self._misses = 0
+        self._promotions = 0
+        self._overflows = 0
+        self._l2_write_errors = 0
+
+    @property
+    def l1(self) -> CacheResponseStore:
+        """The in-process tier."""
+        return self._l1
+
+    @property
+    def l2(self) -> CacheResponseStore:
+        """The shared tier."""
+        return self._l2
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        """Get a cached response, promoting L2 hits into L1."""
+        response = await self._l1.get(key)
+        if response is not None:
+            self._l1_hits += 1
+            return response
+
+        response = self._pending.get(key)
+        if response is None:
+            response = await self._l2.get(key)
+        if response is None:
+            self._misses += 1
+            return None
+
+        self._l2_hits += 1
+        await self._l1.set(key, response)
+        self._promotions += 1
+        return response
+
+    async def peek(self, key: str) -> Optional[CachedResponse]:
+        """Get a cached response without promoting it or counting a hit."""
+        response = await (getattr(self._l1, "peek", None) or self._l1.get)(key)
+        if response is None:
+            response = self._pending.get(key)
+        if response is None:
+            response = await (getattr(self._l2, "peek", None) or self._l2.get)(key)
+        return response
+
+    async def set(self, key: str, response: CachedResponse) -> None:
+        """Store a response in L1 and (now or in the background) in L2."""
+        await self._l1.set(key, response)
+
+        if not self._write_behind or self._closed:
+            await self._l2.set(key, response)
+            return
+
+        if key not in self._pending and len(self._pending) >= self._queue_size:
+            self._overflows += 1
+            await self._l2.set(key, response)
+            return
+
+        # Latest write wins; the flush sees only the newest response per key
+        self._pending.pop(key, None)
+        self._pending[key] = response
+        if self._pending_event is None:
+            self._pending_event = asyncio.Event()
+        self._pending_event.set()
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        """Background writer draining the write-behind queue."""
+        while not self._closed:
+            try:
+                await self._pending_event.wait()
+                self._pending_event.clear()
+                await self.flush()
+            except asyncio.CancelledError:
+                break
+
+    async def _write_batch(self, batch: List[Tuple[str, CachedResponse]]) -> None:
+        """Write a batch to L2, pipelined when the store supports it."""
+        keys = [key for key, _ in batch]
+        self._writing.update(keys)
+        set_many = getattr(self._l2, "set_many", None)
+        try:
+            if set_many is not None:
+                await set_many(batch)
+            else:
+                for key, response in batch:
+                    await self._l2.set(key, response)
+        except Exception:
+            self._l2_write_errors += len(batch)
+        finally:
+            self._writing.difference_update(keys)
+
+        # A delete that raced the write must win
+        for key in keys:
+            if key in self._deleted_while_writing:
+                self._deleted_while_writing.discard(key)
+                await self._l2.delete(key)
+
+    async def flush(self) -> None:
+        """Write every queued entry to L2 now."""
+        while self._pending:
+            batch = []
+            for key in list(self._pending)[: self._batch_size]:
+                batch.append((key, self._pending.pop(key)))
+            await self._write_batch(batch)
+
+    async def has(self, key: str) -> bool:
+        """Check if a key exists in either tier."""
+        if key in self._pending or await self._l1.has(key):
+            return True
+        return await self._l2.has(key)
+
+    async def delete(self, key: str) -> bool:
+        """Delete a cached response from both tiers."""
+        queued = self._pending.pop(key, None) is not None
+        if key in self._writing:
+            self._deleted_while_writing.add(key)
+        in_l1 = await self._l1.delete(key)
+        in_l2 = await self._l2.delete(key)
+        return queued or in_l1 or in_l2
+
+    async def keys_for_tag(self, tag: str) -> List[str]:
+        """Get the keys carrying a tag in either tier (after flushing queued writes)."""
+        await self.flush()
+        keys: Dict[str, None] = {}
+        for tier in (self._l1, self._l2):
+            keys_for_tag = getattr(tier, "keys_for_tag", None)
+            if keys_for_tag is not None:
+                keys.update(dict.fromkeys(await keys_for_tag(tag)))
+        return list(keys)
+
+    async def clear(self) -> None:
+        """Clear both tiers."""
+        self._pending.clear()
+        self._deleted_while_writing.update(self._writing)
+        await self._l1.clear()
+        await self._l2.clear()
+
+    async def size(self) -> int:
+        """Get the number of entries in the shared tier (after flushing queued writes)."""
+        await self.flush()
+        return await self._l2.size()
+
+    async def keys(self) -> List[str]:
+        """Get all keys in the shared tier (after flushing queued writes)."""
+        await self.flush()
+        return await self._l2.keys()
+
+    async def close(self) -> None:
+        """Flush queued writes and close both tiers."""
+        await self.flush()
+        self._closed = True
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self._l1.close()
+        await self._l2.close()
+
+    def get_stats(self) -> TieredCacheStats:
+        """Get per-tier hit statistics."""
+        lookups = self._l1_hits + self._l2_hits + self._misses
+        l2_lookups = self._l2_hits + self._misses
+        return TieredCacheStats(
+            l1_hits=self._l1_hits,
+            l2_hits=self._l2_hits,
+            misses=self._misses,
+            promotions=self._promotions,
+            l1_hit_ratio=self._l1_hits / lookups if lookups else 0.0,
+            l2_hit_ratio=self._l2_hits / l2_lookups if l2_lookups else 0.0,
+            hit_ratio=(self._l1_hits + self._l2_hits) / lookups if lookups else 0.0,
+            write_behind_pending=len(self._pending),
+            write_behind_overflows=self._overflows,
+            l2_write_errors=self._l2_write_errors,
+            l1=self._l1.get_stats() if hasattr(self._l1, "get_stats") else None,
+            l2=self._l2.get_stats() if hasattr(self._l2, "get_stats") else None,
+        )
+
+
+def create_tiered_cache_store(
+    l2: CacheResponseStore,
+    l1: Optional[CacheResponseStore] = None,
+    write_behind: bool = False,
+    write_behind_queue_size: int = 1000,
+) -> TieredCacheStore:
+    """
+    Create a new TieredCacheStore instance.
+
+    Args:
+        l2: Shared, larger store (e.g. DiskCacheStore or RedisCacheStore)
+        l1: In-process store (defaults to a 16MB MemoryCacheStore)
+        write_behind: Queue L2 writes and flush them in the background
+        write_behind_queue_size: Most writes waiting for L2 before writing inline
+
+    Returns:
+        TieredCacheStore instance
+    """
+    return TieredCacheStore(
+        l2,
+        l1=l1,
+        write_behind=write_behind,
+        write_behind_queue_size=write_behind_queue_size,
+    )
@@ -4,12 +4,12 @@ Types for RFC 7234 HTTP response caching.
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
 
 
-@dataclass
+@dataclass(frozen=True)
 class CacheControlDirectives:
-    """Parsed Cache-Control directives."""
+    """Parsed Cache-Control directives (immutable, shared between entries)."""
 
     no_store: bool = False
     """Response must not be cached."""
@@ -80,7 +80,7 @@ class CacheEntryMetadata:
     """Original Cache-Control header."""
 
     directives: Optional[CacheControlDirectives] = None
-    """Parsed Cache-Control directives."""
+    """Parsed Cache-Control directives, kept so lookups never re-parse the header."""
 
     vary: Optional[str] = None
     """Vary header value."""
@@ -99,6 +99,21 @@ class CachedResponse:
     body: Optional[bytes] = None
     """Response body."""
 
+    size: Optional[int] = None
+    """Estimated entry size in bytes, computed once when the entry is built."""
+
+    encoded_body: Optional[bytes] = None
+    """Body as produced by body_codec (set instead of body when compressed)."""
+
+    body_codec: Optional[str] = None
+    """Name of the codec that produced encoded_body."""
+
+    variants: Optional[List[str]] = None
+    """Vary digests, oldest first, when this entry is a variant index rather than a response."""
+
+    tags: Optional[List[str]] = None
+    """Surrogate keys / cache tags used for bulk invalidation."""
+
 
 class CacheFreshness(str, Enum):
     """Cache freshness status."""
@@ -108,6 +123,17 @@ class CacheFreshness(str, Enum):
     EXPIRED = "expired"
 
 
+@dataclass
+class CacheKeyStats:
+    """Cache key generation counters."""
+
+    generated: int
+    """Keys generated (one per lookup, store or invalidation step)."""
+
+    normalized: int
+    """Keys whose URL normalization rewrote, merging them with an equivalent URL's entry."""
+
+
 @dataclass
 class CacheLookupResult:
     """Result of cache lookup."""
@@ -130,6 +156,9 @@ class CacheLookupResult:
     last_modified: Optional[str] = None
     """Last-Modified for If-Modified-Since header."""
 
+    should_refresh: bool = False
+    """Fresh but hot entry due for a refresh-ahead background revalidation."""
+
 
 @dataclass
 class RevalidationResult:
@@ -186,6 +215,70 @@ class CacheResponseStore(ABC):
         pass
 
 
+class SyncCacheResponseStore(ABC):
+    """Blocking cache store interface (for sync clients; must be thread-safe)."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Get a cached response by key."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, response: CachedResponse) -> None:
+        """Store a response."""
+        pass
+
+    @abstractmethod
+    def has(self, key: str) -> bool:
+        """Check if a key exists."""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """Delete a cached response."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Clear all cached responses."""
+        pass
+
+    @abstractmethod
+    def size(self) -> int:
+        """Get current size of store."""
+        pass
+
+    @abstractmethod
+    def keys(self) -> List[str]:
+        """Get all keys (for cleanup)."""
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """Close the store and release resources."""
+        pass
+
+
+@dataclass
+class PostCacheRule:
+    """Opt-in caching for POST endpoints whose body is a read-only query (search, GraphQL)."""
+
+    url_pattern: str
+    """Regular expression searched for in the request URL."""
+
+    ttl_seconds: float = 60
+    """Freshness lifetime of cached responses (an explicit max-age may shorten it)."""
+
+    key_headers: List[str] = field(default_factory=lambda: ["authorization"])
+    """Request headers hashed into the key with the body, so callers never share results."""
+
+    max_body_size: int = 1024 * 1024
+    """Request bodies larger than this are sent upstream uncached. Default: 1MB."""
+
+    override_cache_control: bool = False
+    """Cache even if the response says no-store/no-cache/private or sets a shorter max-age."""
+
+
 @dataclass
 class CacheResponseConfig:
     """Configuration for cache response."""
@@ -228,6 +321,53 @@ class CacheResponseConfig:
     vary_headers: List[str] = field(default_factory=list)
     """Headers to include in Vary-based cache key."""
 
+    body_codec: Optional[str] = None
+    """Codec used to compress stored bodies (e.g. 'zlib'). Default: None (store raw)."""
+
+    body_codec_min_size: int = 1024
+    """Only compress bodies of at least this many bytes. Default: 1024."""
+
+    max_vary_variants: int = 8
+    """Variants kept per URL for responses with a Vary header. Default: 8 (0 keeps one)."""
+
+    refresh_ahead: bool = False
+    """Revalidate hot entries in the background before they expire. Default: False."""
+
+    refresh_ahead_fraction: float = 0.8
+    """Fraction of the TTL after which a hot entry is refreshed. Default: 0.8."""
+
+    refresh_ahead_min_hits: int = 3
+    """Hits within the current TTL that make an entry hot. Default: 3."""
+
+    max_concurrent_refreshes: int = 4
+    """Most refresh-ahead revalidations in flight at once. Default: 4."""
+
+    max_concurrent_revalidations: int = 4
+    """Most background revalidations running at once. Default: 4."""
+
+    revalidation_queue_size: int = 256
+    """Most background revalidations waiting to run; colder keys are dropped first. Default: 256."""
+
+    tag_headers: List[str] = field(default_factory=lambda: ["surrogate-key", "cache-tag"])
+    """Response headers whose space/comma-separated values tag an entry."""
+
+    tagger: Optional[Callable[[str, str, Dict[str, str]], Iterable[str]]] = None
+    """Callback (method, url, normalized response headers) returning extra tags."""
+
+    normalize_urls: bool = False
+    """Normalize URLs before keying (sorted query, lowercase host, no default port). Default: False."""
+
+    ignored_query_params: List[str] = field(
+        default_factory=lambda: [
+            "utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content",
+            "gclid", "fbclid", "msclkid",
+        ]
+    )
+    """Query parameters dropped from keys when normalize_urls is on (e.g. tracking parameters)."""
+
+    post_cache_rules: List[PostCacheRule] = field(default_factory=list)
+    """POST endpoints to cache, keyed by URL plus a SHA-256 of the request body. Default: none."""
+
 
 class CacheResponseEventType(str, Enum):
     """Event types for cache operations."""
@@ -239,6 +379,8 @@ class CacheResponseEventType(str, Enum):
     CACHE_REVALIDATE = "cache:revalidate"
     CACHE_STALE_SERVE = "cache:stale-serve"
     CACHE_BYPASS = "cache:bypass"
+    CACHE_REFRESH_AHEAD = "cache:refresh-ahead"
+    CACHE_INVALIDATE_TAG = "cache:invalidate-tag"
 
 
 @dataclass
@@ -1,4 +1,6 @@
 """Pytest configuration for cache_response tests."""
+import time
+
 import pytest
 
 
@@ -9,3 +11,141 @@ def sample_headers():
         "content-type": "application/json",
         "cache-control": "max-age=3600",
     }
+
+
+class FakeRedisPipeline:
+    """Non-transactional pipeline for FakeRedis."""
+
+    def __init__(self, client: "FakeRedis") -> None:
+        self._client = client
+        self._commands = []
+
+    def set(self, name, value, px=None):
+        self._commands.append(("set", (name, value), {"px": px}))
+        return self
+
+    def delete(self, *names):
+        self._commands.append(("delete", names, {}))
+        return self
+
+    def sadd(self, name, *values):
+        self._commands.append(("sadd", (name, *values), {}))
+        return self
+
+    def pexpire(self, name, time, nx=False, gt=False):
+        self._commands.append(("pexpire", (name, time), {"nx": nx, "gt": gt}))
+        return self
+
+    async def execute(self):
+        self._client.round_trips += 1
+        results = []
+        for command, args, kwargs in self._commands:
+            results.append(getattr(self._client, f"_{command}")(*args, **kwargs))
+        self._commands = []
+        return results
+
+
+class FakeRedis:
+    """Minimal in-process stand-in for an async redis-py client (bytes mode)."""
+
+    def __init__(self) -> None:
+        self.data = {}
+        self.expiry = {}
+        self.round_trips = 0
+        self.closed = False
+
+    def _alive(self, name):
+        expires_at = self.expiry.get(name)
+        if expires_at is not None and expires_at <= time.time():
+            self.data.pop(name, None)
+            self.expiry.pop(name, None)
+        return name in self.data
+
+    def _get(self, name):
+        return self.data[name] if self._alive(name) else None
+
+    def _set(self, name, value, px=None):
+        self.data[name] = bytes(value)
+        if px is not None:
+            self.expiry[name] = time.time() + px / 1000
+        else:
+            self.expiry.pop(name, None)
+        return True
+
+    def _delete(self, *names):
+        removed = 0
+        for name in names:
+            if isinstance(name, bytes):
+                name = name.decode()
+            if self._alive(name):
+                removed += 1
+            self.data.pop(name, None)
+            self.expiry.pop(name, None)
+        return removed
+
+    def _sadd(self, name, *values):
+        self._alive(name)
+        members = self.data.setdefault(name, set())
+        before = len(members)
+        members.update(v.encode() if isinstance(v, str) else v for v in values)
+        return len(members) - before
+
+    def _pexpire(self, name, time_ms, nx=False, gt=False):
+        if not self._alive(name):
+            return 0
+        expires_at = time.time() + time_ms / 1000
+        current = self.expiry.get(name)
+        if nx and current is not None:
+            return 0
+        if gt and (current is None or expires_at <= current):
+            return 0
+        self.expiry[name] = expires_at
+        return 1
+
+    async def smembers(self, name):
+        self.round_trips += 1
+        return set(self.data[name]) if self._alive(name) else set()
+
+    async def get(self, name):
+        self.round_trips += 1
+        return self._get(name)
+
+    async def mget(self, keys):
+        self.round_trips += 1
+        return [self._get(k) for k in keys]
+
+    async def set(self, name, value, px=None):
+        self.round_trips += 1
+        return self._set(name, value, px=px)
+
+    async def exists(self, *names):
+        self.round_trips += 1
+        return sum(1 for n in names if self._alive(n))
+
+    async def delete(self, *names):
+        self.round_trips += 1
+        return self._delete(*names)
+
+    async def pttl(self, name):
+        if not self._alive(name):
+            return -2
+        expires_at = self.expiry.get(name)
+        return int((expires_at - time.time()) * 1000) if expires_at else -1
+
+    async def scan_iter(self, match=None, count=None):
+        prefix = match[:-1] if match and match.endswith("*") else match
+        for name in list(self.data):
+            if self._alive(name) and (prefix is None or name.startswith(prefix)):
+                yield name.encode()
+
+    def pipeline(self, transaction=True):
+        return FakeRedisPipeline(self)
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_redis():
+    """In-process Redis stand-in."""
+    return FakeRedis()
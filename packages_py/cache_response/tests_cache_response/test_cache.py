@@ -6,11 +6,16 @@ import pytest
 from cache_response import (
     ResponseCache,
     create_response_cache,
+    SyncResponseCache,
     CacheResponseConfig,
     CacheResponseEvent,
     CacheResponseEventType,
     CacheFreshness,
     MemoryCacheStore,
+    DiskCacheStore,
+    PostCacheRule,
+    RequestBodyDigest,
+    digest_request_body,
 )
 
 
@@ -53,6 +58,136 @@ class TestGenerateKey:
         assert get_key != head_key
 
 
+class TestKeyNormalization:
+    HEADERS = {"cache-control": "max-age=60"}
+
+    @pytest.mark.asyncio
+    async def test_equivalent_urls_share_an_entry(self):
+        cache = ResponseCache(CacheResponseConfig(normalize_urls=True))
+        await cache.store("GET", "https://api.example.com/items?b=2&a=1", 200, self.HEADERS, b"items")
+
+        for url in (
+            "HTTPS://API.example.com:443/items?a=1&b=2",
+            "https://api.example.com/items?a=1&utm_source=newsletter&b=2",
+        ):
+            assert (await cache.lookup("GET", url)).response.body == b"items"
+
+        stats = cache.get_key_stats()
+        assert stats.normalized == stats.generated > 0
+
+        await cache.lookup("GET", "https://api.example.com/items?a=1&b=2")
+        assert cache.get_key_stats().normalized == stats.normalized
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_custom_denylist(self):
+        cache = ResponseCache(
+            CacheResponseConfig(normalize_urls=True, ignored_query_params=["session"])
+        )
+        await cache.store("GET", "https://h/p?q=1&session=abc", 200, self.HEADERS, b"q")
+
+        assert (await cache.lookup("GET", "https://h/p?q=1&session=def")).found is True
+        assert (await cache.lookup("GET", "https://h/p?q=1&utm_source=x")).found is False
+        await cache.close()
+
+    def test_disabled_by_default(self, cache):
+        assert cache.generate_key("GET", "https://h/p?b=2&a=1") == "GET:https://h/p?b=2&a=1"
+        assert cache.get_key_stats().normalized == 0
+
+
+class TestPostQueryCaching:
+    SEARCH = "https://jira.example.com/rest/api/3/search"
+    QUERY = b'{"jql": "project = MTA"}'
+    HEADERS = {"content-type": "application/json"}
+
+    @staticmethod
+    def make_cache(**rule) -> ResponseCache:
+        rule.setdefault("ttl_seconds", 30)
+        return ResponseCache(
+            CacheResponseConfig(post_cache_rules=[PostCacheRule(r"/rest/api/\d+/search$", **rule)])
+        )
+
+    def digest(self, body: bytes = QUERY, auth: str = "Bearer a") -> str:
+        return digest_request_body([body], {"Authorization": auth}, ["authorization"])
+
+    def test_post_only_cacheable_on_matching_routes(self):
+        cache = self.make_cache()
+        assert cache.is_cacheable("POST", self.SEARCH) is True
+        assert cache.is_cacheable("POST", "https://jira.example.com/rest/api/3/issue") is False
+        assert cache.is_cacheable("POST") is False
+
+    @pytest.mark.asyncio
+    async def test_keyed_by_body_and_credentials(self):
+        cache = self.make_cache()
+        digest = self.digest()
+        assert await cache.store("POST", self.SEARCH, 200, self.HEADERS, b"issues", body_digest=digest)
+
+        assert (await cache.lookup("POST", self.SEARCH, body_digest=digest)).response.body == b"issues"
+        assert (await cache.lookup("POST", self.SEARCH, body_digest=self.digest(b"{}"))).found is False
+        assert (await cache.lookup("POST", self.SEARCH, body_digest=self.digest(auth="Bearer b"))).found is False
+        assert (await cache.lookup("POST", self.SEARCH)).found is False
+        assert (await cache.lookup("GET", self.SEARCH)).found is False
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_rule_ttl_policy(self):
+        cache = self.make_cache()
+        digest = self.digest()
+        now = time.time()
+
+        await cache.store("POST", self.SEARCH, 200, self.HEADERS, b"a", body_digest=digest)
+        ttl = (await cache.lookup("POST", self.SEARCH, body_digest=digest)).response.metadata.expires_at - now
+        assert 29 <= ttl <= 31
+
+        await cache.store("POST", self.SEARCH, 200, {"cache-control": "max-age=5"}, b"a", body_digest=digest)
+        ttl = (await cache.lookup("POST", self.SEARCH, body_digest=digest)).response.metadata.expires_at - now
+        assert 4 <= ttl <= 6
+
+        await cache.store("POST", self.SEARCH, 200, {"cache-control": "max-age=3600"}, b"a", body_digest=digest)
+        ttl = (await cache.lookup("POST", self.SEARCH, body_digest=digest)).response.metadata.expires_at - now
+        assert ttl <= 31
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_no_store_respected_unless_overridden(self):
+        headers = {"cache-control": "no-cache, no-store"}
+        digest = self.digest()
+
+        cache = self.make_cache()
+        assert await cache.store("POST", self.SEARCH, 200, headers, b"a", body_digest=digest) is False
+        await cache.close()
+
+        cache = self.make_cache(override_cache_control=True)
+        assert await cache.store("POST", self.SEARCH, 200, headers, b"a", body_digest=digest) is True
+        lookup = await cache.lookup("POST", self.SEARCH, body_digest=digest)
+        assert lookup.freshness == CacheFreshness.FRESH
+        assert lookup.should_revalidate is False
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_vary_variants_per_body(self):
+        cache = self.make_cache()
+        digest = self.digest()
+        headers = {"vary": "Accept-Language"}
+        await cache.store("POST", self.SEARCH, 200, headers, b"en", {"Accept-Language": "en"}, digest)
+        await cache.store("POST", self.SEARCH, 200, headers, b"de", {"Accept-Language": "de"}, digest)
+
+        lookup = await cache.lookup("POST", self.SEARCH, {"Accept-Language": "de"}, digest)
+        assert lookup.response.body == b"de"
+        assert (await cache.lookup("POST", self.SEARCH, {"Accept-Language": "fr"}, digest)).found is False
+        await cache.close()
+
+    def test_streamed_digest_matches_and_caps_size(self):
+        chunks = [self.QUERY[:5], self.QUERY[5:]]
+        assert digest_request_body(chunks) == digest_request_body([self.QUERY])
+
+        digest = RequestBodyDigest(max_body_size=8)
+        for chunk in chunks:
+            digest.update(chunk)
+        assert digest.overflowed is True
+        assert digest.hexdigest() is None
+
+
 class TestStoreAndLookup:
     @pytest.mark.asyncio
     async def test_store_and_retrieve(self, cache):
@@ -106,6 +241,38 @@ class TestStoreAndLookup:
         assert stored is False
 
 
+class TestPrepareAndStoreEntry:
+    @pytest.mark.asyncio
+    async def test_prepare_returns_bodyless_entry(self, cache):
+        entry = cache.prepare_entry(
+            "GET", "https://example.com/api", 200, {"Cache-Control": "max-age=60"}
+        )
+        assert entry is not None
+        assert entry.body is None
+        assert (await cache.lookup("GET", "https://example.com/api")).found is False
+
+    @pytest.mark.asyncio
+    async def test_prepare_rejects_uncacheable(self, cache):
+        assert cache.prepare_entry(
+            "GET", "https://example.com/api", 200, {"Cache-Control": "no-store"}
+        ) is None
+        assert cache.prepare_entry("GET", "https://example.com/api", 500, {}) is None
+
+    @pytest.mark.asyncio
+    async def test_store_entry_after_body_known(self, cache):
+        events = []
+        cache.on(events.append)
+        entry = cache.prepare_entry(
+            "GET", "https://example.com/api", 200, {"Cache-Control": "max-age=60"}
+        )
+        entry.body = b"streamed"
+        await cache.store_entry("GET", "https://example.com/api", entry)
+
+        lookup = await cache.lookup("GET", "https://example.com/api")
+        assert lookup.response.body == b"streamed"
+        assert CacheResponseEventType.CACHE_STORE in [e.type for e in events]
+
+
 class TestConditionalRequests:
     @pytest.mark.asyncio
     async def test_returns_etag(self, cache):
@@ -257,6 +424,117 @@ class TestVaryHandling:
         assert lookup.found is True
 
 
+class TestVaryVariants:
+    URL = "https://example.com/api/data"
+    HEADERS = {"cache-control": "max-age=3600", "vary": "Accept"}
+
+    @pytest.mark.asyncio
+    async def test_keeps_several_variants(self, cache):
+        await cache.store("GET", self.URL, 200, self.HEADERS, b"json", {"Accept": "application/json"})
+        await cache.store("GET", self.URL, 200, self.HEADERS, b"html", {"Accept": "text/html"})
+
+        json_lookup = await cache.lookup("GET", self.URL, {"Accept": "application/json"})
+        html_lookup = await cache.lookup("GET", self.URL, {"accept": "text/html"})
+
+        assert json_lookup.response.body == b"json"
+        assert html_lookup.response.body == b"html"
+
+    @pytest.mark.asyncio
+    async def test_unknown_variant_is_a_miss(self, cache):
+        await cache.store("GET", self.URL, 200, self.HEADERS, b"json", {"Accept": "application/json"})
+        assert (await cache.lookup("GET", self.URL, {"Accept": "text/csv"})).found is False
+        assert (await cache.lookup("GET", self.URL)).found is False
+
+    @pytest.mark.asyncio
+    async def test_variant_count_is_bounded(self):
+        store = MemoryCacheStore()
+        cache = ResponseCache(CacheResponseConfig(max_vary_variants=2), store)
+        for accept in ("a/1", "a/2", "a/3"):
+            await cache.store("GET", self.URL, 200, self.HEADERS, accept.encode(), {"Accept": accept})
+
+        assert (await cache.lookup("GET", self.URL, {"Accept": "a/1"})).found is False
+        assert (await cache.lookup("GET", self.URL, {"Accept": "a/3"})).found is True
+        assert await store.size() == 3  # index + two variants
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_revalidate_targets_matching_variant(self, cache):
+        await cache.store("GET", self.URL, 200, self.HEADERS, b"json", {"Accept": "application/json"})
+        await cache.store("GET", self.URL, 200, self.HEADERS, b"html", {"Accept": "text/html"})
+
+        assert await cache.revalidate(
+            "GET", self.URL, {"cache-control": "max-age=7200"}, {"Accept": "text/html"}
+        )
+
+        html = await cache.lookup("GET", self.URL, {"Accept": "text/html"})
+        json_ = await cache.lookup("GET", self.URL, {"Accept": "application/json"})
+        assert html.response.metadata.cache_control == "max-age=7200"
+        assert json_.response.metadata.cache_control == "max-age=3600"
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_all_variants(self):
+        store = MemoryCacheStore()
+        cache = ResponseCache(store=store)
+        await cache.store("GET", self.URL, 200, self.HEADERS, b"json", {"Accept": "application/json"})
+        await cache.store("GET", self.URL, 200, self.HEADERS, b"html", {"Accept": "text/html"})
+
+        assert await cache.invalidate("GET", self.URL) is True
+        assert await store.size() == 0
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_changed_vary_drops_old_variants(self):
+        store = MemoryCacheStore()
+        cache = ResponseCache(store=store)
+        await cache.store("GET", self.URL, 200, self.HEADERS, b"json", {"Accept": "application/json"})
+        await cache.store(
+            "GET", self.URL, 200, {"cache-control": "max-age=3600", "vary": "Origin"}, b"o",
+            {"Origin": "https://a.example"},
+        )
+
+        assert await store.size() == 2
+        assert (await cache.lookup("GET", self.URL, {"Origin": "https://a.example"})).found is True
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_variant_stores_keep_every_variant(self):
+        class SlowStore(MemoryCacheStore):
+            """Yields to the loop on every access, like a remote store."""
+
+            async def get(self, key):
+                await asyncio.sleep(0)
+                return await super().get(key)
+
+            async def set(self, key, response):
+                await asyncio.sleep(0)
+                await super().set(key, response)
+
+        cache = ResponseCache(store=SlowStore())
+        accepts = [f"a/{i}" for i in range(5)]
+        await asyncio.gather(*(
+            cache.store("GET", self.URL, 200, self.HEADERS, accept.encode(), {"Accept": accept})
+            for accept in accepts
+        ))
+
+        for accept in accepts:
+            lookup = await cache.lookup("GET", self.URL, {"Accept": accept})
+            assert lookup.response.body == accept.encode()
+        assert cache._index_locks == {}
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_variants_round_trip_through_disk(self, tmp_path):
+        cache = ResponseCache(store=DiskCacheStore(str(tmp_path)))
+        await cache.store("GET", self.URL, 200, self.HEADERS, b"json", {"Accept": "application/json"})
+        await cache.store("GET", self.URL, 200, self.HEADERS, b"html", {"Accept": "text/html"})
+        await cache.close()
+
+        reopened = ResponseCache(store=DiskCacheStore(str(tmp_path)))
+        lookup = await reopened.lookup("GET", self.URL, {"Accept": "text/html"})
+        assert lookup.response.body == b"html"
+        await reopened.close()
+
+
 class TestStaleWhileRevalidate:
     @pytest.mark.asyncio
     async def test_trigger_background_revalidation(self):
@@ -296,6 +574,102 @@ class TestStaleWhileRevalidate:
         await stale_cache.close()
 
 
+class TestRefreshAhead:
+    URL = "https://example.com/api/config"
+
+    async def _age_entry(self, cache, seconds: float) -> None:
+        cached = await cache._store.get(cache.generate_key("GET", self.URL))
+        cached.metadata.cached_at -= seconds
+        cached.metadata.expires_at -= seconds
+
+    async def _hot_cache(self, **config) -> ResponseCache:
+        cache = ResponseCache(CacheResponseConfig(refresh_ahead=True, **config))
+        await cache.store(
+            "GET", self.URL, 200, {"cache-control": "max-age=100", "etag": '"v1"'}, b"body"
+        )
+        return cache
+
+    @pytest.mark.asyncio
+    async def test_hot_entry_refreshed_after_fraction_of_ttl(self):
+        cache = await self._hot_cache(refresh_ahead_min_hits=2)
+        calls = []
+
+        async def revalidator(url, headers):
+            calls.append(headers)
+
+        cache.set_background_revalidator(revalidator)
+        await self._age_entry(cache, 85)
+
+        first = await cache.lookup("GET", self.URL)
+        second = await cache.lookup("GET", self.URL)
+        await asyncio.sleep(0.01)
+
+        assert first.should_refresh is False
+        assert second.should_refresh is True
+        assert second.freshness == CacheFreshness.FRESH
+        assert calls == [{"If-None-Match": '"v1"'}]
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_not_refreshed_before_fraction(self):
+        cache = await self._hot_cache(refresh_ahead_min_hits=1)
+        await self._age_entry(cache, 50)
+
+        assert (await cache.lookup("GET", self.URL)).should_refresh is False
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_cold_entry_not_refreshed(self):
+        cache = await self._hot_cache(refresh_ahead_min_hits=5)
+        await self._age_entry(cache, 90)
+
+        results = [await cache.lookup("GET", self.URL) for _ in range(4)]
+        assert not any(r.should_refresh for r in results)
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_one_refresh_per_key_until_revalidated(self):
+        cache = await self._hot_cache(refresh_ahead_min_hits=1)
+        await self._age_entry(cache, 90)
+
+        assert (await cache.lookup("GET", self.URL)).should_refresh is True
+        assert (await cache.lookup("GET", self.URL)).should_refresh is False
+
+        await cache.revalidate("GET", self.URL, {"cache-control": "max-age=100"})
+        await self._age_entry(cache, 90)
+        assert (await cache.lookup("GET", self.URL)).should_refresh is True
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_refresh_limit(self):
+        cache = ResponseCache(
+            CacheResponseConfig(
+                refresh_ahead=True, refresh_ahead_min_hits=1, max_concurrent_refreshes=2
+            )
+        )
+        urls = [f"https://example.com/api/{i}" for i in range(3)]
+        for url in urls:
+            await cache.store("GET", url, 200, {"cache-control": "max-age=100"}, b"body")
+            cached = await cache._store.get(cache.generate_key("GET", url))
+            cached.metadata.cached_at -= 90
+            cached.metadata.expires_at -= 90
+
+        results = [await cache.lookup("GET", url) for url in urls]
+        assert [r.should_refresh for r in results] == [True, True, False]
+
+        cache.end_refresh("GET", urls[0])
+        assert (await cache.lookup("GET", urls[2])).should_refresh is True
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, cache):
+        await cache.store("GET", self.URL, 200, {"cache-control": "max-age=100"}, b"body")
+        await self._age_entry(cache, 95)
+
+        results = [await cache.lookup("GET", self.URL) for _ in range(5)]
+        assert not any(r.should_refresh for r in results)
+
+
 class TestCreateResponseCache:
     def test_create_with_default_config(self):
         cache = create_response_cache()
@@ -609,3 +983,48 @@ class TestGetStats:
         assert stats2.entries == 1
 
         await cache.close()
+
+
+class TestSyncResponseCache:
+    def test_store_lookup_and_revalidate(self):
+        cache = SyncResponseCache()
+        url = "https://example.com/api"
+        events = []
+        cache.on(lambda event: events.append(event.type))
+
+        assert cache.store("GET", url, 200, {"cache-control": "max-age=60", "etag": '"v1"'}, b"body")
+        lookup = cache.lookup("GET", url)
+        assert lookup.found and lookup.freshness == CacheFreshness.FRESH
+        assert lookup.response.body == b"body"
+
+        cache._store.get(f"GET:{url}").metadata.expires_at = time.time() - 1
+        assert cache.lookup("GET", url).freshness == CacheFreshness.EXPIRED
+        assert cache.revalidate("GET", url, {"cache-control": "max-age=60"})
+        assert cache.lookup("GET", url).freshness == CacheFreshness.FRESH
+
+        assert events == [
+            CacheResponseEventType.CACHE_STORE,
+            CacheResponseEventType.CACHE_HIT,
+            CacheResponseEventType.CACHE_REVALIDATE,
+            CacheResponseEventType.CACHE_HIT,
+        ]
+        cache.close()
+
+    def test_shares_variants_and_post_rules_with_async_cache(self):
+        config = CacheResponseConfig(post_cache_rules=[PostCacheRule(r"/search$")])
+        cache = SyncResponseCache(config)
+        url = "https://example.com/data"
+        headers = {"cache-control": "max-age=60", "vary": "Accept"}
+
+        cache.store("GET", url, 200, headers, b"json", {"accept": "application/json"})
+        cache.store("GET", url, 200, headers, b"xml", {"accept": "application/xml"})
+        assert cache.lookup("GET", url, {"accept": "application/json"}).response.body == b"json"
+        assert cache.lookup("GET", url, {"accept": "application/xml"}).response.body == b"xml"
+
+        search = "https://example.com/search"
+        digest = digest_request_body([b"q"])
+        assert cache.store("POST", search, 200, {}, b"result", body_digest=digest)
+        assert cache.lookup("POST", search, body_digest=digest).response.body == b"result"
+        assert cache.invalidate("GET", url)
+        assert not cache.lookup("GET", url, {"accept": "application/json"}).found
+        cache.close()
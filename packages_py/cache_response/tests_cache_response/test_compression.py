@@ -0,0 +1,166 @@
+"""Tests for compressed body storage."""
+import json
+import os
+import pytest
+
+from cache_response import (
+    BodyCodec,
+    ZlibCodec,
+    register_body_codec,
+    get_body_codec,
+    ResponseCache,
+    CacheResponseConfig,
+    MemoryCacheStore,
+    DiskCacheStore,
+    RedisCacheStore,
+)
+
+URL = "https://example.atlassian.net/rest/api/3/search"
+BODY = json.dumps({"issues": [{"key": f"MTA-{i}", "fields": {}} for i in range(200)]}).encode()
+
+
+class ReverseCodec(BodyCodec):
+    """Toy codec: reverses the body and drops its leading "{"."""
+
+    name = "reverse-test"
+
+    def encode(self, data: bytes) -> bytes:
+        return data[::-1][:-1]
+
+    def decode(self, data: bytes) -> bytes:
+        return (data + b"{")[::-1]
+
+
+class TestCodecRegistry:
+    def test_zlib_is_builtin(self):
+        assert isinstance(get_body_codec("zlib"), ZlibCodec)
+
+    def test_unknown_codec_raises(self):
+        with pytest.raises(ValueError):
+            get_body_codec("nope")
+
+    def test_register_custom_codec(self):
+        register_body_codec(ReverseCodec())
+        assert get_body_codec("reverse-test").decode(ReverseCodec().encode(b"{abc")) == b"{abc"
+
+    def test_register_requires_name(self):
+        class Nameless(ReverseCodec):
+            name = ""
+
+        with pytest.raises(ValueError):
+            register_body_codec(Nameless())
+
+    @pytest.mark.asyncio
+    async def test_cache_rejects_unknown_codec(self):
+        with pytest.raises(ValueError):
+            ResponseCache(CacheResponseConfig(body_codec="nope"))
+
+
+class TestCompressedStorage:
+    @pytest.mark.asyncio
+    async def test_body_stored_compressed_and_decoded_on_hit(self):
+        store = MemoryCacheStore()
+        cache = ResponseCache(CacheResponseConfig(body_codec="zlib"), store)
+
+        await cache.store("GET", URL, 200, {"cache-control": "max-age=60"}, BODY)
+
+        raw = await store.get(f"GET:{URL}")
+        assert raw.body is None
+        assert raw.body_codec == "zlib"
+        assert len(raw.encoded_body) < len(BODY)
+
+        lookup = await cache.lookup("GET", URL)
+        assert lookup.response.body == BODY
+        assert lookup.response.body_codec is None
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_size_accounting_uses_compressed_size(self):
+        raw_store = MemoryCacheStore()
+        compressed_store = MemoryCacheStore()
+        raw_cache = ResponseCache(store=raw_store)
+        compressed_cache = ResponseCache(CacheResponseConfig(body_codec="zlib"), compressed_store)
+
+        for cache in (raw_cache, compressed_cache):
+            await cache.store("GET", URL, 200, {"cache-control": "max-age=60"}, BODY)
+
+        assert compressed_store.get_stats().size_bytes * 3 < raw_store.get_stats().size_bytes
+        await raw_cache.close()
+        await compressed_cache.close()
+
+    @pytest.mark.asyncio
+    async def test_small_bodies_stay_raw(self):
+        store = MemoryCacheStore()
+        cache = ResponseCache(
+            CacheResponseConfig(body_codec="zlib", body_codec_min_size=1024), store
+        )
+
+        await cache.store("GET", URL, 200, {"cache-control": "max-age=60"}, b'{"ok": 1}')
+
+        raw = await store.get(f"GET:{URL}")
+        assert raw.body == b'{"ok": 1}'
+        assert raw.body_codec is None
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_incompressible_bodies_stay_raw(self):
+        store = MemoryCacheStore()
+        cache = ResponseCache(CacheResponseConfig(body_codec="zlib", body_codec_min_size=0), store)
+        body = os.urandom(512)
+
+        await cache.store("GET", URL, 200, {"cache-control": "max-age=60"}, body)
+
+        assert (await store.get(f"GET:{URL}")).body_codec is None
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_revalidate_keeps_body_encoded(self):
+        store = MemoryCacheStore()
+        cache = ResponseCache(CacheResponseConfig(body_codec="zlib"), store)
+        await cache.store("GET", URL, 200, {"cache-control": "max-age=60"}, BODY)
+
+        await cache.revalidate("GET", URL, {"cache-control": "max-age=120"})
+
+        raw = await store.get(f"GET:{URL}")
+        assert raw.body_codec == "zlib"
+        assert (await cache.lookup("GET", URL)).response.body == BODY
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_custom_codec(self):
+        register_body_codec(ReverseCodec())
+        store = MemoryCacheStore()
+        cache = ResponseCache(
+            CacheResponseConfig(body_codec="reverse-test", body_codec_min_size=0), store
+        )
+
+        await cache.store("GET", URL, 200, {"cache-control": "max-age=60"}, BODY)
+
+        assert (await store.get(f"GET:{URL}")).body_codec == "reverse-test"
+        assert (await cache.lookup("GET", URL)).response.body == BODY
+        await cache.close()
+
+
+class TestPersistentStores:
+    @pytest.mark.asyncio
+    async def test_disk_store_keeps_codec(self, tmp_path):
+        cache = ResponseCache(CacheResponseConfig(body_codec="zlib"), DiskCacheStore(str(tmp_path)))
+        await cache.store("GET", URL, 200, {"cache-control": "max-age=60"}, BODY)
+        await cache.close()
+
+        store = DiskCacheStore(str(tmp_path))
+        raw = await store.get(f"GET:{URL}")
+        assert raw.body_codec == "zlib"
+        assert store.get_stats().size_bytes < len(BODY)
+
+        reopened = ResponseCache(store=store)
+        assert (await reopened.lookup("GET", URL)).response.body == BODY
+        await reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_redis_store_keeps_codec(self, fake_redis):
+        cache = ResponseCache(CacheResponseConfig(body_codec="zlib"), RedisCacheStore(fake_redis))
+        await cache.store("GET", URL, 200, {"cache-control": "max-age=60"}, BODY)
+
+        assert sum(len(v) for v in fake_redis.data.values()) < len(BODY)
+        assert (await cache.lookup("GET", URL)).response.body == BODY
@@ -0,0 +1,347 @@
+"""Tests for the disk-backed cache store."""
+import asyncio
+import json
+import os
+import threading
+import time
+import pytest
+
+from cache_response import (
+    DiskCacheStore,
+    create_disk_cache_store,
+    CachedResponse,
+    CacheEntryMetadata,
+    CacheControlDirectives,
+    ResponseCache,
+    CacheFreshness,
+)
+from cache_response.stores.disk import INDEX_FILENAME, SEGMENT_FILENAME
+
+
+def create_response(key: str, expires_in_seconds: float = 60) -> CachedResponse:
+    """Create a test response."""
+    now = time.time()
+    return CachedResponse(
+        metadata=CacheEntryMetadata(
+            url=f"https://example.com/{key}",
+            method="GET",
+            status_code=200,
+            headers={"content-type": "application/json"},
+            cached_at=now,
+            expires_at=now + expires_in_seconds,
+            etag='"abc"',
+            directives=CacheControlDirectives(max_age=60, stale_while_revalidate=30),
+        ),
+        body=json.dumps({"key": key}).encode(),
+    )
+
+
+@pytest.fixture
+async def store(tmp_path):
+    """Create a DiskCacheStore for testing."""
+    s = DiskCacheStore(str(tmp_path), max_entries=100, cleanup_interval_seconds=1.0)
+    yield s
+    await s.close()
+
+
+class TestGetSet:
+    @pytest.mark.asyncio
+    async def test_store_and_retrieve(self, store):
+        await store.set("key1", create_response("test"))
+
+        retrieved = await store.get("key1")
+        assert retrieved is not None
+        assert retrieved.metadata.url == "https://example.com/test"
+        assert retrieved.metadata.etag == '"abc"'
+        assert retrieved.metadata.directives.stale_while_revalidate == 30
+        assert retrieved.body == json.dumps({"key": "test"}).encode()
+
+    @pytest.mark.asyncio
+    async def test_return_none_for_nonexistent(self, store):
+        assert await store.get("non-existent") is None
+
+    @pytest.mark.asyncio
+    async def test_overwrite_existing_key(self, store):
+        await store.set("key1", create_response("first"))
+        await store.set("key1", create_response("second"))
+
+        retrieved = await store.get("key1")
+        assert retrieved.body == json.dumps({"key": "second"}).encode()
+        assert await store.size() == 1
+
+    @pytest.mark.asyncio
+    async def test_preserve_none_and_empty_body(self, store):
+        empty = create_response("empty")
+        empty.body = b""
+        none = create_response("none")
+        none.body = None
+
+        await store.set("empty", empty)
+        await store.set("none", none)
+
+        assert (await store.get("empty")).body == b""
+        assert (await store.get("none")).body is None
+
+
+class TestPersistence:
+    @pytest.mark.asyncio
+    async def test_entries_survive_reopen(self, tmp_path):
+        first = DiskCacheStore(str(tmp_path))
+        await first.set("key1", create_response("test1"))
+        await first.set("key2", create_response("test2"))
+        await first.delete("key2")
+        await first.close()
+
+        second = DiskCacheStore(str(tmp_path))
+        retrieved = await second.get("key1")
+        assert retrieved is not None
+        assert retrieved.body == json.dumps({"key": "test1"}).encode()
+        assert await second.has("key2") is False
+        await second.close()
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_dropped_on_reopen(self, tmp_path):
+        first = DiskCacheStore(str(tmp_path))
+        response = create_response("old", expires_in_seconds=-100)
+        response.metadata.directives = None
+        await first.set("old", response)
+        await first.close()
+
+        second = DiskCacheStore(str(tmp_path))
+        assert await second.size() == 0
+        await second.close()
+
+    @pytest.mark.asyncio
+    async def test_torn_index_record_is_discarded(self, tmp_path):
+        first = DiskCacheStore(str(tmp_path))
+        await first.set("key1", create_response("test1"))
+        await first.close()
+
+        with open(os.path.join(tmp_path, INDEX_FILENAME), "ab") as f:
+            f.write(b"\x01\x01\x05")
+
+        second = DiskCacheStore(str(tmp_path))
+        assert await second.get("key1") is not None
+        await second.set("key2", create_response("test2"))
+        await second.close()
+
+        third = DiskCacheStore(str(tmp_path))
+        assert await third.size() == 2
+        await third.close()
+
+    @pytest.mark.asyncio
+    async def test_mismatched_files_reset_cache(self, tmp_path):
+        first = DiskCacheStore(str(tmp_path))
+        await first.set("key1", create_response("test1"))
+        await first.close()
+
+        os.remove(os.path.join(tmp_path, SEGMENT_FILENAME))
+
+        second = DiskCacheStore(str(tmp_path))
+        assert await second.size() == 0
+        await second.close()
+
+
+class TestExpiration:
+    @pytest.mark.asyncio
+    async def test_kept_within_stale_window(self, store):
+        await store.set("stale", create_response("test", expires_in_seconds=-1))
+        assert await store.get("stale") is not None
+
+    @pytest.mark.asyncio
+    async def test_removed_after_stale_window(self, store):
+        await store.set("expired", create_response("test", expires_in_seconds=-31))
+        assert await store.get("expired") is None
+        assert await store.has("expired") is False
+
+
+class TestEviction:
+    @pytest.mark.asyncio
+    async def test_evict_oldest_when_max_entries_exceeded(self, tmp_path):
+        store = DiskCacheStore(str(tmp_path), max_entries=3)
+
+        for i in range(1, 5):
+            await store.set(f"key{i}", create_response(f"test{i}"))
+
+        assert await store.size() == 3
+        assert await store.has("key1") is False
+        assert await store.has("key4") is True
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_get_refreshes_recency(self, tmp_path):
+        store = DiskCacheStore(str(tmp_path), max_entries=3)
+
+        for i in range(1, 4):
+            await store.set(f"key{i}", create_response(f"test{i}"))
+        await store.get("key1")
+        await store.set("key4", create_response("test4"))
+
+        assert await store.has("key1") is True
+        assert await store.has("key2") is False
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_no_store_large_entries(self, tmp_path):
+        store = DiskCacheStore(str(tmp_path), max_entry_size=10)
+        await store.set("key1", create_response("test"))
+        assert await store.size() == 0
+        await store.close()
+
+
+class TestCompaction:
+    @pytest.mark.asyncio
+    async def test_compaction_reclaims_dead_bytes(self, tmp_path):
+        store = DiskCacheStore(str(tmp_path), compact_threshold_bytes=1024 * 1024)
+
+        for i in range(20):
+            await store.set("hot", create_response(f"version-{i}"))
+        await store.set("other", create_response("other"))
+
+        before = store.get_stats()
+        assert before.dead_bytes > 0
+
+        await store.compact()
+
+        after = store.get_stats()
+        assert after.dead_bytes == 0
+        assert after.segment_bytes < before.segment_bytes
+        assert (await store.get("hot")).body == json.dumps({"key": "version-19"}).encode()
+        assert (await store.get("other")).body == json.dumps({"key": "other"}).encode()
+        await store.close()
+
+        reopened = DiskCacheStore(str(tmp_path))
+        assert await reopened.size() == 2
+        await reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_automatic_compaction_on_threshold(self, tmp_path):
+        store = DiskCacheStore(str(tmp_path), compact_threshold_bytes=512)
+
+        for i in range(50):
+            await store.set("hot", create_response(f"version-{i}"))
+        # Compaction runs in the background
+        while store._compaction is not None:
+            await asyncio.wait([store._compaction])
+
+        stats = store.get_stats()
+        assert stats.dead_bytes < 512 + stats.size_bytes
+        assert (await store.get("hot")).body == json.dumps({"key": "version-49"}).encode()
+        await store.close()
+
+
+    @pytest.mark.asyncio
+    async def test_compaction_keeps_writes_made_while_copying(self, tmp_path):
+        store = DiskCacheStore(str(tmp_path), compact_threshold_bytes=1024 * 1024)
+        for i in range(20):
+            await store.set("hot", create_response(f"version-{i}"))
+        await store.set("gone", create_response("gone"))
+
+        compaction = asyncio.ensure_future(store.compact())
+        await asyncio.sleep(0)  # the copy is running in a worker thread
+        await store.set("hot", create_response("during"))
+        await store.set("new", create_response("new"))
+        await store.delete("gone")
+        await compaction
+
+        assert store.get_stats().dead_bytes == 0
+        assert (await store.get("hot")).body == json.dumps({"key": "during"}).encode()
+        assert (await store.get("new")).body == json.dumps({"key": "new"}).encode()
+        assert await store.get("gone") is None
+        await store.close()
+
+        reopened = DiskCacheStore(str(tmp_path))
+        assert sorted(await reopened.keys()) == ["hot", "new"]
+        await reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_set_compacts_in_background_thread(self, tmp_path, monkeypatch):
+        store = DiskCacheStore(str(tmp_path), compact_threshold_bytes=512)
+        threads = []
+        to_thread = asyncio.to_thread
+
+        async def recording_to_thread(fn, *args):
+            threads.append(fn)
+            return await to_thread(fn, *args)
+
+        monkeypatch.setattr(asyncio, "to_thread", recording_to_thread)
+        while store._compaction is None:
+            await store.set("hot", create_response("value"))
+        # set() returned while the compaction is still pending
+        assert not store._compaction.done()
+        await asyncio.wait([store._compaction])
+
+        assert store._write_compacted in threads
+        assert store.get_stats().dead_bytes == 0
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_fsync_runs_in_worker_thread(self, tmp_path, monkeypatch):
+        store = DiskCacheStore(str(tmp_path), fsync=True)
+        synced = []
+        fsync = os.fsync
+
+        def recording_fsync(fd):
+            synced.append(threading.current_thread() is threading.main_thread())
+            fsync(fd)
+
+        monkeypatch.setattr(os, "fsync", recording_fsync)
+        await store.set("key", create_response("value"))
+        await store.delete("key")
+
+        assert synced and not any(synced)
+        await store.close()
+
+
+class TestClearAndClose:
+    @pytest.mark.asyncio
+    async def test_clear_removes_persisted_entries(self, tmp_path):
+        store = DiskCacheStore(str(tmp_path))
+        await store.set("key1", create_response("test1"))
+        await store.clear()
+        assert await store.size() == 0
+        await store.close()
+
+        reopened = DiskCacheStore(str(tmp_path))
+        assert await reopened.size() == 0
+        await reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_close_multiple_times(self, tmp_path):
+        store = DiskCacheStore(str(tmp_path))
+        await store.set("key1", create_response("test1"))
+        await store.close()
+        await store.close()
+        assert await store.size() == 0
+
+
+class TestCreateDiskCacheStore:
+    @pytest.mark.asyncio
+    async def test_create_with_custom_options(self, tmp_path):
+        store = create_disk_cache_store(str(tmp_path), max_size=1024, max_entries=5)
+        stats = store.get_stats()
+        assert stats.max_size_bytes == 1024
+        assert stats.max_entries == 5
+        await store.close()
+
+
+class TestResponseCacheIntegration:
+    @pytest.mark.asyncio
+    async def test_warm_start_after_restart(self, tmp_path):
+        cache = ResponseCache(store=DiskCacheStore(str(tmp_path)))
+        await cache.store(
+            "GET",
+            "https://api.example.com/data",
+            200,
+            {"Cache-Control": "max-age=3600", "ETag": '"v1"'},
+            b'{"ok": true}',
+        )
+        await cache.close()
+
+        restarted = ResponseCache(store=DiskCacheStore(str(tmp_path)))
+        lookup = await restarted.lookup("GET", "https://api.example.com/data")
+        assert lookup.found is True
+        assert lookup.freshness == CacheFreshness.FRESH
+        assert lookup.etag == '"v1"'
+        assert lookup.response.body == b'{"ok": true}'
+        await restarted.close()
@@ -17,11 +17,15 @@ from cache_response import (
     is_vary_uncacheable,
     extract_vary_headers,
     match_vary_headers,
+    vary_digest,
     normalize_headers,
+    normalize_url,
+    clear_parse_caches,
     CacheControlDirectives,
     CacheEntryMetadata,
     CacheFreshness,
 )
+from cache_response.stores.serialization import metadata_from_dict, metadata_to_dict
 
 
 class TestParseCacheControl:
@@ -304,6 +308,19 @@ class TestVaryHandling:
         cached = {"accept": "application/json"}
         assert match_vary_headers(request, cached) is False
 
+    def test_vary_digest_ignores_case_order_and_whitespace(self):
+        a = vary_digest({"Accept": "application/json,  text/html"}, ["accept", "origin"])
+        b = vary_digest({"accept": " application/json , text/html "}, ["Origin", "Accept"])
+        assert a == b
+
+    def test_vary_digest_distinguishes_values(self):
+        assert vary_digest({"Accept": "text/html"}, ["accept"]) != vary_digest(
+            {"Accept": "application/json"}, ["accept"]
+        )
+
+    def test_vary_digest_absent_differs_from_empty(self):
+        assert vary_digest({}, ["accept"]) != vary_digest({"Accept": ""}, ["accept"])
+
 
 class TestNormalizeHeaders:
     def test_lowercase_keys(self):
@@ -322,6 +339,75 @@ class TestNormalizeHeaders:
         assert normalize_headers({}) == {}
 
 
+class TestNormalizeUrl:
+    def test_lowercases_scheme_and_host(self):
+        assert normalize_url("HTTPS://API.Example.COM/Users") == "https://api.example.com/Users"
+
+    def test_strips_default_ports_only(self):
+        assert normalize_url("https://example.com:443/a") == "https://example.com/a"
+        assert normalize_url("http://example.com:80/a") == "http://example.com/a"
+        assert normalize_url("http://example.com:8080/a") == "http://example.com:8080/a"
+        assert normalize_url("https://example.com:80/a") == "https://example.com:80/a"
+
+    def test_sorts_query_params(self):
+        assert normalize_url("https://h/p?b=2&a=1") == normalize_url("https://h/p?a=1&b=2")
+
+    def test_keeps_repeated_param_order_and_encoding(self):
+        assert normalize_url("https://h/p?z=1&id=2&id=1&q=a%20b+c") == "https://h/p?id=2&id=1&q=a%20b+c&z=1"
+
+    def test_drops_ignored_params(self):
+        url = "https://h/p?page=2&UTM_Source=mail&utm_campaign=x"
+        ignored = frozenset({"utm_source", "utm_campaign"})
+        assert normalize_url(url, ignored) == "https://h/p?page=2"
+
+    def test_drops_fragment_and_empty_query(self):
+        assert normalize_url("https://h?#top") == "https://h/"
+
+    def test_keeps_userinfo_and_ipv6(self):
+        assert normalize_url("http://User@[::1]:80/p") == "http://User@[::1]/p"
+
+    def test_unparseable_url_unchanged(self):
+        assert normalize_url("http://h:port/p") == "http://h:port/p"
+
+
+class TestParseMemoization:
+    def test_identical_headers_share_directives(self):
+        assert parse_cache_control("max-age=60, private") is parse_cache_control("max-age=60, private")
+        assert parse_cache_control(None) is parse_cache_control("")
+
+    def test_directives_are_immutable(self):
+        directives = parse_cache_control("max-age=60")
+        with pytest.raises(AttributeError):
+            directives.max_age = 0
+
+    def test_parse_vary_returns_fresh_list(self):
+        first = parse_vary("Accept, Accept-Encoding")
+        first.append("x-mutated")
+        assert parse_vary("Accept, Accept-Encoding") == ["accept", "accept-encoding"]
+
+    def test_clear_parse_caches(self):
+        before = parse_cache_control("max-age=61")
+        clear_parse_caches()
+        after = parse_cache_control("max-age=61")
+        assert after == before
+        assert after is not before
+
+    def test_deserialized_directives_are_interned(self):
+        now = time.time()
+        metadata = CacheEntryMetadata(
+            url="https://example.com",
+            method="GET",
+            status_code=200,
+            headers={},
+            cached_at=now,
+            expires_at=now + 60,
+            directives=parse_cache_control("max-age=60, public"),
+        )
+        first = metadata_from_dict(metadata_to_dict(metadata))
+        second = metadata_from_dict(metadata_to_dict(metadata))
+        assert first.directives is second.directives
+
+
 # =============================================================================
 # LOGIC TESTING COVERAGE
 # =============================================================================
@@ -0,0 +1,215 @@
+"""Tests for the Redis cache store (against an in-process Redis stand-in)."""
+import asyncio
+import json
+import time
+import pytest
+
+from cache_response import (
+    RedisCacheStore,
+    create_redis_cache_store,
+    CachedResponse,
+    CacheEntryMetadata,
+    CacheControlDirectives,
+    ResponseCache,
+    CacheFreshness,
+)
+
+
+def create_response(
+    key: str, expires_in_seconds: float = 60, stale_window: int = 0
+) -> CachedResponse:
+    """Create a test response."""
+    now = time.time()
+    return CachedResponse(
+        metadata=CacheEntryMetadata(
+            url=f"https://example.com/{key}",
+            method="GET",
+            status_code=200,
+            headers={"content-type": "application/json"},
+            cached_at=now,
+            expires_at=now + expires_in_seconds,
+            directives=CacheControlDirectives(
+                max_age=int(expires_in_seconds),
+                stale_while_revalidate=stale_window or None,
+            ),
+        ),
+        body=json.dumps({"key": key}).encode(),
+    )
+
+
+@pytest.fixture
+def store(fake_redis):
+    """Create a RedisCacheStore for testing."""
+    return RedisCacheStore(fake_redis, key_prefix="test:")
+
+
+class TestGetSet:
+    @pytest.mark.asyncio
+    async def test_store_and_retrieve(self, store):
+        await store.set("key1", create_response("test"))
+
+        retrieved = await store.get("key1")
+        assert retrieved is not None
+        assert retrieved.metadata.url == "https://example.com/test"
+        assert retrieved.body == json.dumps({"key": "test"}).encode()
+
+    @pytest.mark.asyncio
+    async def test_single_key_holds_metadata_and_body(self, store, fake_redis):
+        await store.set("key1", create_response("test"))
+        assert list(fake_redis.data) == ["test:key1"]
+
+    @pytest.mark.asyncio
+    async def test_return_none_for_nonexistent(self, store):
+        assert await store.get("non-existent") is None
+
+    @pytest.mark.asyncio
+    async def test_corrupt_value_is_a_miss(self, store, fake_redis):
+        fake_redis.data["test:bad"] = b"garbage"
+        assert await store.get("bad") is None
+
+    @pytest.mark.asyncio
+    async def test_none_body_round_trip(self, store):
+        response = create_response("none")
+        response.body = None
+        await store.set("none", response)
+        assert (await store.get("none")).body is None
+
+
+class TestTtl:
+    @pytest.mark.asyncio
+    async def test_ttl_is_expiry_plus_stale_window(self, store, fake_redis):
+        await store.set("key1", create_response("test", expires_in_seconds=60, stale_window=30))
+
+        ttl_ms = await fake_redis.pttl("test:key1")
+        assert 89_000 < ttl_ms <= 90_000
+
+    @pytest.mark.asyncio
+    async def test_already_expired_is_not_stored(self, store, fake_redis):
+        await store.set("key1", create_response("test"))
+        await store.set("key1", create_response("test", expires_in_seconds=-5))
+
+        assert await store.has("key1") is False
+        assert fake_redis.data == {}
+
+    @pytest.mark.asyncio
+    async def test_entry_expires_natively(self, store):
+        await store.set("key1", create_response("test", expires_in_seconds=0.05))
+        await asyncio.sleep(0.1)
+        assert await store.get("key1") is None
+
+
+class TestBatching:
+    @pytest.mark.asyncio
+    async def test_concurrent_gets_use_one_mget(self, store, fake_redis):
+        for i in range(5):
+            await store.set(f"key{i}", create_response(f"test{i}"))
+        fake_redis.round_trips = 0
+
+        results = await asyncio.gather(
+            *[store.get(f"key{i}") for i in range(5)], store.get("missing")
+        )
+
+        assert fake_redis.round_trips == 1
+        assert [r.metadata.url for r in results[:5]] == [
+            f"https://example.com/test{i}" for i in range(5)
+        ]
+        assert results[5] is None
+        stats = store.get_stats()
+        assert stats.batches == 1
+        assert stats.batched_keys == 6
+
+    @pytest.mark.asyncio
+    async def test_duplicate_concurrent_keys_share_lookup(self, store, fake_redis):
+        await store.set("key1", create_response("test"))
+
+        results = await asyncio.gather(*[store.get("key1") for _ in range(3)])
+
+        assert all(r is not None for r in results)
+        assert store.get_stats().batched_keys == 1
+
+    @pytest.mark.asyncio
+    async def test_get_many(self, store, fake_redis):
+        await store.set("a", create_response("a"))
+        await store.set("b", create_response("b"))
+        fake_redis.round_trips = 0
+
+        results = await store.get_many(["a", "b", "c"])
+
+        assert fake_redis.round_trips == 1
+        assert results["a"].metadata.url == "https://example.com/a"
+        assert results["c"] is None
+
+    @pytest.mark.asyncio
+    async def test_set_many_pipelines(self, store, fake_redis):
+        fake_redis.round_trips = 0
+
+        await store.set_many([(f"key{i}", create_response(f"test{i}")) for i in range(10)])
+
+        assert fake_redis.round_trips == 1
+        assert await store.size() == 10
+
+    @pytest.mark.asyncio
+    async def test_unbatched_mode(self, fake_redis):
+        store = RedisCacheStore(fake_redis, batch_gets=False)
+        await store.set("key1", create_response("test"))
+        assert (await store.get("key1")) is not None
+        assert store.get_stats().batches == 0
+
+    @pytest.mark.asyncio
+    async def test_mget_error_propagates_to_waiters(self, store, fake_redis):
+        async def failing_mget(keys):
+            raise ConnectionError("redis down")
+
+        fake_redis.mget = failing_mget
+
+        with pytest.raises(ConnectionError):
+            await store.get("key1")
+
+
+class TestKeyspace:
+    @pytest.mark.asyncio
+    async def test_keys_size_and_clear_respect_prefix(self, store, fake_redis):
+        fake_redis.data["other:key"] = b"x"
+        await store.set("key1", create_response("1"))
+        await store.set("key2", create_response("2"))
+
+        assert sorted(await store.keys()) == ["key1", "key2"]
+        assert await store.size() == 2
+
+        await store.clear()
+
+        assert await store.size() == 0
+        assert "other:key" in fake_redis.data
+
+    @pytest.mark.asyncio
+    async def test_has_and_delete(self, store):
+        await store.set("key1", create_response("1"))
+        assert await store.has("key1") is True
+        assert await store.delete("key1") is True
+        assert await store.delete("key1") is False
+        assert await store.has("key1") is False
+
+    @pytest.mark.asyncio
+    async def test_close_closes_client(self, store, fake_redis):
+        await store.close()
+        assert fake_redis.closed is True
+
+
+class TestSharedAcrossWorkers:
+    @pytest.mark.asyncio
+    async def test_second_cache_sees_first_cache_entries(self, fake_redis):
+        worker_a = ResponseCache(store=create_redis_cache_store(fake_redis))
+        worker_b = ResponseCache(store=create_redis_cache_store(fake_redis))
+
+        await worker_a.store(
+            "GET",
+            "https://api.example.com/shared",
+            200,
+            {"Cache-Control": "max-age=300"},
+            b"shared",
+        )
+
+        lookup = await worker_b.lookup("GET", "https://api.example.com/shared")
+        assert lookup.found is True
+        assert lookup.freshness == CacheFreshness.FRESH
+        assert lookup.response.body == b"shared"
@@ -0,0 +1,207 @@
+"""Tests for the bounded background revalidation scheduler."""
+import asyncio
+import pytest
+
+from cache_response import (
+    ResponseCache,
+    CacheResponseConfig,
+    RevalidationScheduler,
+)
+
+
+class Gate:
+    """Revalidation jobs that block until released, recording run order and concurrency."""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.started = []
+        self.running = 0
+        self.peak = 0
+
+    def job(self, name: str, fail: bool = False):
+        async def run():
+            self.started.append(name)
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            try:
+                await self.release.wait()
+                if fail:
+                    raise RuntimeError(name)
+            finally:
+                self.running -= 1
+
+        return run
+
+
+class TestRevalidationScheduler:
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self):
+        gate = Gate()
+        scheduler = RevalidationScheduler(max_concurrency=2)
+        for i in range(5):
+            assert scheduler.schedule(f"k{i}", gate.job(f"k{i}")) is True
+
+        await asyncio.sleep(0.01)
+        assert gate.running == 2
+        gate.release.set()
+        await scheduler.join()
+
+        assert gate.peak == 2
+        stats = scheduler.get_stats()
+        assert (stats.queued, stats.succeeded, stats.pending, stats.running) == (5, 5, 0, 0)
+
+    @pytest.mark.asyncio
+    async def test_deduplicates_queued_and_running_keys(self):
+        gate = Gate()
+        scheduler = RevalidationScheduler(max_concurrency=1)
+        scheduler.schedule("a", gate.job("a"))
+        await asyncio.sleep(0.01)
+
+        assert scheduler.schedule("a", gate.job("a-again")) is False  # running
+        scheduler.schedule("b", gate.job("b"))
+        assert scheduler.schedule("b", gate.job("b-again")) is False  # queued
+        gate.release.set()
+        await scheduler.join()
+
+        assert gate.started == ["a", "b"]
+        assert scheduler.get_stats().deduplicated == 2
+        assert scheduler.schedule("a", gate.job("a")) is True  # finished keys can be rescheduled
+        await scheduler.join()
+
+    @pytest.mark.asyncio
+    async def test_hot_keys_run_first(self):
+        gate = Gate()
+        scheduler = RevalidationScheduler(max_concurrency=1)
+        scheduler.schedule("busy", gate.job("busy"))
+        await asyncio.sleep(0.01)
+
+        scheduler.schedule("cold", gate.job("cold"), priority=1)
+        scheduler.schedule("warm", gate.job("warm"), priority=5)
+        scheduler.schedule("cold-2", gate.job("cold-2"), priority=1)
+        scheduler.schedule("cold-2", gate.job("cold-2"), priority=9)  # got hot while queued
+        gate.release.set()
+        await scheduler.join()
+
+        assert gate.started == ["busy", "cold-2", "warm", "cold"]
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_coldest(self):
+        gate = Gate()
+        done = []
+        scheduler = RevalidationScheduler(max_concurrency=1, max_queue_size=2)
+        scheduler.schedule("busy", gate.job("busy"))
+        await asyncio.sleep(0.01)
+
+        scheduler.schedule("a", gate.job("a"), priority=2, on_done=lambda: done.append("a"))
+        scheduler.schedule("b", gate.job("b"), priority=1, on_done=lambda: done.append("b"))
+        assert scheduler.schedule("c", gate.job("c"), priority=1) is False  # not hotter than b
+        assert scheduler.schedule("d", gate.job("d"), priority=3) is True  # evicts b
+        assert done == ["b"]
+
+        gate.release.set()
+        await scheduler.join()
+        assert gate.started == ["busy", "d", "a"]
+        assert scheduler.get_stats().dropped == 2
+
+    @pytest.mark.asyncio
+    async def test_failures_are_counted(self):
+        gate = Gate()
+        gate.release.set()
+        done = []
+        scheduler = RevalidationScheduler()
+        scheduler.schedule("ok", gate.job("ok"), on_done=lambda: done.append("ok"))
+        scheduler.schedule("bad", gate.job("bad", fail=True), on_done=lambda: done.append("bad"))
+        await scheduler.join()
+
+        stats = scheduler.get_stats()
+        assert (stats.succeeded, stats.failed) == (1, 1)
+        assert sorted(done) == ["bad", "ok"]
+
+    @pytest.mark.asyncio
+    async def test_schedule_while_worker_is_finishing(self):
+        gate = Gate()
+        gate.release.set()
+        scheduler = RevalidationScheduler(max_concurrency=1, max_queue_size=10)
+        scheduler.schedule("a", gate.job("a"))
+        (worker,) = scheduler._workers
+        while not worker.done():
+            await asyncio.sleep(0)
+        # Returned, but its done callback has not dropped it from the set yet
+        assert worker in scheduler._workers
+
+        assert scheduler.schedule("b", gate.job("b")) is True
+        await scheduler.join()
+
+        assert gate.started == ["a", "b"]
+        stats = scheduler.get_stats()
+        assert (stats.succeeded, stats.pending, stats.running) == (2, 0, 0)
+
+    @pytest.mark.asyncio
+    async def test_close_cancels_and_releases(self):
+        gate = Gate()
+        done = []
+        scheduler = RevalidationScheduler(max_concurrency=1)
+        scheduler.schedule("running", gate.job("running"), on_done=lambda: done.append("running"))
+        scheduler.schedule("queued", gate.job("queued"), on_done=lambda: done.append("queued"))
+        await asyncio.sleep(0.01)
+
+        await scheduler.close()
+        assert sorted(done) == ["queued", "running"]
+        assert gate.started == ["running"]
+        assert scheduler.get_stats().running == 0
+
+
+class TestResponseCacheRevalidation:
+    @pytest.mark.asyncio
+    async def test_stale_burst_is_bounded(self):
+        cache = ResponseCache(CacheResponseConfig(max_concurrent_revalidations=2))
+        gate = Gate()
+        revalidated = []
+
+        async def revalidator(url, headers):
+            await gate.job(url)()
+            revalidated.append(url)
+
+        cache.set_background_revalidator(revalidator)
+        urls = [f"https://example.com/api/{i}" for i in range(10)]
+        for url in urls:
+            await cache.store("GET", url, 200, {"cache-control": "max-age=0, stale-while-revalidate=60"}, b"body")
+        await asyncio.sleep(0.01)
+
+        for url in urls + urls:
+            await cache.lookup("GET", url)
+        await asyncio.sleep(0.01)
+        assert gate.running == 2
+
+        gate.release.set()
+        await cache._scheduler.join()
+        stats = cache.get_revalidation_stats()
+        assert gate.peak == 2
+        assert sorted(revalidated) == sorted(urls)
+        assert (stats.queued, stats.deduplicated, stats.succeeded) == (10, 10, 10)
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_dropped_refresh_releases_slot(self):
+        cache = ResponseCache(
+            CacheResponseConfig(
+                refresh_ahead=True,
+                refresh_ahead_min_hits=1,
+                max_concurrent_revalidations=1,
+                revalidation_queue_size=0,
+            )
+        )
+        url = "https://example.com/api/config"
+        await cache.store("GET", url, 200, {"cache-control": "max-age=100"}, b"body")
+        cached = await cache._store.get(cache.generate_key("GET", url))
+        cached.metadata.cached_at -= 90
+        cached.metadata.expires_at -= 90
+
+        async def revalidator(url, headers):
+            pass
+
+        cache.set_background_revalidator(revalidator)
+        assert (await cache.lookup("GET", url)).should_refresh is True
+        assert cache.get_revalidation_stats().dropped == 1
+        assert cache._refreshing_keys == set()
+        await cache.close()
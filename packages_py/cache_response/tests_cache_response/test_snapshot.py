@@ -0,0 +1,173 @@
+"""Tests for cache snapshot export/import."""
+import os
+import time
+import pytest
+
+from cache_response import (
+    ResponseCache,
+    CacheResponseConfig,
+    CacheFreshness,
+    MemoryCacheStore,
+    TieredCacheStore,
+    read_snapshot,
+    snapshot_lifespan,
+    write_snapshot,
+)
+from cache_response import snapshot
+
+
+async def warm_cache(cache: ResponseCache) -> None:
+    await cache.store("GET", "https://api.example.com/a", 200, {"cache-control": "max-age=300"}, b"a")
+    await cache.store(
+        "GET",
+        "https://api.example.com/b",
+        200,
+        {"cache-control": "max-age=300", "vary": "Accept"},
+        b"b-json",
+        {"Accept": "application/json"},
+    )
+
+
+class TestSnapshotRoundTrip:
+    @pytest.mark.asyncio
+    async def test_export_import(self, tmp_path):
+        path = str(tmp_path / "responses.snap")
+        cache = ResponseCache()
+        await warm_cache(cache)
+
+        # Plain entry, plus variant index and one variant for /b
+        assert await cache.export_snapshot(path) == 3
+        assert not os.path.exists(f"{path}.tmp")
+
+        warm = ResponseCache()
+        assert await warm.import_snapshot(path) == 3
+
+        lookup = await warm.lookup("GET", "https://api.example.com/a")
+        assert lookup.freshness == CacheFreshness.FRESH
+        assert lookup.response.body == b"a"
+        lookup = await warm.lookup("GET", "https://api.example.com/b", {"Accept": "application/json"})
+        assert lookup.response.body == b"b-json"
+
+    @pytest.mark.asyncio
+    async def test_compressed_bodies_stay_encoded(self, tmp_path):
+        path = str(tmp_path / "responses.snap")
+        config = CacheResponseConfig(body_codec="zlib", body_codec_min_size=0)
+        cache = ResponseCache(config)
+        body = b'{"items": []}' * 100
+        await cache.store("GET", "https://api.example.com/big", 200, {"cache-control": "max-age=300"}, body)
+        await cache.export_snapshot(path)
+
+        [(key, entry)] = list(read_snapshot(path))
+        assert entry.body_codec == "zlib"
+        assert len(entry.encoded_body) < len(body)
+
+        warm = ResponseCache(config)
+        await warm.import_snapshot(path)
+        assert (await warm.lookup("GET", "https://api.example.com/big")).response.body == body
+
+    @pytest.mark.asyncio
+    async def test_import_skips_expired_entries(self, tmp_path):
+        path = str(tmp_path / "responses.snap")
+        store = MemoryCacheStore()
+        cache = ResponseCache(store=store)
+        await warm_cache(cache)
+        await write_snapshot(store, path)
+
+        entries = list(read_snapshot(path))
+        for _, entry in entries:
+            if entry.metadata.url.endswith("/a"):
+                entry.metadata.expires_at = time.time() - 1
+        expired_store = MemoryCacheStore()
+        for key, entry in entries:
+            await expired_store.set(key, entry)
+        await write_snapshot(expired_store, path)
+
+        warm = ResponseCache()
+        assert await warm.import_snapshot(path) == 2
+        assert (await warm.lookup("GET", "https://api.example.com/a")).found is False
+
+    @pytest.mark.asyncio
+    async def test_missing_file_loads_nothing(self, tmp_path):
+        assert await ResponseCache().import_snapshot(str(tmp_path / "missing.snap")) == 0
+
+    @pytest.mark.asyncio
+    async def test_truncated_snapshot_loads_complete_records(self, tmp_path):
+        path = str(tmp_path / "responses.snap")
+        cache = ResponseCache()
+        await warm_cache(cache)
+        await cache.export_snapshot(path)
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) - 3)
+
+        assert await ResponseCache().import_snapshot(path) == 2
+
+    @pytest.mark.asyncio
+    async def test_records_span_io_batches(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(snapshot, "_BATCH_SIZE", 7)
+        path = str(tmp_path / "responses.snap")
+        cache = ResponseCache()
+        await warm_cache(cache)
+
+        assert await cache.export_snapshot(path) == 3
+        warm = ResponseCache()
+        assert await warm.import_snapshot(path) == 3
+        assert (await warm.lookup("GET", "https://api.example.com/a")).response.body == b"a"
+
+    def test_rejects_foreign_file(self, tmp_path):
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"not a snapshot at all")
+        with pytest.raises(ValueError):
+            list(read_snapshot(str(path)))
+
+
+class TestSnapshotAccessStats:
+    @pytest.mark.asyncio
+    async def test_export_leaves_memory_stats_and_lru_order(self, tmp_path):
+        store = MemoryCacheStore(max_entries=2)
+        cache = ResponseCache(store=store)
+        await cache.store("GET", "https://api.example.com/a", 200, {"cache-control": "max-age=300"}, b"a")
+        await cache.store("GET", "https://api.example.com/b", 200, {"cache-control": "max-age=300"}, b"b")
+
+        assert await write_snapshot(store, str(tmp_path / "responses.snap")) == 2
+        stats = store.get_stats()
+        assert (stats.hits, stats.misses) == (0, 0)
+
+        # /a is still least recently used, so it is the one evicted
+        await cache.store("GET", "https://api.example.com/c", 200, {"cache-control": "max-age=300"}, b"c")
+        assert (await cache.lookup("GET", "https://api.example.com/a")).found is False
+        assert (await cache.lookup("GET", "https://api.example.com/b")).found is True
+
+    @pytest.mark.asyncio
+    async def test_export_does_not_promote_tiered_entries(self, tmp_path):
+        l2 = MemoryCacheStore()
+        store = TieredCacheStore(l2)
+        cache = ResponseCache(store=l2)
+        await warm_cache(cache)
+
+        assert await write_snapshot(store, str(tmp_path / "responses.snap")) == 3
+        stats = store.get_stats()
+        assert (stats.l2_hits, stats.misses, stats.promotions) == (0, 0, 0)
+        assert await store.l1.size() == 0
+
+
+class TestSnapshotLifespan:
+    @pytest.mark.asyncio
+    async def test_imports_on_startup_and_exports_on_shutdown(self, tmp_path):
+        path = str(tmp_path / "responses.snap")
+        first = ResponseCache()
+        async with snapshot_lifespan((first, path))(None):
+            await warm_cache(first)
+        assert os.path.exists(path)
+
+        second = ResponseCache()
+        async with snapshot_lifespan((second, path))(None):
+            assert (await second.lookup("GET", "https://api.example.com/a")).found is True
+
+    @pytest.mark.asyncio
+    async def test_bad_snapshot_starts_cold(self, tmp_path):
+        path = tmp_path / "responses.snap"
+        path.write_bytes(b"garbage")
+        cache = ResponseCache()
+
+        async with snapshot_lifespan((cache, str(path)))(None):
+            assert (await cache.lookup("GET", "https://api.example.com/a")).found is False
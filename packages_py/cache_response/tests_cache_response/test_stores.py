@@ -1,6 +1,7 @@
 """Tests for cache stores."""
 import asyncio
 import json
+import threading
 import time
 import pytest
 
@@ -9,6 +10,14 @@ from cache_response import (
     create_memory_cache_store,
     CachedResponse,
     CacheEntryMetadata,
+    ResponseCache,
+    estimate_entry_size,
+    CountMinSketch,
+    LruPolicy,
+    WTinyLfuPolicy,
+    create_eviction_policy,
+    SyncMemoryCacheStore,
+    create_sync_memory_cache_store,
 )
 
 
@@ -519,3 +528,358 @@ class TestStatsCalculation:
         assert stats2.utilization_percent <= 100
 
         await store.close()
+
+
+class TestExpiryIndex:
+    @pytest.mark.asyncio
+    async def test_sweep_removes_only_due_entries(self):
+        store = MemoryCacheStore(max_entries=10_000, max_size=1024 * 1024 * 1024)
+
+        for i in range(1000):
+            await store.set(f"live{i}", create_response(f"live{i}", 60))
+        for i in range(10):
+            await store.set(f"gone{i}", create_response(f"gone{i}", -1))
+
+        assert await store.size() == 1000
+        assert await store.has("live0") is True
+
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_overwritten_entry_keeps_new_expiry(self):
+        store = MemoryCacheStore()
+
+        await store.set("key1", create_response("old", -1))
+        await store.set("key1", create_response("new", 60))
+
+        assert await store.size() == 1
+        assert (await store.get("key1")).body == json.dumps({"key": "new"}).encode()
+
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_stale_heap_items_stay_bounded(self):
+        store = MemoryCacheStore()
+
+        for i in range(5000):
+            await store.set("hot", create_response(f"v{i}", 60))
+
+        assert len(store._expiry) <= 2 * 1 + 64 + 1
+        assert await store.size() == 1
+
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_evicted_entry_heap_item_is_ignored(self):
+        store = MemoryCacheStore(max_entries=1)
+
+        await store.set("key1", create_response("first", 60))
+        await store.set("key2", create_response("second", 60))
+
+        assert await store.keys() == ["key2"]
+
+        await store.close()
+
+
+class TestCarriedEntrySize:
+    @pytest.mark.asyncio
+    async def test_uses_size_carried_by_entry(self):
+        store = MemoryCacheStore()
+        response = create_response("test")
+        response.size = 4321
+
+        await store.set("key1", response)
+
+        assert store.get_stats().size_bytes == 4321
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_estimate_counts_body_and_headers(self):
+        response = create_response("test")
+        base = estimate_entry_size(response.metadata)
+
+        assert estimate_entry_size(response.metadata, b"x" * 100) == base + 100
+
+        response.metadata.headers["x-extra"] = "abcde"
+        assert estimate_entry_size(response.metadata) == base + len("x-extra") + 5
+
+    @pytest.mark.asyncio
+    async def test_response_cache_sets_entry_size(self):
+        store = MemoryCacheStore()
+        cache = ResponseCache(store=store)
+
+        await cache.store(
+            "GET", "https://example.com/a", 200, {"cache-control": "max-age=60"}, b"x" * 1000
+        )
+
+        cached = await store.get("GET:https://example.com/a")
+        assert cached.size == estimate_entry_size(cached.metadata, cached.body)
+        assert store.get_stats().size_bytes == cached.size
+        await cache.close()
+
+
+def body_response(key: str, body: bytes) -> CachedResponse:
+    """Create a test response with a given body."""
+    response = create_response(key)
+    response.body = body
+    return response
+
+
+class TestBodyDeduplication:
+    BODY = b'{"items": [], "next": null}' * 100
+
+    @pytest.mark.asyncio
+    async def test_identical_bodies_stored_once(self):
+        store = MemoryCacheStore(dedupe_bodies=True)
+        await store.set("a", body_response("a", bytes(self.BODY)))
+        await store.set("b", body_response("b", bytes(self.BODY)))
+
+        a, b = await store.get("a"), await store.get("b")
+        assert a.body is b.body
+        stats = store.get_stats()
+        assert stats.pooled_bodies == 1
+        assert stats.shared_bytes == len(self.BODY)
+        assert stats.size_bytes == (
+            estimate_entry_size(a.metadata) + estimate_entry_size(b.metadata) + len(self.BODY)
+        )
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_body_released_with_last_reference(self):
+        store = MemoryCacheStore(dedupe_bodies=True)
+        await store.set("a", body_response("a", self.BODY))
+        await store.set("b", body_response("b", self.BODY))
+
+        await store.delete("a")
+        assert (await store.get("b")).body == self.BODY
+        assert store.get_stats().shared_bytes == 0
+
+        await store.delete("b")
+        stats = store.get_stats()
+        assert (stats.pooled_bodies, stats.size_bytes) == (0, 0)
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_replacing_key_keeps_shared_body(self):
+        store = MemoryCacheStore(dedupe_bodies=True)
+        await store.set("a", body_response("a", self.BODY))
+        await store.set("a", body_response("a", self.BODY))
+        await store.set("b", body_response("b", b"other body " * 10))
+
+        stats = store.get_stats()
+        assert (stats.entries, stats.pooled_bodies, stats.shared_bytes) == (2, 2, 0)
+        await store.clear()
+        assert store.get_stats().size_bytes == 0
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_more_urls_fit_in_budget(self):
+        budget = 4 * len(self.BODY)
+        plain = MemoryCacheStore(max_size=budget, max_entries=1000)
+        pooled = MemoryCacheStore(max_size=budget, max_entries=1000, dedupe_bodies=True)
+        for i in range(20):
+            await plain.set(f"page-{i}", body_response(f"page-{i}", self.BODY))
+            await pooled.set(f"page-{i}", body_response(f"page-{i}", self.BODY))
+
+        assert await plain.size() < 4
+        assert await pooled.size() == 20
+        await plain.close()
+        await pooled.close()
+
+    @pytest.mark.asyncio
+    async def test_revalidation_reuses_pooled_body(self):
+        store = MemoryCacheStore(dedupe_bodies=True)
+        cache = ResponseCache(store=store)
+        headers = {"cache-control": "max-age=60"}
+        await cache.store("GET", "https://example.com/a", 200, headers, self.BODY)
+        await cache.store("GET", "https://example.com/b", 200, headers, self.BODY)
+
+        await cache.revalidate("GET", "https://example.com/a", {"cache-control": "max-age=120"})
+        stats = store.get_stats()
+        assert (stats.pooled_bodies, stats.shared_bytes) == (1, len(self.BODY))
+        assert (await cache.lookup("GET", "https://example.com/a")).response.body == self.BODY
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_small_bodies_not_pooled(self):
+        store = MemoryCacheStore(dedupe_bodies=True)
+        await store.set("a", body_response("a", b"tiny"))
+        await store.set("b", body_response("b", b"tiny"))
+
+        assert store.get_stats().pooled_bodies == 0
+        await store.close()
+
+
+class TestCountMinSketch:
+    def test_estimates_access_counts(self):
+        sketch = CountMinSketch(capacity=64)
+        for _ in range(5):
+            sketch.increment("hot")
+        sketch.increment("cold")
+
+        assert sketch.estimate("hot") >= 5
+        assert sketch.estimate("cold") >= 1
+        assert sketch.estimate("hot") > sketch.estimate("cold")
+
+    def test_counters_saturate_and_age(self):
+        sketch = CountMinSketch(capacity=16)
+        for _ in range(100):
+            sketch.increment("hot")
+        assert sketch.estimate("hot") == 15
+
+        for i in range(200):
+            sketch.increment(f"other-{i}")
+        assert sketch.estimate("hot") < 15
+
+
+class TestPluggableEviction:
+    def test_create_policy_by_name(self):
+        assert isinstance(create_eviction_policy("lru"), LruPolicy)
+        assert isinstance(create_eviction_policy("w-tinylfu"), WTinyLfuPolicy)
+        with pytest.raises(ValueError):
+            create_eviction_policy("fifo")
+
+    @pytest.mark.asyncio
+    async def test_custom_policy_instance(self):
+        class NewestFirst(LruPolicy):
+            name = "mru"
+
+            def evict(self):
+                if not self._order:
+                    return None
+                key, _ = self._order.popitem(last=True)
+                return key
+
+        store = MemoryCacheStore(max_entries=2, eviction_policy=NewestFirst())
+        for i in range(3):
+            await store.set(f"key{i}", create_response(f"test{i}"))
+
+        assert await store.keys() == ["key0", "key2"]
+        assert store.get_stats().eviction_policy == "mru"
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_stats_report_policy_and_hit_rate(self):
+        store = MemoryCacheStore(eviction_policy="w-tinylfu")
+        await store.set("key1", create_response("test"))
+        await store.get("key1")
+        await store.get("key1")
+        await store.get("missing")
+
+        stats = store.get_stats()
+        assert stats.eviction_policy == "w-tinylfu"
+        assert (stats.hits, stats.misses) == (2, 1)
+        assert stats.hit_rate == pytest.approx(2 / 3)
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_rewrite_keeps_entry_and_size(self):
+        store = MemoryCacheStore(max_entries=2, eviction_policy="w-tinylfu")
+        await store.set("key1", create_response("test1"))
+        await store.set("key1", create_response("test1"))
+
+        assert await store.size() == 1
+        assert store.get_stats().size_bytes == estimate_entry_size(
+            create_response("test1").metadata, create_response("test1").body
+        )
+        await store.close()
+
+
+class TestWTinyLfuScanResistance:
+    async def _run_trace(self, policy: str) -> MemoryCacheStore:
+        store = MemoryCacheStore(max_entries=20, eviction_policy=policy)
+        hot = [f"hot{i}" for i in range(10)]
+
+        async def access(key: str) -> None:
+            if await store.get(key) is None:
+                await store.set(key, create_response(key))
+
+        for _ in range(5):
+            for key in hot:
+                await access(key)
+        # One-off crawl, with the hot endpoints still requested now and then
+        for i in range(300):
+            await access(f"scan{i}")
+            if i % 3 == 2:
+                await access(hot[(i // 3) % len(hot)])
+        return store
+
+    @pytest.mark.asyncio
+    async def test_hot_set_survives_scan(self):
+        store = await self._run_trace("w-tinylfu")
+        keys = set(await store.keys())
+        assert {f"hot{i}" for i in range(10)} <= keys
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_lru_loses_hot_set_to_scan(self):
+        store = await self._run_trace("lru")
+        keys = set(await store.keys())
+        assert len(keys & {f"hot{i}" for i in range(10)}) < 10
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_respects_entry_limit(self):
+        store = await self._run_trace("w-tinylfu")
+        assert await store.size() <= 20
+        await store.close()
+
+
+class TestSyncMemoryCacheStore:
+    def test_store_and_retrieve(self):
+        store = create_sync_memory_cache_store()
+        store.set("key1", create_response("test"))
+
+        assert store.get("key1").metadata.url == "https://example.com/test"
+        assert store.has("key1") is True
+        assert store.delete("key1") is True
+        assert store.get("key1") is None
+
+    def test_evicts_least_recently_used(self):
+        store = SyncMemoryCacheStore(max_entries=2)
+        store.set("key1", create_response("1"))
+        store.set("key2", create_response("2"))
+        store.get("key1")
+        store.set("key3", create_response("3"))
+
+        assert sorted(store.keys()) == ["key1", "key3"]
+
+    def test_size_budget(self):
+        response = create_response("x")
+        entry_size = estimate_entry_size(response.metadata, response.body)
+        store = SyncMemoryCacheStore(max_size=entry_size * 2, max_entries=100)
+        for i in range(5):
+            store.set(f"key{i}", create_response("x"))
+
+        stats = store.get_stats()
+        assert stats.entries == 2
+        assert stats.size_bytes <= entry_size * 2
+
+    def test_expired_entries_are_dropped(self):
+        store = SyncMemoryCacheStore()
+        store.set("old", create_response("old", expires_in_seconds=-1))
+        store.set("new", create_response("new"))
+
+        assert store.get("old") is None
+        assert store.size() == 1
+
+    def test_concurrent_threads(self):
+        store = SyncMemoryCacheStore(max_entries=50)
+
+        def worker(worker_id):
+            for i in range(200):
+                key = f"key{(worker_id * 7 + i) % 80}"
+                store.set(key, create_response(key))
+                store.get(key)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = store.get_stats()
+        assert stats.entries == len(store.keys()) <= 50
+        assert stats.size_bytes == sum(
+            estimate_entry_size(store.get(key).metadata, store.get(key).body) for key in store.keys()
+        )
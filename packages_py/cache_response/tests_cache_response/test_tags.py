@@ -0,0 +1,177 @@
+"""Tests for tag-based (surrogate key) invalidation."""
+import pytest
+
+from cache_response import (
+    ResponseCache,
+    CacheResponseConfig,
+    CacheResponseEventType,
+    MemoryCacheStore,
+    DiskCacheStore,
+    RedisCacheStore,
+    TieredCacheStore,
+    parse_cache_tags,
+)
+from cache_response.stores.serialization import decode_entry, encode_entry
+
+ISSUE = "https://api.example.com/issues/1"
+COMMENTS = "https://api.example.com/issues/1/comments"
+OTHER = "https://api.example.com/issues/2"
+
+
+class ScanOnlyStore(MemoryCacheStore):
+    """Memory store without a tag index, forcing the scan fallback."""
+
+    keys_for_tag = None
+
+
+async def warm(cache: ResponseCache) -> None:
+    await cache.store("GET", ISSUE, 200, {"cache-control": "max-age=300", "surrogate-key": "issue-1 project-a"}, b"1")
+    await cache.store("GET", COMMENTS, 200, {"cache-control": "max-age=300", "cache-tag": "issue-1,comments"}, b"c")
+    await cache.store("GET", OTHER, 200, {"cache-control": "max-age=300", "surrogate-key": "issue-2 project-a"}, b"2")
+
+
+async def found(cache: ResponseCache, url: str) -> bool:
+    return (await cache.lookup("GET", url)).found
+
+
+class TestParseCacheTags:
+    def test_space_and_comma_separated(self):
+        headers = {"surrogate-key": "a b  c", "cache-tag": "c, d,e"}
+        assert parse_cache_tags(headers, ["surrogate-key", "cache-tag"]) == ["a", "b", "c", "d", "e"]
+
+    def test_missing_headers(self):
+        assert parse_cache_tags({"content-type": "text/plain"}, ["surrogate-key"]) == []
+
+
+class TestInvalidateTag:
+    @pytest.mark.asyncio
+    async def test_drops_only_tagged_entries(self):
+        cache = ResponseCache()
+        await warm(cache)
+
+        assert await cache.invalidate_tag("issue-1") == 2
+        assert not await found(cache, ISSUE)
+        assert not await found(cache, COMMENTS)
+        assert await found(cache, OTHER)
+        assert await cache.invalidate_tag("issue-1") == 0
+
+    @pytest.mark.asyncio
+    async def test_emits_event(self):
+        cache = ResponseCache()
+        events = []
+        cache.on(lambda e: events.append(e))
+        await warm(cache)
+
+        await cache.invalidate_tag("project-a")
+        [event] = [e for e in events if e.type == CacheResponseEventType.CACHE_INVALIDATE_TAG]
+        assert event.key == "project-a"
+        assert event.metadata == {"invalidated": 2}
+
+    @pytest.mark.asyncio
+    async def test_tagger_adds_tags(self):
+        config = CacheResponseConfig(tagger=lambda method, url, headers: [url.rsplit("/", 1)[-1]])
+        cache = ResponseCache(config)
+        await warm(cache)
+
+        assert await cache.invalidate_tag("comments") == 1
+        assert not await found(cache, COMMENTS)
+        assert await found(cache, ISSUE)
+
+    @pytest.mark.asyncio
+    async def test_tagger_error_bypasses_cache(self):
+        def tagger(method, url, headers):
+            raise RuntimeError("boom")
+
+        cache = ResponseCache(CacheResponseConfig(tagger=tagger))
+        events = []
+        cache.on(lambda e: events.append(e))
+        await cache.store("GET", ISSUE, 200, {"cache-control": "max-age=300"}, b"1")
+
+        assert not await found(cache, ISSUE)
+        assert any(
+            e.type == CacheResponseEventType.CACHE_BYPASS and e.metadata["reason"] == "tagger-error"
+            for e in events
+        )
+
+    @pytest.mark.asyncio
+    async def test_tag_headers_can_be_disabled(self):
+        cache = ResponseCache(CacheResponseConfig(tag_headers=[]))
+        await warm(cache)
+        assert await cache.invalidate_tag("issue-1") == 0
+
+    @pytest.mark.asyncio
+    async def test_variants_are_tagged(self):
+        cache = ResponseCache()
+        headers = {"cache-control": "max-age=300", "vary": "Accept", "surrogate-key": "issue-1"}
+        await cache.store("GET", ISSUE, 200, headers, b"json", {"Accept": "application/json"})
+        await cache.store("GET", ISSUE, 200, headers, b"xml", {"Accept": "application/xml"})
+
+        assert await cache.invalidate_tag("issue-1") == 2
+        assert not (await cache.lookup("GET", ISSUE, {"Accept": "application/json"})).found
+
+    @pytest.mark.asyncio
+    async def test_scan_fallback(self):
+        cache = ResponseCache(store=ScanOnlyStore())
+        await warm(cache)
+        assert await cache.invalidate_tag("issue-1") == 2
+        assert await found(cache, OTHER)
+
+    @pytest.mark.asyncio
+    async def test_tags_survive_revalidation_and_serialization(self):
+        cache = ResponseCache()
+        await warm(cache)
+        await cache.revalidate("GET", ISSUE, {"cache-control": "max-age=600"})
+
+        cached = (await cache.lookup("GET", ISSUE)).response
+        assert cached.tags == ["issue-1", "project-a"]
+        assert decode_entry(encode_entry(cached)).tags == ["issue-1", "project-a"]
+        assert await cache.invalidate_tag("project-a") == 2
+
+
+class TestStoreTagIndexes:
+    @pytest.mark.asyncio
+    async def test_memory_index_follows_eviction(self):
+        store = MemoryCacheStore(max_entries=2)
+        cache = ResponseCache(store=store)
+        await warm(cache)
+
+        # ISSUE was evicted to make room for OTHER
+        assert sorted(await store.keys_for_tag("issue-1")) == [f"GET:{COMMENTS}"]
+        await store.clear()
+        assert await store.keys_for_tag("project-a") == []
+
+    @pytest.mark.asyncio
+    async def test_disk_index_rebuilt_after_reopen(self, tmp_path):
+        cache = ResponseCache(store=DiskCacheStore(str(tmp_path)))
+        await warm(cache)
+        await cache.close()
+
+        reopened = ResponseCache(store=DiskCacheStore(str(tmp_path)))
+        assert await reopened.invalidate_tag("issue-1") == 2
+        assert await found(reopened, OTHER)
+        await reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_redis_tag_sets(self, fake_redis):
+        store = RedisCacheStore(fake_redis)
+        cache = ResponseCache(store=store)
+        await warm(cache)
+
+        assert "cache_response_tags:issue-1" in fake_redis.data
+        assert "cache_response_tags:issue-1" in fake_redis.expiry
+        assert await cache.invalidate_tag("issue-1") == 2
+        assert await found(cache, OTHER)
+
+        await store.clear()
+        assert not any(name.startswith("cache_response_tags:") for name in fake_redis.data)
+
+    @pytest.mark.asyncio
+    async def test_tiered_unions_both_tiers(self, tmp_path):
+        l2 = DiskCacheStore(str(tmp_path))
+        await warm(ResponseCache(store=l2))
+        store = TieredCacheStore(l2, MemoryCacheStore())
+        cache = ResponseCache(store=store)
+        await cache.store("GET", "https://api.example.com/local", 200, {"cache-control": "max-age=300", "surrogate-key": "issue-1"}, b"l")
+
+        assert await cache.invalidate_tag("issue-1") == 3
+        await cache.close()
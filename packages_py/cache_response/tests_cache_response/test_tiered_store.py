@@ -0,0 +1,215 @@
+"""Tests for the two-tier (L1 memory / L2 shared) cache store."""
+import asyncio
+import json
+import time
+import pytest
+
+from cache_response import (
+    TieredCacheStore,
+    create_tiered_cache_store,
+    MemoryCacheStore,
+    DiskCacheStore,
+    RedisCacheStore,
+    CachedResponse,
+    CacheEntryMetadata,
+    ResponseCache,
+)
+
+
+def create_response(key: str, expires_in_seconds: float = 60) -> CachedResponse:
+    """Create a test response."""
+    now = time.time()
+    return CachedResponse(
+        metadata=CacheEntryMetadata(
+            url=f"https://example.com/{key}",
+            method="GET",
+            status_code=200,
+            headers={"content-type": "application/json"},
+            cached_at=now,
+            expires_at=now + expires_in_seconds,
+        ),
+        body=json.dumps({"key": key}).encode(),
+    )
+
+
+class FailingStore(MemoryCacheStore):
+    """L2 stand-in whose writes fail."""
+
+    async def set(self, key, response):
+        raise ConnectionError("l2 down")
+
+
+@pytest.fixture
+async def store():
+    """Create a TieredCacheStore over an in-memory L2 for testing."""
+    s = TieredCacheStore(MemoryCacheStore(), l1=MemoryCacheStore(max_entries=2))
+    yield s
+    await s.close()
+
+
+class TestReadPath:
+    @pytest.mark.asyncio
+    async def test_write_goes_to_both_tiers(self, store):
+        await store.set("key1", create_response("test"))
+
+        assert await store.l1.has("key1") is True
+        assert await store.l2.has("key1") is True
+
+    @pytest.mark.asyncio
+    async def test_l1_hit(self, store):
+        await store.set("key1", create_response("test"))
+
+        assert (await store.get("key1")).metadata.url == "https://example.com/test"
+        stats = store.get_stats()
+        assert (stats.l1_hits, stats.l2_hits, stats.misses) == (1, 0, 0)
+
+    @pytest.mark.asyncio
+    async def test_l2_hit_is_promoted(self, store):
+        await store.l2.set("key1", create_response("test"))
+
+        assert await store.get("key1") is not None
+        assert await store.l1.has("key1") is True
+        await store.get("key1")
+
+        stats = store.get_stats()
+        assert (stats.l1_hits, stats.l2_hits, stats.promotions) == (1, 1, 1)
+
+    @pytest.mark.asyncio
+    async def test_small_l1_falls_back_to_l2(self, store):
+        for i in range(3):
+            await store.set(f"key{i}", create_response(f"test{i}"))
+
+        assert await store.l1.has("key0") is False
+        assert await store.get("key0") is not None
+        assert store.get_stats().l2_hits == 1
+
+    @pytest.mark.asyncio
+    async def test_hit_ratios(self, store):
+        await store.set("key1", create_response("1"))
+        await store.l2.set("key2", create_response("2"))
+
+        await store.get("key1")  # L1
+        await store.get("key2")  # L2
+        await store.get("missing")
+        await store.get("missing")
+
+        stats = store.get_stats()
+        assert stats.l1_hit_ratio == pytest.approx(1 / 4)
+        assert stats.l2_hit_ratio == pytest.approx(1 / 3)
+        assert stats.hit_ratio == pytest.approx(2 / 4)
+        assert stats.l1.entries == 2
+
+    @pytest.mark.asyncio
+    async def test_delete_and_clear_both_tiers(self, store):
+        await store.set("key1", create_response("1"))
+        await store.set("key2", create_response("2"))
+
+        assert await store.delete("key1") is True
+        assert await store.has("key1") is False
+
+        await store.clear()
+        assert await store.l1.size() == 0
+        assert await store.size() == 0
+
+
+class TestWriteBehind:
+    @pytest.mark.asyncio
+    async def test_l2_written_in_background(self):
+        store = TieredCacheStore(MemoryCacheStore(), write_behind=True)
+        await store.set("key1", create_response("test"))
+
+        assert await store.l2.has("key1") is False
+        assert await store.get("key1") is not None  # Served from L1 meanwhile
+
+        await asyncio.sleep(0.01)
+        assert await store.l2.has("key1") is True
+        assert store.get_stats().write_behind_pending == 0
+        await store.close()
+
+    def test_store_created_outside_event_loop(self):
+        store = TieredCacheStore(MemoryCacheStore(), write_behind=True)
+        assert store._pending_event is None
+
+        async def use():
+            await store.set("key1", create_response("test"))
+            await asyncio.sleep(0.01)
+            assert await store.l2.has("key1") is True
+            await store.close()
+
+        asyncio.run(use())
+
+    @pytest.mark.asyncio
+    async def test_queue_full_writes_inline(self):
+        store = TieredCacheStore(
+            MemoryCacheStore(), write_behind=True, write_behind_queue_size=1
+        )
+        await store.set("key1", create_response("1"))
+        await store.set("key2", create_response("2"))
+
+        assert await store.l2.has("key2") is True
+        assert store.get_stats().write_behind_overflows == 1
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_delete_drops_queued_write(self):
+        store = TieredCacheStore(MemoryCacheStore(), write_behind=True)
+        await store.set("key1", create_response("1"))
+
+        assert await store.delete("key1") is True
+        await store.flush()
+        assert await store.l2.has("key1") is False
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_queue(self):
+        l2 = MemoryCacheStore()
+        store = TieredCacheStore(l2, write_behind=True)
+        for i in range(5):
+            await store.set(f"key{i}", create_response(str(i)))
+
+        await store.flush()
+        assert await l2.size() == 5
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_write_errors_are_counted(self):
+        store = TieredCacheStore(FailingStore(), write_behind=True)
+        await store.set("key1", create_response("1"))
+        await store.flush()
+
+        assert store.get_stats().l2_write_errors == 1
+        assert await store.get("key1") is not None
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_redis_l2_batches_writes(self, fake_redis):
+        store = TieredCacheStore(RedisCacheStore(fake_redis), write_behind=True)
+        for i in range(10):
+            await store.set(f"key{i}", create_response(str(i)))
+        fake_redis.round_trips = 0
+
+        await store.flush()
+
+        assert fake_redis.round_trips == 1
+        assert len(fake_redis.data) == 10
+        await store.close()
+
+
+class TestSharedL2:
+    @pytest.mark.asyncio
+    async def test_workers_share_disk_l2(self, tmp_path):
+        worker_a = ResponseCache(store=create_tiered_cache_store(DiskCacheStore(str(tmp_path))))
+        await worker_a.store(
+            "GET", "https://api.example.com/shared", 200, {"cache-control": "max-age=300"}, b"x"
+        )
+        await worker_a.close()
+
+        tiered = create_tiered_cache_store(DiskCacheStore(str(tmp_path)))
+        worker_b = ResponseCache(store=tiered)
+        for _ in range(3):
+            lookup = await worker_b.lookup("GET", "https://api.example.com/shared")
+            assert lookup.response.body == b"x"
+
+        stats = tiered.get_stats()
+        assert (stats.l1_hits, stats.l2_hits) == (2, 1)
+        await worker_b.close()
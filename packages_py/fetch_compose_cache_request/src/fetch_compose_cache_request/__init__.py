@@ -13,6 +13,8 @@ from cache_request import (
     CacheRequestEventListener,
 )
 from .transport import CacheRequestTransport, SyncCacheRequestTransport
+from .spool import ResponseSpool, SpoolStream
+from .body import read_request_body, read_sync_request_body
 from .factory import (
     compose_transport,
     compose_sync_transport,
@@ -37,6 +39,12 @@ __all__ = [
     # Transport wrappers
     "CacheRequestTransport",
     "SyncCacheRequestTransport",
+    # Coalesced response streaming
+    "ResponseSpool",
+    "SpoolStream",
+    # Request body digests
+    "read_request_body",
+    "read_sync_request_body",
     # Factory functions
     "compose_transport",
     "compose_sync_transport",
@@ -0,0 +1,103 @@
+"""
+Request body digests for httpx requests.
+
+Both cache transports key requests by a digest of their body. Reading a
+streamed body consumes it, so the helpers here hand back a request that
+still sends the whole body: buffered while the digest may be used, and
+streamed straight through once a size-capped digest overflows.
+"""
+import itertools
+from typing import AsyncIterable, AsyncIterator, Iterable, List, Union
+
+import httpx
+
+from cache_request import BodyDigest
+
+
+def _replayable_request(request: httpx.Request, chunks: List[bytes]) -> httpx.Request:
+    """Rebuild a streamed request around its buffered body."""
+    headers = [
+        (name, value)
+        for name, value in request.headers.multi_items()
+        if name.lower() != "transfer-encoding"
+    ]
+    return httpx.Request(
+        request.method,
+        request.url,
+        headers=headers,
+        content=b"".join(chunks),
+        extensions=request.extensions,
+    )
+
+
+def _resumed_request(
+    request: httpx.Request, content: Union[Iterable[bytes], AsyncIterable[bytes]]
+) -> httpx.Request:
+    """Rebuild a streamed request around a stream resuming where the digest stopped."""
+    return httpx.Request(
+        request.method,
+        request.url,
+        headers=request.headers,
+        content=content,
+        extensions=request.extensions,
+    )
+
+
+async def read_request_body(request: httpx.Request, digest: BodyDigest) -> httpx.Request:
+    """
+    Feed a request body to a digest, returning a request that still sends it.
+
+    A streamed body is buffered so it can be replayed, but only until the
+    digest overflows: from then on the chunks read so far and the rest of
+    the stream are forwarded as they come.
+
+    Args:
+        request: The request whose body to digest
+        digest: Digest to feed, e.g. a BodyDigest with max_size
+    """
+    try:
+        digest.update(request.content)
+        return request
+    except httpx.RequestNotRead:
+        pass
+
+    chunks: List[bytes] = []
+    stream = request.stream.__aiter__()
+    async for chunk in stream:
+        chunks.append(chunk)
+        digest.update(chunk)
+        if digest.overflowed:
+            async def resume() -> AsyncIterator[bytes]:
+                for buffered in chunks:
+                    yield buffered
+                async for rest in stream:
+                    yield rest
+
+            return _resumed_request(request, resume())
+    return _replayable_request(request, chunks)
+
+
+def read_sync_request_body(request: httpx.Request, digest: BodyDigest) -> httpx.Request:
+    """
+    Feed a request body to a digest, returning a request that still sends it.
+
+    Sync counterpart of read_request_body.
+
+    Args:
+        request: The request whose body to digest
+        digest: Digest to feed, e.g. a BodyDigest with max_size
+    """
+    try:
+        digest.update(request.content)
+        return request
+    except httpx.RequestNotRead:
+        pass
+
+    chunks: List[bytes] = []
+    stream = iter(request.stream)
+    for chunk in stream:
+        chunks.append(chunk)
+        digest.update(chunk)
+        if digest.overflowed:
+            return _resumed_request(request, itertools.chain(chunks, stream))
+    return _replayable_request(request, chunks)
@@ -74,6 +74,8 @@ def create_cache_request_transport(
     singleflight_store: Optional[SingleflightStore] = None,
     on_idempotency_key_generated: Optional[Callable[[str, str, str], None]] = None,
     on_request_coalesced: Optional[Callable[[str, int], None]] = None,
+    stream_coalesced_responses: bool = False,
+    spool_memory_bytes: int = 1024 * 1024,
 ) -> CacheRequestTransport:
     """
     Create a cache request transport.
@@ -88,6 +90,8 @@ def create_cache_request_transport(
         singleflight_store: Custom store for singleflight
         on_idempotency_key_generated: Callback when idempotency key is generated
         on_request_coalesced: Callback when request is coalesced
+        stream_coalesced_responses: Stream coalesced bodies to every caller from a shared spool
+        spool_memory_bytes: Body size a spool keeps in memory before spilling to a temp file
 
     Returns:
         CacheRequestTransport instance
@@ -105,6 +109,8 @@ def create_cache_request_transport(
         singleflight_store=singleflight_store,
         on_idempotency_key_generated=on_idempotency_key_generated,
         on_request_coalesced=on_request_coalesced,
+        stream_coalesced_responses=stream_coalesced_responses,
+        spool_memory_bytes=spool_memory_bytes,
     )
 
 
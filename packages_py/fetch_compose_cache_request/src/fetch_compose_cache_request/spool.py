@@ -0,0 +1,182 @@
+"""
+Spool buffer for fanning one upstream response body out to many readers.
+"""
+import asyncio
+import tempfile
+from typing import AsyncIterator, IO, Optional
+
+import httpx
+
+
+class ResponseSpool:
+    """
+    Append-only body buffer written by one producer and read by any number of readers.
+
+    The producer never waits for readers: chunks are kept in memory until
+    max_memory_bytes is exceeded, after which the whole body rolls over to
+    an anonymous temp file. Each reader keeps its own offset, so a slow
+    reader only falls further behind instead of holding up the others.
+
+    Readers (and anyone else calling retain()) keep the buffer open. Once
+    the producer has finished and the last of them has drained or been
+    closed, the buffer and its temp file are released.
+    """
+
+    def __init__(self, max_memory_bytes: int = 1024 * 1024) -> None:
+        """
+        Create a new ResponseSpool.
+
+        Args:
+            max_memory_bytes: Body size kept in memory before spilling to disk. Default: 1MB
+        """
+        self._max_memory_bytes = max_memory_bytes
+        self._memory = bytearray()
+        self._file: Optional[IO[bytes]] = None
+        self._size = 0
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._changed = asyncio.Event()
+        self._refs = 0
+        self._retained = False
+        self._closed = False
+
+    @property
+    def size(self) -> int:
+        """Bytes written so far."""
+        return self._size
+
+    @property
+    def spilled(self) -> bool:
+        """Whether the body has rolled over to a temp file."""
+        return self._file is not None
+
+    @property
+    def done(self) -> bool:
+        """Whether the producer has finished (successfully or not)."""
+        return self._done
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        """The error the producer failed with, if any."""
+        return self._error
+
+    @property
+    def closed(self) -> bool:
+        """Whether the buffer has been released; no new readers can open."""
+        return self._closed
+
+    def write(self, chunk: bytes) -> None:
+        """Append a chunk and wake waiting readers."""
+        if not chunk or self._closed:
+            return
+        if self._file is None and self._size + len(chunk) > self._max_memory_bytes:
+            self._file = tempfile.TemporaryFile()
+            self._file.write(self._memory)
+            self._memory = bytearray()
+
+        if self._file is not None:
+            self._file.seek(0, 2)
+            self._file.write(chunk)
+        else:
+            self._memory += chunk
+        self._size += len(chunk)
+        self._notify()
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """Mark the body complete, or failed with error; readers raise it once drained."""
+        self._done = True
+        self._error = error
+        self._notify()
+        if self._retained and self._refs == 0:
+            self.close()
+
+    def read(self, offset: int, max_bytes: int) -> bytes:
+        """Read up to max_bytes already written at offset."""
+        if self._closed:
+            raise ValueError("Read from a closed spool")
+        length = min(max_bytes, self._size - offset)
+        if length <= 0:
+            return b""
+        if self._file is not None:
+            self._file.flush()
+            self._file.seek(offset)
+            return self._file.read(length)
+        return bytes(self._memory[offset:offset + length])
+
+    async def wait(self, offset: int) -> None:
+        """Wait until there is data past offset or the body is complete."""
+        while offset >= self._size and not self._done and not self._closed:
+            await self._changed.wait()
+
+    def reader(self, chunk_size: int = 64 * 1024) -> "SpoolStream":
+        """Open an independent stream over the whole body (it holds the buffer open until closed)."""
+        return SpoolStream(self, chunk_size)
+
+    def retain(self) -> None:
+        """
+        Keep the buffer open until a matching release().
+
+        Raises:
+            RuntimeError: If the spool is already closed
+        """
+        if self._closed:
+            raise RuntimeError("Spool is closed")
+        self._refs += 1
+        self._retained = True
+
+    def release(self) -> None:
+        """Drop a retain(), closing the spool if the producer has finished and it was the last."""
+        self._refs -= 1
+        if self._refs == 0 and self._done:
+            self.close()
+
+    def close(self) -> None:
+        """Release the buffer and temp file now; readers still open fail with a ReadError."""
+        if self._closed:
+            return
+        self._closed = True
+        self._memory = bytearray()
+        if self._file is not None:
+            self._file.close()
+        self._notify()
+
+    def _notify(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+
+class SpoolStream(httpx.AsyncByteStream):
+    """Async byte stream reading a ResponseSpool from the start, concurrently with its producer."""
+
+    def __init__(self, spool: ResponseSpool, chunk_size: int = 64 * 1024) -> None:
+        spool.retain()
+        self._spool = spool
+        self._chunk_size = chunk_size
+        self._closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        spool = self._spool
+        offset = 0
+        try:
+            while not self._closed:
+                await spool.wait(offset)
+                if spool.closed:
+                    raise httpx.ReadError("Spool was closed before the body was read")
+                chunk = spool.read(offset, self._chunk_size)
+                if chunk:
+                    offset += len(chunk)
+                    yield chunk
+                elif spool.done:
+                    if spool.error is not None:
+                        raise spool.error
+                    return
+        finally:
+            self._release()
+
+    async def aclose(self) -> None:
+        self._release()
+
+    def _release(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._spool.release()
@@ -3,8 +3,9 @@ Cache request transport wrapper for httpx.
 """
 import asyncio
 import time
+import weakref
 from dataclasses import dataclass
-from typing import Any, Awaitable, Callable, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
 import httpx
 
@@ -16,10 +17,15 @@ from cache_request import (
     CacheRequestStore,
     SingleflightStore,
     RequestFingerprint,
+    BodyDigest,
+    generate_fingerprint,
     create_memory_cache_store,
     create_memory_singleflight_store,
 )
 
+from .body import read_request_body, read_sync_request_body
+from .spool import ResponseSpool
+
 
 @dataclass
 class CachedResponseData:
@@ -31,6 +37,15 @@ class CachedResponseData:
     http_version: str = "HTTP/1.1"
 
 
+@dataclass
+class StreamedResponseData:
+    """A coalesced response whose body is still being spooled from upstream."""
+
+    status_code: int
+    headers: httpx.Headers
+    spool: ResponseSpool
+
+
 class CacheRequestTransport(httpx.AsyncBaseTransport):
     """
     Cache request transport wrapper for httpx.
@@ -56,6 +71,8 @@ class CacheRequestTransport(httpx.AsyncBaseTransport):
         singleflight_store: Optional[SingleflightStore] = None,
         on_idempotency_key_generated: Optional[Callable[[str, str, str], None]] = None,
         on_request_coalesced: Optional[Callable[[str, int], None]] = None,
+        stream_coalesced_responses: bool = False,
+        spool_memory_bytes: int = 1024 * 1024,
     ) -> None:
         """
         Create a new CacheRequestTransport.
@@ -70,12 +87,27 @@ class CacheRequestTransport(httpx.AsyncBaseTransport):
             singleflight_store: Custom store for singleflight
             on_idempotency_key_generated: Callback when idempotency key is generated
             on_request_coalesced: Callback when request is coalesced
+            stream_coalesced_responses: Hand coalesced responses out as soon as the
+                headers arrive, each streaming the body from a shared spool. Default: False
+            spool_memory_bytes: Body size a spool keeps in memory before spilling
+                to a temp file. Default: 1MB
         """
         self._inner = inner
         self._enable_idempotency = enable_idempotency
         self._enable_singleflight = enable_singleflight
         self._on_idempotency_key_generated = on_idempotency_key_generated
         self._on_request_coalesced = on_request_coalesced
+        self._stream_coalesced_responses = stream_coalesced_responses
+        self._spool_memory_bytes = spool_memory_bytes
+        self._pumps: Set[asyncio.Task] = set()
+        # fingerprint -> response whose body is still being spooled
+        self._spooling: Dict[str, StreamedResponseData] = {}
+        # fingerprint -> local requests waiting on the singleflight call, and
+        # the spools kept open until each of them has opened its reader
+        self._subscribing: Dict[str, int] = {}
+        self._pinned: Dict[str, List[ResponseSpool]] = {}
+        # Every spool not yet garbage collected, closed on aclose()
+        self._spools: "weakref.WeakSet[ResponseSpool]" = weakref.WeakSet()
 
         # Create managers
         self._idempotency_manager: Optional[IdempotencyManager] = None
@@ -93,26 +125,44 @@ class CacheRequestTransport(httpx.AsyncBaseTransport):
     async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
         """Handle an async HTTP request with cache request capabilities."""
         method = request.method
-        url = str(request.url)
+
+        idempotent = bool(
+            self._idempotency_manager and self._idempotency_manager.requires_idempotency(method)
+        )
+        coalesced = bool(self._singleflight and self._singleflight.supports_coalescing(method))
+
+        # Pass through for other methods
+        if not idempotent and not coalesced:
+            return await self._inner.handle_async_request(request)
 
         # Build request fingerprint
+        request, body_digest = await self._digest_request_body(request)
         fingerprint = RequestFingerprint(
             method=method,
-            url=url,
+            url=str(request.url),
             headers=dict(request.headers),
-            body=request.content if request.content else None,
+            body_digest=body_digest,
         )
 
         # Handle idempotency for mutating methods
-        if self._idempotency_manager and self._idempotency_manager.requires_idempotency(method):
+        if idempotent:
             return await self._handle_idempotent_request(request, fingerprint)
 
         # Handle singleflight for safe methods
-        if self._singleflight and self._singleflight.supports_coalescing(method):
-            return await self._handle_singleflight_request(request, fingerprint)
+        return await self._handle_singleflight_request(request, fingerprint)
 
-        # Pass through for other methods
-        return await self._inner.handle_async_request(request)
+    async def _digest_request_body(
+        self, request: httpx.Request
+    ) -> Tuple[httpx.Request, Optional[str]]:
+        """
+        Hash the request body as it is read.
+
+        A streamed body is buffered so it can still be sent; the returned
+        request replays it.
+        """
+        digest = BodyDigest()
+        request = await read_request_body(request, digest)
+        return request, digest.hexdigest()
 
     async def _handle_idempotent_request(
         self, request: httpx.Request, fingerprint: RequestFingerprint
@@ -132,11 +182,11 @@ class CacheRequestTransport(httpx.AsyncBaseTransport):
                 idempotency_key, request.method, str(request.url)
             )
 
-        # Check for cached response
-        result = await manager.check(idempotency_key, fingerprint)
+        # Claim the key, or wait for the request that already holds it
+        reservation = await manager.reserve(idempotency_key, fingerprint)
 
-        if result.cached and result.response:
-            cached = result.response.value
+        if reservation.response:
+            cached = reservation.response.value
             return httpx.Response(
                 status_code=cached.status_code,
                 headers=cached.headers,
@@ -147,26 +197,32 @@ class CacheRequestTransport(httpx.AsyncBaseTransport):
         if not existing_key:
             request.headers[header_name] = idempotency_key
 
-        # Execute request
-        response = await self._inner.handle_async_request(request)
-
-        # Cache successful responses (2xx)
-        if 200 <= response.status_code < 300:
-            # Read response content to cache it
-            content = await response.aread()
-            cached_data = CachedResponseData(
-                status_code=response.status_code,
-                headers=response.headers,
-                content=content,
-            )
-            await manager.store(idempotency_key, cached_data, fingerprint)
+        try:
+            # Execute request
+            response = await self._inner.handle_async_request(request)
 
-            # Create new response with the content we read
-            return httpx.Response(
-                status_code=response.status_code,
-                headers=response.headers,
-                content=content,
-            )
+            # Cache successful responses (2xx)
+            if 200 <= response.status_code < 300:
+                # Read response content to cache it
+                content = await response.aread()
+                cached_data = CachedResponseData(
+                    status_code=response.status_code,
+                    headers=response.headers,
+                    content=content,
+                )
+                await manager.store(
+                    idempotency_key, cached_data, fingerprint, reservation.token
+                )
+
+                # Create new response with the content we read
+                return httpx.Response(
+                    status_code=response.status_code,
+                    headers=response.headers,
+                    content=content,
+                )
+        finally:
+            # Unless a response was stored, let a waiting duplicate run instead
+            await manager.release(idempotency_key, reservation.token)
 
         return response
 
@@ -175,6 +231,14 @@ class CacheRequestTransport(httpx.AsyncBaseTransport):
     ) -> httpx.Response:
         """Handle singleflight request with coalescing."""
         sf = self._singleflight
+        key = sf.generate_fingerprint(fingerprint)
+
+        # Join a body that is still streaming in, not just a pending request
+        spooling = self._spooling.get(key)
+        if spooling is not None and not spooling.spool.closed:
+            if self._on_request_coalesced:
+                self._on_request_coalesced(key, 1)
+            return self._streamed_response(spooling)
 
         async def execute() -> CachedResponseData:
             response = await self._inner.handle_async_request(request)
@@ -185,12 +249,43 @@ class CacheRequestTransport(httpx.AsyncBaseTransport):
                 content=content,
             )
 
-        result = await sf.do(fingerprint, execute)
-
-        if self._on_request_coalesced and result.shared:
-            self._on_request_coalesced(
-                sf.generate_fingerprint(fingerprint), result.subscribers
+        async def execute_streaming() -> StreamedResponseData:
+            response = await self._inner.handle_async_request(request)
+            streamed = StreamedResponseData(
+                status_code=response.status_code,
+                headers=response.headers,
+                spool=ResponseSpool(self._spool_memory_bytes),
             )
+            self._spooling[key] = streamed
+            streamed.spool.retain()
+            self._pinned.setdefault(key, []).append(streamed.spool)
+            self._spools.add(streamed.spool)
+
+            def done(pump: asyncio.Task) -> None:
+                self._pumps.discard(pump)
+                if self._spooling.get(key) is streamed:
+                    del self._spooling[key]
+
+            pump = asyncio.ensure_future(self._pump(response, streamed.spool))
+            self._pumps.add(pump)
+            pump.add_done_callback(done)
+            return streamed
+
+        self._subscribing[key] = self._subscribing.get(key, 0) + 1
+        try:
+            # A streamed result pins its spool (and any temp file), so it is never memoized
+            if self._stream_coalesced_responses:
+                result = await sf.do(fingerprint, execute_streaming, memoize=False)
+            else:
+                result = await sf.do(fingerprint, execute)
+
+            if self._on_request_coalesced and result.shared:
+                self._on_request_coalesced(key, result.subscribers)
+
+            if isinstance(result.value, StreamedResponseData):
+                return self._streamed_response(result.value)
+        finally:
+            self._unsubscribe(key)
 
         return httpx.Response(
             status_code=result.value.status_code,
@@ -198,8 +293,46 @@ class CacheRequestTransport(httpx.AsyncBaseTransport):
             content=result.value.content,
         )
 
+    def _unsubscribe(self, key: str) -> None:
+        """Drop a waiting request; the last one unpins the spools opened for the key."""
+        self._subscribing[key] -= 1
+        if self._subscribing[key] == 0:
+            del self._subscribing[key]
+            for spool in self._pinned.pop(key, ()):
+                spool.release()
+
+    def _streamed_response(self, streamed: StreamedResponseData) -> httpx.Response:
+        """Build a response reading its own stream over a shared spool."""
+        return httpx.Response(
+            status_code=streamed.status_code,
+            headers=streamed.headers,
+            stream=streamed.spool.reader(),
+        )
+
+    async def _pump(self, response: httpx.Response, spool: ResponseSpool) -> None:
+        """Copy the upstream body into a spool, never waiting on its readers."""
+        try:
+            async for chunk in response.aiter_raw():
+                spool.write(chunk)
+        except asyncio.CancelledError:
+            spool.finish(httpx.ReadError("Coalesced response was closed before it completed"))
+            raise
+        except Exception as error:
+            spool.finish(error)
+        else:
+            spool.finish()
+        finally:
+            await response.aclose()
+
     async def aclose(self) -> None:
         """Close the transport."""
+        for pump in list(self._pumps):
+            pump.cancel()
+        if self._pumps:
+            await asyncio.gather(*self._pumps, return_exceptions=True)
+        for spool in list(self._spools):
+            spool.close()
+        self._pinned.clear()
         if self._idempotency_manager:
             await self._idempotency_manager.close()
         if self._singleflight:
@@ -270,10 +403,14 @@ class SyncCacheRequestTransport(httpx.BaseTransport):
                 idempotency_key, request.method, str(request.url)
             )
 
-        # Build fingerprint
-        fingerprint = f"{request.method}|{request.url}"
-        if request.content:
-            fingerprint += f"|{request.content.decode('utf-8', errors='replace')}"
+        # Build fingerprint, hashing the body as it is read
+        digest = BodyDigest()
+        request = read_sync_request_body(request, digest)
+        fingerprint = generate_fingerprint(
+            RequestFingerprint(
+                method=request.method, url=str(request.url), body_digest=digest.hexdigest()
+            )
+        )
 
         # Check for cached response
         if idempotency_key in self._cache:
@@ -0,0 +1,64 @@
+"""
+Tests for digesting httpx request bodies.
+"""
+import httpx
+import pytest
+
+from cache_request import BodyDigest, digest_body
+from fetch_compose_cache_request import read_request_body, read_sync_request_body
+
+URL = "http://localhost/api/data"
+
+
+class TestReadRequestBody:
+    """Tests for read_request_body and read_sync_request_body."""
+
+    @pytest.mark.asyncio
+    async def test_streamed_body_is_buffered_for_replay(self) -> None:
+        async def chunks():
+            yield b"hello "
+            yield b"world"
+
+        digest = BodyDigest()
+        request = await read_request_body(httpx.Request("POST", URL, content=chunks()), digest)
+
+        assert digest.hexdigest() == digest_body(b"hello world")
+        assert request.content == b"hello world"
+        assert "transfer-encoding" not in request.headers
+
+    @pytest.mark.asyncio
+    async def test_overflowed_body_streams_through(self) -> None:
+        yielded = []
+
+        async def chunks():
+            for chunk in (b"0123", b"4567", b"89ab"):
+                yielded.append(chunk)
+                yield chunk
+
+        digest = BodyDigest(max_size=4)
+        request = await read_request_body(httpx.Request("POST", URL, content=chunks()), digest)
+
+        assert digest.hexdigest() is None
+        assert yielded == [b"0123", b"4567"]
+        assert await request.aread() == b"0123456789ab"
+
+    def test_sync_overflowed_body_streams_through(self) -> None:
+        yielded = []
+
+        def chunks():
+            for chunk in (b"0123", b"4567", b"89ab"):
+                yielded.append(chunk)
+                yield chunk
+
+        digest = BodyDigest(max_size=4)
+        request = read_sync_request_body(httpx.Request("POST", URL, content=chunks()), digest)
+
+        assert yielded == [b"0123", b"4567"]
+        assert request.read() == b"0123456789ab"
+
+    def test_buffered_body_is_returned_as_is(self) -> None:
+        original = httpx.Request("POST", URL, content=b"{}")
+        digest = BodyDigest()
+
+        assert read_sync_request_body(original, digest) is original
+        assert digest.hexdigest() == digest_body(b"{}")
@@ -0,0 +1,115 @@
+"""
+Tests for the response spool used to fan coalesced bodies out to readers.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from fetch_compose_cache_request import ResponseSpool
+
+
+async def drain(spool: ResponseSpool, chunk_size: int = 4) -> bytes:
+    return b"".join([chunk async for chunk in spool.reader(chunk_size)])
+
+
+class TestResponseSpool:
+    """Tests for ResponseSpool."""
+
+    @pytest.mark.asyncio
+    async def test_readers_follow_the_producer(self) -> None:
+        spool = ResponseSpool()
+        readers = [asyncio.ensure_future(drain(spool)) for _ in range(3)]
+
+        for part in (b"hello ", b"spooled ", b"world"):
+            spool.write(part)
+            await asyncio.sleep(0)
+        assert not any(reader.done() for reader in readers)
+
+        spool.finish()
+        assert await asyncio.gather(*readers) == [b"hello spooled world"] * 3
+
+    @pytest.mark.asyncio
+    async def test_late_reader_starts_from_the_beginning(self) -> None:
+        spool = ResponseSpool()
+        spool.write(b"abc")
+        spool.write(b"def")
+        spool.finish()
+
+        first, second = spool.reader(4), spool.reader(1)
+
+        assert b"".join([chunk async for chunk in first]) == b"abcdef"
+        assert b"".join([chunk async for chunk in second]) == b"abcdef"
+
+    @pytest.mark.asyncio
+    async def test_spills_to_temp_file_past_memory_limit(self) -> None:
+        spool = ResponseSpool(max_memory_bytes=8)
+        early = spool.read(0, 100)
+        spool.write(b"12345")
+        assert spool.spilled is False
+
+        spool.write(b"67890")
+        spool.write(b"abc")
+        spool.finish()
+
+        assert early == b""
+        assert spool.spilled is True
+        assert spool.size == 13
+        assert spool.read(3, 4) == b"4567"
+        assert await drain(spool) == b"1234567890abc"
+
+    @pytest.mark.asyncio
+    async def test_readers_raise_producer_error_after_draining(self) -> None:
+        spool = ResponseSpool()
+        received = []
+
+        async def read():
+            async for chunk in spool.reader():
+                received.append(chunk)
+
+        reader = asyncio.ensure_future(read())
+        spool.write(b"partial")
+        spool.finish(ConnectionError("upstream reset"))
+
+        with pytest.raises(ConnectionError):
+            await reader
+        assert received == [b"partial"]
+
+    @pytest.mark.asyncio
+    async def test_temp_file_closes_after_last_reader_drains(self) -> None:
+        spool = ResponseSpool(max_memory_bytes=4)
+        first, second = spool.reader(), spool.reader()
+        spool.write(b"spilled body")
+        spool.finish()
+        temp_file = spool._file
+
+        assert b"".join([chunk async for chunk in first]) == b"spilled body"
+        assert not temp_file.closed
+
+        await second.aclose()
+        assert temp_file.closed
+        assert spool.closed
+
+    @pytest.mark.asyncio
+    async def test_stays_open_until_producer_finishes(self) -> None:
+        spool = ResponseSpool(max_memory_bytes=4)
+        reader = spool.reader()
+        spool.write(b"spilled body")
+        await reader.aclose()
+        assert not spool.closed
+
+        spool.finish()
+        assert spool.closed
+
+    @pytest.mark.asyncio
+    async def test_close_fails_open_readers(self) -> None:
+        spool = ResponseSpool()
+        reader = asyncio.ensure_future(drain(spool))
+        spool.write(b"partial")
+        await asyncio.sleep(0)
+
+        spool.close()
+        with pytest.raises(httpx.ReadError):
+            await reader
+        with pytest.raises(RuntimeError):
+            spool.reader()
@@ -320,6 +320,66 @@ class TestCacheRequestTransport:
 
             await transport.aclose()
 
+        @pytest.mark.asyncio
+        async def test_streamed_body_is_fingerprinted_and_replayed(self) -> None:
+            """Test that a streamed body is hashed as read and still reaches upstream."""
+            inner = MockAsyncTransport()
+            transport = CacheRequestTransport(inner, enable_singleflight=False)
+
+            async def body():
+                yield b'{"item": '
+                yield b'"test"}'
+
+            idempotency_key = str(uuid.uuid4())
+            streamed = httpx.Request(
+                "POST",
+                "http://localhost/api/orders",
+                headers={"Idempotency-Key": idempotency_key},
+                content=body(),
+            )
+            response = await transport.handle_async_request(streamed)
+            assert response.status_code == 200
+            assert inner.requests[0].content == b'{"item": "test"}'
+            assert "transfer-encoding" not in inner.requests[0].headers
+
+            # The same body sent buffered matches the stored fingerprint
+            buffered = httpx.Request(
+                "POST",
+                "http://localhost/api/orders",
+                headers={"Idempotency-Key": idempotency_key},
+                content=b'{"item": "test"}',
+            )
+            await transport.handle_async_request(buffered)
+            assert len(inner.requests) == 1
+
+            await transport.aclose()
+
+        @pytest.mark.asyncio
+        async def test_concurrent_duplicates_wait_for_original(self) -> None:
+            """Test that concurrent retries with the same key execute once."""
+            inner = DelayedMockAsyncTransport(delay=0.05)
+            transport = CacheRequestTransport(inner, enable_singleflight=False)
+
+            idempotency_key = str(uuid.uuid4())
+
+            def request() -> httpx.Request:
+                return httpx.Request(
+                    "POST",
+                    "http://localhost/api/orders",
+                    headers={"Idempotency-Key": idempotency_key},
+                    content=b'{"item": "test"}',
+                )
+
+            responses = await asyncio.gather(
+                *[transport.handle_async_request(request()) for _ in range(3)]
+            )
+
+            assert inner.request_count == 1
+            assert [r.status_code for r in responses] == [200, 200, 200]
+            assert all(r.content == b'{"success": true}' for r in responses)
+
+            await transport.aclose()
+
         @pytest.mark.asyncio
         async def test_put_request_with_idempotency(self) -> None:
             """Test PUT request with idempotency."""
@@ -565,6 +625,193 @@ class TestCacheRequestTransport:
             # Should not raise
 
 
+class GatedStreamTransport(httpx.AsyncBaseTransport):
+    """Returns headers at once and releases each body chunk when its gate opens."""
+
+    def __init__(self, chunks: list) -> None:
+        self.chunks = chunks
+        self.gates = [asyncio.Event() for _ in chunks]
+        self.request_count = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.request_count += 1
+
+        async def body():
+            for chunk, gate in zip(self.chunks, self.gates):
+                await gate.wait()
+                yield chunk
+
+        return httpx.Response(200, headers={"content-type": "application/octet-stream"}, content=body())
+
+    def release_all(self) -> None:
+        for gate in self.gates:
+            gate.set()
+
+    async def aclose(self) -> None:
+        pass
+
+
+class TestStreamingFanOut:
+    """Tests for streaming coalesced responses from a shared spool."""
+
+    @staticmethod
+    def transport(inner: httpx.AsyncBaseTransport, **kwargs) -> CacheRequestTransport:
+        return CacheRequestTransport(
+            inner, enable_idempotency=False, stream_coalesced_responses=True, **kwargs
+        )
+
+    @pytest.mark.asyncio
+    async def test_streamed_responses_are_not_memoized(self) -> None:
+        inner = GatedStreamTransport([b"body"])
+        inner.release_all()
+        transport = self.transport(
+            inner, singleflight_config=SingleflightConfig(memo_ttl_seconds=60)
+        )
+
+        for _ in range(2):
+            response = await transport.handle_async_request(
+                httpx.Request("GET", "http://localhost/big")
+            )
+            assert await response.aread() == b"body"
+            await asyncio.gather(*transport._pumps)
+
+        assert inner.request_count == 2
+        assert transport._singleflight.get_stats()["memoized"] == 0
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_followers_get_headers_before_body_completes(self) -> None:
+        inner = GatedStreamTransport([b"first-", b"second"])
+        transport = self.transport(inner)
+
+        responses = await asyncio.wait_for(
+            asyncio.gather(
+                *[
+                    transport.handle_async_request(httpx.Request("GET", "http://localhost/big"))
+                    for _ in range(3)
+                ]
+            ),
+            timeout=1,
+        )
+        assert inner.request_count == 1
+        assert [r.status_code for r in responses] == [200, 200, 200]
+
+        inner.release_all()
+        bodies = await asyncio.gather(*[r.aread() for r in responses])
+        assert bodies == [b"first-second"] * 3
+
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_slow_reader_does_not_block_others(self) -> None:
+        inner = GatedStreamTransport([b"a" * 100, b"b" * 100, b"c" * 100])
+        transport = self.transport(inner, spool_memory_bytes=150)
+
+        fast, slow = await asyncio.gather(
+            transport.handle_async_request(httpx.Request("GET", "http://localhost/big")),
+            transport.handle_async_request(httpx.Request("GET", "http://localhost/big")),
+        )
+        inner.release_all()
+
+        # The fast reader finishes while the slow one has not read anything yet
+        assert await asyncio.wait_for(fast.aread(), timeout=1) == b"a" * 100 + b"b" * 100 + b"c" * 100
+        assert await slow.aread() == fast.content
+
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_upstream_failure_reaches_every_reader(self) -> None:
+        class BrokenStream(httpx.AsyncByteStream):
+            async def __aiter__(self):
+                yield b"partial"
+                raise httpx.ReadError("connection reset")
+
+        class BrokenTransport(httpx.AsyncBaseTransport):
+            async def handle_async_request(self, request):
+                return httpx.Response(200, stream=BrokenStream())
+
+        transport = self.transport(BrokenTransport())
+        responses = await asyncio.gather(
+            *[
+                transport.handle_async_request(httpx.Request("GET", "http://localhost/big"))
+                for _ in range(2)
+            ]
+        )
+
+        for response in responses:
+            with pytest.raises(httpx.ReadError):
+                await response.aread()
+
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_spool_closes_once_every_reader_is_done(self) -> None:
+        inner = GatedStreamTransport([b"a" * 100, b"b" * 100])
+        transport = self.transport(inner, spool_memory_bytes=50)
+
+        first, second = await asyncio.gather(
+            transport.handle_async_request(httpx.Request("GET", "http://localhost/big")),
+            transport.handle_async_request(httpx.Request("GET", "http://localhost/big")),
+        )
+        (spool,) = transport._spools
+        inner.release_all()
+
+        assert await first.aread() == b"a" * 100 + b"b" * 100
+        assert spool.spilled and not spool.closed
+        await second.aclose()
+        assert spool.closed
+
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_follower_reads_body_that_finished_before_it_resumed(self) -> None:
+        inner = GatedStreamTransport([b"quick"])
+        inner.release_all()
+        transport = self.transport(inner, spool_memory_bytes=1)
+
+        responses = await asyncio.gather(
+            *[
+                transport.handle_async_request(httpx.Request("GET", "http://localhost/big"))
+                for _ in range(3)
+            ]
+        )
+        await asyncio.gather(*transport._pumps)
+
+        assert inner.request_count == 1
+        assert [await r.aread() for r in responses] == [b"quick"] * 3
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_unread_spools(self) -> None:
+        inner = GatedStreamTransport([b"a" * 100])
+        inner.release_all()
+        transport = self.transport(inner, spool_memory_bytes=50)
+
+        response = await transport.handle_async_request(
+            httpx.Request("GET", "http://localhost/big")
+        )
+        await asyncio.gather(*transport._pumps)
+        (spool,) = transport._spools
+        assert spool.spilled and not spool.closed
+
+        await transport.aclose()
+        assert spool.closed
+        with pytest.raises(httpx.ReadError):
+            await response.aread()
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self) -> None:
+        inner = GatedStreamTransport([b"body"])
+        inner.release_all()
+        transport = CacheRequestTransport(inner, enable_idempotency=False)
+
+        response = await transport.handle_async_request(httpx.Request("GET", "http://localhost/big"))
+        assert response.content == b"body"
+        assert response.is_stream_consumed
+
+        await transport.aclose()
+
+
 class TestSyncCacheRequestTransport:
     """Tests for SyncCacheRequestTransport."""
 
@@ -14,7 +14,9 @@ from cache_response import (
     CacheFreshness,
     CacheLookupResult,
     CacheResponseStore,
+    SyncCacheResponseStore,
     CacheResponseConfig,
+    PostCacheRule,
     CacheResponseEventType,
     CacheResponseEvent,
     CacheResponseEventListener,
@@ -24,6 +26,8 @@ from cache_response import (
     parse_cache_control,
     MemoryCacheStore,
     create_memory_cache_store,
+    SyncMemoryCacheStore,
+    create_sync_memory_cache_store,
 )
 from .transport import CacheResponseTransport, SyncCacheResponseTransport
 from .factory import (
@@ -44,7 +48,9 @@ __all__ = [
     "CacheFreshness",
     "CacheLookupResult",
     "CacheResponseStore",
+    "SyncCacheResponseStore",
     "CacheResponseConfig",
+    "PostCacheRule",
     "CacheResponseEventType",
     "CacheResponseEvent",
     "CacheResponseEventListener",
@@ -54,6 +60,8 @@ __all__ = [
     "parse_cache_control",
     "MemoryCacheStore",
     "create_memory_cache_store",
+    "SyncMemoryCacheStore",
+    "create_sync_memory_cache_store",
     # Transport wrappers
     "CacheResponseTransport",
     "SyncCacheResponseTransport",
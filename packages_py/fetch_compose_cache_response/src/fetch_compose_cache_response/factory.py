@@ -8,6 +8,7 @@ import httpx
 from cache_response import (
     CacheResponseConfig,
     CacheResponseStore,
+    SyncCacheResponseStore,
     CacheFreshness,
 )
 
@@ -72,6 +73,9 @@ def create_cache_response_transport(
     on_cache_miss: Optional[Callable[[str], None]] = None,
     on_cache_store: Optional[Callable[[str, int, float], None]] = None,
     on_revalidated: Optional[Callable[[str], None]] = None,
+    enable_streaming: bool = False,
+    max_streamed_cache_size: int = 5 * 1024 * 1024,
+    coalesce_misses: bool = True,
 ) -> CacheResponseTransport:
     """
     Create a cache response transport.
@@ -85,6 +89,9 @@ def create_cache_response_transport(
         on_cache_miss: Callback when cache miss occurs
         on_cache_store: Callback when response is cached
         on_revalidated: Callback when conditional request results in 304
+        enable_streaming: Stream bodies through, teeing cacheable ones into the store
+        max_streamed_cache_size: Stop caching a streamed body past this many bytes
+        coalesce_misses: Run at most one upstream fetch per cache key at a time
 
     Returns:
         CacheResponseTransport instance
@@ -101,6 +108,9 @@ def create_cache_response_transport(
         on_cache_miss=on_cache_miss,
         on_cache_store=on_cache_store,
         on_revalidated=on_revalidated,
+        enable_streaming=enable_streaming,
+        max_streamed_cache_size=max_streamed_cache_size,
+        coalesce_misses=coalesce_misses,
     )
 
 
@@ -108,9 +118,11 @@ def create_cache_response_sync_transport(
     inner: Optional[httpx.BaseTransport] = None,
     *,
     config: Optional[CacheResponseConfig] = None,
+    store: Optional[SyncCacheResponseStore] = None,
     on_cache_hit: Optional[Callable[[str, str], None]] = None,
     on_cache_miss: Optional[Callable[[str], None]] = None,
     on_cache_store: Optional[Callable[[str, int, float], None]] = None,
+    on_revalidated: Optional[Callable[[str], None]] = None,
 ) -> SyncCacheResponseTransport:
     """
     Create a sync cache response transport.
@@ -118,9 +130,11 @@ def create_cache_response_sync_transport(
     Args:
         inner: The inner transport (defaults to HTTPTransport)
         config: Cache configuration
+        store: Custom sync cache store (defaults to a bounded SyncMemoryCacheStore)
         on_cache_hit: Callback when cache hit occurs
         on_cache_miss: Callback when cache miss occurs
         on_cache_store: Callback when response is cached
+        on_revalidated: Callback when conditional request results in 304
 
     Returns:
         SyncCacheResponseTransport instance
@@ -131,9 +145,11 @@ def create_cache_response_sync_transport(
     return SyncCacheResponseTransport(
         inner,
         config=config,
+        store=store,
         on_cache_hit=on_cache_hit,
         on_cache_miss=on_cache_miss,
         on_cache_store=on_cache_store,
+        on_revalidated=on_revalidated,
     )
 
 
@@ -142,6 +158,7 @@ def create_cache_response_client(
     config: Optional[CacheResponseConfig] = None,
     store: Optional[CacheResponseStore] = None,
     enable_background_revalidation: bool = True,
+    enable_streaming: bool = False,
     base_url: Optional[str] = None,
     **client_kwargs,
 ) -> httpx.AsyncClient:
@@ -152,6 +169,7 @@ def create_cache_response_client(
         config: Cache configuration
         store: Custom cache store
         enable_background_revalidation: Enable stale-while-revalidate
+        enable_streaming: Stream bodies through, teeing cacheable ones into the store
         base_url: Base URL for the client
         **client_kwargs: Additional arguments for httpx.AsyncClient
 
@@ -162,6 +180,7 @@ def create_cache_response_client(
         config=config,
         store=store,
         enable_background_revalidation=enable_background_revalidation,
+        enable_streaming=enable_streaming,
     )
 
     return httpx.AsyncClient(
@@ -174,6 +193,7 @@ def create_cache_response_client(
 def create_cache_response_sync_client(
     *,
     config: Optional[CacheResponseConfig] = None,
+    store: Optional[SyncCacheResponseStore] = None,
     base_url: Optional[str] = None,
     **client_kwargs,
 ) -> httpx.Client:
@@ -182,13 +202,14 @@ def create_cache_response_sync_client(
 
     Args:
         config: Cache configuration
+        store: Custom sync cache store
         base_url: Base URL for the client
         **client_kwargs: Additional arguments for httpx.Client
 
     Returns:
         Client with cache response transport
     """
-    transport = create_cache_response_sync_transport(config=config)
+    transport = create_cache_response_sync_transport(config=config, store=store)
 
     return httpx.Client(
         transport=transport,
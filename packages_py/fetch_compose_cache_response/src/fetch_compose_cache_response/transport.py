@@ -6,19 +6,148 @@ Implements RFC 7234 compliant HTTP response caching with:
 - ETag and Last-Modified conditional request support
 - Vary header handling
 - Stale-while-revalidate pattern
+- Stale-if-error on transport errors and 500/502/503/504
+- Refresh-ahead for hot entries (CacheResponseConfig.refresh_ahead)
+- POST query caching keyed by body digest (CacheResponseConfig.post_cache_rules)
 """
 import asyncio
-from typing import Callable, Dict, Optional
+import time
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import httpx
 
 from cache_response import (
     ResponseCache,
+    SyncResponseCache,
     CacheResponseConfig,
     CacheResponseStore,
+    SyncCacheResponseStore,
+    CachedResponse,
     CacheFreshness,
+    CacheLookupResult,
+    PostCacheRule,
+    RequestBodyDigest,
+    RevalidationStats,
     create_memory_cache_store,
+    create_sync_memory_cache_store,
+    parse_cache_control,
 )
+from fetch_compose_cache_request import read_request_body, read_sync_request_body
+
+# Origin failures that stale-if-error may mask (RFC 5861 section 4)
+_STALE_IF_ERROR_STATUSES = frozenset({500, 502, 503, 504})
+
+# Marks a stale entry served in place of a failed origin response (RFC 7234 section 5.5.2)
+_STALE_WARNING = '111 - "Revalidation Failed"'
+
+
+def _within_stale_while_revalidate(cached: CachedResponse) -> bool:
+    """Check whether an expired entry may be served while revalidating in the background."""
+    directives = cached.metadata.directives
+    if not directives or not directives.stale_while_revalidate:
+        return False
+    return time.time() < cached.metadata.expires_at + directives.stale_while_revalidate
+
+
+def _within_stale_if_error(config: CacheResponseConfig, cached: CachedResponse) -> bool:
+    """Check whether an entry is still inside its stale-if-error window."""
+    directives = cached.metadata.directives
+    if not config.stale_if_error or not directives or not directives.stale_if_error:
+        return False
+    return time.time() < cached.metadata.expires_at + directives.stale_if_error
+
+
+def _stale_response(cached: CachedResponse) -> httpx.Response:
+    """Build a response from a stale entry served because the origin failed."""
+    headers = httpx.Headers(cached.metadata.headers)
+    headers["warning"] = _STALE_WARNING
+    return httpx.Response(
+        status_code=cached.metadata.status_code,
+        headers=headers,
+        content=cached.body or b"",
+    )
+
+
+def _conditional_request(
+    request: httpx.Request, etag: Optional[str], last_modified: Optional[str]
+) -> httpx.Request:
+    """Build a conditional request with If-None-Match/If-Modified-Since."""
+    if request.method.upper() not in ("GET", "HEAD"):
+        # Validators on other methods are preconditions (a match means 412)
+        return request
+    if not etag and not last_modified:
+        return request
+
+    headers = dict(request.headers)
+    lower_names = {name.lower() for name in headers}
+    if etag and "if-none-match" not in lower_names:
+        headers["If-None-Match"] = etag
+    if last_modified and "if-modified-since" not in lower_names:
+        headers["If-Modified-Since"] = last_modified
+
+    return httpx.Request(
+        method=request.method,
+        url=request.url,
+        headers=headers,
+        content=request.content,
+    )
+
+
+class _TeeToCacheStream(httpx.AsyncByteStream):
+    """
+    Async byte stream that yields upstream chunks to the caller while
+    collecting them for the cache.
+
+    Collection stops (and buffered chunks are released) once the body grows
+    past max_size; the caller still receives every chunk. The completion
+    callback only runs if the body was read to the end within the cap; the
+    finish callback always runs once, when the body is exhausted or closed.
+    """
+
+    def __init__(
+        self,
+        stream: httpx.AsyncByteStream,
+        on_complete: Callable[[bytes], Awaitable[None]],
+        max_size: int,
+        on_finish: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self._stream = stream
+        self._on_complete = on_complete
+        self._max_size = max_size
+        self._on_finish = on_finish
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        chunks: Optional[List[bytes]] = []
+        size = 0
+
+        try:
+            async for chunk in self._stream:
+                if chunks is not None:
+                    size += len(chunk)
+                    if size > self._max_size:
+                        chunks = None
+                    else:
+                        chunks.append(chunk)
+                yield chunk
+
+            if chunks is not None:
+                try:
+                    await self._on_complete(b"".join(chunks))
+                except Exception:
+                    pass  # The caller already has the full body; caching is best effort
+        finally:
+            self._finish()
+
+    def _finish(self) -> None:
+        if self._on_finish is not None:
+            on_finish, self._on_finish = self._on_finish, None
+            on_finish()
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._finish()
 
 
 class CacheResponseTransport(httpx.AsyncBaseTransport):
@@ -26,6 +155,10 @@ class CacheResponseTransport(httpx.AsyncBaseTransport):
     Cache response transport wrapper for httpx.
 
     Wraps another transport and provides RFC 7234 compliant HTTP response caching.
+    Entries past their stale-while-revalidate window are revalidated inline;
+    if the origin then raises or answers 500/502/503/504 within the entry's
+    stale-if-error window, the stale entry is served with a Warning: 111
+    header and on_cache_hit reports it as stale.
 
     Example:
         base = httpx.AsyncHTTPTransport()
@@ -44,6 +177,10 @@ class CacheResponseTransport(httpx.AsyncBaseTransport):
         on_cache_miss: Optional[Callable[[str], None]] = None,
         on_cache_store: Optional[Callable[[str, int, float], None]] = None,
         on_revalidated: Optional[Callable[[str], None]] = None,
+        enable_streaming: bool = False,
+        max_streamed_cache_size: int = 5 * 1024 * 1024,
+        coalesce_misses: bool = True,
+        coalesce_timeout_seconds: float = 30.0,
     ) -> None:
         """
         Create a new CacheResponseTransport.
@@ -57,6 +194,14 @@ class CacheResponseTransport(httpx.AsyncBaseTransport):
             on_cache_miss: Callback when cache miss occurs
             on_cache_store: Callback when response is cached
             on_revalidated: Callback when conditional request results in 304
+            enable_streaming: Decide cacheability from headers and stream bodies
+                through instead of buffering them. Default: False
+            max_streamed_cache_size: In streaming mode, stop caching a body once it
+                exceeds this many bytes. Default: 5MB
+            coalesce_misses: Run at most one upstream fetch per cache key; concurrent
+                misses wait for it and are served from the stored entry. Default: True
+            coalesce_timeout_seconds: Longest a coalesced miss waits before fetching
+                upstream itself. Default: 30
         """
         self._inner = inner
         self._cache = ResponseCache(config, store or create_memory_cache_store())
@@ -65,7 +210,11 @@ class CacheResponseTransport(httpx.AsyncBaseTransport):
         self._on_cache_miss = on_cache_miss
         self._on_cache_store = on_cache_store
         self._on_revalidated = on_revalidated
-        self._revalidating: set = set()
+        self._enable_streaming = enable_streaming
+        self._max_streamed_cache_size = max_streamed_cache_size
+        self._coalesce_misses = coalesce_misses
+        self._coalesce_timeout_seconds = coalesce_timeout_seconds
+        self._inflight: Dict[str, asyncio.Future] = {}
 
     async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
         """Handle an async HTTP request with caching capabilities."""
@@ -73,43 +222,136 @@ class CacheResponseTransport(httpx.AsyncBaseTransport):
         url = str(request.url)
 
         # Check if method is cacheable
-        if not self._cache.is_cacheable(method):
+        if not self._cache.is_cacheable(method, url):
             return await self._inner.handle_async_request(request)
 
+        # POST queries opted in by a rule are keyed by their body
+        body_digest = None
+        if method.upper() == "POST":
+            rule = self._cache.post_cache_rule(url)
+            if rule is not None:
+                request, body_digest = await self._digest_request_body(request, rule)
+                if body_digest is None:
+                    return await self._inner.handle_async_request(request)
+
         request_headers = dict(request.headers)
+        key = self._cache.generate_key(method, url, body_digest=body_digest)
+        waited = False
 
-        # Check cache
-        lookup = await self._cache.lookup(method, url, request_headers)
+        while True:
+            # Check cache
+            lookup = await self._cache.lookup(method, url, request_headers, body_digest)
 
-        if lookup.found and lookup.response and lookup.freshness == CacheFreshness.FRESH:
-            # Serve from cache
-            if self._on_cache_hit:
-                self._on_cache_hit(url, lookup.freshness)
-            return self._build_response(lookup.response)
+            if lookup.found and lookup.response and lookup.freshness == CacheFreshness.FRESH:
+                # Serve from cache
+                if self._on_cache_hit:
+                    self._on_cache_hit(url, lookup.freshness)
+
+                # Refresh-ahead: hot entry nearing expiry, revalidate off the request path
+                if lookup.should_refresh:
+                    if self._enable_background_revalidation:
+                        self._trigger_background_revalidation(
+                            request, lookup.etag, lookup.last_modified, body_digest
+                        )
+                    else:
+                        self._cache.end_refresh(method, url, body_digest)
+
+                return self._build_response(lookup.response)
+
+            if (
+                lookup.found
+                and lookup.response
+                and lookup.freshness == CacheFreshness.STALE
+                and _within_stale_while_revalidate(lookup.response)
+            ):
+                # Stale-while-revalidate: serve stale and revalidate in background
+                if self._on_cache_hit:
+                    self._on_cache_hit(url, lookup.freshness)
 
-        if lookup.found and lookup.response and lookup.freshness == CacheFreshness.STALE:
-            # Stale-while-revalidate: serve stale and revalidate in background
-            if self._on_cache_hit:
-                self._on_cache_hit(url, lookup.freshness)
+                if self._enable_background_revalidation:
+                    self._trigger_background_revalidation(
+                        request, lookup.etag, lookup.last_modified, body_digest
+                    )
 
-            if self._enable_background_revalidation and url not in self._revalidating:
-                self._trigger_background_revalidation(
-                    request, lookup.etag, lookup.last_modified
+                return self._build_response(lookup.response)
+
+            # Another request is already fetching this key: wait once, then re-check
+            pending = self._inflight.get(key) if self._coalesce_misses else None
+            if pending is None or waited:
+                break
+            waited = True
+            try:
+                await asyncio.wait_for(
+                    asyncio.shield(pending), self._coalesce_timeout_seconds
                 )
+            except asyncio.TimeoutError:
+                break
+
+        release = self._claim(key) if self._coalesce_misses else None
+        try:
+            return await self._fetch(request, lookup, request_headers, release, body_digest)
+        except BaseException:
+            if release:
+                release()
+            raise
+
+    async def _digest_request_body(
+        self, request: httpx.Request, rule: PostCacheRule
+    ) -> Tuple[httpx.Request, Optional[str]]:
+        """
+        Hash a POST body as it is read.
 
-            return self._build_response(lookup.response)
+        Returns a request whose body can be replayed (for revalidation) and
+        the body digest, or None if the body is larger than the rule allows
+        (the request then streams the rest of its body through unbuffered).
+        """
+        digest = RequestBodyDigest(rule.max_body_size)
+        request = await read_request_body(request, digest)
+        return request, digest.hexdigest(dict(request.headers), rule.key_headers)
+
+    def _claim(self, key: str) -> Optional[Callable[[], None]]:
+        """Register this request as the upstream fetch for a key; returns its release callback."""
+        if key in self._inflight:
+            return None
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+
+        def release() -> None:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            if not future.done():
+                future.set_result(None)
+
+        return release
+
+    async def _fetch(
+        self,
+        request: httpx.Request,
+        lookup: CacheLookupResult,
+        request_headers: Dict[str, str],
+        release: Optional[Callable[[], None]],
+        body_digest: Optional[str] = None,
+    ) -> httpx.Response:
+        """Fetch upstream on a miss, store the result and release waiting requests."""
+        method = request.method
+        url = str(request.url)
 
         # Cache miss or need revalidation
         if self._on_cache_miss:
             self._on_cache_miss(url)
 
         # Build conditional request
-        conditional_request = self._build_conditional_request(
-            request, lookup.etag, lookup.last_modified
-        )
+        conditional_request = _conditional_request(request, lookup.etag, lookup.last_modified)
 
         # Execute request
-        response = await self._inner.handle_async_request(conditional_request)
+        try:
+            response = await self._inner.handle_async_request(conditional_request)
+        except Exception:
+            if lookup.response and _within_stale_if_error(self._cache.get_config(), lookup.response):
+                if release:
+                    release()
+                return self._serve_stale(url, lookup.response)
+            raise
 
         # Handle 304 Not Modified
         if response.status_code == 304 and lookup.response:
@@ -118,11 +360,29 @@ class CacheResponseTransport(httpx.AsyncBaseTransport):
 
             # Update cache expiration
             await self._cache.revalidate(
-                method, url, dict(response.headers), request_headers
+                method, url, dict(response.headers), request_headers, body_digest
             )
+            if release:
+                release()
 
             return self._build_response(lookup.response)
 
+        if (
+            response.status_code in _STALE_IF_ERROR_STATUSES
+            and lookup.response
+            and _within_stale_if_error(self._cache.get_config(), lookup.response)
+        ):
+            await response.aclose()
+            if release:
+                release()
+            return self._serve_stale(url, lookup.response)
+
+        if self._enable_streaming:
+            # Waiters are released once the streamed body has been stored
+            return self._stream_response(
+                method, url, response, request_headers, release, body_digest
+            )
+
         # Read response body for caching
         content = await response.aread()
 
@@ -134,7 +394,10 @@ class CacheResponseTransport(httpx.AsyncBaseTransport):
             dict(response.headers),
             content,
             request_headers,
+            body_digest,
         )
+        if release:
+            release()
 
         if stored and self._on_cache_store:
             cache_control = response.headers.get("cache-control", "")
@@ -148,6 +411,47 @@ class CacheResponseTransport(httpx.AsyncBaseTransport):
             content=content,
         )
 
+    def _stream_response(
+        self,
+        method: str,
+        url: str,
+        response: httpx.Response,
+        request_headers: Dict[str, str],
+        release: Optional[Callable[[], None]] = None,
+        body_digest: Optional[str] = None,
+    ) -> httpx.Response:
+        """Stream an upstream response through, teeing cacheable bodies into the store."""
+        entry = self._cache.prepare_entry(
+            method, url, response.status_code, dict(response.headers), request_headers, body_digest
+        )
+        content_length = response.headers.get("content-length")
+        too_large = (
+            content_length is not None
+            and content_length.isdigit()
+            and int(content_length) > self._max_streamed_cache_size
+        )
+        if entry is None or too_large:
+            if release:
+                release()
+            return response
+
+        async def on_complete(body: bytes) -> None:
+            entry.body = body
+            await self._cache.store_entry(method, url, entry, body_digest)
+            if self._on_cache_store:
+                cache_control = response.headers.get("cache-control", "")
+                max_age = self._parse_max_age(cache_control)
+                self._on_cache_store(url, response.status_code, max_age)
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_TeeToCacheStream(
+                response.stream, on_complete, self._max_streamed_cache_size, release
+            ),
+            extensions=response.extensions,
+        )
+
     def _build_response(self, cached) -> httpx.Response:
         """Build an httpx.Response from cached data."""
         return httpx.Response(
@@ -156,76 +460,66 @@ class CacheResponseTransport(httpx.AsyncBaseTransport):
             content=cached.body or b"",
         )
 
-    def _build_conditional_request(
-        self,
-        request: httpx.Request,
-        etag: Optional[str],
-        last_modified: Optional[str],
-    ) -> httpx.Request:
-        """Build a conditional request with If-None-Match/If-Modified-Since."""
-        headers = dict(request.headers)
-
-        if etag and "if-none-match" not in [k.lower() for k in headers]:
-            headers["If-None-Match"] = etag
-
-        if last_modified and "if-modified-since" not in [k.lower() for k in headers]:
-            headers["If-Modified-Since"] = last_modified
-
-        return httpx.Request(
-            method=request.method,
-            url=request.url,
-            headers=headers,
-            content=request.content,
-        )
+    def _serve_stale(self, url: str, cached: CachedResponse) -> httpx.Response:
+        """Serve a stale entry in place of a failed origin response."""
+        if self._on_cache_hit:
+            self._on_cache_hit(url, CacheFreshness.STALE)
+        return _stale_response(cached)
 
     def _trigger_background_revalidation(
         self,
         request: httpx.Request,
         etag: Optional[str],
         last_modified: Optional[str],
+        body_digest: Optional[str] = None,
     ) -> None:
-        """Trigger background revalidation for stale-while-revalidate."""
+        """
+        Queue a background revalidation for stale-while-revalidate or refresh-ahead.
+
+        Runs on the cache's bounded scheduler, so concurrent revalidations
+        are capped and a key already being revalidated is not fetched twice.
+        """
         url = str(request.url)
-        self._revalidating.add(url)
 
         async def _revalidate():
-            try:
-                conditional_request = self._build_conditional_request(
-                    request, etag, last_modified
+            conditional_request = _conditional_request(request, etag, last_modified)
+            response = await self._inner.handle_async_request(conditional_request)
+            content = await response.aread()
+
+            request_headers = dict(request.headers)
+
+            if response.status_code == 304:
+                if self._on_revalidated:
+                    self._on_revalidated(url)
+                await self._cache.revalidate(
+                    request.method,
+                    url,
+                    dict(response.headers),
+                    request_headers,
+                    body_digest,
                 )
-                response = await self._inner.handle_async_request(conditional_request)
-                content = await response.aread()
-
-                request_headers = dict(request.headers)
-
-                if response.status_code == 304:
-                    if self._on_revalidated:
-                        self._on_revalidated(url)
-                    await self._cache.revalidate(
-                        request.method,
-                        url,
-                        dict(response.headers),
-                        request_headers,
-                    )
-                else:
-                    stored = await self._cache.store(
-                        request.method,
-                        url,
-                        response.status_code,
-                        dict(response.headers),
-                        content,
-                        request_headers,
-                    )
-                    if stored and self._on_cache_store:
-                        cache_control = response.headers.get("cache-control", "")
-                        max_age = self._parse_max_age(cache_control)
-                        self._on_cache_store(url, response.status_code, max_age)
-            except Exception:
-                pass  # Silently ignore background revalidation errors
-            finally:
-                self._revalidating.discard(url)
+            else:
+                stored = await self._cache.store(
+                    request.method,
+                    url,
+                    response.status_code,
+                    dict(response.headers),
+                    content,
+                    request_headers,
+                    body_digest,
+                )
+                if stored and self._on_cache_store:
+                    cache_control = response.headers.get("cache-control", "")
+                    max_age = self._parse_max_age(cache_control)
+                    self._on_cache_store(url, response.status_code, max_age)
+
+        def _release() -> None:
+            self._cache.end_refresh(request.method, url, body_digest)
 
-        asyncio.create_task(_revalidate())
+        if not self._cache.schedule_revalidation(
+            request.method, url, _revalidate, _release, body_digest
+        ):
+            _release()
 
     def _parse_max_age(self, cache_control: str) -> float:
         """Parse max-age from Cache-Control header."""
@@ -241,6 +535,10 @@ class CacheResponseTransport(httpx.AsyncBaseTransport):
 
         return 0
 
+    def get_revalidation_stats(self) -> RevalidationStats:
+        """Get background revalidation counters (queued, dropped, succeeded, failed)."""
+        return self._cache.get_revalidation_stats()
+
     async def aclose(self) -> None:
         """Close the transport."""
         await self._cache.close()
@@ -251,6 +549,12 @@ class SyncCacheResponseTransport(httpx.BaseTransport):
     """
     Synchronous cache response transport wrapper for httpx.
 
+    Backed by a SyncResponseCache, so keys, POST rules, Vary variants and
+    tags behave as in the async transport, over a SyncCacheResponseStore
+    (a thread-safe, bounded LRU by default). Stale entries are revalidated
+    inline with If-None-Match / If-Modified-Since, and served anyway when
+    the origin fails within their stale-if-error window.
+
     Note: Background revalidation is not available in sync mode.
     """
 
@@ -259,9 +563,11 @@ class SyncCacheResponseTransport(httpx.BaseTransport):
         inner: httpx.BaseTransport,
         *,
         config: Optional[CacheResponseConfig] = None,
+        store: Optional[SyncCacheResponseStore] = None,
         on_cache_hit: Optional[Callable[[str, str], None]] = None,
         on_cache_miss: Optional[Callable[[str], None]] = None,
         on_cache_store: Optional[Callable[[str, int, float], None]] = None,
+        on_revalidated: Optional[Callable[[str], None]] = None,
     ) -> None:
         """
         Create a new SyncCacheResponseTransport.
@@ -269,120 +575,97 @@ class SyncCacheResponseTransport(httpx.BaseTransport):
         Args:
             inner: The wrapped transport to delegate requests to
             config: Cache configuration
+            store: Custom sync cache store. Default: SyncMemoryCacheStore
             on_cache_hit: Callback when cache hit occurs
             on_cache_miss: Callback when cache miss occurs
             on_cache_store: Callback when response is cached
+            on_revalidated: Callback when conditional request results in 304
         """
         self._inner = inner
-        self._config = config or CacheResponseConfig()
+        self._cache = SyncResponseCache(config, store or create_sync_memory_cache_store())
         self._on_cache_hit = on_cache_hit
         self._on_cache_miss = on_cache_miss
         self._on_cache_store = on_cache_store
-
-        # Simple sync cache (dict-based)
-        self._cache: Dict[str, tuple] = {}
+        self._on_revalidated = on_revalidated
 
     def handle_request(self, request: httpx.Request) -> httpx.Response:
         """Handle a sync HTTP request with caching capabilities."""
-        import time
-        from cache_response import (
-            is_cacheable_method,
-            is_cacheable_status,
-            parse_cache_control,
-            should_cache,
-            calculate_expiration,
-            extract_etag,
-            extract_last_modified,
-            normalize_headers,
-        )
-
         method = request.method
         url = str(request.url)
 
         # Check if method is cacheable
-        cacheable_methods = self._config.methods or ["GET", "HEAD"]
-        if not is_cacheable_method(method, cacheable_methods):
+        if not self._cache.is_cacheable(method, url):
             return self._inner.handle_request(request)
 
-        cache_key = f"{method}:{url}"
-        now = time.time()
+        # POST queries opted in by a rule are keyed by their body
+        body_digest = None
+        if method.upper() == "POST":
+            rule = self._cache.post_cache_rule(url)
+            if rule is not None:
+                request, body_digest = self._digest_request_body(request, rule)
+                if body_digest is None:
+                    return self._inner.handle_request(request)
 
-        # Check cache
-        if cache_key in self._cache:
-            cached_data, expires_at, cached_headers, etag, last_modified = self._cache[cache_key]
-            if now < expires_at:
-                if self._on_cache_hit:
-                    self._on_cache_hit(url, "fresh")
-                return httpx.Response(
-                    status_code=cached_data["status_code"],
-                    headers=cached_data["headers"],
-                    content=cached_data["content"],
-                )
+        request_headers = dict(request.headers)
+        lookup = self._cache.lookup(method, url, request_headers, body_digest)
+        cached = lookup.response if lookup.found else None
 
-        # Cache miss
+        if (
+            cached is not None
+            and lookup.freshness == CacheFreshness.FRESH
+            and not lookup.should_revalidate
+        ):
+            if self._on_cache_hit:
+                self._on_cache_hit(url, lookup.freshness.value)
+            if lookup.should_refresh:
+                # No background refresh in sync mode; the entry revalidates once stale
+                self._cache.end_refresh(method, url, body_digest)
+            return self._build_response(cached)
+
+        # Cache miss or need revalidation
         if self._on_cache_miss:
             self._on_cache_miss(url)
 
-        # Execute request
-        response = self._inner.handle_request(request)
-        content = response.read()
+        conditional_request = _conditional_request(request, lookup.etag, lookup.last_modified)
+        try:
+            response = self._inner.handle_request(conditional_request)
+        except Exception:
+            if cached is not None and _within_stale_if_error(self._cache.get_config(), cached):
+                return self._serve_stale(url, cached)
+            raise
 
-        # Check if cacheable
-        cacheable_statuses = self._config.cacheable_statuses or [
-            200, 203, 204, 206, 300, 301, 404, 405, 410, 414, 501
-        ]
-        if not is_cacheable_status(response.status_code, cacheable_statuses):
-            return httpx.Response(
-                status_code=response.status_code,
-                headers=response.headers,
-                content=content,
+        # Handle 304 Not Modified
+        if response.status_code == 304 and cached is not None:
+            response.close()
+            if self._on_revalidated:
+                self._on_revalidated(url)
+            self._cache.revalidate(
+                method, url, dict(response.headers), request_headers, body_digest
             )
+            return self._build_response(cached)
 
-        # Check cache-control
-        response_headers = normalize_headers(dict(response.headers))
-        cache_control = response_headers.get("cache-control")
-        directives = parse_cache_control(cache_control)
-
-        if not should_cache(
-            directives,
-            respect_no_store=self._config.respect_no_store,
-            respect_no_cache=self._config.respect_no_cache,
-            respect_private=self._config.respect_private,
+        if (
+            response.status_code in _STALE_IF_ERROR_STATUSES
+            and cached is not None
+            and _within_stale_if_error(self._cache.get_config(), cached)
         ):
-            return httpx.Response(
-                status_code=response.status_code,
-                headers=response.headers,
-                content=content,
-            )
+            response.close()
+            return self._serve_stale(url, cached)
 
-        # Calculate expiration
-        expires_at = calculate_expiration(
-            response_headers,
-            directives,
-            self._config.default_ttl_seconds,
-            self._config.max_ttl_seconds,
+        content = response.read()
+        stored = self._cache.store(
+            method,
+            url,
+            response.status_code,
+            dict(response.headers),
+            content,
+            request_headers,
+            body_digest,
         )
-
-        if expires_at > now:
-            # Cache the response
-            cached_data = {
-                "status_code": response.status_code,
-                "headers": dict(response.headers),
-                "content": content,
-            }
-            etag = extract_etag(response_headers)
-            last_modified = extract_last_modified(response_headers)
-            self._cache[cache_key] = (
-                cached_data,
-                expires_at,
-                response_headers,
-                etag,
-                last_modified,
-            )
-
-            if self._on_cache_store:
-                max_age = directives.max_age or directives.s_maxage or 0
-                self._on_cache_store(url, response.status_code, float(max_age))
+        if stored and self._on_cache_store:
+            directives = parse_cache_control(response.headers.get("cache-control"))
+            max_age = directives.max_age or directives.s_maxage or 0
+            self._on_cache_store(url, response.status_code, float(max_age))
 
         return httpx.Response(
             status_code=response.status_code,
@@ -390,7 +673,29 @@ class SyncCacheResponseTransport(httpx.BaseTransport):
             content=content,
         )
 
+    def _digest_request_body(
+        self, request: httpx.Request, rule: PostCacheRule
+    ) -> Tuple[httpx.Request, Optional[str]]:
+        """Hash a POST body as it is read (see CacheResponseTransport._digest_request_body)."""
+        digest = RequestBodyDigest(rule.max_body_size)
+        request = read_sync_request_body(request, digest)
+        return request, digest.hexdigest(dict(request.headers), rule.key_headers)
+
+    def _serve_stale(self, url: str, cached: CachedResponse) -> httpx.Response:
+        """Serve a stale entry in place of a failed origin response."""
+        if self._on_cache_hit:
+            self._on_cache_hit(url, CacheFreshness.STALE.value)
+        return _stale_response(cached)
+
+    def _build_response(self, cached: CachedResponse) -> httpx.Response:
+        """Build an httpx.Response from cached data."""
+        return httpx.Response(
+            status_code=cached.metadata.status_code,
+            headers=cached.metadata.headers,
+            content=cached.body or b"",
+        )
+
     def close(self) -> None:
         """Close the transport."""
-        self._cache.clear()
+        self._cache.close()
         self._inner.close()
@@ -231,6 +231,60 @@ class NonCacheableMockAsyncTransport(httpx.AsyncBaseTransport):
         pass
 
 
+class ChunkedStream(httpx.AsyncByteStream):
+    """Async byte stream that records how many chunks were consumed."""
+
+    def __init__(self, chunks: list[bytes]) -> None:
+        self.chunks = chunks
+        self.consumed = 0
+        self.closed = False
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            self.consumed += 1
+            yield chunk
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+class StreamingMockAsyncTransport(httpx.AsyncBaseTransport):
+    """Mock async transport that returns chunked, unbuffered responses."""
+
+    def __init__(
+        self,
+        chunks: list[bytes] | None = None,
+        response_status: int = 200,
+        cache_control: str = "max-age=3600",
+        extra_headers: dict | None = None,
+    ) -> None:
+        self.chunks = chunks or [b'{"part": 1}', b'{"part": 2}']
+        self.response_status = response_status
+        self.cache_control = cache_control
+        self.extra_headers = extra_headers or {}
+        self.requests: list[httpx.Request] = []
+        self.streams: list[ChunkedStream] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Return a response whose body is only produced when iterated."""
+        self.requests.append(request)
+        stream = ChunkedStream(list(self.chunks))
+        self.streams.append(stream)
+        return httpx.Response(
+            status_code=self.response_status,
+            headers={
+                "content-type": "application/json",
+                "cache-control": self.cache_control,
+                **self.extra_headers,
+            },
+            stream=stream,
+        )
+
+    async def aclose(self) -> None:
+        """Close the transport."""
+        pass
+
+
 class ErrorMockAsyncTransport(httpx.AsyncBaseTransport):
     """Mock async transport that raises errors."""
 
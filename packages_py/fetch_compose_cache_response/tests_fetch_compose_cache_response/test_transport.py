@@ -7,6 +7,8 @@ Following logic testing methodologies:
 - Error Handling
 """
 import asyncio
+import time
+from typing import Optional
 from unittest.mock import MagicMock
 
 import httpx
@@ -15,6 +17,8 @@ import pytest
 from cache_response import (
     CacheResponseConfig,
     CacheFreshness,
+    PostCacheRule,
+    SyncMemoryCacheStore,
 )
 from fetch_compose_cache_response import CacheResponseTransport, SyncCacheResponseTransport
 from .conftest import (
@@ -25,6 +29,7 @@ from .conftest import (
     NonCacheableMockAsyncTransport,
     ErrorMockAsyncTransport,
     ErrorMockSyncTransport,
+    StreamingMockAsyncTransport,
 )
 
 
@@ -373,7 +378,7 @@ class TestSyncCacheResponseTransport:
             transport = SyncCacheResponseTransport(inner)
 
             assert transport._inner is inner
-            assert transport._config is not None
+            assert transport._cache.get_config() is not None
 
             transport.close()
 
@@ -387,7 +392,8 @@ class TestSyncCacheResponseTransport:
 
             transport = SyncCacheResponseTransport(inner, config=config)
 
-            assert transport._config == config
+            merged = transport._cache.get_config()
+            assert (merged.default_ttl_seconds, merged.max_ttl_seconds) == (600, 3600)
 
             transport.close()
 
@@ -528,7 +534,7 @@ class TestSyncCacheResponseTransport:
             transport.close()
 
             # Cache should be cleared
-            assert len(transport._cache) == 0
+            assert transport._cache._store.size() == 0
 
 
 class TestBoundaryConditions:
@@ -932,6 +938,208 @@ class TestMultipleConcurrentRequests:
         await transport.aclose()
 
 
+class SlowCacheableTransport(CacheableMockAsyncTransport):
+    """Cacheable mock that yields to the event loop before responding."""
+
+    def __init__(self, delay: float = 0.01, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.delay = delay
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.delay)
+        return await super().handle_async_request(request)
+
+
+class TestMissCoalescing:
+    """Concurrent misses for one cache key share a single upstream fetch."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_fetch_once(self) -> None:
+        inner = SlowCacheableTransport(max_age=3600)
+        transport = CacheResponseTransport(inner)
+
+        responses = await asyncio.gather(
+            *[
+                transport.handle_async_request(httpx.Request("GET", "http://localhost/api/data"))
+                for _ in range(10)
+            ]
+        )
+
+        assert len(inner.requests) == 1
+        assert all(r.content == b'{"data": "cached"}' for r in responses)
+
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_revalidations_send_one_conditional_request(self) -> None:
+        inner = SlowCacheableTransport(max_age=3600, etag='"v1"')
+        transport = CacheResponseTransport(inner)
+        url = "http://localhost/api/data"
+        await transport.handle_async_request(httpx.Request("GET", url))
+
+        # Expire the entry in place so lookups find it and must revalidate
+        cached = await transport._cache._store.get(f"GET:{url}")
+        cached.metadata.expires_at = time.time() - 1
+        inner.requests.clear()
+
+        responses = await asyncio.gather(
+            *[transport.handle_async_request(httpx.Request("GET", url)) for _ in range(5)]
+        )
+
+        assert len(inner.requests) == 1
+        assert inner.requests[0].headers["if-none-match"] == '"v1"'
+        assert all(r.content == b'{"data": "cached"}' for r in responses)
+
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_response_releases_waiters_to_fetch(self) -> None:
+        class SlowNoStore(NonCacheableMockAsyncTransport):
+            async def handle_async_request(self, request):
+                await asyncio.sleep(0.01)
+                return await super().handle_async_request(request)
+
+        inner = SlowNoStore()
+        transport = CacheResponseTransport(inner)
+
+        responses = await asyncio.gather(
+            *[
+                transport.handle_async_request(httpx.Request("GET", "http://localhost/api/me"))
+                for _ in range(3)
+            ]
+        )
+
+        assert all(r.status_code == 200 for r in responses)
+        assert len(inner.requests) == 3  # Private data is never shared between requests
+
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_leader_failure_releases_waiters(self) -> None:
+        calls = 0
+
+        class FailFirst(SlowCacheableTransport):
+            async def handle_async_request(self, request):
+                nonlocal calls
+                calls += 1
+                if calls == 1:
+                    await asyncio.sleep(0.01)
+                    raise httpx.ConnectError("Connection refused")
+                return await super().handle_async_request(request)
+
+        transport = CacheResponseTransport(FailFirst())
+        results = await asyncio.gather(
+            *[
+                transport.handle_async_request(httpx.Request("GET", "http://localhost/api/data"))
+                for _ in range(3)
+            ],
+            return_exceptions=True,
+        )
+
+        assert isinstance(results[0], httpx.ConnectError)
+        assert all(r.status_code == 200 for r in results[1:])
+        assert transport._inflight == {}
+
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_streaming_waiters_wait_for_body(self) -> None:
+        inner = StreamingMockAsyncTransport()
+        transport = CacheResponseTransport(inner, enable_streaming=True)
+        url = "http://localhost/api/data"
+
+        leader = await transport.handle_async_request(httpx.Request("GET", url))
+        waiter = asyncio.ensure_future(
+            transport.handle_async_request(httpx.Request("GET", url))
+        )
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        await leader.aread()
+        response = await waiter
+
+        assert response.content == b'{"part": 1}{"part": 2}'
+        assert len(inner.requests) == 1
+
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_coalescing_can_be_disabled(self) -> None:
+        inner = SlowCacheableTransport(max_age=3600)
+        transport = CacheResponseTransport(inner, coalesce_misses=False)
+
+        await asyncio.gather(
+            *[
+                transport.handle_async_request(httpx.Request("GET", "http://localhost/api/data"))
+                for _ in range(3)
+            ]
+        )
+
+        assert len(inner.requests) == 3
+
+        await transport.aclose()
+
+
+class TestRefreshAhead:
+    """Hot entries are revalidated in the background before they expire."""
+
+    @pytest.mark.asyncio
+    async def test_hot_entry_revalidated_while_fresh(self) -> None:
+        revalidated = []
+        inner = CacheableMockAsyncTransport(max_age=100, etag='"v1"')
+        transport = CacheResponseTransport(
+            inner,
+            config=CacheResponseConfig(refresh_ahead=True, refresh_ahead_min_hits=2),
+            on_revalidated=revalidated.append,
+        )
+        url = "http://localhost/api/config"
+        await transport.handle_async_request(httpx.Request("GET", url))
+
+        cached = await transport._cache._store.get(f"GET:{url}")
+        cached.metadata.cached_at -= 90
+        cached.metadata.expires_at -= 90
+
+        for _ in range(2):
+            response = await transport.handle_async_request(httpx.Request("GET", url))
+            assert response.status_code == 200
+        await asyncio.sleep(0.01)
+
+        assert len(inner.requests) == 2
+        assert inner.requests[1].headers["if-none-match"] == '"v1"'
+        assert revalidated == [url]
+        refreshed = await transport._cache._store.get(f"GET:{url}")
+        assert refreshed.metadata.expires_at > time.time() + 90
+
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_releases_slot(self) -> None:
+        inner = CacheableMockAsyncTransport(max_age=100)
+        transport = CacheResponseTransport(
+            inner, config=CacheResponseConfig(refresh_ahead=True, refresh_ahead_min_hits=1)
+        )
+        url = "http://localhost/api/config"
+        await transport.handle_async_request(httpx.Request("GET", url))
+        cached = await transport._cache._store.get(f"GET:{url}")
+        cached.metadata.cached_at -= 90
+        cached.metadata.expires_at -= 90
+        attempts = []
+
+        async def fail(request):
+            attempts.append(request)
+            raise httpx.ConnectError("down")
+
+        inner.handle_async_request = fail
+        response = await transport.handle_async_request(httpx.Request("GET", url))
+        await asyncio.sleep(0.01)
+
+        assert response.status_code == 200
+        assert len(attempts) == 1
+        assert transport._cache._refreshing_keys == set()
+
+        await transport.aclose()
+
+
 class TestErrorRecovery:
     """Test error recovery scenarios."""
 
@@ -964,6 +1172,608 @@ class TestErrorRecovery:
         await transport.aclose()
 
 
+class TestBoundedBackgroundRevalidation:
+    """Background revalidations run on the cache's bounded scheduler."""
+
+    @pytest.mark.asyncio
+    async def test_stale_burst_is_capped(self) -> None:
+        release = asyncio.Event()
+        in_flight = 0
+        peak = 0
+
+        class GatedTransport(httpx.AsyncBaseTransport):
+            async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+                nonlocal in_flight, peak
+                if "if-none-match" in request.headers:
+                    in_flight += 1
+                    peak = max(peak, in_flight)
+                    await release.wait()
+                    in_flight -= 1
+                    return httpx.Response(304, headers={"cache-control": "max-age=60"})
+                return httpx.Response(
+                    200,
+                    headers={"cache-control": "max-age=0, stale-while-revalidate=60", "etag": '"v1"'},
+                    content=b"ok",
+                )
+
+        on_revalidated = MagicMock()
+        transport = CacheResponseTransport(
+            GatedTransport(),
+            config=CacheResponseConfig(max_concurrent_revalidations=3),
+            on_revalidated=on_revalidated,
+        )
+        urls = [f"http://localhost/api/{i}" for i in range(20)]
+        for url in urls:
+            await transport.handle_async_request(httpx.Request("GET", url))
+        await asyncio.sleep(0.01)
+
+        for url in urls + urls:
+            response = await transport.handle_async_request(httpx.Request("GET", url))
+            assert response.content == b"ok"
+        await asyncio.sleep(0.01)
+        assert in_flight == 3
+
+        release.set()
+        await transport._cache._scheduler.join()
+        stats = transport.get_revalidation_stats()
+        assert peak == 3
+        assert on_revalidated.call_count == 20
+        assert (stats.queued, stats.deduplicated, stats.succeeded, stats.failed) == (20, 20, 20, 0)
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_failures_are_counted(self) -> None:
+        inner = ScriptedAsyncTransport(
+            httpx.Response(200, headers={"cache-control": "max-age=0, stale-while-revalidate=60"}, content=b"ok"),
+            httpx.ConnectError("Connection refused"),
+        )
+        transport = CacheResponseTransport(inner)
+        url = "http://localhost/api/data"
+
+        await transport.handle_async_request(httpx.Request("GET", url))
+        await asyncio.sleep(0.01)
+        assert (await transport.handle_async_request(httpx.Request("GET", url))).content == b"ok"
+        await transport._cache._scheduler.join()
+
+        assert transport.get_revalidation_stats().failed == 1
+        await transport.aclose()
+
+
+class ScriptedAsyncTransport(httpx.AsyncBaseTransport):
+    """Async transport that replays a fixed sequence of responses or errors."""
+
+    def __init__(self, *steps) -> None:
+        self.steps = list(steps)
+        self.requests: list[httpx.Request] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        step = self.steps.pop(0)
+        if isinstance(step, Exception):
+            raise step
+        return step
+
+
+async def expire_async(transport: CacheResponseTransport, url: str) -> None:
+    """Move a stored entry's expiry into the past."""
+    (await transport._cache._store.get(f"GET:{url}")).metadata.expires_at = time.time() - 1
+
+
+class TestStaleIfError:
+    """Expired entries inside their stale-if-error window mask origin failures."""
+
+    URL = "http://localhost/api/data"
+
+    @staticmethod
+    def cached_ok(cache_control: str = "max-age=60, stale-if-error=300") -> httpx.Response:
+        return httpx.Response(200, headers={"cache-control": cache_control}, content=b"ok")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "failure",
+        [
+            httpx.ConnectError("Connection refused"),
+            httpx.ReadTimeout("Timed out"),
+            httpx.Response(500),
+            httpx.Response(502),
+            httpx.Response(503),
+            httpx.Response(504),
+        ],
+    )
+    async def test_serves_stale_on_failure(self, failure) -> None:
+        inner = ScriptedAsyncTransport(self.cached_ok(), failure)
+        on_cache_hit = MagicMock()
+        transport = CacheResponseTransport(inner, on_cache_hit=on_cache_hit)
+
+        await transport.handle_async_request(httpx.Request("GET", self.URL))
+        await expire_async(transport, self.URL)
+        response = await transport.handle_async_request(httpx.Request("GET", self.URL))
+
+        assert response.status_code == 200
+        assert response.content == b"ok"
+        assert response.headers["warning"] == '111 - "Revalidation Failed"'
+        on_cache_hit.assert_called_once_with(self.URL, CacheFreshness.STALE)
+        assert transport._inflight == {}
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_revalidates_inline_when_origin_recovers(self) -> None:
+        inner = ScriptedAsyncTransport(
+            self.cached_ok(),
+            httpx.Response(200, headers={"cache-control": "max-age=60"}, content=b"new"),
+        )
+        transport = CacheResponseTransport(inner)
+
+        await transport.handle_async_request(httpx.Request("GET", self.URL))
+        await expire_async(transport, self.URL)
+        response = await transport.handle_async_request(httpx.Request("GET", self.URL))
+
+        assert response.content == b"new"
+        assert "warning" not in response.headers
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_other_errors_are_not_masked(self) -> None:
+        inner = ScriptedAsyncTransport(self.cached_ok(), httpx.Response(404))
+        transport = CacheResponseTransport(inner)
+
+        await transport.handle_async_request(httpx.Request("GET", self.URL))
+        await expire_async(transport, self.URL)
+
+        assert (await transport.handle_async_request(httpx.Request("GET", self.URL))).status_code == 404
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_error_outside_window_propagates(self) -> None:
+        inner = ScriptedAsyncTransport(
+            self.cached_ok("max-age=60"),
+            httpx.ConnectError("Connection refused"),
+            httpx.Response(503),
+        )
+        transport = CacheResponseTransport(inner)
+
+        await transport.handle_async_request(httpx.Request("GET", self.URL))
+        await expire_async(transport, self.URL)
+
+        with pytest.raises(httpx.ConnectError):
+            await transport.handle_async_request(httpx.Request("GET", self.URL))
+        assert transport._inflight == {}
+        assert (await transport.handle_async_request(httpx.Request("GET", self.URL))).status_code == 503
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_config(self) -> None:
+        inner = ScriptedAsyncTransport(self.cached_ok(), httpx.ConnectError("Connection refused"))
+        transport = CacheResponseTransport(inner, config=CacheResponseConfig(stale_if_error=False))
+
+        await transport.handle_async_request(httpx.Request("GET", self.URL))
+        await expire_async(transport, self.URL)
+
+        with pytest.raises(httpx.ConnectError):
+            await transport.handle_async_request(httpx.Request("GET", self.URL))
+        await transport.aclose()
+
+
+    @pytest.mark.asyncio
+    async def test_unset_options_use_merged_defaults(self) -> None:
+        inner = ScriptedAsyncTransport(self.cached_ok(), httpx.ConnectError("Connection refused"))
+        transport = CacheResponseTransport(inner, config=CacheResponseConfig(stale_if_error=None))
+
+        await transport.handle_async_request(httpx.Request("GET", self.URL))
+        await expire_async(transport, self.URL)
+
+        response = await transport.handle_async_request(httpx.Request("GET", self.URL))
+        assert response.headers["warning"] == '111 - "Revalidation Failed"'
+        await transport.aclose()
+
+
+class RecordingAsyncTransport(httpx.AsyncBaseTransport):
+    """Async transport that echoes request bodies and records what it received."""
+
+    def __init__(self, headers: Optional[dict] = None) -> None:
+        self.headers = headers or {"content-type": "application/json"}
+        self.bodies: list[bytes] = []
+        self.requests: list[httpx.Request] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        self.requests.append(request)
+        self.bodies.append(body)
+        return httpx.Response(200, headers=self.headers, content=b"result:" + body)
+
+
+class TestPostQueryCaching:
+    """POST queries matching a post_cache_rule are cached by body digest."""
+
+    SEARCH = "http://localhost/rest/api/3/search"
+    CONFIG = CacheResponseConfig(post_cache_rules=[PostCacheRule(r"/search$", ttl_seconds=60)])
+
+    @pytest.mark.asyncio
+    async def test_same_query_served_from_cache(self) -> None:
+        inner = RecordingAsyncTransport()
+        transport = CacheResponseTransport(inner, config=self.CONFIG)
+
+        for body in (b'{"jql": "a"}', b'{"jql": "a"}', b'{"jql": "b"}'):
+            response = await transport.handle_async_request(
+                httpx.Request("POST", self.SEARCH, content=body)
+            )
+            assert response.content == b"result:" + body
+
+        assert inner.bodies == [b'{"jql": "a"}', b'{"jql": "b"}']
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_streamed_request_body_is_forwarded_intact(self) -> None:
+        inner = RecordingAsyncTransport()
+        transport = CacheResponseTransport(inner, config=self.CONFIG)
+
+        async def chunks():
+            yield b'{"query": '
+            yield b'"{ viewer { login } }"}'
+
+        for _ in range(2):
+            response = await transport.handle_async_request(
+                httpx.Request("POST", self.SEARCH, content=chunks())
+            )
+            assert response.content == b'result:{"query": "{ viewer { login } }"}'
+
+        assert len(inner.requests) == 1
+        assert "transfer-encoding" not in inner.requests[0].headers
+        assert inner.requests[0].headers["content-length"] == str(len(inner.bodies[0]))
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_unmatched_routes_and_large_bodies_bypass(self) -> None:
+        config = CacheResponseConfig(
+            post_cache_rules=[PostCacheRule(r"/search$", max_body_size=8)]
+        )
+        inner = RecordingAsyncTransport()
+        transport = CacheResponseTransport(inner, config=config)
+
+        for _ in range(2):
+            await transport.handle_async_request(
+                httpx.Request("POST", self.SEARCH, content=b"a much larger query")
+            )
+            await transport.handle_async_request(
+                httpx.Request("POST", "http://localhost/rest/api/3/issue", content=b"{}")
+            )
+
+        assert len(inner.requests) == 4
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_oversized_streamed_body_is_not_buffered(self) -> None:
+        config = CacheResponseConfig(
+            post_cache_rules=[PostCacheRule(r"/search$", max_body_size=8)]
+        )
+        yielded = []
+
+        async def chunks():
+            for chunk in (b"0123", b"4567", b"89ab", b"cdef"):
+                yielded.append(chunk)
+                yield chunk
+
+        class CountingTransport(RecordingAsyncTransport):
+            async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+                self.read_before_send = len(yielded)
+                return await super().handle_async_request(request)
+
+        inner = CountingTransport()
+        transport = CacheResponseTransport(inner, config=config)
+
+        response = await transport.handle_async_request(
+            httpx.Request("POST", self.SEARCH, content=chunks())
+        )
+
+        # Reading stopped at the chunk that overflowed; the rest streamed through
+        assert inner.read_before_send == 3
+        assert response.content == b"result:0123456789abcdef"
+        assert inner.requests[0].headers["transfer-encoding"] == "chunked"
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_stale_post_refetched_without_validators(self) -> None:
+        inner = RecordingAsyncTransport(
+            {"content-type": "application/json", "etag": '"v1"'}
+        )
+        transport = CacheResponseTransport(inner, config=self.CONFIG)
+
+        await transport.handle_async_request(httpx.Request("POST", self.SEARCH, content=b"q"))
+        key = next(iter(await transport._cache._store.keys()))
+        (await transport._cache._store.get(key)).metadata.expires_at = time.time() - 1
+        await transport.handle_async_request(httpx.Request("POST", self.SEARCH, content=b"q"))
+
+        assert len(inner.requests) == 2
+        assert "if-none-match" not in inner.requests[1].headers
+        await transport.aclose()
+
+
+class TestStreamingMode:
+    """Tests for streaming pass-through and tee-to-cache."""
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_response_is_passed_through_unread(self) -> None:
+        """No-store responses are returned without buffering the body."""
+        inner = StreamingMockAsyncTransport(cache_control="no-store")
+        transport = CacheResponseTransport(inner, enable_streaming=True)
+
+        request = httpx.Request("GET", "http://localhost/api/download")
+        response = await transport.handle_async_request(request)
+
+        assert inner.streams[0].consumed == 0
+        assert await response.aread() == b'{"part": 1}{"part": 2}'
+
+        await transport.handle_async_request(request)
+        assert len(inner.requests) == 2
+
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_server_error_is_passed_through_unread(self) -> None:
+        """5xx responses stream straight through."""
+        inner = StreamingMockAsyncTransport(response_status=503)
+        transport = CacheResponseTransport(inner, enable_streaming=True)
+
+        response = await transport.handle_async_request(
+            httpx.Request("GET", "http://localhost/api/data")
+        )
+
+        assert response.status_code == 503
+        assert inner.streams[0].consumed == 0
+
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_cacheable_response_is_teed_into_store(self) -> None:
+        """Cacheable bodies are stored once the caller has read them."""
+        stored = []
+        inner = StreamingMockAsyncTransport()
+        transport = CacheResponseTransport(
+            inner,
+            enable_streaming=True,
+            on_cache_store=lambda url, status, max_age: stored.append((url, max_age)),
+        )
+
+        request = httpx.Request("GET", "http://localhost/api/data")
+        response = await transport.handle_async_request(request)
+
+        assert inner.streams[0].consumed == 0
+        assert stored == []
+
+        body = await response.aread()
+        assert body == b'{"part": 1}{"part": 2}'
+        assert stored == [("http://localhost/api/data", 3600.0)]
+
+        cached = await transport.handle_async_request(request)
+        assert cached.content == body
+        assert len(inner.requests) == 1
+
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_body_over_cap_is_not_cached(self) -> None:
+        """Caching stops once the streamed body exceeds the cap."""
+        inner = StreamingMockAsyncTransport(chunks=[b"a" * 10, b"b" * 10, b"c" * 10])
+        transport = CacheResponseTransport(
+            inner, enable_streaming=True, max_streamed_cache_size=15
+        )
+
+        request = httpx.Request("GET", "http://localhost/api/large")
+        response = await transport.handle_async_request(request)
+        assert await response.aread() == b"a" * 10 + b"b" * 10 + b"c" * 10
+
+        await transport.handle_async_request(request)
+        assert len(inner.requests) == 2
+
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_declared_length_over_cap_skips_tee(self) -> None:
+        """A Content-Length above the cap passes the response through untouched."""
+        inner = StreamingMockAsyncTransport(extra_headers={"content-length": "1000"})
+        transport = CacheResponseTransport(
+            inner, enable_streaming=True, max_streamed_cache_size=100
+        )
+
+        request = httpx.Request("GET", "http://localhost/api/large")
+        response = await transport.handle_async_request(request)
+
+        assert response.stream is inner.streams[0]
+
+        await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_partially_read_body_is_not_cached(self) -> None:
+        """Closing the response early leaves the cache untouched."""
+        inner = StreamingMockAsyncTransport()
+        transport = CacheResponseTransport(inner, enable_streaming=True)
+
+        request = httpx.Request("GET", "http://localhost/api/data")
+        response = await transport.handle_async_request(request)
+        async for _ in response.aiter_raw():
+            break
+        await response.aclose()
+
+        assert inner.streams[0].closed is True
+        await transport.handle_async_request(request)
+        assert len(inner.requests) == 2
+
+        await transport.aclose()
+
+
+class ScriptedSyncTransport(httpx.BaseTransport):
+    """Sync transport replaying a script of responses and errors."""
+
+    def __init__(self, *steps) -> None:
+        self.steps = list(steps)
+        self.requests: list[httpx.Request] = []
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        step = self.steps.pop(0)
+        if isinstance(step, Exception):
+            raise step
+        return step
+
+
+def expire(transport: SyncCacheResponseTransport, key: str) -> None:
+    """Move a stored entry's expiry into the past."""
+    transport._cache._store.get(key).metadata.expires_at = time.time() - 1
+
+
+class TestSyncStoreBackedCaching:
+    """The sync transport is bounded, Vary-aware and revalidates like the async one."""
+
+    def test_store_is_bounded(self) -> None:
+        inner = CacheableMockSyncTransport(max_age=3600)
+        store = SyncMemoryCacheStore(max_entries=2)
+        transport = SyncCacheResponseTransport(inner, store=store)
+
+        for i in range(3):
+            transport.handle_request(httpx.Request("GET", f"http://localhost/api/{i}"))
+
+        assert store.size() == 2
+        assert store.has("GET:http://localhost/api/0") is False
+        transport.close()
+
+    def test_vary_mismatch_is_a_miss(self) -> None:
+        inner = ScriptedSyncTransport(
+            httpx.Response(200, headers={"cache-control": "max-age=60", "vary": "Accept"}, content=b"json"),
+            httpx.Response(200, headers={"cache-control": "max-age=60", "vary": "Accept"}, content=b"xml"),
+        )
+        transport = SyncCacheResponseTransport(inner)
+        url = "http://localhost/api/data"
+
+        transport.handle_request(httpx.Request("GET", url, headers={"Accept": "application/json"}))
+        response = transport.handle_request(
+            httpx.Request("GET", url, headers={"Accept": "application/xml"})
+        )
+
+        assert response.content == b"xml"
+        assert len(inner.requests) == 2
+        transport.close()
+
+    def test_vary_variants_are_kept_side_by_side(self) -> None:
+        inner = ScriptedSyncTransport(
+            httpx.Response(200, headers={"cache-control": "max-age=60", "vary": "Accept"}, content=b"json"),
+            httpx.Response(200, headers={"cache-control": "max-age=60", "vary": "Accept"}, content=b"xml"),
+        )
+        transport = SyncCacheResponseTransport(inner)
+        url = "http://localhost/api/data"
+
+        for accept, body in [("application/json", b"json"), ("application/xml", b"xml")] * 2:
+            response = transport.handle_request(
+                httpx.Request("GET", url, headers={"Accept": accept})
+            )
+            assert response.content == body
+
+        assert len(inner.requests) == 2
+        transport.close()
+
+    def test_post_query_rules_and_url_normalization(self) -> None:
+        inner = ScriptedSyncTransport(
+            httpx.Response(200, content=b"a"),
+            httpx.Response(200, content=b"b"),
+        )
+        config = CacheResponseConfig(
+            post_cache_rules=[PostCacheRule(r"/search$", ttl_seconds=60)],
+            normalize_urls=True,
+        )
+        transport = SyncCacheResponseTransport(inner, config=config)
+
+        for url, body in [
+            ("http://localhost/search", b"a"),
+            ("HTTP://LOCALHOST:80/search", b"a"),
+            ("http://localhost/search", b"b"),
+        ]:
+            transport.handle_request(httpx.Request("POST", url, content=body))
+
+        assert [request.content for request in inner.requests] == [b"a", b"b"]
+        transport.close()
+
+    def test_oversized_streamed_post_body_is_not_buffered(self) -> None:
+        inner = ScriptedSyncTransport(httpx.Response(200, content=b"ok"))
+        config = CacheResponseConfig(
+            post_cache_rules=[PostCacheRule(r"/search$", max_body_size=8)]
+        )
+        transport = SyncCacheResponseTransport(inner, config=config)
+        yielded = []
+
+        def chunks():
+            for chunk in (b"0123", b"4567", b"89ab", b"cdef"):
+                yielded.append(chunk)
+                yield chunk
+
+        transport.handle_request(httpx.Request("POST", "http://localhost/search", content=chunks()))
+
+        assert len(yielded) == 3
+        assert b"".join(inner.requests[0].stream) == b"0123456789abcdef"
+        transport.close()
+
+    def test_stale_entry_revalidated_with_304(self) -> None:
+        inner = CacheableMockSyncTransport(max_age=3600, etag='"v1"', last_modified="Wed, 21 Oct 2015 07:28:00 GMT")
+        on_revalidated = MagicMock()
+        transport = SyncCacheResponseTransport(inner, on_revalidated=on_revalidated)
+        url = "http://localhost/api/data"
+
+        transport.handle_request(httpx.Request("GET", url))
+        expire(transport, f"GET:{url}")
+        response = transport.handle_request(httpx.Request("GET", url))
+
+        assert response.status_code == 200
+        assert response.content == b'{"data": "cached"}'
+        assert inner.requests[1].headers["if-none-match"] == '"v1"'
+        assert inner.requests[1].headers["if-modified-since"] == "Wed, 21 Oct 2015 07:28:00 GMT"
+        on_revalidated.assert_called_once_with(url)
+
+        # Lifetime renewed: the next request is a fresh hit
+        transport.handle_request(httpx.Request("GET", url))
+        assert len(inner.requests) == 2
+        transport.close()
+
+    @pytest.mark.parametrize(
+        "failure",
+        [httpx.ConnectError("Connection refused"), httpx.Response(503), httpx.Response(500)],
+    )
+    def test_stale_if_error(self, failure) -> None:
+        inner = ScriptedSyncTransport(
+            httpx.Response(
+                200, headers={"cache-control": "max-age=60, stale-if-error=300"}, content=b"ok"
+            ),
+            failure,
+        )
+        on_cache_hit = MagicMock()
+        transport = SyncCacheResponseTransport(inner, on_cache_hit=on_cache_hit)
+        url = "http://localhost/api/data"
+
+        transport.handle_request(httpx.Request("GET", url))
+        expire(transport, f"GET:{url}")
+        response = transport.handle_request(httpx.Request("GET", url))
+
+        assert response.status_code == 200
+        assert response.content == b"ok"
+        assert response.headers["warning"] == '111 - "Revalidation Failed"'
+        on_cache_hit.assert_called_once_with(url, "stale")
+        transport.close()
+
+    def test_error_outside_stale_if_error_window(self) -> None:
+        inner = ScriptedSyncTransport(
+            httpx.Response(200, headers={"cache-control": "max-age=60"}, content=b"ok"),
+            httpx.ConnectError("Connection refused"),
+            httpx.Response(503),
+        )
+        transport = SyncCacheResponseTransport(inner)
+        url = "http://localhost/api/data"
+
+        transport.handle_request(httpx.Request("GET", url))
+        expire(transport, f"GET:{url}")
+
+        with pytest.raises(httpx.ConnectError):
+            transport.handle_request(httpx.Request("GET", url))
+        assert transport.handle_request(httpx.Request("GET", url)).status_code == 503
+        transport.close()
+
+
 class TestSyncTransportEdgeCases:
     """Edge case tests for sync transport."""
 